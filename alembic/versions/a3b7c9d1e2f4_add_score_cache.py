@@ -0,0 +1,52 @@
+"""Add score cache table
+
+Revision ID: a3b7c9d1e2f4
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-18
+
+Caches content scores keyed by a hash of the transcript excerpt, topic set,
+model and scoring prompt version, so identical scoring requests (reruns,
+reprocessed feeds, re-uploaded videos) are not paid for twice.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = 'a3b7c9d1e2f4'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'score_cache',
+        sa.Column('cache_key', sa.String(64), nullable=False),
+        sa.Column('scores', postgresql.JSONB(), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('prompt_version', sa.String(50), nullable=False),
+        sa.Column('topic_fingerprint', sa.String(32), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+
+    # For pruning entries from old prompt versions / topic sets
+    op.create_index('ix_score_cache_prompt_version', 'score_cache', ['prompt_version'])
+    op.create_index('ix_score_cache_created_at', 'score_cache', ['created_at'])
+
+    op.execute("ALTER TABLE score_cache ENABLE ROW LEVEL SECURITY;")
+    op.execute("""
+        CREATE POLICY "service_role_policy" ON score_cache
+        FOR ALL TO service_role
+        USING (true) WITH CHECK (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS service_role_policy ON score_cache;")
+    op.drop_table('score_cache')
@@ -0,0 +1,26 @@
+"""Add summary watermark to story arcs
+
+Revision ID: a8e6b3f2c9d4
+Revises: f4c1d7e9a2b6
+Create Date: 2026-10-18
+
+summary_updated_at is the extracted_at of the newest event covered by
+story_arcs.summary. Arcs with events extracted after it (or no summary
+yet) are the ones scripts/update_arc_summaries.py regenerates.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'a8e6b3f2c9d4'
+down_revision = 'f4c1d7e9a2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('story_arcs', sa.Column('summary_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('story_arcs', 'summary_updated_at')
@@ -0,0 +1,44 @@
+"""Add topic score fingerprints table
+
+Revision ID: b5d2e8f1c3a7
+Revises: a3b7c9d1e2f4
+Create Date: 2026-10-18
+
+Records, per topic, a hash of the name and description that stored episode
+scores were produced with. Incremental rescoring compares it with the
+current topic to score only topics that were added or edited.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'b5d2e8f1c3a7'
+down_revision = 'a3b7c9d1e2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'topic_score_fingerprints',
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.Column('topic_name', sa.String(256), nullable=False),
+        sa.Column('topic_hash', sa.String(32), nullable=False),
+        sa.Column('model', sa.String(100), nullable=True),
+        sa.Column('prompt_version', sa.String(50), nullable=True),
+        sa.Column('scored_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('topic_id'),
+        sa.ForeignKeyConstraint(['topic_id'], ['topics.id'], ondelete='CASCADE'),
+    )
+
+    op.execute("ALTER TABLE topic_score_fingerprints ENABLE ROW LEVEL SECURITY;")
+    op.execute("""
+        CREATE POLICY "service_role_policy" ON topic_score_fingerprints
+        FOR ALL TO service_role
+        USING (true) WITH CHECK (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS service_role_policy ON topic_score_fingerprints;")
+    op.drop_table('topic_score_fingerprints')
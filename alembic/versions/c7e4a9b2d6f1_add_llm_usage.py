@@ -0,0 +1,56 @@
+"""Add LLM usage ledger table
+
+Revision ID: c7e4a9b2d6f1
+Revises: b5d2e8f1c3a7
+Create Date: 2026-10-18
+
+One row per chat completion or embedding call: model, tokens (including
+prompt-cached tokens), latency, retries and estimated cost, tagged by
+pipeline stage, episode and run.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'c7e4a9b2d6f1'
+down_revision = 'b5d2e8f1c3a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_usage',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('run_id', sa.String(100), nullable=True),
+        sa.Column('stage', sa.String(50), nullable=False),
+        sa.Column('operation', sa.String(20), nullable=False, server_default='chat'),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('episode_guid', sa.String(512), nullable=True),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cached_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('retries', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cost_usd', sa.Numeric(12, 6), nullable=False, server_default='0'),
+        sa.Column('success', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_index('ix_llm_usage_run_id', 'llm_usage', ['run_id'])
+    op.create_index('ix_llm_usage_stage_created', 'llm_usage', ['stage', 'created_at'])
+    op.create_index('ix_llm_usage_episode_guid', 'llm_usage', ['episode_guid'])
+
+    op.execute("ALTER TABLE llm_usage ENABLE ROW LEVEL SECURITY;")
+    op.execute("""
+        CREATE POLICY "service_role_policy" ON llm_usage
+        FOR ALL TO service_role
+        USING (true) WITH CHECK (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS service_role_policy ON llm_usage;")
+    op.drop_table('llm_usage')
@@ -0,0 +1,27 @@
+"""Add prompt_version to LLM usage ledger
+
+Revision ID: d9f3b6a1c8e2
+Revises: c7e4a9b2d6f1
+Create Date: 2026-10-18
+
+Records which prompt version each call sent, so the cached-token share can
+be compared across prompt layouts.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'd9f3b6a1c8e2'
+down_revision = 'c7e4a9b2d6f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('llm_usage', sa.Column('prompt_version', sa.String(50), nullable=True))
+    op.create_index('ix_llm_usage_stage_prompt_version', 'llm_usage', ['stage', 'prompt_version'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_usage_stage_prompt_version', table_name='llm_usage')
+    op.drop_column('llm_usage', 'prompt_version')
@@ -0,0 +1,45 @@
+"""Add story arc embeddings table
+
+Revision ID: e2a8c5f7b1d4
+Revises: d9f3b6a1c8e2
+Create Date: 2026-10-18
+
+Stores one embedding per story arc (name plus latest events) for selecting
+the arcs most similar to an episode as extraction context. text_hash
+identifies the text that was embedded, so an arc is re-embedded only after
+its name or latest events change.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = 'e2a8c5f7b1d4'
+down_revision = 'd9f3b6a1c8e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'story_arc_embeddings',
+        sa.Column('story_arc_id', sa.Integer(), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('text_hash', sa.String(64), nullable=False),
+        sa.Column('embedding', postgresql.ARRAY(sa.REAL()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.ForeignKeyConstraint(['story_arc_id'], ['story_arcs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('story_arc_id', 'model'),
+    )
+
+    op.execute("ALTER TABLE story_arc_embeddings ENABLE ROW LEVEL SECURITY;")
+    op.execute("""
+        CREATE POLICY "service_role_policy" ON story_arc_embeddings
+        FOR ALL TO service_role
+        USING (true) WITH CHECK (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS service_role_policy ON story_arc_embeddings;")
+    op.drop_table('story_arc_embeddings')
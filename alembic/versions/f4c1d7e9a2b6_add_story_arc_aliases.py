@@ -0,0 +1,49 @@
+"""Add story arc aliases table
+
+Revision ID: f4c1d7e9a2b6
+Revises: e2a8c5f7b1d4
+Create Date: 2026-10-18
+
+Maps alternative arc slugs to the arc they name, per digest topic. Aliases
+are learned when dedupe_topics.py merges a duplicate arc (its slug now
+names the canonical arc) and when an extracted arc name is resolved to an
+existing arc by fuzzy matching, so the same variant resolves exactly next
+time.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'f4c1d7e9a2b6'
+down_revision = 'e2a8c5f7b1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'story_arc_aliases',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('digest_topic', sa.String(256), nullable=False),
+        sa.Column('alias_slug', sa.String(255), nullable=False),
+        sa.Column('story_arc_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(20), nullable=False),  # merge, fuzzy
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.ForeignKeyConstraint(['story_arc_id'], ['story_arcs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_unique_constraint('uq_story_arc_aliases_slug_digest', 'story_arc_aliases', ['alias_slug', 'digest_topic'])
+    op.create_index('ix_story_arc_aliases_story_arc_id', 'story_arc_aliases', ['story_arc_id'])
+
+    op.execute("ALTER TABLE story_arc_aliases ENABLE ROW LEVEL SECURITY;")
+    op.execute("""
+        CREATE POLICY "service_role_policy" ON story_arc_aliases
+        FOR ALL TO service_role
+        USING (true) WITH CHECK (true);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS service_role_policy ON story_arc_aliases;")
+    op.drop_table('story_arc_aliases')
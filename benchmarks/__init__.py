@@ -0,0 +1 @@
+# Parsing benchmarks and fuzz corpus
@@ -0,0 +1,352 @@
+"""
+Synthetic Parsing Corpus
+
+Deterministic generators for YouTube-style captions (VTT, SRT, json3, srv3)
+and YouTube Atom channel feeds of configurable size, plus a set of
+hand-written malformed samples and random corruptions used for fuzzing.
+
+Every generator takes a seed, so the same arguments always produce the
+same bytes and benchmark numbers stay comparable between runs.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "so the new model is actually really good at reasoning and we tested it on "
+    "a bunch of coding tasks agents tools memory context window benchmark open "
+    "source weights inference cost latency you know I think that's the point"
+).split()
+
+# One auto-caption phrase every PHRASE_SECONDS
+PHRASE_SECONDS = 2.01
+
+
+def _vtt_time(seconds: float) -> str:
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}"
+
+
+def _srt_time(seconds: float) -> str:
+    return _vtt_time(seconds).replace('.', ',')
+
+
+def generate_phrases(hours: float, seed: int = 0) -> List[Tuple[float, List[str]]]:
+    """Generate (start_seconds, words) caption phrases, one every PHRASE_SECONDS."""
+    rng = random.Random(seed)
+    phrases = []
+    t = 0.0
+    end = hours * 3600
+
+    while t < end:
+        phrases.append((t, [rng.choice(WORDS) for _ in range(rng.randint(5, 9))]))
+        t += PHRASE_SECONDS
+
+    return phrases
+
+
+def generate_auto_caption_vtt(hours: float, seed: int = 0) -> str:
+    """
+    Generate a YouTube-style rolling auto-caption VTT file.
+
+    Each phrase appears three times: once with inline word timing tags,
+    once as a 10ms "settle" cue, and again as the first line of the next cue.
+    """
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    prev = ""
+
+    for t, words in generate_phrases(hours, seed):
+        timed = words[0] + "".join(
+            f"<{_vtt_time(t + 0.3 * (i + 1))}><c> {w}</c>" for i, w in enumerate(words[1:])
+        )
+        phrase = " ".join(words)
+
+        out.append(f"{_vtt_time(t)} --> {_vtt_time(t + 2.0)} align:start position:0%")
+        out.extend([prev, timed] if prev else [timed])
+        out.append("")
+        out.append(f"{_vtt_time(t + 2.0)} --> {_vtt_time(t + 2.01)} align:start position:0%")
+        out.extend([prev, phrase] if prev else [phrase])
+        out.append("")
+
+        prev = phrase
+
+    return "\n".join(out)
+
+
+def generate_overlapping_vtt(hours: float, seed: int = 0) -> str:
+    """
+    Generate rolling captions with overlapping cues and no settle cues.
+
+    Each phrase is first shown half-typed, then complete, and stays on screen
+    as the top line of the next cue; cue times overlap by half a second. This
+    is the worst case for overlap de-duplication.
+    """
+    out = ["WEBVTT", ""]
+    prev = ""
+
+    for t, words in generate_phrases(hours, seed):
+        half = " ".join(words[:len(words) // 2])
+        phrase = " ".join(words)
+
+        out.append(f"{_vtt_time(t)} --> {_vtt_time(t + 1.5)}")
+        out.extend([prev, half] if prev else [half])
+        out.append("")
+        out.append(f"{_vtt_time(t + 1.0)} --> {_vtt_time(t + 2.5)}")
+        out.extend([prev, phrase] if prev else [phrase])
+        out.append("")
+
+        prev = phrase
+
+    return "\n".join(out)
+
+
+def generate_styled_vtt(hours: float, seed: int = 0) -> str:
+    """
+    Generate a manually authored VTT file with heavy markup.
+
+    Includes a STYLE block, NOTE comments, cue identifiers, voice spans,
+    bold/italic/class tags, ASS-style brace tags and CRLF line endings.
+    """
+    rng = random.Random(seed)
+    out = [
+        "WEBVTT - styled captions",
+        "",
+        "STYLE",
+        "::cue { color: yellow; }",
+        "",
+        "NOTE generated for benchmarks",
+        "",
+    ]
+    speakers = ["Host", "Guest", "Narrator"]
+
+    for i, (t, words) in enumerate(generate_phrases(hours, seed)):
+        phrase = " ".join(words)
+        style = rng.randrange(5)
+        if style == 0:
+            phrase = f"<v {rng.choice(speakers)}>{phrase}</v>"
+        elif style == 1:
+            phrase = f"<b>{words[0]}</b> {' '.join(words[1:])}"
+        elif style == 2:
+            phrase = f"<i>{phrase}</i>"
+        elif style == 3:
+            phrase = f"<c.colorE5E5E5>{phrase}</c>"
+        else:
+            phrase = "{\\an8}" + phrase
+
+        out.append(f"cue-{i + 1}")
+        out.append(f"{_vtt_time(t)} --> {_vtt_time(t + 2.0)} line:85% align:middle")
+        out.append(phrase)
+        out.append("")
+
+    return "\r\n".join(out)
+
+
+def generate_auto_caption_json3(hours: float, seed: int = 0) -> str:
+    """Generate the same captions as generate_auto_caption_vtt in json3 format."""
+    events = [{"tStartMs": 0, "dDurationMs": int(hours * 3600 * 1000), "id": 1, "wpWinPosId": 1}]
+
+    for t, words in generate_phrases(hours, seed):
+        start_ms = int(t * 1000)
+        segs = [{"utf8": words[0], "acAsrConf": 0}]
+        segs.extend({"utf8": f" {w}", "tOffsetMs": 300 * (i + 1), "acAsrConf": 0} for i, w in enumerate(words[1:]))
+        events.append({"tStartMs": start_ms, "dDurationMs": 4020, "wWinId": 1, "segs": segs})
+        events.append({"tStartMs": start_ms + 2000, "dDurationMs": 2020, "wWinId": 1, "aAppend": 1, "segs": [{"utf8": "\n"}]})
+
+    return json.dumps({"wireMagic": "pb3", "pens": [{}], "events": events})
+
+
+def generate_auto_caption_srv3(hours: float, seed: int = 0) -> str:
+    """Generate the same captions as generate_auto_caption_vtt in srv3 format."""
+    out = ['<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">', '<body>']
+
+    for t, words in generate_phrases(hours, seed):
+        start_ms = int(t * 1000)
+        segs = f'<s ac="0">{escape(words[0])}</s>' + "".join(
+            f'<s t="{300 * (i + 1)}" ac="0"> {escape(w)}</s>' for i, w in enumerate(words[1:])
+        )
+        out.append(f'<p t="{start_ms}" d="4020" w="1">{segs}</p>')
+        out.append(f'<p t="{start_ms + 2000}" d="2020" w="1" a="1">\n</p>')
+
+    out.append('</body></timedtext>')
+    return "\n".join(out)
+
+
+def generate_srt(hours: float, seed: int = 0) -> str:
+    """Generate a manual-caption style SRT file."""
+    rng = random.Random(seed)
+    out = []
+    t = 0.0
+    index = 1
+    end = hours * 3600
+
+    while t < end:
+        phrase = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12)))
+        out.append(str(index))
+        out.append(f"{_srt_time(t)} --> {_srt_time(t + 3.0)}")
+        out.append(f"<i>{phrase}</i>" if index % 7 == 0 else phrase)
+        out.append("")
+        index += 1
+        t += 3.0
+
+    return "\n".join(out)
+
+
+def generate_youtube_feed(entries: int = 15, seed: int = 0, channel_id: str = "UCbenchmark00000000000000") -> str:
+    """
+    Generate a YouTube channel Atom feed (feeds/videos.xml) document.
+
+    YouTube serves the 15 most recent uploads; larger counts are useful for
+    measuring per-entry cost.
+    """
+    rng = random.Random(seed)
+    published = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+        'xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">',
+        f' <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"/>',
+        f' <id>yt:channel:{channel_id}</id>',
+        f' <yt:channelId>{channel_id}</yt:channelId>',
+        ' <title>Benchmark Channel</title>',
+        f' <link rel="alternate" href="https://www.youtube.com/channel/{channel_id}"/>',
+        f' <published>{published.isoformat()}</published>',
+    ]
+
+    for i in range(entries):
+        video_id = "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-") for _ in range(11))
+        title = escape(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).title())
+        description = escape("\n".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))) for _ in range(rng.randint(3, 12))
+        ))
+        when = (published + timedelta(hours=6 * i)).isoformat()
+        out.extend([
+            ' <entry>',
+            f'  <id>yt:video:{video_id}</id>',
+            f'  <yt:videoId>{video_id}</yt:videoId>',
+            f'  <yt:channelId>{channel_id}</yt:channelId>',
+            f'  <title>{title}</title>',
+            f'  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>',
+            '  <author>',
+            '   <name>Benchmark Channel</name>',
+            f'   <uri>https://www.youtube.com/channel/{channel_id}</uri>',
+            '  </author>',
+            f'  <published>{when}</published>',
+            f'  <updated>{when}</updated>',
+            '  <media:group>',
+            f'   <media:title>{title}</media:title>',
+            f'   <media:content url="https://www.youtube.com/v/{video_id}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>',
+            f'   <media:thumbnail url="https://i1.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>',
+            f'   <media:description>{description}</media:description>',
+            '   <media:community>',
+            f'    <media:starRating count="{rng.randint(0, 5000)}" average="5.00" min="1" max="5"/>',
+            f'    <media:statistics views="{rng.randint(0, 10 ** 6)}"/>',
+            '   </media:community>',
+            '  </media:group>',
+            ' </entry>',
+        ])
+
+    out.append('</feed>')
+    return "\n".join(out)
+
+
+# Hand-written inputs that have broken parsers before or plausibly could.
+# Keyed by the format the sample claims to be.
+MALFORMED_SAMPLES: Dict[str, List[bytes]] = {
+    'vtt': [
+        b'',
+        b'WEBVTT',
+        b'WEBVTT\n\n00:00:00.000 --> ',
+        b'WEBVTT\n\n --> \ntext without timing\n',
+        b'WEBVTT\n\n99:99:99.999 --> 00:00:00.000\nbackwards cue\n',
+        b'WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n<c unterminated tag\n{unterminated brace\n',
+        b'\xef\xbb\xbfWEBVTT\r\n\r\n00:00:01.000 --> 00:00:02.000\r\nbom and crlf\r\n',
+        b'WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n\xff\xfe invalid \xc3 utf-8 \xe2\x82\n',
+        b'WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n' + b'word ' * 50000 + b'\n',
+        b'WEBVTT\n' + b'\n' * 10000,
+    ],
+    'srt': [
+        b'',
+        b'1\n',
+        b'1\n00:00:01,000 --> \n',
+        b'1\n00:00:01,000 --> 00:00:02,000\n<i>unclosed italics\n\n2\n',
+        b'\xef\xbb\xbf1\r\n00:00:01,000 --> 00:00:02,000\r\nbom\r\n',
+        b'\xd9\xa1\xd9\xa2\n00:00:01,000 --> 00:00:02,000\narabic-indic sequence number\n',
+    ],
+    'json3': [
+        b'',
+        b'{',
+        b'null',
+        b'[]',
+        b'"events"',
+        b'{"events": null}',
+        b'{"events": 5}',
+        b'{"events": "abc"}',
+        b'{"events": [null, 1, "x", []]}',
+        b'{"events": [{"segs": null}, {"segs": {}}, {"segs": [null, 1, {"utf8": 5}]}]}',
+        b'{"events": [{"tStartMs": "soon", "dDurationMs": null, "segs": [{"utf8": "bad timing"}]}]}',
+        b'{"events": [{"tStartMs": 1e400, "segs": [{"utf8": "overflowing timing"}]}]}',
+        b'{"events": [{"segs": [{"utf8": "\\ud800 lone surrogate"}]}]}',
+    ],
+    'srv3': [
+        b'',
+        b'<',
+        b'<timedtext><body><p t="0" d="1">unclosed',
+        b'<timedtext><body><p t="x" d="y">bad timing</p></body></timedtext>',
+        b'<timedtext><body><p>&undefined;</p></body></timedtext>',
+        b'<?xml version="1.0" encoding="latin-1"?><timedtext><body><p t="0">caf\xe9</p></body></timedtext>',
+        b'<!DOCTYPE x [<!ENTITY a "aaaaaaaaaa">]><timedtext><body><p>&a;&a;</p></body></timedtext>',
+        b'<timedtext><body><p t="0"><s>nested <s>segments</s></s></p></body></timedtext>',
+    ],
+    'feed': [
+        b'',
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><id>yt:video:</id></entry></feed>',
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>no id</title></entry></feed>',
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><id>yt:video:abc</id>'
+        b'<published>not a date</published></entry></feed>',
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><id>yt:video:abc',
+        b'<!doctype html><html><body>captcha</body></html>',
+    ],
+}
+
+
+def corrupt(data: bytes, rng: random.Random) -> bytes:
+    """
+    Apply one to three random corruptions to a document.
+
+    Mutations: truncation, random byte flips, deleted or duplicated spans,
+    inserted markup fragments and swapped chunks.
+    """
+    data = bytearray(data)
+    fragments = [b'-->', b'<', b'>', b'{', b'}', b'\n\n', b'\r', b'\x00', b'\xff', b'"',
+                 b'<p t="', b'{"segs":', b'WEBVTT', b'99:99:99.999', b'&', b'<![CDATA[']
+
+    for _ in range(rng.randint(1, 3)):
+        if not data:
+            data.extend(rng.choice(fragments))
+            continue
+
+        i = rng.randrange(len(data))
+        j = min(len(data), i + rng.randint(1, 256))
+        mutation = rng.randrange(6)
+
+        if mutation == 0:
+            del data[i:]
+        elif mutation == 1:
+            for _ in range(rng.randint(1, 16)):
+                data[rng.randrange(len(data))] = rng.randrange(256)
+        elif mutation == 2:
+            del data[i:j]
+        elif mutation == 3:
+            data[i:i] = data[i:j] * rng.randint(2, 8)
+        elif mutation == 4:
+            data[i:i] = rng.choice(fragments)
+        else:
+            k = rng.randrange(len(data))
+            a, b = sorted((i, k))
+            data = data[:a] + data[b:] + data[a:b]
+
+    return bytes(data)
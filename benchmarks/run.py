@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Parsing Benchmark Runner
+
+Measures throughput (MB/s) and peak memory of the subtitle parsers and the
+YouTube feed parsing path (feedparser + YouTubeFeedProcessor._parse_entry)
+on the synthetic corpus in benchmarks/corpus.py, and compares the results
+with benchmarks/baseline.json. A case that is slower or uses more memory
+than the baseline allows fails the run (exit code 1).
+
+Speed is compared as a ratio against a fixed pure-Python calibration loop
+timed alongside each run, which factors out most of the machine speed and
+background load; raw MB/s is printed for reference. Short cases are looped
+until each timed sample takes MIN_SAMPLE_SECONDS, and a slowdown smaller than
+MIN_SLOWDOWN_SECONDS per run is not reported whatever its ratio, so timer
+noise on millisecond cases doesn't fail the run.
+
+--fuzz N instead feeds N randomly corrupted documents (plus the hand-written
+malformed samples) through every parser and fails if any of them raises.
+
+Baseline numbers are machine-specific: refresh them with --update-baseline
+on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.run [--hours N] [--repeat N] [--case NAME ...]
+                             [--update-baseline] [--tolerance F] [--memory-tolerance F]
+    python -m benchmarks.run --fuzz N [--seed S] [--save-failures DIR]
+"""
+
+import argparse
+import io
+import json
+import logging
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import corpus
+from src.youtube.subtitle_parser import (
+    parse_vtt_stream, parse_srt_stream, parse_json3_stream, parse_srv3_stream, parse_subtitle
+)
+
+try:
+    import feedparser
+    from src.youtube.feed_processor import YouTubeFeedProcessor
+except ImportError:
+    feedparser = None
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+# Size of the documents that get corrupted in fuzz mode (~70 cues)
+FUZZ_SAMPLE_HOURS = 0.04
+
+FEED_CHANNEL_ID = 'UCbenchmark00000000000000'
+
+CALIBRATION_LOOPS = 100_000
+
+# Timed samples repeat a case until they take at least this long
+MIN_SAMPLE_SECONDS = 0.2
+# Slowdowns below this per run are noise, not regressions
+MIN_SLOWDOWN_SECONDS = 0.005
+
+
+@dataclass
+class BenchCase:
+    """One parser run over one generated document."""
+    name: str
+    generate: Callable[[float], str]
+    run: Callable[[bytes], int]
+    needs_feedparser: bool = False
+
+
+def _parse_feed(data: bytes) -> int:
+    """The parse half of YouTubeFeedProcessor.parse_feed (no network)."""
+    feed = feedparser.parse(data)
+    return len(YouTubeFeedProcessor().videos_from_feed(feed, FEED_CHANNEL_ID))
+
+
+def _fuzz_feed(data: bytes) -> int:
+    """
+    Like _parse_feed, but an exception from feedparser itself counts as a
+    rejected document (parse_feed catches it and reports a failed fetch).
+    Entry handling must still never raise, even for bozo feeds.
+    """
+    try:
+        feed = feedparser.parse(data)
+    except Exception:
+        return 0
+    return len(YouTubeFeedProcessor().videos_from_feed(feed, FEED_CHANNEL_ID))
+
+
+# Subtitle cases parse from a binary file handle with cue timing, the same
+# way YtdlpTranscriptFetcher does via parse_subtitle_file(); VTT cases merge
+# overlaps as it does for auto-captions
+CASES = [
+    BenchCase('vtt_auto_caption', corpus.generate_auto_caption_vtt,
+              lambda data: parse_vtt_stream(io.BytesIO(data), merge_overlaps=True, with_cues=True).word_count),
+    BenchCase('vtt_overlapping', corpus.generate_overlapping_vtt,
+              lambda data: parse_vtt_stream(io.BytesIO(data), merge_overlaps=True, with_cues=True).word_count),
+    BenchCase('vtt_styled', corpus.generate_styled_vtt,
+              lambda data: parse_vtt_stream(io.BytesIO(data), merge_overlaps=True, with_cues=True).word_count),
+    BenchCase('srt', corpus.generate_srt,
+              lambda data: parse_srt_stream(io.BytesIO(data), with_cues=True).word_count),
+    BenchCase('json3_auto_caption', corpus.generate_auto_caption_json3,
+              lambda data: parse_json3_stream(io.BytesIO(data), with_cues=True).word_count),
+    BenchCase('srv3_auto_caption', corpus.generate_auto_caption_srv3,
+              lambda data: parse_srv3_stream(io.BytesIO(data), with_cues=True).word_count),
+    # Feed size scales with --hours so a quick run stays quick
+    BenchCase('feed_15_entries', lambda hours: corpus.generate_youtube_feed(15),
+              _parse_feed, needs_feedparser=True),
+    BenchCase('feed_large', lambda hours: corpus.generate_youtube_feed(max(15, int(hours * 200))),
+              _parse_feed, needs_feedparser=True),
+]
+
+# Every parser entry point the fuzzer throws data at
+FUZZ_TARGETS: Dict[str, Callable[[bytes], object]] = {
+    'vtt': lambda data: parse_vtt_stream(io.BytesIO(data), merge_overlaps=True, with_cues=True),
+    'vtt_str_no_merge': lambda data: parse_vtt_stream(
+        data.decode('utf-8', errors='replace'), merge_overlaps=False, with_cues=True),
+    'srt': lambda data: parse_srt_stream(io.BytesIO(data), with_cues=True),
+    'json3': lambda data: parse_json3_stream(io.BytesIO(data), with_cues=True),
+    'srv3': lambda data: parse_srv3_stream(io.BytesIO(data), with_cues=True),
+    'srv3_str': lambda data: parse_srv3_stream(data.decode('utf-8', errors='replace')),
+    'auto_detect': lambda data: parse_subtitle(data.decode('utf-8', errors='replace'), format='auto', with_cues=True),
+}
+if feedparser:
+    FUZZ_TARGETS['feed'] = _fuzz_feed
+
+FUZZ_SEEDS = {
+    'vtt': corpus.generate_auto_caption_vtt,
+    'vtt_overlapping': corpus.generate_overlapping_vtt,
+    'vtt_styled': corpus.generate_styled_vtt,
+    'srt': corpus.generate_srt,
+    'json3': corpus.generate_auto_caption_json3,
+    'srv3': corpus.generate_auto_caption_srv3,
+    'feed': lambda hours: corpus.generate_youtube_feed(3),
+}
+
+
+def _calibration_run() -> float:
+    """Time a fixed workload of the same flavour as the parsers (str ops in a loop)."""
+    start = time.perf_counter()
+    total = 0
+    for i in range(CALIBRATION_LOOPS):
+        total += len(str(i).split('1'))
+    return time.perf_counter() - start
+
+
+def measure(case: BenchCase, data: bytes, repeat: int, calibration: List[float]) -> Dict:
+    """
+    Time `repeat` samples (median wins), then one traced run for peak memory.
+
+    Each sample loops the case enough times to last MIN_SAMPLE_SECONDS and
+    records the time per run. A calibration run is timed before each sample
+    and appended to `calibration`, which is shared by the whole session.
+    """
+    timings = []
+    start = time.perf_counter()
+    items = case.run(data)  # warm-up: imports, regex and codec caches
+    loops = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-6)))
+    for _ in range(repeat):
+        calibration.append(_calibration_run())
+        start = time.perf_counter()
+        for _ in range(loops):
+            items = case.run(data)
+        timings.append((time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    try:
+        case.run(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'size_bytes': len(data),
+        'seconds': statistics.median(timings),
+        'mb_per_s': round(len(data) / 1024 / 1024 / statistics.median(timings), 2),
+        'peak_bytes': peak,
+        'items': items,
+    }
+
+
+def load_baseline() -> Optional[Dict]:
+    if not BASELINE_PATH.exists():
+        return None
+    with open(BASELINE_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(
+    name: str,
+    result: Dict,
+    baseline: Dict,
+    calibration: float,
+    tolerance: float,
+    memory_tolerance: float
+) -> List[str]:
+    """Return regression messages for one case (empty if within limits)."""
+    problems = []
+    base = baseline.get('cases', {}).get(name)
+    if not base:
+        return problems
+
+    slowdown = 1 - result['relative_speed'] / base['relative_speed']
+    # Seconds per run added, at this session's calibration
+    added = calibration / result['relative_speed'] - calibration / base['relative_speed']
+    if slowdown > tolerance and added >= MIN_SLOWDOWN_SECONDS:
+        problems.append(
+            f"{name}: {slowdown:.0%} slower than baseline relative to calibration "
+            f"({result['mb_per_s']:.1f} MB/s now, {base['mb_per_s']:.1f} MB/s when recorded; "
+            f"-{tolerance:.0%} allowed)"
+        )
+
+    max_peak = base['peak_bytes'] * (1 + memory_tolerance)
+    if result['peak_bytes'] > max_peak:
+        problems.append(
+            f"{name}: peak memory {result['peak_bytes'] / 1024:.0f} KB is above baseline "
+            f"{base['peak_bytes'] / 1024:.0f} KB (+{memory_tolerance:.0%} allowed)"
+        )
+
+    if result['items'] != base.get('items', result['items']):
+        problems.append(f"{name}: output changed ({base['items']} -> {result['items']} items)")
+
+    return problems
+
+
+def run_benchmarks(args) -> int:
+    baseline = load_baseline()
+    if baseline and baseline.get('hours') != args.hours:
+        print(f"Baseline was recorded with --hours {baseline.get('hours')}; not comparing")
+        baseline = None
+
+    cases = [c for c in CASES if not args.case or c.name in args.case]
+    results = {}
+    problems = []
+    calibration = []
+
+    print(f"Parsing benchmarks ({args.hours:g}h documents, median of {args.repeat})")
+    print(f"{'case':<22} {'size':>10} {'MB/s':>9} {'peak':>11} {'items':>9} {'baseline MB/s':>14}")
+    print("-" * 80)
+
+    for case in cases:
+        if case.needs_feedparser and not feedparser:
+            print(f"{case.name:<22} skipped (feedparser not installed)")
+            continue
+
+        data = case.generate(args.hours).encode('utf-8')
+        result = measure(case, data, args.repeat, calibration)
+        results[case.name] = result
+
+        base = (baseline or {}).get('cases', {}).get(case.name)
+        base_speed = f"{base['mb_per_s']:.1f}" if base else '-'
+        print(f"{case.name:<22} {result['size_bytes'] / 1024 / 1024:8.2f}MB {result['mb_per_s']:9.1f} "
+              f"{result['peak_bytes'] / 1024:9.0f}KB {result['items']:>9} {base_speed:>14}")
+
+    session_calibration = statistics.median(calibration) if calibration else 0.0
+    for name, result in results.items():
+        result['relative_speed'] = round(session_calibration / result.pop('seconds'), 4)
+        if baseline:
+            problems.extend(compare(
+                name, result, baseline, session_calibration, args.tolerance, args.memory_tolerance
+            ))
+
+    if args.update_baseline:
+        updated = baseline or {'cases': {}}
+        updated.update({
+            'hours': args.hours,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'recorded_at': time.strftime('%Y-%m-%d'),
+        })
+        updated['cases'].update(results)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(updated, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    if problems:
+        print("\nREGRESSIONS:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+
+    if baseline:
+        print("\nAll cases within baseline limits")
+    else:
+        print("\nNo baseline to compare against (run with --update-baseline)")
+    return 0
+
+
+def run_fuzz(args) -> int:
+    """Throw malformed and randomly corrupted documents at every parser."""
+    inputs = []
+    for fmt, samples in corpus.MALFORMED_SAMPLES.items():
+        for i, sample in enumerate(samples):
+            inputs.append((f"malformed {fmt}[{i}]", sample))
+
+    seeds = {name: generate(FUZZ_SAMPLE_HOURS).encode('utf-8') for name, generate in FUZZ_SEEDS.items()}
+    seed_names = sorted(seeds)
+    for i in range(args.fuzz):
+        rng = random.Random(args.seed + i)
+        name = rng.choice(seed_names)
+        inputs.append((f"seed {args.seed + i} ({name})", corpus.corrupt(seeds[name], rng)))
+
+    failures = []
+    for label, data in inputs:
+        for target, parse in FUZZ_TARGETS.items():
+            try:
+                parse(data)
+            except Exception as e:
+                failures.append((label, target, data, e))
+
+    print(f"Fuzzed {len(inputs)} inputs x {len(FUZZ_TARGETS)} parsers")
+    if not failures:
+        print("No parser raised")
+        return 0
+
+    print(f"\n{len(failures)} FAILURES:")
+    for label, target, data, e in failures[:50]:
+        print(f"  {target:<18} {label:<32} {type(e).__name__}: {e}")
+
+    if args.save_failures:
+        out_dir = Path(args.save_failures)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for n, (label, target, data, _) in enumerate(failures):
+            (out_dir / f"{n:04d}_{target}.bin").write_bytes(data)
+        print(f"\nFailing inputs saved to {out_dir}")
+
+    return 1
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark and fuzz subtitle/feed parsing')
+    parser.add_argument('--hours', type=float, default=3.0, help='Caption length in hours (default: 3)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed samples per case; the median is kept (default: 5)')
+    parser.add_argument('--case', type=str, action='append', help='Only run this case (can be repeated)')
+    parser.add_argument('--update-baseline', action='store_true', help='Record results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.35,
+                        help='Allowed relative slowdown vs baseline (default: 0.35)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10,
+                        help='Allowed peak memory increase vs baseline (default: 0.10)')
+    parser.add_argument('--fuzz', type=int, help='Fuzz the parsers with N corrupted documents instead')
+    parser.add_argument('--seed', type=int, default=0, help='First fuzz seed (default: 0)')
+    parser.add_argument('--save-failures', type=str, help='Directory to save inputs that made a parser raise')
+
+    args = parser.parse_args()
+
+    # Parsers log warnings for every malformed entry; only results matter here
+    logging.disable(logging.CRITICAL)
+
+    if args.fuzz is not None:
+        return run_fuzz(args)
+    return run_benchmarks(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+A/B Test Fused Scoring + Story Arc Extraction
+
+Runs recent episodes through both paths and compares them:
+
+- two-call: ContentScorer, then one StoryArcExtractor call per relevant
+  tracking-enabled topic (the default pipeline)
+- fused: one FusedEpisodeAnalyzer call per episode
+  (topic_tracking.fused_extraction = true)
+
+Reports LLM cost, tokens and latency per episode for each path, score
+differences, how often the relevance verdicts agree, and the overlap of
+extracted arc names. Nothing is written to the database; the score cache
+is bypassed so both paths really call the model.
+
+Usage:
+    python scripts/ab_fused_extraction.py [--days N] [--limit N] [--verbose]
+"""
+
+import argparse
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.excerpt import ExcerptBuilder
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.scoring.content_scorer import ContentScorer
+from src.topic_tracking.fused_analyzer import FusedEpisodeAnalyzer
+from src.topic_tracking.topic_extractor import StoryArcExtractor
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"ab_fused_extraction_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def normalize_arc_name(name: str) -> str:
+    """Lowercase alphanumeric words, for comparing arc names across paths."""
+    return " ".join(re.findall(r'[a-z0-9]+', name.lower()))
+
+
+def arc_names(extraction: dict) -> set:
+    """Normalized names of all continuing and new arcs in one extraction."""
+    arcs = extraction.get('continuing_arcs', []) + extraction.get('new_arcs', [])
+    return {normalize_arc_name(arc['arc_name']) for arc in arcs}
+
+
+def run_two_call(scorer, extractor, tracking_topic_names, score_threshold, episode) -> dict:
+    """Score, then extract arcs for each relevant tracking topic."""
+    result = scorer.score_transcript(episode['transcript_content'], episode['episode_guid'])
+    extractions = {}
+    if result.success:
+        for topic_name in tracking_topic_names:
+            if result.scores.get(topic_name, 0.0) >= score_threshold:
+                extractions[topic_name] = extractor.extract(
+                    episode['transcript_content'], topic_name, episode['title'], episode['episode_guid']
+                )
+    return {'success': result.success, 'scores': result.scores, 'extractions': extractions}
+
+
+def run_fused(analyzer, episode) -> dict:
+    """Score and extract arcs in one call."""
+    result = analyzer.analyze(episode['transcript_content'], episode['episode_guid'], episode['title'])
+    return {'success': result.scoring.success, 'scores': result.scoring.scores, 'extractions': result.extractions}
+
+
+def timed(ledger: UsageLedger, run, *args) -> tuple:
+    """Run one path with its own ledger installed; returns (outcome, seconds)."""
+    set_usage_ledger(ledger)
+    start = time.perf_counter()
+    outcome = run(*args)
+    return outcome, time.perf_counter() - start
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Compare fused and two-call scoring + story arc extraction')
+    parser.add_argument('--days', type=int, default=14, help='Sample episodes published in the last N days (default: 14)')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum number of episodes (default: 20)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    db = SupabaseClient()
+
+    topics = db.get_active_topics()
+    if not topics:
+        logger.error("No active topics found in database")
+        return 1
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    tracking_topics = db.get_topics_with_tracking_enabled()
+    if not tracking_topics:
+        logger.error("No topics have story arc tracking enabled")
+        return 1
+
+    excerpt_builder = ExcerptBuilder.from_settings(
+        db, model=db.get_setting('ai_content_scoring', 'model', 'gpt-4o-mini')
+    )
+    # No score cache or prefilter: both paths score every episode with the LLM
+    scorer = ContentScorer(
+        topics=topics, score_threshold=score_threshold, db_client=db, excerpt_builder=excerpt_builder
+    )
+    extractor = StoryArcExtractor(db_client=db, excerpt_builder=excerpt_builder)
+    analyzer = FusedEpisodeAnalyzer(scorer, extractor, tracking_topics, score_threshold=score_threshold)
+    tracking_topic_names = analyzer.tracking_topic_names
+
+    episodes = db.get_episodes_for_rescoring(
+        statuses=['scored', 'not_relevant'], since_days=args.days, limit=args.limit
+    )
+    if not episodes:
+        logger.error("No scored episodes with transcripts in the sample window")
+        return 1
+
+    two_call_ledger = UsageLedger(run_id='ab-two-call')
+    fused_ledger = UsageLedger(run_id='ab-fused')
+    two_call_seconds, fused_seconds = [], []
+    score_diffs, verdicts_agree, topic_verdicts_agree, arc_overlaps = [], 0, [], []
+    compared = 0
+
+    for i, episode in enumerate(episodes, 1):
+        guid = episode['episode_guid']
+        logger.info(f"[{i}/{len(episodes)}] {guid}: {episode['title'][:60]}")
+
+        two_call, seconds = timed(
+            two_call_ledger, run_two_call, scorer, extractor, tracking_topic_names, score_threshold, episode
+        )
+        two_call_seconds.append(seconds)
+        fused, seconds = timed(fused_ledger, run_fused, analyzer, episode)
+        fused_seconds.append(seconds)
+
+        if not (two_call['success'] and fused['success']):
+            logger.warning(f"Skipping comparison for {guid}: a path failed")
+            continue
+        compared += 1
+
+        score_diffs.extend(
+            abs(two_call['scores'].get(t['name'], 0.0) - fused['scores'].get(t['name'], 0.0)) for t in topics
+        )
+        verdicts_agree += scorer.is_relevant(two_call['scores']) == scorer.is_relevant(fused['scores'])
+        for topic_name in tracking_topic_names:
+            in_two_call = topic_name in two_call['extractions']
+            in_fused = topic_name in fused['extractions']
+            topic_verdicts_agree.append(in_two_call == in_fused)
+            if in_two_call and in_fused:
+                names_a = arc_names(two_call['extractions'][topic_name])
+                names_b = arc_names(fused['extractions'][topic_name])
+                if names_a or names_b:
+                    arc_overlaps.append(len(names_a & names_b) / len(names_a | names_b))
+
+    set_usage_ledger(UsageLedger())
+
+    print()
+    print(f"Sample: {len(episodes)} episodes ({compared} compared), {len(topics)} topics, "
+          f"tracking {tracking_topic_names}, threshold {score_threshold}")
+    print(f"  {'path':<10} {'calls':>6} {'prompt tok':>11} {'compl tok':>10} {'$/episode':>10} "
+          f"{'s/episode':>10} {'total $':>9}")
+    for label, ledger, seconds in (
+        ('two-call', two_call_ledger, two_call_seconds),
+        ('fused', fused_ledger, fused_seconds),
+    ):
+        usage = ledger.summary()
+        print(
+            f"  {label:<10} {usage['calls']:6d} {usage['prompt_tokens']:11d} {usage['completion_tokens']:10d} "
+            f"{usage['cost_usd'] / len(episodes):10.6f} {sum(seconds) / len(seconds):10.2f} "
+            f"{usage['cost_usd']:9.4f}"
+        )
+
+    two_call_cost = two_call_ledger.summary()['cost_usd']
+    fused_cost = fused_ledger.summary()['cost_usd']
+    if two_call_cost:
+        print(f"  fused cost vs two-call: {fused_cost / two_call_cost - 1:+.1%}")
+
+    print()
+    print("Agreement (fused vs two-call):")
+    if compared:
+        print(f"  mean |score difference|:       {sum(score_diffs) / len(score_diffs):.3f}")
+        print(f"  episode relevance verdict:     {verdicts_agree}/{compared} ({verdicts_agree / compared:.0%})")
+    if topic_verdicts_agree:
+        agree = sum(topic_verdicts_agree)
+        print(f"  per-topic extraction verdict:  {agree}/{len(topic_verdicts_agree)} "
+              f"({agree / len(topic_verdicts_agree):.0%})")
+    if arc_overlaps:
+        print(f"  arc name overlap (Jaccard):    {sum(arc_overlaps) / len(arc_overlaps):.2f} "
+              f"over {len(arc_overlaps)} episode-topics")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
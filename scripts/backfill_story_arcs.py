@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Story Arc Backfill
+
+Extracts story arcs for past relevant episodes, e.g. to rebuild arcs after an
+extraction prompt change. Work is split into one partition per tracking-enabled
+digest topic:
+
+- within a partition, episodes are processed strictly in publication order,
+  and each extraction sees the arcs as of its episode's publication date
+  (PointInTimeArcContext), including those created by earlier episodes
+- partitions share no arcs, so they run in parallel (--workers)
+
+Progress and spend are checkpointed after every episode (--checkpoint), so
+an interrupted, failed or capped run resumes where each partition stopped.
+Episodes that already have arc events for a topic are skipped, as in the
+pipeline. --rebuild first deletes the arc events extracted from the
+partition's remaining episodes (and arcs left without events), so they are
+extracted again, e.g. with a new prompt.
+
+--max-cost stops starting new extractions once the LLM spend recorded
+for the backfill, across resumed runs, reaches the cap. In-flight calls
+finish, so the total can exceed the cap by up to one extraction per
+worker. --dry-run extracts nothing and estimates prompt tokens and cost
+per partition instead, using the arc context as of each episode.
+
+Usage:
+    python scripts/backfill_story_arcs.py [--days N] [--digest-topic NAME] [--workers N] [--rebuild]
+                                          [--max-cost USD] [--checkpoint PATH] [--dry-run] [--verbose]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.models import estimate_message_tokens
+from src.llm.pricing import estimate_cost
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.topic_tracking.arc_context import PointInTimeArcContext
+from src.topic_tracking.topic_extractor import StoryArcExtractor
+
+DEFAULT_CHECKPOINT = project_root / 'batch_jobs' / 'story_arc_backfill.json'
+
+# Typical extraction response size, for dry-run cost estimates
+DRY_RUN_OUTPUT_TOKENS = 800
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"story_arc_backfill_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def episode_key(episode: dict) -> tuple:
+    """Processing order within a partition: publication date, then ID."""
+    published = episode['published_date'] or datetime.min.replace(tzinfo=timezone.utc)
+    return (published, episode['id'])
+
+
+class Checkpoint:
+    """Thread-safe backfill progress per partition, saved to a JSON file after every change."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        if path.exists():
+            self.data = json.loads(path.read_text(encoding='utf-8'))
+        else:
+            self.data = {'partitions': {}, 'cost_usd': 0.0}
+
+    def last_key(self, digest_topic: str):
+        """Key of the last episode finished in a partition (None if not started)."""
+        with self._lock:
+            last = self.data['partitions'].get(digest_topic, {}).get('last_key')
+        return (datetime.fromisoformat(last[0]), last[1]) if last else None
+
+    def advance(self, digest_topic: str, key: tuple, outcome: str, episode_guid: str, cost_usd: float = 0.0) -> None:
+        """Record an episode as finished (extracted, skipped or failed), with spend since the last save."""
+        with self._lock:
+            self.data['cost_usd'] = round(self.data['cost_usd'] + cost_usd, 6)
+            partition = self.data['partitions'].setdefault(
+                digest_topic, {'last_key': None, 'extracted': 0, 'skipped': 0, 'failed': []}
+            )
+            partition['last_key'] = [key[0].isoformat(), key[1]]
+            if outcome == 'failed':
+                partition['failed'].append(episode_guid)
+            else:
+                partition[outcome] += 1
+            self._save()
+
+    def add_cost(self, cost_usd: float) -> None:
+        with self._lock:
+            self.data['cost_usd'] = round(self.data['cost_usd'] + cost_usd, 6)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.data, indent=2), encoding='utf-8')
+        tmp_path.replace(self.path)
+
+
+class CostBudget:
+    """Spend so far (earlier runs from the checkpoint, plus this run's ledger) against a cap."""
+
+    def __init__(self, ledger: UsageLedger, max_cost: float, prior_cost: float):
+        self.ledger = ledger
+        self.max_cost = max_cost
+        self.prior_cost = prior_cost
+        self._recorded = 0.0
+        self._lock = threading.Lock()
+
+    def spent(self) -> float:
+        return self.prior_cost + self.ledger.summary()['cost_usd']
+
+    def take_unrecorded(self) -> float:
+        """This run's spend not yet written to the checkpoint, marked as written."""
+        with self._lock:
+            run_cost = self.ledger.summary()['cost_usd']
+            delta, self._recorded = run_cost - self._recorded, run_cost
+            return delta
+
+    def exhausted(self) -> bool:
+        return self.max_cost is not None and self.spent() >= self.max_cost
+
+
+def build_partitions(episodes: list, tracking_topics: list, score_threshold: float) -> dict:
+    """Relevant episodes per digest topic, in processing order."""
+    partitions = {}
+    for topic_name in tracking_topics:
+        relevant = [e for e in episodes if (e.get('scores') or {}).get(topic_name, 0.0) >= score_threshold]
+        partitions[topic_name] = sorted(relevant, key=episode_key)
+    return partitions
+
+
+def estimate_partition(extractor: StoryArcExtractor, digest_topic: str, episodes: list) -> dict:
+    """Prompt tokens and cost of extracting a partition, without calling the model."""
+    prompt_tokens = 0
+    for episode in episodes:
+        extractor.arc_context.set_as_of(digest_topic, episode['published_date'])
+        request = extractor.build_request(episode['transcript_content'], digest_topic, episode['title'])
+        prompt_tokens += estimate_message_tokens(request['messages'])
+    completion_tokens = DRY_RUN_OUTPUT_TOKENS * len(episodes)
+    return {
+        'episodes': len(episodes),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'cost_usd': estimate_cost(extractor.model, prompt_tokens, completion_tokens),
+    }
+
+
+def backfill_partition(
+    digest_topic: str,
+    episodes: list,
+    db: SupabaseClient,
+    extractor: StoryArcExtractor,
+    checkpoint: Checkpoint,
+    budget: CostBudget,
+    logger: logging.Logger,
+    rebuild: bool = False
+) -> dict:
+    """Extract story arcs for one partition's episodes, strictly in order."""
+    stats = {'extracted': 0, 'skipped': 0, 'failed': 0, 'resumed_past': 0, 'capped': False}
+    last_key = checkpoint.last_key(digest_topic)
+
+    if rebuild:
+        remaining = [e['episode_guid'] for e in episodes if last_key is None or episode_key(e) > last_key]
+        cleared = db.clear_story_arc_events_for_episodes(digest_topic, remaining)
+        extractor.arc_context.invalidate(digest_topic)
+        extractor.arc_index.invalidate(digest_topic)
+        logger.info(
+            f"[{digest_topic}] Rebuild: deleted {cleared['events_deleted']} events and "
+            f"{cleared['arcs_deleted']} arcs from {len(remaining)} episodes"
+        )
+
+    for i, episode in enumerate(episodes, 1):
+        key = episode_key(episode)
+        if last_key is not None and key <= last_key:
+            stats['resumed_past'] += 1
+            continue
+        if budget.exhausted():
+            stats['capped'] = True
+            logger.warning(f"[{digest_topic}] Cost cap reached; stopping at episode {i}/{len(episodes)}")
+            break
+
+        guid = episode['episode_guid']
+        if db.has_story_arc_events(guid, digest_topic):
+            checkpoint.advance(digest_topic, key, 'skipped', guid)
+            stats['skipped'] += 1
+            continue
+
+        extractor.arc_context.set_as_of(digest_topic, episode['published_date'])
+
+        logger.info(f"[{digest_topic}] {i}/{len(episodes)} {key[0]:%Y-%m-%d} {episode['title'][:60]}")
+        try:
+            extractor.extract_and_store_story_arcs(
+                episode_id=episode['id'],
+                episode_guid=guid,
+                feed_id=episode['feed_id'],
+                digest_topic=digest_topic,
+                transcript=episode['transcript_content'],
+                episode_title=episode['title'],
+                episode_published_date=episode['published_date'],
+                relevance_score=episode['scores'][digest_topic]
+            )
+            checkpoint.advance(digest_topic, key, 'extracted', guid, budget.take_unrecorded())
+            stats['extracted'] += 1
+        except Exception as e:
+            logger.error(f"[{digest_topic}] Extraction failed for {guid}: {e}")
+            checkpoint.advance(digest_topic, key, 'failed', guid, budget.take_unrecorded())
+            stats['failed'] += 1
+
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Backfill story arcs for past episodes')
+    parser.add_argument('--days', type=int, default=30, help='Episodes published in the last N days (default: 30)')
+    parser.add_argument('--digest-topic', type=str, help='Backfill only this digest topic')
+    parser.add_argument('--workers', type=int, default=4, help='Partitions processed in parallel (default: 4)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Delete and re-extract arcs of episodes that already have them')
+    parser.add_argument('--max-cost', type=float, help='Stop once the backfill has spent this many USD')
+    parser.add_argument('--checkpoint', type=Path, default=DEFAULT_CHECKPOINT,
+                        help=f'Progress file, resumed if it exists (default: {DEFAULT_CHECKPOINT.relative_to(project_root)})')
+    parser.add_argument('--dry-run', action='store_true', help='Estimate tokens and cost without extracting')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    db = SupabaseClient()
+
+    tracking_topics = [t['name'] for t in db.get_topics_with_tracking_enabled()]
+    if args.digest_topic:
+        tracking_topics = [t for t in tracking_topics if t == args.digest_topic]
+    if not tracking_topics:
+        logger.error("No matching topics with story arc tracking enabled")
+        return 1
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    max_arcs_per_episode = db.get_setting('topic_tracking', 'max_topics_per_episode', 10)
+    retention_days = db.get_setting('story_arcs', 'retention_days', 14)
+    arc_context = PointInTimeArcContext(db, load_days=args.days + retention_days, retention_days=retention_days)
+    extractor = StoryArcExtractor(db_client=db, max_arcs_per_episode=max_arcs_per_episode, arc_context=arc_context)
+
+    episodes = db.get_episodes_for_rescoring(statuses=['scored'], since_days=args.days)
+    partitions = build_partitions(episodes, tracking_topics, score_threshold)
+    partition_sizes = {topic: len(eps) for topic, eps in partitions.items()}
+    logger.info(f"{len(episodes)} relevant episodes in the last {args.days} days; partitions: {partition_sizes}")
+
+    if args.dry_run:
+        print()
+        print(f"Dry run: {extractor.model}, ~{DRY_RUN_OUTPUT_TOKENS} output tokens per extraction "
+              f"(estimated tokens; arc context as of each episode, without arcs the backfill would add)")
+        print(f"  {'digest topic':<30} {'episodes':>9} {'prompt tok':>11} {'output tok':>11} {'est. $':>9}")
+        totals = {'episodes': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost_usd': 0.0}
+        for topic_name, topic_episodes in partitions.items():
+            estimate = estimate_partition(extractor, topic_name, topic_episodes)
+            for field in totals:
+                totals[field] += estimate[field]
+            print(f"  {topic_name:<30} {estimate['episodes']:9d} {estimate['prompt_tokens']:11d} "
+                  f"{estimate['completion_tokens']:11d} {estimate['cost_usd']:9.4f}")
+        print(f"  {'total':<30} {totals['episodes']:9d} {totals['prompt_tokens']:11d} "
+              f"{totals['completion_tokens']:11d} {totals['cost_usd']:9.4f}")
+        return 0
+
+    run_id = f"arc-backfill-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    started_at = datetime.now(timezone.utc)
+    usage_ledger = UsageLedger(db_client=db, run_id=run_id)
+    set_usage_ledger(usage_ledger)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    budget = CostBudget(usage_ledger, args.max_cost, checkpoint.data['cost_usd'])
+    logger.info(f"Checkpoint {args.checkpoint}; spent so far ${budget.prior_cost:.4f}")
+
+    db.log_pipeline_run(
+        run_id=run_id,
+        workflow_name='story_arc_backfill',
+        status='running',
+        started_at=started_at,
+        trigger='manual'
+    )
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(partitions)))) as executor:
+            futures = {
+                topic_name: executor.submit(
+                    backfill_partition, topic_name, topic_episodes, db, extractor,
+                    checkpoint, budget, logger, args.rebuild
+                )
+                for topic_name, topic_episodes in partitions.items()
+            }
+            for topic_name, future in futures.items():
+                results[topic_name] = future.result()
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}", exc_info=True)
+        try:
+            db.log_pipeline_run(
+                run_id=run_id,
+                workflow_name='story_arc_backfill',
+                status='completed',
+                conclusion='failure',
+                started_at=started_at,
+                finished_at=datetime.now(timezone.utc),
+                notes=f"Error: {str(e)}"
+            )
+        except Exception:
+            pass  # Don't fail on logging errors
+        return 1
+    finally:
+        # Spend of extractions the last checkpoint save did not include
+        checkpoint.add_cost(budget.take_unrecorded())
+        usage_ledger.flush()
+
+    usage_ledger.log_summary()
+    run_cost = usage_ledger.summary()['cost_usd']
+
+    print()
+    print(f"  {'digest topic':<30} {'extracted':>10} {'skipped':>8} {'failed':>7} {'done before':>12}")
+    for topic_name, stats in results.items():
+        note = '  (cost cap)' if stats['capped'] else ''
+        print(f"  {topic_name:<30} {stats['extracted']:10d} {stats['skipped']:8d} "
+              f"{stats['failed']:7d} {stats['resumed_past']:12d}{note}")
+    print(f"  cost this run ${run_cost:.4f}, total ${checkpoint.data['cost_usd']:.4f}"
+          + (f" of ${args.max_cost:.2f} cap" if args.max_cost is not None else ""))
+
+    total_failed = sum(s['failed'] for s in results.values())
+    finished_at = datetime.now(timezone.utc)
+    db.log_pipeline_run(
+        run_id=run_id,
+        workflow_name='story_arc_backfill',
+        status='completed',
+        conclusion='success' if total_failed == 0 else 'failure',
+        started_at=started_at,
+        finished_at=finished_at,
+        phase={
+            'partitions': results,
+            'llm_usage': usage_ledger.summary(),
+            'duration_seconds': (finished_at - started_at).total_seconds()
+        },
+        notes=f"Extracted {sum(s['extracted'] for s in results.values())} episode topics"
+    )
+
+    return 0 if total_failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
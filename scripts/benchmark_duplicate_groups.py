@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark Duplicate Group Detection
+
+Times the similarity grouping behind SemanticTopicMatcher.find_duplicate_groups
+on synthetic embeddings, without API keys or spend. Each run plants clusters
+of near-duplicate vectors among random ones, then checks that the blocked
+matrix grouping (src/topic_tracking/semantic_matcher.py) finds exactly the
+planted clusters. For small sizes the previous pairwise loop is timed too.
+
+Usage:
+    python scripts/benchmark_duplicate_groups.py [--sizes N ...] [--dim N] [--threshold T]
+                                                 [--block-size N] [--loop-max N] [--seed N]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.topic_tracking.semantic_matcher import (
+    SIMILARITY_BLOCK_SIZE,
+    SemanticTopicMatcher,
+    normalize_embeddings,
+    similarity_groups,
+)
+
+
+def generate_embeddings(count: int, dim: int, duplicate_share: float, seed: int) -> tuple:
+    """Random unit vectors with planted clusters of 2-4 near-duplicates."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+
+    planted = []
+    index = 0
+    budget = int(count * duplicate_share)
+    while index + 4 <= budget:
+        size = int(rng.integers(2, 5))
+        base = vectors[index]
+        for offset in range(1, size):
+            vectors[index + offset] = base + 0.1 * rng.standard_normal(dim, dtype=np.float32)
+        planted.append(list(range(index, index + size)))
+        index += size
+
+    # Shuffle so clusters don't sit in the same block
+    order = rng.permutation(count)
+    position = np.empty(count, dtype=np.intp)
+    position[order] = np.arange(count)
+    planted = sorted(sorted(int(position[i]) for i in group) for group in planted)
+    return [vectors[i] for i in order], planted
+
+
+def loop_groups(vectors: list, threshold: float) -> list:
+    """Previous implementation: cosine similarity per pair in Python."""
+    matcher = SemanticTopicMatcher.__new__(SemanticTopicMatcher)
+    parent = list(range(len(vectors)))
+
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    for i in range(len(vectors)):
+        for j in range(i + 1, len(vectors)):
+            if matcher._cosine_similarity(vectors[i], vectors[j]) >= threshold:
+                pi, pj = find(i), find(j)
+                if pi != pj:
+                    parent[pi] = pj
+
+    groups = {}
+    for i in range(len(vectors)):
+        groups.setdefault(find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark duplicate story arc grouping on synthetic embeddings')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Arc counts (default: 1k 10k 50k)')
+    parser.add_argument('--dim', type=int, default=1536, help='Embedding dimensions (default: 1536, text-embedding-3-small)')
+    parser.add_argument('--threshold', type=float, default=0.85, help='Similarity threshold (default: 0.85)')
+    parser.add_argument('--duplicate-share', type=float, default=0.1, help='Share of arcs in planted clusters')
+    parser.add_argument('--block-size', type=int, default=SIMILARITY_BLOCK_SIZE, help='Similarity tile edge length')
+    parser.add_argument('--loop-max', type=int, default=1000, help='Largest size to also time the pairwise loop at')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic embeddings')
+
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        vectors, planted = generate_embeddings(size, args.dim, args.duplicate_share, args.seed)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        matrix = normalize_embeddings(vectors)
+        groups = similarity_groups(matrix, args.threshold, args.block_size)
+        elapsed = time.perf_counter() - start
+        # Peak beyond the input vectors: the stacked matrix plus working tiles
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        loop_seconds = None
+        if size <= args.loop_max:
+            start = time.perf_counter()
+            loop_result = loop_groups(vectors, args.threshold)
+            loop_seconds = time.perf_counter() - start
+            if sorted(loop_result) != sorted(groups):
+                print(f"  WARNING: loop and matrix groups differ at {size} arcs")
+
+        rows.append({
+            'size': size,
+            'seconds': elapsed,
+            'peak_mb': peak_mb,
+            'groups': len(groups),
+            'correct': sorted(groups) == planted,
+            'loop_seconds': loop_seconds,
+        })
+
+    print()
+    print(f"dim {args.dim}, threshold {args.threshold}, block {args.block_size}, "
+          f"{args.duplicate_share:.0%} of arcs in planted clusters")
+    print(f"  {'arcs':>7} {'matrix s':>9} {'peak MB':>8} {'loop s':>8} {'speedup':>8} {'groups':>7} {'correct':>8}")
+    for row in rows:
+        loop = f"{row['loop_seconds']:8.2f}" if row['loop_seconds'] is not None else f"{'-':>8}"
+        speedup = f"{row['loop_seconds'] / row['seconds']:7.0f}x" if row['loop_seconds'] is not None else f"{'-':>8}"
+        print(
+            f"  {row['size']:7d} {row['seconds']:9.2f} {row['peak_mb']:8.0f} {loop} {speedup} "
+            f"{row['groups']:7d} {'yes' if row['correct'] else 'NO':>8}"
+        )
+
+    return 0 if all(row['correct'] for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark Scoring Throughput
+
+Scores synthetic transcripts against the local fake OpenAI server
+(src/llm/fake_server.py) to compare sequential, batched and concurrent
+scoring under configurable latency, error and 429 rates, without API keys
+or spend. Reports wall time, throughput, requests made and retries for
+each mode.
+
+Usage:
+    python scripts/benchmark_scoring.py [--episodes N] [--latency S] [--jitter S]
+                                        [--rate-limit-rate R] [--error-rate R]
+                                        [--concurrency N ...] [--batch-size N] [--seed N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.corpus import WORDS
+from src.llm.fake_server import FakeOpenAIServer
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.scoring.content_scorer import ContentScorer
+
+TOPICS = [
+    {'name': 'AI and Technology', 'description': 'Model releases, AI research and tooling'},
+    {'name': 'Business', 'description': 'Company strategy, funding and markets'},
+    {'name': 'Developer Tools', 'description': 'Coding assistants, frameworks and workflows'},
+]
+
+
+def generate_transcripts(count: int, words: int, seed: int) -> list:
+    """Deterministic (episode_id, transcript) pairs."""
+    rng = random.Random(seed)
+    return [
+        (f"bench-{i:05d}", " ".join(rng.choice(WORDS) for _ in range(words)))
+        for i in range(count)
+    ]
+
+
+def run_mode(label: str, server: FakeOpenAIServer, score) -> dict:
+    """Time one scoring mode and collect request/retry counters."""
+    ledger = UsageLedger(run_id=label)
+    set_usage_ledger(ledger)
+    requests_before = server.requests
+    rate_limited_before = server.rate_limited
+    errors_before = server.errors
+
+    start = time.perf_counter()
+    results = score()
+    elapsed = time.perf_counter() - start
+
+    usage = ledger.summary()
+    return {
+        'mode': label,
+        'seconds': elapsed,
+        'episodes': len(results),
+        'failed': sum(1 for r in results if not r.success),
+        'requests': server.requests - requests_before,
+        'rate_limited': server.rate_limited - rate_limited_before,
+        'server_errors': server.errors - errors_before,
+        'retries': sum(s['retries'] for s in usage['stages'].values()),
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark scoring modes against the fake OpenAI server')
+    parser.add_argument('--episodes', type=int, default=40, help='Synthetic transcripts to score (default: 40)')
+    parser.add_argument('--words', type=int, default=3000, help='Words per transcript (default: 3000)')
+    parser.add_argument('--latency', type=float, default=0.3, help='Server latency per request in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Extra random latency, 0..N seconds')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 500')
+    parser.add_argument('--retry-after', type=float, default=0.5, help='Retry-After for 429s in seconds')
+    parser.add_argument('--concurrency', type=int, action='append', help='score_many concurrency (can be repeated, default: 4 and 8)')
+    parser.add_argument('--batch-size', type=int, default=8, help='Transcripts per batched request (default: 8)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for transcripts and injected failures')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Show scoring logs')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    items = generate_transcripts(args.episodes, args.words, args.seed)
+
+    with FakeOpenAIServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    ) as server:
+        os.environ['OPENAI_BASE_URL'] = server.base_url
+
+        sequential = ContentScorer(topics=TOPICS, max_batch_size=1)
+        batched = ContentScorer(topics=TOPICS, max_batch_size=args.batch_size)
+
+        async def collect(scorer, concurrency):
+            return [r async for r in scorer.score_many(items, concurrency=concurrency)]
+
+        rows = [
+            run_mode('sequential', server, lambda: [sequential.score_transcript(t, e) for e, t in items]),
+            run_mode(f'batched x{args.batch_size}', server, lambda: batched.score_batch(items)),
+        ]
+        for concurrency in args.concurrency or [4, 8]:
+            scorer = ContentScorer(topics=TOPICS, max_concurrency=concurrency)
+            rows.append(run_mode(
+                f'concurrent x{concurrency}', server, lambda: asyncio.run(collect(scorer, concurrency))
+            ))
+
+    print()
+    print(f"{args.episodes} transcripts x {args.words} words, latency {args.latency}s "
+          f"+ 0..{args.jitter}s, 429 rate {args.rate_limit_rate:.0%}, 500 rate {args.error_rate:.0%}")
+    print(f"  {'mode':<16} {'seconds':>8} {'eps/s':>7} {'requests':>9} {'429s':>5} {'500s':>5} {'retries':>8} {'failed':>7}")
+    for row in rows:
+        print(
+            f"  {row['mode']:<16} {row['seconds']:8.2f} {row['episodes'] / row['seconds']:7.2f} "
+            f"{row['requests']:9d} {row['rate_limited']:5d} {row['server_errors']:5d} "
+            f"{row['retries']:8d} {row['failed']:7d}"
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
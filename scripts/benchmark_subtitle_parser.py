@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Subtitle Parser Benchmark
+
+Measures subtitle_parser throughput (MB/s) on long synthetic YouTube
+auto-caption files in every supported format (VTT, SRT, json3, srv3), or on
+real subtitle files passed with --file.
+
+Synthetic files come from benchmarks/corpus.py; the full benchmark suite
+with baselines and fuzzing is `python -m benchmarks.run`.
+
+--check-equivalence verifies that the same captions rendered as VTT, json3
+and srv3 parse to identical transcript text (exit code 1 if not).
+
+Usage:
+    python scripts/benchmark_subtitle_parser.py [--hours N] [--repeat N] [--file PATH ...]
+                                                [--check-equivalence]
+"""
+
+import argparse
+import io
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.youtube.subtitle_parser import (
+    parse_vtt, parse_vtt_stream, parse_srt_stream,
+    parse_json3_stream, parse_srv3_stream, parse_subtitle_file
+)
+from benchmarks.corpus import (
+    generate_auto_caption_vtt, generate_auto_caption_json3, generate_auto_caption_srv3, generate_srt
+)
+
+
+def time_parser(fn: Callable, make_input: Callable, size_bytes: int, repeat: int) -> Tuple[float, object]:
+    """Run a parser `repeat` times and return (best MB/s, last result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        source = make_input()
+        start = time.perf_counter()
+        result = fn(source)
+        best = min(best, time.perf_counter() - start)
+    return (size_bytes / 1024 / 1024) / best, result
+
+
+def bench_content(label: str, content: str, repeat: int, parse_stream: Callable) -> List[str]:
+    data = content.encode('utf-8')
+    size = len(data)
+
+    rows = []
+    cases = [
+        ("str", parse_stream, lambda: content),
+        ("file handle", parse_stream, lambda: io.BytesIO(data)),
+        ("bytes iterator", parse_stream, lambda: (data[i:i + 8192] for i in range(0, size, 8192))),
+    ]
+    for name, fn, make_input in cases:
+        mbps, result = time_parser(fn, make_input, size, repeat)
+        rows.append(
+            f"  {label:<28} {name:<16} {size / 1024 / 1024:8.2f} MB  {mbps:8.1f} MB/s  "
+            f"{result.word_count:>9} words"
+        )
+    return rows
+
+
+def check_equivalence(hours: float) -> bool:
+    """Parse the same captions in every format and compare transcripts."""
+    results = {
+        'vtt': parse_vtt(generate_auto_caption_vtt(hours), merge_overlaps=True),
+        'json3': parse_json3_stream(generate_auto_caption_json3(hours)),
+        'srv3': parse_srv3_stream(generate_auto_caption_srv3(hours)),
+    }
+    reference = results['vtt']
+    ok = True
+    for fmt, parsed in results.items():
+        same = parsed.text == reference.text
+        ok = ok and same
+        print(f"  {fmt:<6} {parsed.word_count:>9} words  {'OK' if same else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark subtitle parser throughput')
+    parser.add_argument('--hours', type=float, default=3.0, help='Synthetic caption length in hours (default: 3)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case; best time is reported (default: 5)')
+    parser.add_argument('--file', type=str, action='append', help='Benchmark a real subtitle file (can be repeated)')
+    parser.add_argument('--check-equivalence', action='store_true',
+                        help='Check that VTT, json3 and srv3 renderings parse identically')
+
+    args = parser.parse_args()
+
+    if args.check_equivalence:
+        print(f"Format equivalence ({args.hours:g}h synthetic captions)")
+        return 0 if check_equivalence(args.hours) else 1
+
+    print(f"Subtitle parser throughput (best of {args.repeat})")
+    print("-" * 90)
+
+    if args.file:
+        for path in args.file:
+            size = Path(path).stat().st_size
+            mbps, result = time_parser(parse_subtitle_file, lambda: path, size, args.repeat)
+            print(f"  {Path(path).name:<45} {size / 1024 / 1024:8.2f} MB  {mbps:8.1f} MB/s  "
+                  f"{result.word_count:>9} words")
+        return 0
+
+    cases = [
+        (f"auto-caption VTT {args.hours:g}h", generate_auto_caption_vtt(args.hours),
+         partial(parse_vtt_stream, merge_overlaps=True)),
+        (f"auto-caption json3 {args.hours:g}h", generate_auto_caption_json3(args.hours), parse_json3_stream),
+        (f"auto-caption srv3 {args.hours:g}h", generate_auto_caption_srv3(args.hours), parse_srv3_stream),
+        (f"SRT {args.hours:g}h", generate_srt(args.hours), parse_srt_stream),
+    ]
+    for label, content, parse_stream in cases:
+        for row in bench_content(label, content, args.repeat, parse_stream):
+            print(row)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Bulk Score Batch
+
+Offline scoring and story arc extraction through the OpenAI Batch API, for
+backfills and rescoring after topic changes. Batch requests cost half as
+much as synchronous calls and do not compete with the daily pipeline for
+rate limits, at the price of up to 24 hours of latency.
+
+A job lives in its own directory and moves through four steps:
+
+    prepare  select episodes and write requests.jsonl + manifest.json
+    submit   upload the requests and create the batch job
+    poll     check the job; download results once it has finished
+    apply    write scores / story arcs back to episodes
+
+apply is idempotent: applied requests are recorded in applied.json, and
+story arcs are never extracted twice for the same episode and topic, so it
+can be re-run after a crash or a partial failure.
+
+Score jobs reuse the score cache: excerpts already scored with the same
+topics, model and prompt are applied from the cache without a request, and
+batch results are cached for later runs. Arc extraction requests capture
+the active story arcs when they are prepared, so run an arcs job after the
+score job it depends on has been applied.
+
+--backend local answers jobs on the filesystem (LocalBatchBackend) instead of
+calling OpenAI, for testing the flow with no network.
+
+Usage:
+    python scripts/bulk_score_batch.py prepare --kind score|arcs [--status STATUS ...] [--days N]
+                                               [--episode-guid GUID ...] [--limit N] [--job-dir DIR]
+    python scripts/bulk_score_batch.py submit --job-dir DIR [--backend openai|local]
+    python scripts/bulk_score_batch.py poll --job-dir DIR [--wait] [--interval SECONDS]
+    python scripts/bulk_score_batch.py apply --job-dir DIR [--dry-run]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.batch import get_batch_backend, read_batch_results, write_batch_requests
+from src.scoring.content_scorer import ContentScorer, SCORING_PROMPT_VERSION
+from src.scoring.score_cache import ScoreCache
+from src.topic_tracking.topic_extractor import StoryArcExtractor
+
+DEFAULT_JOBS_DIR = project_root / 'batch_jobs'
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"bulk_score_batch_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def load_json(path: Path, default=None):
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_json(path: Path, data) -> None:
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(data, indent=2, default=str), encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def get_score_cache(db):
+    if db.get_setting('ai_content_scoring', 'score_cache_enabled', True):
+        return ScoreCache(db_client=db)
+    return None
+
+
+# ==================== Prepare ====================
+
+def prepare_score_requests(db, episodes, manifest, logger):
+    """Build scoring requests; cache hits are stored in the manifest instead."""
+    topics = db.get_active_topics()
+    if not topics:
+        raise ValueError("No active topics found in database")
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    score_cache = get_score_cache(db)
+    scorer = ContentScorer(topics=topics, score_threshold=score_threshold, db_client=db, score_cache=score_cache)
+
+    manifest.update({
+        'topics': topics,
+        'score_threshold': score_threshold,
+        'model': scorer.model,
+        'prompt_version': SCORING_PROMPT_VERSION,
+    })
+
+    requests = []
+    for episode in episodes:
+        custom_id = f"score-{len(manifest['requests']):06d}"
+        cache_key, body = scorer.batch_request(episode['transcript_content'])
+        entry = {
+            'episode_guid': episode['episode_guid'],
+            'status': episode['status'],
+            'cache_key': cache_key,
+        }
+
+        cached_scores = score_cache.get(cache_key) if score_cache else None
+        if cached_scores is not None:
+            entry['cached_scores'] = cached_scores
+        else:
+            requests.append((custom_id, body))
+
+        manifest['requests'][custom_id] = entry
+
+    logger.info(f"Score requests: {len(requests)}, answered from score cache: {len(episodes) - len(requests)}")
+    return requests
+
+
+def prepare_arc_requests(db, episodes, manifest, logger):
+    """Build story arc extraction requests for relevant, not yet extracted episode topics."""
+    tracking_topics = [t['name'] for t in db.get_topics_with_tracking_enabled()]
+    if not tracking_topics:
+        raise ValueError("No topics with tracking enabled")
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    max_arcs_per_episode = db.get_setting('topic_tracking', 'max_topics_per_episode', 10)
+    extractor = StoryArcExtractor(db_client=db, max_arcs_per_episode=max_arcs_per_episode)
+
+    manifest.update({
+        'score_threshold': score_threshold,
+        'max_arcs_per_episode': max_arcs_per_episode,
+        'model': extractor.model,
+    })
+
+    requests = []
+    already_extracted = 0
+    for episode in episodes:
+        scores = episode.get('scores') or {}
+        for topic_name in tracking_topics:
+            topic_score = scores.get(topic_name, 0.0)
+            if topic_score < score_threshold:
+                continue
+            if db.has_story_arc_events(episode['episode_guid'], topic_name):
+                already_extracted += 1
+                continue
+
+            custom_id = f"arcs-{len(manifest['requests']):06d}"
+            body = extractor.build_request(episode['transcript_content'], topic_name, episode['title'])
+            requests.append((custom_id, body))
+            manifest['requests'][custom_id] = {
+                'episode_guid': episode['episode_guid'],
+                'episode_id': episode['id'],
+                'feed_id': episode['feed_id'],
+                'episode_title': episode['title'],
+                'published_date': episode['published_date'].isoformat() if episode['published_date'] else None,
+                'digest_topic': topic_name,
+                'relevance_score': topic_score,
+            }
+
+    logger.info(f"Arc extraction requests: {len(requests)}, already extracted: {already_extracted}")
+    return requests
+
+
+def cmd_prepare(args, logger) -> int:
+    job_dir = Path(args.job_dir) if args.job_dir else (
+        DEFAULT_JOBS_DIR / f"{args.kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    if (job_dir / 'manifest.json').exists():
+        logger.error(f"Job already prepared in {job_dir}")
+        return 1
+    job_dir.mkdir(parents=True, exist_ok=True)
+
+    db = SupabaseClient()
+
+    statuses = args.status or (['scored'] if args.kind == 'arcs' else None)
+    episodes = db.get_episodes_for_rescoring(
+        statuses=statuses,
+        since_days=args.days,
+        episode_guids=args.episode_guid,
+        limit=args.limit
+    )
+    if not episodes:
+        logger.info("No episodes selected")
+        return 0
+
+    manifest = {
+        'kind': args.kind,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'requests': {},
+    }
+    if args.kind == 'score':
+        requests = prepare_score_requests(db, episodes, manifest, logger)
+    else:
+        requests = prepare_arc_requests(db, episodes, manifest, logger)
+
+    count = write_batch_requests(job_dir / 'requests.jsonl', requests)
+    save_json(job_dir / 'manifest.json', manifest)
+
+    logger.info(f"Prepared {count} requests for {len(episodes)} episodes in {job_dir}")
+    if count:
+        logger.info(f"Next: python scripts/bulk_score_batch.py submit --job-dir {job_dir}")
+    elif manifest['requests']:
+        logger.info(f"Nothing to submit; apply cached results with: "
+                    f"python scripts/bulk_score_batch.py apply --job-dir {job_dir}")
+    return 0
+
+
+# ==================== Submit / Poll ====================
+
+def make_backend(job: dict):
+    if job['backend'] == 'local':
+        return get_batch_backend('local', root_dir=job['local_dir'])
+    return get_batch_backend(job['backend'])
+
+
+def cmd_submit(args, logger) -> int:
+    job_dir = Path(args.job_dir)
+    manifest = load_json(job_dir / 'manifest.json')
+    if manifest is None:
+        logger.error(f"No prepared job in {job_dir}")
+        return 1
+    if (job_dir / 'job.json').exists():
+        logger.error(f"Job in {job_dir} was already submitted")
+        return 1
+
+    requests_path = job_dir / 'requests.jsonl'
+    if not requests_path.exists() or requests_path.stat().st_size == 0:
+        logger.info("No requests to submit")
+        return 0
+
+    job = {'backend': args.backend}
+    if args.backend == 'local':
+        job['local_dir'] = str(Path(args.local_dir) if args.local_dir else DEFAULT_JOBS_DIR / 'local_backend')
+
+    backend = make_backend(job)
+    batch = backend.submit(requests_path, metadata={'kind': manifest['kind'], 'job_dir': job_dir.name})
+
+    job.update({
+        'batch_id': batch.id,
+        'status': batch.status,
+        'submitted_at': datetime.now(timezone.utc).isoformat(),
+    })
+    save_json(job_dir / 'job.json', job)
+
+    logger.info(f"Submitted {batch.request_counts.get('total') or len(manifest['requests'])} requests as {batch.id}")
+    return 0
+
+
+def cmd_poll(args, logger) -> int:
+    job_dir = Path(args.job_dir)
+    job = load_json(job_dir / 'job.json')
+    if job is None:
+        logger.error(f"Job in {job_dir} has not been submitted")
+        return 1
+
+    backend = make_backend(job)
+    while True:
+        batch = backend.retrieve(job['batch_id'])
+        counts = batch.request_counts
+        logger.info(
+            f"Batch {batch.id}: {batch.status} "
+            f"({counts.get('completed', 0)} completed, {counts.get('failed', 0)} failed of {counts.get('total', 0)})"
+        )
+        if batch.is_done or not args.wait:
+            break
+        time.sleep(args.interval)
+
+    job['status'] = batch.status
+    job['request_counts'] = batch.request_counts
+    if batch.is_done:
+        job['finished_at'] = datetime.now(timezone.utc).isoformat()
+        if batch.output_file_id:
+            backend.download(batch.output_file_id, job_dir / 'output.jsonl')
+            job['output_file'] = 'output.jsonl'
+        if batch.error_file_id:
+            backend.download(batch.error_file_id, job_dir / 'errors.jsonl')
+            job['error_file'] = 'errors.jsonl'
+    save_json(job_dir / 'job.json', job)
+
+    if batch.status == 'completed':
+        logger.info(f"Next: python scripts/bulk_score_batch.py apply --job-dir {job_dir}")
+        return 0
+    if batch.is_done:
+        logger.error(f"Batch {batch.id} ended with status {batch.status}")
+        return 1
+    return 0
+
+
+# ==================== Apply ====================
+
+def apply_scores(db, manifest, answers, applied, save_applied, dry_run, logger) -> dict:
+    """Write scores and statuses; cache scores that came from the batch."""
+    scorer = ContentScorer(
+        topics=manifest['topics'],
+        score_threshold=manifest['score_threshold'],
+        model=manifest['model']
+    )
+    score_cache = get_score_cache(db)
+    stats = {'applied': 0, 'failed': 0, 'status_changes': 0}
+
+    for custom_id, entry, result in answers:
+        try:
+            if result is None:
+                scores = entry['cached_scores']
+            else:
+                scores = scorer.parse_scores(result.content)
+                if score_cache and not dry_run:
+                    score_cache.put(
+                        entry['cache_key'],
+                        scores,
+                        model=scorer.model,
+                        prompt_version=manifest['prompt_version'],
+                        topics_fingerprint=scorer.topics_fingerprint,
+                        prompt_tokens=result.prompt_tokens,
+                        completion_tokens=result.completion_tokens
+                    )
+        except Exception as e:
+            logger.error(f"Invalid scores for {entry['episode_guid']} ({custom_id}): {e}")
+            stats['failed'] += 1
+            continue
+
+        status = 'scored' if scorer.is_relevant(scores) else 'not_relevant'
+        if status != entry['status']:
+            stats['status_changes'] += 1
+            logger.info(f"{entry['episode_guid']}: {entry['status']} -> {status}")
+
+        if not dry_run:
+            db.update_episode_scores(entry['episode_guid'], scores, status)
+            applied.add(custom_id)
+            save_applied()
+        stats['applied'] += 1
+
+    return stats
+
+
+def apply_arcs(db, manifest, answers, applied, save_applied, dry_run, logger) -> dict:
+    """Store extracted story arcs, skipping episode topics that already have events."""
+    extractor = StoryArcExtractor(db_client=db, max_arcs_per_episode=manifest['max_arcs_per_episode'])
+    stats = {'applied': 0, 'failed': 0, 'already_extracted': 0, 'arcs_new': 0, 'arcs_continued': 0}
+
+    for custom_id, entry, result in answers:
+        try:
+            extraction_data = json.loads(result.content)
+        except Exception as e:
+            logger.error(f"Invalid extraction for {entry['episode_guid']} ({custom_id}): {e}")
+            stats['failed'] += 1
+            continue
+
+        if db.has_story_arc_events(entry['episode_guid'], entry['digest_topic']):
+            stats['already_extracted'] += 1
+            if not dry_run:
+                applied.add(custom_id)
+                save_applied()
+            continue
+
+        if dry_run:
+            logger.info(
+                f"{entry['episode_guid']} / {entry['digest_topic']}: "
+                f"{len(extraction_data.get('continuing_arcs', []))} continuing, "
+                f"{len(extraction_data.get('new_arcs', []))} new arcs"
+            )
+            stats['applied'] += 1
+            continue
+
+        published_date = entry['published_date']
+        try:
+            extracted = extractor.store_extraction(
+                extraction_data,
+                episode_id=entry['episode_id'],
+                episode_guid=entry['episode_guid'],
+                feed_id=entry['feed_id'],
+                digest_topic=entry['digest_topic'],
+                episode_title=entry['episode_title'],
+                episode_published_date=datetime.fromisoformat(published_date) if published_date else None,
+                relevance_score=entry['relevance_score']
+            )
+        except Exception as e:
+            logger.error(f"Storing story arcs failed for {entry['episode_guid']} ({custom_id}): {e}")
+            stats['failed'] += 1
+            continue
+        applied.add(custom_id)
+        save_applied()
+        stats['applied'] += 1
+        stats['arcs_new'] += len([r for r in extracted if r.get('is_new')])
+        stats['arcs_continued'] += len([r for r in extracted if not r.get('is_new')])
+
+    return stats
+
+
+def cmd_apply(args, logger) -> int:
+    job_dir = Path(args.job_dir)
+    manifest = load_json(job_dir / 'manifest.json')
+    if manifest is None:
+        logger.error(f"No prepared job in {job_dir}")
+        return 1
+
+    job = load_json(job_dir / 'job.json', {})
+    if job and job.get('status') != 'completed':
+        logger.error(f"Batch {job.get('batch_id')} is {job.get('status')}; poll until it has completed")
+        return 1
+
+    applied_path = job_dir / 'applied.json'
+    applied = set(load_json(applied_path, []))
+
+    def save_applied():
+        save_json(applied_path, sorted(applied))
+
+    # (custom_id, manifest entry, BatchResult or None for cached scores)
+    answers = []
+    request_errors = 0
+    answered = set()
+
+    for custom_id, entry in manifest['requests'].items():
+        if 'cached_scores' in entry:
+            answered.add(custom_id)
+            if custom_id not in applied:
+                answers.append((custom_id, entry, None))
+
+    for file_key in ('output_file', 'error_file'):
+        if not job.get(file_key):
+            continue
+        for result in read_batch_results(job_dir / job[file_key]):
+            entry = manifest['requests'].get(result.custom_id)
+            if entry is None:
+                logger.warning(f"Result for unknown request {result.custom_id}")
+                continue
+            answered.add(result.custom_id)
+            if result.custom_id in applied:
+                continue
+            if not result.success:
+                logger.error(f"Request {result.custom_id} ({entry['episode_guid']}) failed: {result.error}")
+                request_errors += 1
+                continue
+            answers.append((result.custom_id, entry, result))
+
+    missing = len(manifest['requests']) - len(answered)
+    skipped = len(applied)
+    logger.info(
+        f"Applying {len(answers)} results ({skipped} already applied, {request_errors} failed requests, "
+        f"{missing} without a result)"
+    )
+    if args.dry_run:
+        logger.info("DRY RUN MODE - nothing will be written")
+
+    db = SupabaseClient()
+    if manifest['kind'] == 'score':
+        stats = apply_scores(db, manifest, answers, applied, save_applied, args.dry_run, logger)
+    else:
+        stats = apply_arcs(db, manifest, answers, applied, save_applied, args.dry_run, logger)
+
+    logger.info("=" * 60)
+    for key, value in stats.items():
+        logger.info(f"{key.replace('_', ' ').capitalize()}: {value}")
+
+    failed = stats['failed'] + request_errors + missing
+    return 0 if failed == 0 else 1
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Offline bulk scoring and story arc extraction via batch jobs')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    prepare = subparsers.add_parser('prepare', help='Select episodes and write batch requests')
+    prepare.add_argument('--kind', choices=['score', 'arcs'], required=True,
+                         help='Topic scoring or story arc extraction')
+    prepare.add_argument('--status', type=str, action='append',
+                         help="Only episodes with this status (can be repeated; arcs default: 'scored')")
+    prepare.add_argument('--days', type=int, help='Only episodes published in the last N days')
+    prepare.add_argument('--episode-guid', type=str, action='append', help='Only this episode (can be repeated)')
+    prepare.add_argument('--limit', type=int, help='Maximum number of episodes')
+    prepare.add_argument('--job-dir', type=str, help='Job directory (default: batch_jobs/<kind>_<timestamp>)')
+
+    submit = subparsers.add_parser('submit', help='Submit prepared requests as a batch job')
+    submit.add_argument('--job-dir', type=str, required=True, help='Job directory')
+    submit.add_argument('--backend', choices=['openai', 'local'], default='openai',
+                        help='Batch backend (local: filesystem stand-in, no network)')
+    submit.add_argument('--local-dir', type=str, help='Local backend directory (default: batch_jobs/local_backend)')
+
+    poll = subparsers.add_parser('poll', help='Check a batch job and download its results')
+    poll.add_argument('--job-dir', type=str, required=True, help='Job directory')
+    poll.add_argument('--wait', action='store_true', help='Keep polling until the job has finished')
+    poll.add_argument('--interval', type=float, default=60.0, help='Seconds between polls with --wait (default: 60)')
+
+    apply = subparsers.add_parser('apply', help='Write batch results back to episodes')
+    apply.add_argument('--job-dir', type=str, required=True, help='Job directory')
+    apply.add_argument('--dry-run', action='store_true', help='Report what would change without writing')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    commands = {
+        'prepare': cmd_prepare,
+        'submit': cmd_submit,
+        'poll': cmd_poll,
+        'apply': cmd_apply,
+    }
+    try:
+        return commands[args.command](args, logger)
+    except Exception as e:
+        logger.error(f"{args.command} failed: {e}", exc_info=True)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
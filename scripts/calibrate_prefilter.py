@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Calibrate Relevance Prefilter
+
+Replays historical LLM-scored episodes through the embedding prefilter to
+choose its similarity floor. For each candidate floor it reports how many
+episodes would skip LLM scoring, how many relevant episodes that would have
+missed (recall), how often the prefilter agrees with the stored LLM
+verdict, and the net saving after paying for embeddings.
+
+The recommended floor is the highest one that keeps recall at or above
+--min-recall. Enable the prefilter by setting, in web_settings:
+    ai_content_scoring.prefilter_enabled = true
+    ai_content_scoring.prefilter_floor   = <recommended floor>
+
+Episodes without stored scores (including ones the prefilter rejected) are
+not used, so calibration only ever learns from LLM verdicts.
+
+Usage:
+    python scripts/calibrate_prefilter.py [--days N] [--limit N] [--min-recall R]
+                                          [--floor-step S] [--model MODEL] [--verbose]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.models import estimate_message_tokens
+from src.llm.pricing import estimate_cost
+from src.scoring.content_scorer import ContentScorer, BATCH_ITEM_OUTPUT_TOKENS, BATCH_TOPIC_OUTPUT_TOKENS
+from src.scoring.relevance_prefilter import RelevancePrefilter
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"calibrate_prefilter_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def evaluate_floors(best: np.ndarray, relevant: np.ndarray, floors: np.ndarray) -> dict:
+    """
+    Evaluate candidate floors against stored LLM verdicts.
+
+    Args:
+        best: Best topic similarity per episode
+        relevant: Stored LLM verdict per episode (bool)
+        floors: Candidate floors
+
+    Returns:
+        Dict of arrays (one value per floor): skipped, missed, recall, agreement
+    """
+    skipped_mask = best[None, :] < floors[:, None]
+    skipped = skipped_mask.sum(axis=1)
+    missed = (skipped_mask & relevant[None, :]).sum(axis=1)
+    relevant_count = int(relevant.sum())
+
+    # Escalated episodes get the LLM verdict, so only missed episodes disagree
+    return {
+        'skipped': skipped,
+        'missed': missed,
+        'recall': 1.0 - missed / relevant_count if relevant_count else np.ones(len(floors)),
+        'agreement': 1.0 - missed / len(best),
+    }
+
+
+def percentile_row(label: str, values: np.ndarray) -> str:
+    if len(values) == 0:
+        return f"  {label:<14} (none)"
+    cells = "".join(f"{v:7.3f}" for v in np.percentile(values, [5, 25, 50, 75, 95]))
+    return f"  {label:<14}{cells}"
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Calibrate the embedding relevance prefilter floor')
+    parser.add_argument('--days', type=int, default=90, help='Use episodes published in the last N days (default: 90)')
+    parser.add_argument('--limit', type=int, help='Maximum number of episodes to use')
+    parser.add_argument('--min-recall', type=float, default=0.98,
+                        help='Share of relevant episodes the floor must keep (default: 0.98)')
+    parser.add_argument('--floor-step', type=float, default=0.01, help='Floor grid step (default: 0.01)')
+    parser.add_argument('--model', type=str, help='Embedding model (default: web_settings prefilter_model)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    db = SupabaseClient()
+
+    topics = db.get_active_topics()
+    if not topics:
+        logger.error("No active topics found in database")
+        return 1
+    topic_names = [t['name'] for t in topics]
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    scorer = ContentScorer(topics=topics, score_threshold=score_threshold, db_client=db)
+    if args.model:
+        prefilter = RelevancePrefilter(topics=topics, model=args.model)
+    else:
+        prefilter = RelevancePrefilter.from_settings(topics, db)
+
+    episodes = db.get_episodes_for_rescoring(
+        statuses=['scored', 'not_relevant'],
+        since_days=args.days,
+        limit=args.limit
+    )
+    # Only episodes the LLM scored against at least one active topic
+    episodes = [e for e in episodes if any(name in (e['scores'] or {}) for name in topic_names)]
+    if not episodes:
+        logger.error("No LLM-scored episodes to calibrate against")
+        return 1
+
+    relevant = np.array([
+        any((e['scores'].get(name) or 0.0) >= score_threshold for name in topic_names) for e in episodes
+    ])
+    excerpts = [scorer.build_excerpt(e['transcript_content']) for e in episodes]
+
+    logger.info(f"Embedding {len(excerpts)} excerpts with {prefilter.model}")
+    best = prefilter.similarities(excerpts).max(axis=1)
+
+    # Cost of one LLM scoring call vs. one embedding, per episode
+    output_tokens = BATCH_ITEM_OUTPUT_TOKENS + BATCH_TOPIC_OUTPUT_TOKENS * len(topics)
+    llm_costs = np.array([
+        estimate_cost(scorer.model, estimate_message_tokens(scorer._create_scoring_messages(excerpt)), output_tokens)
+        for excerpt in excerpts
+    ])
+    embedding_cost = estimate_cost(prefilter.model, prefilter.embedding_tokens) / len(excerpts)
+
+    floors = np.round(np.arange(0.0, float(best.max()) + args.floor_step, args.floor_step), 4)
+    evaluation = evaluate_floors(best, relevant, floors)
+
+    print()
+    print(f"Calibration set: {len(episodes)} episodes, {int(relevant.sum())} relevant "
+          f"(threshold {score_threshold}), {len(topics)} topics")
+    print(f"LLM scoring ~${llm_costs.mean():.6f}/episode ({scorer.model}), "
+          f"embedding ~${embedding_cost:.6f}/episode ({prefilter.model})")
+    print()
+    print("Best topic similarity    p5     p25    p50    p75    p95")
+    print(percentile_row('relevant', best[relevant]))
+    print(percentile_row('not relevant', best[~relevant]))
+    print()
+    print(f"  {'floor':>6} {'skipped':>8} {'skip%':>6} {'missed':>7} {'recall':>7} {'agree':>7} {'net $/1k eps':>13}")
+
+    recommended = None
+    last_skipped = None
+    for i, floor in enumerate(floors):
+        recall = float(evaluation['recall'][i])
+        if recall >= args.min_recall:
+            recommended = i
+        # Only print floors that change the outcome
+        if evaluation['skipped'][i] == last_skipped:
+            continue
+        last_skipped = evaluation['skipped'][i]
+        skipped_mask = best < floor
+        net_per_1k = (llm_costs[skipped_mask].sum() / len(episodes) - embedding_cost) * 1000
+        print(
+            f"  {floor:6.3f} {int(evaluation['skipped'][i]):8d} {evaluation['skipped'][i] / len(episodes):6.1%} "
+            f"{int(evaluation['missed'][i]):7d} {recall:7.1%} {float(evaluation['agreement'][i]):7.1%} "
+            f"{net_per_1k:13.4f}"
+        )
+        if evaluation['skipped'][i] == len(episodes):
+            break
+
+    print()
+    if recommended is None or evaluation['skipped'][recommended] == 0:
+        print(f"No floor skips any episode while keeping recall >= {args.min_recall:.0%}; "
+              f"leave the prefilter disabled.")
+        return 0
+
+    floor = float(floors[recommended])
+    skipped_mask = best < floor
+    net_per_1k = (llm_costs[skipped_mask].sum() / len(episodes) - embedding_cost) * 1000
+    print(f"Recommended floor: {floor:.3f}")
+    print(f"  skips {int(skipped_mask.sum())}/{len(episodes)} episodes "
+          f"({skipped_mask.mean():.1%}), recall {float(evaluation['recall'][recommended]):.1%}, "
+          f"net saving ~${net_per_1k:.4f} per 1k episodes")
+    if net_per_1k <= 0:
+        print("  Embeddings cost more than the LLM calls they save; leave the prefilter disabled.")
+
+    missed = [(e, b) for e, b, r in zip(episodes, best, relevant) if r and b < floor]
+    if missed:
+        print("  Relevant episodes this floor would miss:")
+        for episode, similarity in missed[:10]:
+            top_score = max(episode['scores'].get(name) or 0.0 for name in topic_names)
+            print(f"    {episode['episode_guid']}  similarity {similarity:.3f}  "
+                  f"score {top_score:.2f}  {episode['title'][:60]}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
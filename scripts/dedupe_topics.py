@@ -24,6 +24,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.database.supabase_client import SupabaseClient
+from src.llm.usage import UsageLedger, set_usage_ledger
 from src.topic_tracking.semantic_matcher import SemanticTopicMatcher
 
 
@@ -173,12 +174,30 @@ def merge_story_arcs(
                         events_moved = cur.rowcount
                         stats['events_moved'] += events_moved
 
+                        # Keep the duplicate's name (and its own aliases) resolving
+                        # to the canonical arc in later extractions
+                        cur.execute("""
+                            UPDATE story_arc_aliases
+                            SET story_arc_id = %s
+                            WHERE story_arc_id = %s
+                        """, (canonical['id'], dup['id']))
+                        cur.execute("""
+                            INSERT INTO story_arc_aliases (
+                                digest_topic, alias_slug, story_arc_id, source, created_at
+                            ) VALUES (%s, %s, %s, 'merge', %s)
+                            ON CONFLICT (alias_slug, digest_topic) DO UPDATE SET
+                                story_arc_id = EXCLUDED.story_arc_id,
+                                source = EXCLUDED.source
+                        """, (dup['digest_topic'], dup['arc_slug'], canonical['id'],
+                              datetime.now(timezone.utc)))
+
                         # Delete the duplicate arc
                         cur.execute("""
                             DELETE FROM story_arcs WHERE id = %s
                         """, (dup['id'],))
 
-                        # Update canonical arc's event_count and source_count
+                        # Update canonical arc's event_count and source_count, and
+                        # queue its summary for regeneration with the moved events
                         cur.execute("""
                             UPDATE story_arcs
                             SET event_count = (
@@ -190,6 +209,7 @@ def merge_story_arcs(
                                 FROM story_arc_events
                                 WHERE story_arc_id = %s AND source_feed_id IS NOT NULL
                             ),
+                            summary_updated_at = NULL,
                             updated_at = %s
                             WHERE id = %s
                         """, (canonical['id'], canonical['id'],
@@ -344,6 +364,10 @@ def main():
     try:
         db = SupabaseClient()
 
+        # Record embedding calls (written to llm_usage unless dry run)
+        usage_ledger = UsageLedger(db_client=None if args.dry_run else db, run_id=run_id)
+        set_usage_ledger(usage_ledger)
+
         # Get retention days from settings
         retention_days = db.get_setting('story_arcs', 'retention_days', 14)
         days_back = args.days_back if args.days_back else retention_days
@@ -405,6 +429,9 @@ def main():
         logger.info(f"Arcs cleaned up: {total_cleaned}")
         logger.info(f"Errors: {total_errors}")
 
+        usage_ledger.flush()
+        usage_ledger.log_summary()
+
         # Log successful completion to database
         if not args.dry_run:
             finished_at = datetime.now(timezone.utc)
@@ -423,6 +450,7 @@ def main():
                     'events_moved': total_events_moved,
                     'arcs_cleaned_up': total_cleaned,
                     'errors': total_errors,
+                    'llm_usage': usage_ledger.summary(),
                     'duration_seconds': (finished_at - started_at).total_seconds()
                 },
                 notes=f"Processed {len(digest_topics)} digest topics, merged {total_merged} arcs"
@@ -11,7 +11,8 @@ Usage:
 import argparse
 import logging
 import sys
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add project root to path
@@ -19,6 +20,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.database.supabase_client import SupabaseClient
+from src.llm.usage import UsageLedger, set_usage_ledger
 from src.newsletter.generator import NewsletterGenerator
 
 
@@ -60,8 +62,15 @@ def main():
         db = SupabaseClient()
         generator = NewsletterGenerator(db)
 
+        # Record LLM calls (written to llm_usage unless dry run)
+        run_id = f"newsletter-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        usage_ledger = UsageLedger(db_client=None if args.dry_run else db, run_id=run_id)
+        set_usage_ledger(usage_ledger)
+
         # Generate content
         content = generator.generate_content(days=args.days)
+        usage_ledger.flush()
+        usage_ledger.log_summary()
 
         if not content:
             logger.warning("No content generated - no suitable episodes found")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Re-parse Cached Subtitles
+
+Re-derives transcripts from the local raw subtitle cache without hitting
+YouTube. Useful after changing subtitle_parser, or to debug a transcript.
+
+Usage:
+    python scripts/reparse_subtitle_cache.py [--cache-dir DIR] [--video-id ID ...]
+                                             [--update-db] [--stats] [--verbose]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.youtube.subtitle_cache import SubtitleCache, DEFAULT_MAX_BYTES
+from src.youtube.ytdlp_fetcher import YtdlpTranscriptFetcher
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"subtitle_reparse_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Re-parse transcripts from the subtitle cache')
+    parser.add_argument('--cache-dir', type=str, default=os.getenv('SUBTITLE_CACHE_DIR'),
+                        help='Subtitle cache directory (default: $SUBTITLE_CACHE_DIR)')
+    parser.add_argument('--video-id', type=str, action='append',
+                        help='Only re-parse this video (can be repeated)')
+    parser.add_argument('--update-db', action='store_true',
+                        help='Write re-parsed transcripts back to the episodes table')
+    parser.add_argument('--stats', action='store_true', help='Print cache statistics and exit')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    if not args.cache_dir:
+        logger.error("No cache directory given (use --cache-dir or set SUBTITLE_CACHE_DIR)")
+        return 1
+
+    cache = SubtitleCache(
+        args.cache_dir,
+        max_bytes=int(os.getenv('SUBTITLE_CACHE_MAX_MB', str(DEFAULT_MAX_BYTES // (1024 * 1024)))) * 1024 * 1024
+    )
+
+    if args.stats:
+        stats = cache.stats()
+        logger.info(f"Entries: {stats['entries']} ({stats['videos']} videos)")
+        logger.info(f"Raw size: {stats['raw_bytes'] / 1024 / 1024:.1f} MB")
+        logger.info(f"Stored size: {stats['stored_bytes'] / 1024 / 1024:.1f} MB "
+                    f"(ratio {stats['compression_ratio']:.1f}x)")
+        return 0
+
+    fetcher = YtdlpTranscriptFetcher(subtitle_cache=cache)
+
+    db = None
+    if args.update_db:
+        from src.database.supabase_client import SupabaseClient
+        db = SupabaseClient()
+
+    video_ids = args.video_id or cache.video_ids()
+    logger.info(f"Re-parsing {len(video_ids)} cached videos")
+
+    parsed_count = 0
+    updated_count = 0
+    missing = 0
+
+    for video_id in video_ids:
+        result = fetcher.transcript_from_cache(video_id)
+        if not result:
+            logger.warning(f"No usable cached subtitles for {video_id}")
+            missing += 1
+            continue
+
+        parsed_count += 1
+        logger.info(f"{video_id}: {result.word_count} words (lang={result.language}, auto={result.is_generated})")
+
+        if db:
+            if db.update_episode_transcript(video_id, result.transcript_text, result.word_count):
+                updated_count += 1
+            else:
+                logger.debug(f"No episode found for {video_id}")
+
+    cache.flush()
+
+    logger.info("=" * 60)
+    logger.info(f"Re-parsed: {parsed_count}, missing: {missing}")
+    if db:
+        logger.info(f"Episodes updated: {updated_count}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Arc Retrieval Report
+
+Measures what retrieval-based arc context (topic_tracking.arc_retrieval_enabled)
+changes in story arc extraction:
+
+- Prompt size: for recent episodes and each tracking-enabled topic, the
+  tokens of the active arcs context with the most recent arcs (the default)
+  and with the arcs ArcRetriever selects for that episode. Nothing is
+  extracted or written except arc embeddings, which are stored for reuse.
+- Duplicate rate: the share of checked arcs that story arc consolidation
+  (dedupe_topics.py) merged, per run, before and after --since (the date
+  retrieval was turned on).
+
+Usage:
+    python scripts/report_arc_retrieval.py [--days N] [--limit N] [--since YYYY-MM-DD] [--verbose]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.models import count_tokens, has_tokenizer
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.topic_tracking.arc_retrieval import ArcRetriever
+from src.topic_tracking.topic_extractor import StoryArcExtractor
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"report_arc_retrieval_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def percentile(values: list, share: float) -> int:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def duplicate_rates(runs: list, since: datetime) -> dict:
+    """Merged / checked arcs over consolidation runs before and after `since`."""
+    totals = {'before': [0, 0, 0], 'after': [0, 0, 0]}
+    for run in runs:
+        phase = run.get('phase') or {}
+        if run.get('status') != 'completed' or not phase.get('arcs_checked'):
+            continue
+        started_at = run['started_at'].replace(tzinfo=None)
+        bucket = totals['after' if since and started_at >= since else 'before']
+        bucket[0] += 1
+        bucket[1] += phase['arcs_checked']
+        bucket[2] += phase.get('arcs_merged', 0)
+    return totals
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Compare recency and retrieval-based story arc context')
+    parser.add_argument('--days', type=int, default=14, help='Sample episodes published in the last N days (default: 14)')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum number of episodes (default: 20)')
+    parser.add_argument('--since', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help='Date arc retrieval was enabled, to split the duplicate rate (YYYY-MM-DD)')
+    parser.add_argument('--runs', type=int, default=50,
+                        help='Recent consolidation runs to read for the duplicate rate (default: 50)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    db = SupabaseClient()
+
+    tracking_topics = db.get_topics_with_tracking_enabled()
+    if not tracking_topics:
+        logger.error("No topics have story arc tracking enabled")
+        return 1
+
+    retriever = ArcRetriever.from_settings(db)
+    extractor = StoryArcExtractor(db_client=db, arc_retriever=retriever)
+    arc_context = extractor.arc_context
+
+    episodes = db.get_episodes_for_rescoring(
+        statuses=['scored'], since_days=args.days, limit=args.limit
+    )
+    if not episodes:
+        logger.error("No scored episodes with transcripts in the sample window")
+        return 1
+
+    ledger = UsageLedger(run_id='report-arc-retrieval')
+    set_usage_ledger(ledger)
+
+    recency_tokens, retrieval_tokens, selected_counts = [], [], []
+    for i, episode in enumerate(episodes, 1):
+        logger.info(f"[{i}/{len(episodes)}] {episode['episode_guid']}: {episode['title'][:60]}")
+        excerpt = extractor.excerpt_builder.build(episode['transcript_content'], extractor.excerpt_tokens)
+        for topic in tracking_topics:
+            recency_tokens.append(count_tokens(arc_context.get_prompt_context(topic['name'])))
+            selected = retriever.select(arc_context.get_arcs(topic['name']), excerpt)
+            selected_counts.append(len(selected))
+            retrieval_tokens.append(count_tokens(
+                db.format_story_arcs_for_prompt(selected, len(selected), arc_context.max_events_per_arc)
+            ))
+
+    set_usage_ledger(UsageLedger())
+    ledger.flush()
+
+    counter = 'tiktoken' if has_tokenizer() else 'estimated'
+    active_arcs = {t['name']: len(arc_context.get_arcs(t['name'])) for t in tracking_topics}
+    print()
+    print(f"Arc context per extraction prompt ({counter} tokens): {len(episodes)} episodes x "
+          f"{len(tracking_topics)} topics, active arcs {active_arcs}")
+    print(f"  retriever: top_k={retriever.top_k}, token_budget={retriever.token_budget}, model={retriever.model}")
+    print(f"  {'context':<10} {'mean':>7} {'p95':>7} {'max':>7}")
+    for label, tokens in (('recency', recency_tokens), ('retrieval', retrieval_tokens)):
+        print(f"  {label:<10} {sum(tokens) / len(tokens):7.0f} {percentile(tokens, 0.95):7d} {max(tokens):7d}")
+    if sum(recency_tokens):
+        print(f"  reduction: {1 - sum(retrieval_tokens) / sum(recency_tokens):.1%} "
+              f"(mean {sum(selected_counts) / len(selected_counts):.1f} arcs selected)")
+
+    stats = retriever.stats()
+    usage = ledger.summary()
+    print(f"  embeddings: {stats['arcs_embedded']} arcs embedded, {stats['arcs_loaded']} loaded from the database, "
+          f"{stats['fallbacks']} fallbacks, ${usage['cost_usd']:.4f}")
+
+    totals = duplicate_rates(db.get_recent_pipeline_runs('story_arc_consolidation', limit=args.runs), args.since)
+    print()
+    print("Duplicate rate (arcs merged by consolidation / arcs checked)")
+    for label, (runs, checked, merged) in totals.items():
+        if label == 'after' and not args.since:
+            continue
+        if runs:
+            print(f"  {label:<7} {runs:4d} runs  {merged:6d}/{checked:<6d} {merged / checked:6.1%}")
+        else:
+            print(f"  {label:<7} (no runs)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Caption De-duplication Report
+
+Compares transcripts parsed with and without rolling auto-caption overlap
+merging and reports the reduction in words and (estimated) OpenAI tokens.
+Runs against VTT tracks in the raw subtitle cache, explicit files, or a
+synthetic auto-caption file.
+
+Usage:
+    python scripts/report_caption_dedup.py [--cache-dir DIR] [--file PATH ...] [--synthetic HOURS]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.youtube.subtitle_parser import parse_vtt
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+def get_token_counter() -> Tuple[Callable[[str], int], str]:
+    """Return a token counting function and a label describing it."""
+    if tiktoken:
+        encoding = tiktoken.get_encoding('o200k_base')
+        return (lambda text: len(encoding.encode(text))), 'tiktoken o200k_base'
+    # ~4 characters per token for English text
+    return (lambda text: len(text) // 4), 'estimated (chars / 4)'
+
+
+def load_samples(args) -> List[Tuple[str, str]]:
+    """Collect (label, vtt_content) samples from the requested sources."""
+    samples = []
+
+    if args.synthetic:
+        from benchmarks.corpus import generate_auto_caption_vtt
+        samples.append((f"synthetic {args.synthetic:g}h", generate_auto_caption_vtt(args.synthetic)))
+
+    for path in args.file or []:
+        samples.append((Path(path).name, Path(path).read_text(encoding='utf-8', errors='replace')))
+
+    if args.cache_dir:
+        from src.youtube.subtitle_cache import SubtitleCache
+        cache = SubtitleCache(args.cache_dir)
+        for entry in cache.entries():
+            if entry.format != 'vtt':
+                continue
+            payload = cache.read(entry)
+            if payload:
+                samples.append((entry.key, payload.decode('utf-8', errors='replace')))
+
+    return samples
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Report rolling caption de-duplication savings')
+    parser.add_argument('--cache-dir', type=str, default=os.getenv('SUBTITLE_CACHE_DIR'),
+                        help='Subtitle cache directory (default: $SUBTITLE_CACHE_DIR)')
+    parser.add_argument('--file', type=str, action='append', help='VTT file to include (can be repeated)')
+    parser.add_argument('--synthetic', type=float, help='Include a synthetic auto-caption file of N hours')
+
+    args = parser.parse_args()
+
+    samples = load_samples(args)
+    if not samples:
+        print("No VTT samples found (use --cache-dir, --file or --synthetic)")
+        return 1
+
+    count_tokens, token_label = get_token_counter()
+    print(f"Token counts: {token_label}")
+    print(f"{'sample':<40} {'words before':>12} {'words after':>12} {'tokens before':>14} {'tokens after':>13} {'saved':>7}")
+    print("-" * 103)
+
+    totals = [0, 0, 0, 0]
+    for label, content in samples:
+        before = parse_vtt(content, merge_overlaps=False)
+        after = parse_vtt(content, merge_overlaps=True)
+        row = [
+            before.word_count,
+            after.word_count,
+            count_tokens(before.text),
+            count_tokens(after.text),
+        ]
+        totals = [t + r for t, r in zip(totals, row)]
+        saved = 1 - (row[3] / row[2]) if row[2] else 0.0
+        print(f"{label[:40]:<40} {row[0]:>12} {row[1]:>12} {row[2]:>14} {row[3]:>13} {saved:>6.1%}")
+
+    saved = 1 - (totals[3] / totals[2]) if totals[2] else 0.0
+    print("-" * 103)
+    print(f"{'TOTAL':<40} {totals[0]:>12} {totals[1]:>12} {totals[2]:>14} {totals[3]:>13} {saved:>6.1%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Prompt Cache Report
+
+Shows whether provider prompt caching is discounting our LLM calls. For each
+stage, model and prompt version in the llm_usage ledger it reports calls,
+average prompt tokens, the share of prompt tokens served from cache, and how
+many calls got any cached tokens.
+
+It also measures the static prefix (system prompt) of each current prompt
+layout. Providers only cache prefixes of at least PROMPT_CACHE_MIN_TOKENS;
+a stage whose system prompt is shorter can still get cached tokens when the
+context that follows it is shared too (story arc extraction: the topic's
+active arcs, the same for every episode of that topic in a run).
+
+Usage:
+    python scripts/report_prompt_cache.py [--days N]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.models import PROMPT_CACHE_MIN_TOKENS, count_tokens, has_tokenizer
+from src.llm.usage import STAGE_ARC_EXTRACTION, STAGE_NEWSLETTER, STAGE_SCORING
+from src.newsletter.generator import PRACTICAL_TIPS_SYSTEM_PROMPT, STORY_ARC_SYSTEM_PROMPT
+from src.scoring.content_scorer import ContentScorer
+from src.topic_tracking.topic_extractor import EXTRACTION_SYSTEM_PROMPT
+
+
+def static_prefixes(db: SupabaseClient) -> list:
+    """(stage, prompt, system prompt) for the current prompt layouts."""
+    prefixes = [
+        (STAGE_ARC_EXTRACTION, 'extraction', EXTRACTION_SYSTEM_PROMPT),
+        (STAGE_NEWSLETTER, 'story arcs', STORY_ARC_SYSTEM_PROMPT),
+        (STAGE_NEWSLETTER, 'practical tips', PRACTICAL_TIPS_SYSTEM_PROMPT),
+    ]
+    topics = db.get_active_topics()
+    if topics:
+        scorer = ContentScorer(topics=topics, db_client=db)
+        prefixes[:0] = [
+            (STAGE_SCORING, 'single', scorer._create_system_prompt()),
+            (STAGE_SCORING, 'batch', scorer._create_batch_system_prompt()),
+        ]
+    return prefixes
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Report prompt-cache hits from the LLM usage ledger')
+    parser.add_argument('--days', type=int, default=7, help='Report calls from the last N days (default: 7)')
+
+    args = parser.parse_args()
+
+    db = SupabaseClient()
+    rows = db.get_llm_cache_usage(days=args.days)
+
+    print()
+    print(f"Chat calls in the last {args.days} days")
+    if not rows:
+        print("  (none recorded)")
+    else:
+        print(f"  {'stage':<26} {'model':<20} {'version':<14} {'calls':>6} {'avg prompt':>11} "
+              f"{'cached':>7} {'cached calls':>13} {'cost $':>9}")
+        for row in rows:
+            calls = row['calls']
+            prompt_tokens = int(row['prompt_tokens'])
+            cached_share = int(row['cached_tokens']) / prompt_tokens if prompt_tokens else 0.0
+            print(
+                f"  {row['stage']:<26} {row['model']:<20} {row['prompt_version'] or '-':<14} {calls:6d} "
+                f"{prompt_tokens // calls:11d} {cached_share:7.1%} "
+                f"{row['cached_calls']:6d} ({row['cached_calls'] / calls:4.0%}) {float(row['cost_usd']):9.4f}"
+            )
+
+    counter = 'tiktoken' if has_tokenizer() else 'estimated'
+    print()
+    print(f"Static prompt prefixes ({counter} tokens; cacheable from {PROMPT_CACHE_MIN_TOKENS})")
+    for stage, label, prompt in static_prefixes(db):
+        tokens = count_tokens(prompt)
+        note = 'cacheable' if tokens >= PROMPT_CACHE_MIN_TOKENS else 'below minimum'
+        print(f"  {stage:<26} {label:<16} {tokens:6d}  {note}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Rescore Episodes
+
+Backfills topic scores for stored episodes using batched scoring requests,
+e.g. after changing the scoring model. Episodes whose excerpt was already
+scored with the same topics, model and prompt are answered from the score
+cache.
+
+With --changed-topics, only topics added or edited since episodes were last
+scored are scored (detected by comparing each topic's name/description hash
+with topic_score_fingerprints). Their scores are merged into each episode's
+existing scores and scored/not_relevant status is recomputed in bulk in the
+database. Run with --mark-current once to record the current topics as
+already scored without calling the model.
+
+Usage:
+    python scripts/rescore_episodes.py [--status STATUS ...] [--days N] [--episode-guid GUID ...]
+                                       [--limit N] [--batch-size N] [--changed-topics]
+                                       [--mark-current] [--dry-run] [--verbose]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.scoring.content_scorer import ContentScorer, DEFAULT_MAX_BATCH_SIZE, SCORING_PROMPT_VERSION
+from src.scoring.score_cache import ScoreCache, topic_hash
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"rescore_episodes_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def get_changed_topics(db: SupabaseClient, topics: list) -> list:
+    """Active topics whose name or description differs from the one stored episodes were scored with."""
+    stored = db.get_topic_score_fingerprints()
+    return [t for t in topics if stored.get(t['id']) != topic_hash(t)]
+
+
+def record_topic_fingerprints(db: SupabaseClient, topics: list, model: str = None) -> None:
+    """Record that stored episodes are now scored against these topics as they are."""
+    db.store_topic_score_fingerprints(
+        [(t['id'], t['name'], topic_hash(t)) for t in topics],
+        model=model,
+        prompt_version=SCORING_PROMPT_VERSION
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Rescore stored episodes in batches')
+    parser.add_argument('--status', type=str, action='append',
+                        help="Only episodes with this status (can be repeated, e.g. 'scored', 'not_relevant')")
+    parser.add_argument('--days', type=int, help='Only episodes published in the last N days')
+    parser.add_argument('--episode-guid', type=str, action='append', help='Only this episode (can be repeated)')
+    parser.add_argument('--limit', type=int, help='Maximum number of episodes to rescore')
+    parser.add_argument('--batch-size', type=int, help='Transcripts per scoring request (default: web_settings)')
+    parser.add_argument('--changed-topics', action='store_true',
+                        help='Score only topics added or edited since the last rescore and merge their scores')
+    parser.add_argument('--mark-current', action='store_true',
+                        help='Record the current topics as scored without rescoring anything')
+    parser.add_argument('--dry-run', action='store_true', help='Score but do not write to the database')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    db = SupabaseClient()
+
+    topics = db.get_active_topics()
+    if not topics:
+        logger.error("No active topics found in database")
+        return 1
+
+    if args.mark_current:
+        if not args.dry_run:
+            record_topic_fingerprints(db, topics)
+        logger.info(f"Recorded {len(topics)} topics as scored: {[t['name'] for t in topics]}")
+        return 0
+
+    all_topics = topics
+    statuses = args.status
+    if args.changed_topics:
+        topics = get_changed_topics(db, topics)
+        if not topics:
+            logger.info("No added or edited topics; nothing to rescore")
+            return 0
+        logger.info(f"Added or edited topics: {[t['name'] for t in topics]}")
+        # Other statuses get full scoring from the pipeline
+        statuses = statuses or ['scored', 'not_relevant']
+
+    episodes = db.get_episodes_for_rescoring(
+        statuses=statuses,
+        since_days=args.days,
+        episode_guids=args.episode_guid,
+        limit=args.limit
+    )
+    if not episodes:
+        logger.info("No episodes to rescore")
+        return 0
+
+    score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
+    batch_size = args.batch_size or db.get_setting('ai_content_scoring', 'batch_size', DEFAULT_MAX_BATCH_SIZE)
+
+    score_cache = None
+    if db.get_setting('ai_content_scoring', 'score_cache_enabled', True):
+        score_cache = ScoreCache(db_client=db)
+
+    scorer = ContentScorer(
+        topics=topics,
+        score_threshold=score_threshold,
+        db_client=db,
+        score_cache=score_cache,
+        max_batch_size=batch_size
+    )
+
+    mode = "changed topics only, merging scores" if args.changed_topics else "all topics"
+    logger.info(
+        f"Rescoring {len(episodes)} episodes against {len(topics)} topics "
+        f"({mode}, batch size {batch_size})"
+    )
+    if args.dry_run:
+        logger.info("DRY RUN MODE - scores will not be saved")
+
+    results = scorer.score_batch([(e['episode_guid'], e['transcript_content']) for e in episodes])
+
+    updated = 0
+    failed = 0
+    status_changes = 0
+    merged_scores = {}
+    for episode, result in zip(episodes, results):
+        if not result.success:
+            logger.error(f"Scoring failed for {episode['episode_guid']}: {result.error_message}")
+            failed += 1
+            continue
+
+        if args.changed_topics:
+            merged_scores[episode['episode_guid']] = result.scores
+            continue
+
+        status = 'scored' if scorer.is_relevant(result.scores) else 'not_relevant'
+        if status != episode['status']:
+            status_changes += 1
+            logger.info(f"{episode['episode_guid']}: {episode['status']} -> {status}")
+
+        if not args.dry_run:
+            db.update_episode_scores(episode['episode_guid'], result.scores, status)
+            updated += 1
+
+    if args.changed_topics and not args.dry_run:
+        updated = db.merge_episode_scores(merged_scores)
+        changes = db.recompute_episode_relevance(
+            list(merged_scores), [t['name'] for t in all_topics], scorer.score_threshold
+        )
+        status_changes = len(changes)
+        for change in changes:
+            logger.info(f"{change['episode_guid']}: {change['old_status']} -> {change['new_status']}")
+    elif args.changed_topics:
+        # Dry run: preview status changes from the merged scores
+        for episode in episodes:
+            if episode['episode_guid'] not in merged_scores:
+                continue
+            scores = {**(episode['scores'] or {}), **merged_scores[episode['episode_guid']]}
+            relevant = any((scores.get(t['name']) or 0.0) >= scorer.score_threshold for t in all_topics)
+            status = 'scored' if relevant else 'not_relevant'
+            if status != episode['status']:
+                status_changes += 1
+                logger.info(f"{episode['episode_guid']}: {episode['status']} -> {status}")
+
+    # A complete pass over the window brings these topics up to date
+    if not args.dry_run and failed == 0 and not args.episode_guid and not args.limit:
+        record_topic_fingerprints(db, topics, scorer.model)
+
+    logger.info("=" * 60)
+    logger.info(f"Episodes rescored: {len(episodes) - failed}, failed: {failed}")
+    logger.info(f"Status changes: {status_changes}")
+    logger.info(f"Episodes updated: {updated}")
+    if score_cache:
+        cache_stats = score_cache.stats()
+        logger.info(
+            f"Score cache: {cache_stats['hits']}/{cache_stats['lookups']} hits "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['tokens_saved']} tokens "
+            f"(~${cache_stats['cost_saved_usd']:.4f}) saved"
+        )
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
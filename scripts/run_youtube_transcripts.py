@@ -10,10 +10,13 @@ Usage:
 """
 
 import argparse
+import asyncio
 import logging
 import random
 import sys
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -21,10 +24,17 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.youtube.ytdlp_fetcher import YtdlpTranscriptFetcher
-from src.youtube.feed_processor import YouTubeFeedProcessor
+from src.youtube.ytdlp_fetcher import TranscriptResult, YtdlpTranscriptFetcher
+from src.youtube.subtitle_cache import SubtitleCache
+from src.youtube.feed_processor import YouTubeFeedProcessor, YouTubeVideo
 from src.database.supabase_client import SupabaseClient
-from src.scoring.content_scorer import ContentScorer
+from src.llm.excerpt import ExcerptBuilder
+from src.llm.rate_limit import TokenBudget
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.scoring.content_scorer import ContentScorer, ScoringResult, DEFAULT_MAX_BATCH_SIZE
+from src.scoring.score_cache import ScoreCache
+from src.scoring.relevance_prefilter import RelevancePrefilter
+from src.topic_tracking.fused_analyzer import FusedEpisodeAnalyzer
 from src.topic_tracking.topic_extractor import StoryArcExtractor
 
 # Minimum video duration in seconds (3 minutes)
@@ -96,15 +106,83 @@ def estimate_duration_from_transcript(word_count: int) -> int:
     return int((word_count / words_per_minute) * 60)
 
 
+def new_feed_results(feed_id, feed_title: str) -> dict:
+    """Empty per-feed counters, as reported in the run summary."""
+    return {
+        'feed_id': feed_id,
+        'feed_title': feed_title,
+        'videos_found': 0,
+        'videos_new': 0,
+        'videos_over_3min': 0,
+        'videos_skipped_short': 0,
+        'videos_skipped_no_transcript': 0,
+        'transcripts_downloaded': 0,
+        'usable_episodes': 0,
+        'transcripts_scored': 0,
+        'episodes_relevant': 0,
+        'episodes_not_relevant': 0,
+        'topics_extracted': 0,
+        'errors': []
+    }
+
+
+def queue_stranded_episodes(
+    db: SupabaseClient,
+    scoring_queue: list,
+    feed_id: int = None,
+    logger: logging.Logger = None
+) -> dict:
+    """
+    Queue episodes an earlier run stored but never scored.
+
+    process_feed stores episodes as 'transcribed' before they are scored. If
+    that run stopped first, nothing else picks them up: they are no longer
+    new videos.
+
+    Args:
+        scoring_queue: Queue to append the episodes to
+        feed_id: Only this feed's episodes (optional)
+
+    Returns:
+        Results dictionary for the re-queued episodes
+    """
+    results = new_feed_results(None, 'Unscored episodes from earlier runs')
+    episodes = db.get_episodes_for_rescoring(statuses=['transcribed'])
+    if feed_id is not None:
+        episodes = [e for e in episodes if e['feed_id'] == feed_id]
+
+    for episode in episodes:
+        video_id = episode['episode_guid']
+        transcript = episode['transcript_content']
+        scoring_queue.append({
+            'video': YouTubeVideo(
+                video_id=video_id,
+                title=episode['title'],
+                published_date=episode['published_date'],
+                channel_id='',
+                channel_name=''
+            ),
+            'transcript_result': TranscriptResult(
+                video_id=video_id,
+                success=True,
+                transcript_text=transcript,
+                word_count=len(transcript.split())
+            ),
+            'feed_id': episode['feed_id'],
+            'results': results
+        })
+
+    if episodes:
+        logger.info(f"Re-queued {len(episodes)} episodes an earlier run stored but did not score")
+    return results
+
+
 def process_feed(
     feed: dict,
     db: SupabaseClient,
     fetcher: YtdlpTranscriptFetcher,
     feed_processor: YouTubeFeedProcessor,
-    scorer: ContentScorer,
-    score_threshold: float,
-    story_arc_extractor: StoryArcExtractor = None,
-    topics_with_tracking: list = None,
+    scoring_queue: list,
     dry_run: bool = False,
     logger: logging.Logger = None,
     max_transcripts_remaining: int = None
@@ -112,6 +190,10 @@ def process_feed(
     """
     Process a single YouTube feed.
 
+    Created episodes are stored as 'transcribed' and appended to
+    scoring_queue; scoring and story arc extraction happen in
+    score_pending_episodes(), which main() runs whenever a batch is waiting.
+
     Returns:
         Dictionary with processing results
     """
@@ -121,22 +203,7 @@ def process_feed(
 
     logger.info(f"Processing feed: {feed_title} (ID: {feed_id})")
 
-    results = {
-        'feed_id': feed_id,
-        'feed_title': feed_title,
-        'videos_found': 0,
-        'videos_new': 0,
-        'videos_over_3min': 0,
-        'videos_skipped_short': 0,
-        'videos_skipped_no_transcript': 0,
-        'transcripts_downloaded': 0,
-        'usable_episodes': 0,
-        'transcripts_scored': 0,
-        'episodes_relevant': 0,
-        'episodes_not_relevant': 0,
-        'topics_extracted': 0,
-        'errors': []
-    }
+    results = new_feed_results(feed_id, feed_title)
 
     try:
         # Parse feed to get videos
@@ -197,7 +264,8 @@ def process_feed(
             results['transcripts_downloaded'] += 1
 
             # Add delay between transcript fetches to avoid rate limiting
-            if not dry_run:
+            # (cache hits never touched YouTube, so they don't need one)
+            if not dry_run and not transcript_result.from_cache:
                 logger.info(f"Waiting {TRANSCRIPT_FETCH_DELAY}s before next transcript fetch...")
                 time.sleep(TRANSCRIPT_FETCH_DELAY)
 
@@ -243,81 +311,13 @@ def process_feed(
                 results['errors'].append(error_msg)
                 continue
 
-            # Score the transcript
-            scoring_result = scorer.score_transcript(
-                transcript_result.transcript_text,
-                episode_id=video_id
-            )
-
-            if not scoring_result.success:
-                error_msg = f"Scoring failed for {video_id}: {scoring_result.error_message}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
-                continue
-
-            results['transcripts_scored'] += 1
-
-            # Determine relevance and update status
-            is_relevant = scorer.is_relevant(scoring_result.scores)
-            status = 'scored' if is_relevant else 'not_relevant'
-
-            db.update_episode_scores(video_id, scoring_result.scores, status)
-
-            if is_relevant:
-                results['episodes_relevant'] += 1
-                relevant_topics = scorer.get_relevant_topics(scoring_result.scores)
-                logger.info(f"Episode {video_id} is RELEVANT for topics: {relevant_topics}")
-
-                # Extract story arcs for topics with tracking enabled AND score >= threshold
-                # This aligns with podscrape2's approach
-                if story_arc_extractor and topics_with_tracking and not dry_run:
-                    # Get episode details from database
-                    episode = db.get_episode_by_guid(video_id)
-                    if episode:
-                        # Only extract for topics that have tracking enabled
-                        tracking_topic_names = {t['name'] for t in topics_with_tracking}
-
-                        for topic_name in relevant_topics:
-                            # Skip if topic doesn't have tracking enabled
-                            if topic_name not in tracking_topic_names:
-                                logger.debug(f"Skipping story arc extraction for '{topic_name}' (tracking not enabled)")
-                                continue
-
-                            topic_score = scoring_result.scores.get(topic_name, 0.0)
-
-                            # Skip if score below threshold (podscrape2 alignment)
-                            if topic_score < score_threshold:
-                                logger.debug(
-                                    f"Skipping story arc extraction for '{topic_name}' "
-                                    f"(score {topic_score:.2f} < {score_threshold})"
-                                )
-                                continue
-
-                            try:
-                                extracted = story_arc_extractor.extract_and_store_story_arcs(
-                                    episode_id=episode['id'],
-                                    episode_guid=video_id,
-                                    feed_id=feed_id,
-                                    digest_topic=topic_name,
-                                    transcript=transcript_result.transcript_text,
-                                    episode_title=video.title,
-                                    episode_published_date=video.published_date,
-                                    relevance_score=topic_score
-                                )
-                                results['topics_extracted'] += len(extracted)
-                                new_arcs = len([r for r in extracted if r.get('is_new')])
-                                continued_arcs = len([r for r in extracted if not r.get('is_new')])
-                                logger.info(
-                                    f"Story arcs for {video_id} under '{topic_name}': "
-                                    f"{new_arcs} new, {continued_arcs} continued"
-                                )
-                            except Exception as e:
-                                error_msg = f"Topic extraction failed for {video_id}/{topic_name}: {e}"
-                                logger.error(error_msg)
-                                results['errors'].append(error_msg)
-            else:
-                results['episodes_not_relevant'] += 1
-                logger.info(f"Episode {video_id} is NOT RELEVANT (scores: {scoring_result.scores})")
+            # Scored by main() once a batch is waiting
+            scoring_queue.append({
+                'video': video,
+                'transcript_result': transcript_result,
+                'feed_id': feed_id,
+                'results': results
+            })
 
         return results
 
@@ -328,6 +328,313 @@ def process_feed(
         return results
 
 
+def record_extraction(results: dict, video_id: str, topic_name: str, outcome, logger: logging.Logger) -> None:
+    """Count and log one topic's story arc results, or record its failure."""
+    if isinstance(outcome, Exception):
+        error_msg = f"Topic extraction failed for {video_id}/{topic_name}: {outcome}"
+        logger.error(error_msg)
+        results['errors'].append(error_msg)
+        return
+
+    results['topics_extracted'] += len(outcome)
+    new_arcs = len([r for r in outcome if r.get('is_new')])
+    continued_arcs = len([r for r in outcome if not r.get('is_new')])
+    logger.info(
+        f"Story arcs for {video_id} under '{topic_name}': "
+        f"{new_arcs} new, {continued_arcs} continued"
+    )
+
+
+def apply_scoring_result(
+    pending: dict,
+    scoring_result: ScoringResult,
+    db: SupabaseClient,
+    scorer: ContentScorer,
+    score_threshold: float,
+    story_arc_extractor: StoryArcExtractor = None,
+    topics_with_tracking: list = None,
+    logger: logging.Logger = None,
+    extractions: dict = None
+) -> None:
+    """
+    Store scores for a newly created episode and extract story arcs if relevant.
+
+    Args:
+        pending: Queued episode from process_feed (video, transcript_result,
+                 feed_id and the feed's results dict, which is updated)
+        scoring_result: ScoringResult for the episode
+        extractions: Story arcs already extracted per topic by the fused call
+                     (topics missing here are extracted with a separate call)
+    """
+    video = pending['video']
+    video_id = video.video_id
+    transcript_result = pending['transcript_result']
+    feed_id = pending['feed_id']
+    results = pending['results']
+
+    if not scoring_result.success:
+        error_msg = f"Scoring failed for {video_id}: {scoring_result.error_message}"
+        logger.error(error_msg)
+        results['errors'].append(error_msg)
+        return
+
+    results['transcripts_scored'] += 1
+
+    # Determine relevance and update status
+    is_relevant = scorer.is_relevant(scoring_result.scores)
+    status = 'scored' if is_relevant else 'not_relevant'
+
+    db.update_episode_scores(video_id, scoring_result.scores, status)
+
+    if is_relevant:
+        results['episodes_relevant'] += 1
+        relevant_topics = scorer.get_relevant_topics(scoring_result.scores)
+        logger.info(f"Episode {video_id} is RELEVANT for topics: {relevant_topics}")
+
+        # Extract story arcs for topics with tracking enabled AND score >= threshold
+        # This aligns with podscrape2's approach
+        if story_arc_extractor and topics_with_tracking:
+            # Get episode details from database
+            episode = db.get_episode_by_guid(video_id)
+            if episode:
+                # Only extract for topics that have tracking enabled
+                tracking_topic_names = {t['name'] for t in topics_with_tracking}
+                topics_to_extract = {}
+
+                for topic_name in relevant_topics:
+                    # Skip if topic doesn't have tracking enabled
+                    if topic_name not in tracking_topic_names:
+                        logger.debug(f"Skipping story arc extraction for '{topic_name}' (tracking not enabled)")
+                        continue
+
+                    topic_score = scoring_result.scores.get(topic_name, 0.0)
+
+                    # Skip if score below threshold (podscrape2 alignment)
+                    if topic_score < score_threshold:
+                        logger.debug(
+                            f"Skipping story arc extraction for '{topic_name}' "
+                            f"(score {topic_score:.2f} < {score_threshold})"
+                        )
+                        continue
+
+                    if extractions and topic_name in extractions:
+                        try:
+                            outcome = story_arc_extractor.store_extraction(
+                                extractions[topic_name],
+                                episode_id=episode['id'],
+                                episode_guid=video_id,
+                                feed_id=feed_id,
+                                digest_topic=topic_name,
+                                episode_title=video.title,
+                                episode_published_date=video.published_date,
+                                relevance_score=topic_score
+                            )
+                        except Exception as e:
+                            outcome = e
+                        record_extraction(results, video_id, topic_name, outcome, logger)
+                    else:
+                        topics_to_extract[topic_name] = topic_score
+
+                # Remaining topics are extracted concurrently, writes serialized per topic
+                if topics_to_extract:
+                    outcomes = story_arc_extractor.extract_and_store_for_topics(
+                        topics_to_extract,
+                        episode_id=episode['id'],
+                        episode_guid=video_id,
+                        feed_id=feed_id,
+                        transcript=transcript_result.transcript_text,
+                        episode_title=video.title,
+                        episode_published_date=video.published_date
+                    )
+                    for topic_name, outcome in outcomes.items():
+                        record_extraction(results, video_id, topic_name, outcome, logger)
+    else:
+        results['episodes_not_relevant'] += 1
+        if scoring_result.prefiltered:
+            logger.info(
+                f"Episode {video_id} is NOT RELEVANT (prefiltered, "
+                f"best topic similarity {scoring_result.prefilter_similarity:.3f})"
+            )
+        else:
+            logger.info(f"Episode {video_id} is NOT RELEVANT (scores: {scoring_result.scores})")
+
+
+async def stream_pending_episodes(
+    scoring_queue: list,
+    db: SupabaseClient,
+    scorer: ContentScorer,
+    score_threshold: float,
+    story_arc_extractor: StoryArcExtractor = None,
+    topics_with_tracking: list = None,
+    logger: logging.Logger = None,
+    concurrency: int = None
+) -> None:
+    """
+    Score queued episodes with concurrent requests, storing each result
+    (and extracting its story arcs) as soon as it arrives.
+
+    Results are applied one at a time in a worker thread, so scoring
+    requests already in flight keep running meanwhile.
+    """
+    queued = {pending['video'].video_id: pending for pending in scoring_queue}
+    items = [(video_id, pending['transcript_result'].transcript_text) for video_id, pending in queued.items()]
+
+    async for scoring_result in scorer.score_many(items, concurrency=concurrency):
+        pending = queued[scoring_result.episode_id]
+        try:
+            await asyncio.to_thread(
+                apply_scoring_result,
+                pending,
+                scoring_result,
+                db=db,
+                scorer=scorer,
+                score_threshold=score_threshold,
+                story_arc_extractor=story_arc_extractor,
+                topics_with_tracking=topics_with_tracking,
+                logger=logger
+            )
+        except Exception as e:
+            error_msg = f"Error storing scores for {scoring_result.episode_id}: {e}"
+            logger.error(error_msg)
+            pending['results']['errors'].append(error_msg)
+
+
+def analyze_pending_episodes(
+    scoring_queue: list,
+    db: SupabaseClient,
+    scorer: ContentScorer,
+    score_threshold: float,
+    fused_analyzer: FusedEpisodeAnalyzer,
+    story_arc_extractor: StoryArcExtractor = None,
+    topics_with_tracking: list = None,
+    logger: logging.Logger = None,
+    concurrency: int = 1
+) -> None:
+    """
+    Score queued episodes and extract their story arcs with one fused call each,
+    storing each result as it arrives.
+
+    With concurrency 1, episodes are analyzed strictly one after another, so
+    each request's arc context includes the arcs stored from the previous
+    episode, as in the two-call path. With more, requests are built while
+    earlier results are still being stored, so a story that first appears in
+    two episodes of the same run can be created twice (dedupe_topics.py
+    merges those later); topic_tracking.fused_concurrency trades that for speed.
+    """
+    def analyze(pending):
+        return fused_analyzer.analyze(
+            pending['transcript_result'].transcript_text,
+            pending['video'].video_id,
+            pending['video'].title
+        )
+
+    def store(pending, get_result):
+        try:
+            fused_result = get_result()
+            apply_scoring_result(
+                pending,
+                fused_result.scoring,
+                db=db,
+                scorer=scorer,
+                score_threshold=score_threshold,
+                story_arc_extractor=story_arc_extractor,
+                topics_with_tracking=topics_with_tracking,
+                logger=logger,
+                extractions=fused_result.extractions
+            )
+        except Exception as e:
+            error_msg = f"Error storing scores for {pending['video'].video_id}: {e}"
+            logger.error(error_msg)
+            pending['results']['errors'].append(error_msg)
+
+    if concurrency <= 1:
+        for pending in scoring_queue:
+            store(pending, lambda: analyze(pending))
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(analyze, pending): pending for pending in scoring_queue}
+        for future in as_completed(futures):
+            store(futures[future], future.result)
+
+
+def score_pending_episodes(
+    scoring_queue: list,
+    db: SupabaseClient,
+    scorer: ContentScorer,
+    score_threshold: float,
+    story_arc_extractor: StoryArcExtractor = None,
+    topics_with_tracking: list = None,
+    logger: logging.Logger = None,
+    concurrency: int = 1,
+    fused_analyzer: FusedEpisodeAnalyzer = None,
+    fused_concurrency: int = 1
+) -> None:
+    """
+    Score queued episodes.
+
+    Args:
+        scoring_queue: Episodes queued by process_feed or queue_stranded_episodes
+        concurrency: 1 packs episodes into batched requests; more runs that
+                     many single-episode requests concurrently (score_many)
+        fused_analyzer: Score and extract story arcs in one call per episode instead
+        fused_concurrency: Fused calls in flight; 1 keeps episodes in order so
+                           each sees the previous one's arcs (see analyze_pending_episodes)
+    """
+    if not scoring_queue:
+        return
+
+    logger.info(f"Scoring {len(scoring_queue)} queued episodes")
+    if fused_analyzer:
+        analyze_pending_episodes(
+            scoring_queue,
+            db=db,
+            scorer=scorer,
+            score_threshold=score_threshold,
+            fused_analyzer=fused_analyzer,
+            story_arc_extractor=story_arc_extractor,
+            topics_with_tracking=topics_with_tracking,
+            logger=logger,
+            concurrency=fused_concurrency
+        )
+        return
+
+    if concurrency > 1:
+        asyncio.run(stream_pending_episodes(
+            scoring_queue,
+            db=db,
+            scorer=scorer,
+            score_threshold=score_threshold,
+            story_arc_extractor=story_arc_extractor,
+            topics_with_tracking=topics_with_tracking,
+            logger=logger,
+            concurrency=concurrency
+        ))
+        return
+
+    scoring_results = scorer.score_batch([
+        (pending['video'].video_id, pending['transcript_result'].transcript_text)
+        for pending in scoring_queue
+    ])
+
+    for pending, scoring_result in zip(scoring_queue, scoring_results):
+        try:
+            apply_scoring_result(
+                pending,
+                scoring_result,
+                db=db,
+                scorer=scorer,
+                score_threshold=score_threshold,
+                story_arc_extractor=story_arc_extractor,
+                topics_with_tracking=topics_with_tracking,
+                logger=logger
+            )
+        except Exception as e:
+            error_msg = f"Error storing scores for {pending['video'].video_id}: {e}"
+            logger.error(error_msg)
+            pending['results']['errors'].append(error_msg)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='YouTube Transcript Pipeline')
@@ -346,10 +653,21 @@ def main():
     if args.dry_run:
         logger.info("DRY RUN MODE - No changes will be made")
 
+    # Generate unique run ID and track start time
+    run_id = f"youtube-transcripts-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    started_at = datetime.now(timezone.utc)
+    db = None
+
     try:
         # Initialize components
         db = SupabaseClient()
-        fetcher = YtdlpTranscriptFetcher()
+
+        # Record every LLM call of this run (written to llm_usage unless dry run)
+        usage_ledger = UsageLedger(db_client=None if args.dry_run else db, run_id=run_id)
+        set_usage_ledger(usage_ledger)
+
+        # Raw subtitle cache is enabled by SUBTITLE_CACHE_DIR
+        fetcher = YtdlpTranscriptFetcher(subtitle_cache=SubtitleCache.from_env())
 
         # Get lookback days from settings
         lookback_days = db.get_setting('pipeline', 'discovery_lookback_days', 5)
@@ -363,7 +681,10 @@ def main():
         transcripts_today = get_transcripts_downloaded_today(db)
         logger.info(f"Usable episodes created today so far: {transcripts_today}")
 
-        if transcripts_today >= max_transcripts_per_day:
+        # At the limit, still run if an interrupted run left episodes to score
+        if transcripts_today >= max_transcripts_per_day and (
+            args.dry_run or not db.get_episodes_for_rescoring(statuses=['transcribed'], limit=1)
+        ):
             logger.warning(f"Daily episode limit ({max_transcripts_per_day}) already reached. Exiting.")
             return 0
 
@@ -380,14 +701,50 @@ def main():
 
         logger.info(f"Loaded {len(topics)} active topics for scoring")
 
+        # Log run start (only if not dry run)
+        if not args.dry_run:
+            db.log_pipeline_run(
+                run_id=run_id,
+                workflow_name='youtube_transcripts',
+                status='running',
+                started_at=started_at,
+                trigger='manual' if args.feed_id else 'cron'
+            )
+
         # Get score threshold from settings (content_filtering.score_threshold)
         score_threshold = db.get_setting('content_filtering', 'score_threshold', 0.6)
         logger.info(f"Using score threshold: {score_threshold}")
 
+        # Reuse scores for excerpts we've already paid to score
+        score_cache = None
+        if db.get_setting('ai_content_scoring', 'score_cache_enabled', True):
+            score_cache = ScoreCache(db_client=db)
+
+        # Skip LLM scoring for clearly off-topic videos (floor from scripts/calibrate_prefilter.py)
+        prefilter = None
+        if db.get_setting('ai_content_scoring', 'prefilter_enabled', False):
+            prefilter = RelevancePrefilter.from_settings(topics, db)
+            logger.info(f"Relevance prefilter enabled: floor={prefilter.floor}, model={prefilter.model}")
+
+        # Concurrent scoring: requests in flight and a client-side tokens/minute cap (0 = none)
+        scoring_concurrency = db.get_setting('ai_content_scoring', 'concurrency', 1)
+        tokens_per_minute = db.get_setting('ai_content_scoring', 'tokens_per_minute', 0)
+
+        # One excerpt builder for scoring and extraction, so each transcript is
+        # windowed and tokenized once
+        excerpt_builder = ExcerptBuilder.from_settings(
+            db, model=db.get_setting('ai_content_scoring', 'model', 'gpt-4o-mini')
+        )
+
         scorer = ContentScorer(
             topics=topics,
             score_threshold=score_threshold,
-            db_client=db  # Load model from web_settings
+            db_client=db,  # Load model from web_settings
+            score_cache=score_cache,
+            max_batch_size=db.get_setting('ai_content_scoring', 'batch_size', DEFAULT_MAX_BATCH_SIZE),
+            prefilter=prefilter,
+            token_budget=TokenBudget(tokens_per_minute) if tokens_per_minute else None,
+            excerpt_builder=excerpt_builder
         )
 
         # Initialize story arc extractor
@@ -399,12 +756,27 @@ def main():
 
         story_arc_extractor = StoryArcExtractor(
             db_client=db,
-            max_arcs_per_episode=max_arcs_per_episode
+            max_arcs_per_episode=max_arcs_per_episode,
+            excerpt_builder=excerpt_builder
         )
         logger.info(
             f"StoryArcExtractor initialized: max_arcs_per_episode={max_arcs_per_episode}"
         )
 
+        # Optionally score and extract story arcs in one call per episode
+        fused_analyzer = None
+        if topics_with_tracking and db.get_setting('topic_tracking', 'fused_extraction', False):
+            fused_analyzer = FusedEpisodeAnalyzer(
+                scorer=scorer,
+                extractor=story_arc_extractor,
+                tracking_topics=topics_with_tracking,
+                score_threshold=score_threshold
+            )
+            logger.info("Fused scoring + story arc extraction enabled")
+
+        # Fused calls in flight; above 1, episodes of one run don't see each other's arcs
+        fused_concurrency = db.get_setting('topic_tracking', 'fused_concurrency', 1)
+
         # Get YouTube feeds
         if args.feed_id:
             feeds = [f for f in db.get_youtube_feeds() if f['id'] == args.feed_id]
@@ -416,9 +788,31 @@ def main():
 
         logger.info(f"Found {len(feeds)} YouTube feeds to process")
 
+        def score_queue():
+            score_pending_episodes(
+                scoring_queue,
+                db=db,
+                scorer=scorer,
+                score_threshold=score_threshold,
+                story_arc_extractor=story_arc_extractor,
+                topics_with_tracking=topics_with_tracking,
+                logger=logger,
+                concurrency=scoring_concurrency,
+                fused_analyzer=fused_analyzer,
+                fused_concurrency=fused_concurrency
+            )
+            scoring_queue.clear()
+
         # Process each feed
         all_results = []
         total_usable_episodes = 0
+        scoring_queue = []
+
+        # Episodes stored but left unscored by an interrupted run go first
+        if not args.dry_run:
+            stranded_results = queue_stranded_episodes(db, scoring_queue, feed_id=args.feed_id, logger=logger)
+            if scoring_queue:
+                all_results.append(stranded_results)
 
         for i, feed in enumerate(feeds):
             # Check if we've hit the daily limit across all feeds
@@ -431,10 +825,7 @@ def main():
                 db=db,
                 fetcher=fetcher,
                 feed_processor=feed_processor,
-                scorer=scorer,
-                score_threshold=score_threshold,
-                story_arc_extractor=story_arc_extractor,
-                topics_with_tracking=topics_with_tracking,
+                scoring_queue=scoring_queue,
                 dry_run=args.dry_run,
                 logger=logger,
                 max_transcripts_remaining=transcripts_remaining - total_usable_episodes
@@ -444,6 +835,13 @@ def main():
             # Track total usable episodes (for daily limit)
             total_usable_episodes += results['usable_episodes']
 
+            # Score as soon as a batch is waiting rather than after the whole
+            # (slow, rate-limited) fetch phase
+            if len(scoring_queue) >= scorer.max_batch_size:
+                score_queue()
+
+        score_queue()
+
         # Summary
         logger.info("=" * 60)
         logger.info("PIPELINE COMPLETE - SUMMARY")
@@ -474,12 +872,95 @@ def main():
         logger.info(f"Episodes relevant: {total_relevant}")
         logger.info(f"Episodes not relevant: {total_not_relevant}")
         logger.info(f"Topics extracted: {total_topics}")
+        if score_cache:
+            cache_stats = score_cache.stats()
+            logger.info(
+                f"Score cache: {cache_stats['hits']}/{cache_stats['lookups']} hits "
+                f"({cache_stats['hit_rate']:.0%}), {cache_stats['tokens_saved']} tokens "
+                f"(~${cache_stats['cost_saved_usd']:.4f}) saved"
+            )
+        if prefilter:
+            prefilter_stats = prefilter.stats()
+            logger.info(
+                f"Relevance prefilter: {prefilter_stats['skipped']}/{prefilter_stats['checks']} skipped "
+                f"without LLM scoring, {prefilter_stats['errors']} errors, "
+                f"embeddings ~${prefilter_stats['embedding_cost_usd']:.4f}"
+            )
+        arc_context_stats = story_arc_extractor.arc_context.stats()
+        logger.info(
+            f"Arc context cache: {arc_context_stats['lookups']} lookups served from "
+            f"{arc_context_stats['loads']} loads, {arc_context_stats['writes']} writes applied"
+        )
+        resolution_stats = story_arc_extractor.arc_index.stats()
+        logger.info(
+            f"Arc name resolution: {resolution_stats['lookups']} lookups, "
+            f"{resolution_stats['slug']} exact, {resolution_stats['alias']} alias, "
+            f"{resolution_stats['key']} token key, {resolution_stats['fuzzy']} fuzzy, "
+            f"{resolution_stats['misses']} new"
+        )
+        if story_arc_extractor.arc_retriever:
+            retrieval_stats = story_arc_extractor.arc_retriever.stats()
+            logger.info(
+                f"Arc retrieval: {retrieval_stats['retrieved']}/{retrieval_stats['selections']} prompts ranked by "
+                f"similarity, {retrieval_stats['arcs_embedded']} arcs embedded, "
+                f"{retrieval_stats['fallbacks']} fallbacks to recency"
+            )
         logger.info(f"Errors: {total_errors}")
 
+        usage_ledger.flush()
+        usage_ledger.log_summary()
+        llm_usage = usage_ledger.summary(relevant_episodes=total_relevant)
+        logger.info(
+            f"LLM cost: ~${llm_usage['cost_usd']:.4f} over {llm_usage['calls']} calls"
+            + (f", ~${llm_usage['cost_per_relevant_episode_usd']:.4f} per relevant episode" if total_relevant else "")
+        )
+
+        if not args.dry_run:
+            finished_at = datetime.now(timezone.utc)
+            db.log_pipeline_run(
+                run_id=run_id,
+                workflow_name='youtube_transcripts',
+                status='completed',
+                conclusion='success' if total_errors == 0 else 'failure',
+                started_at=started_at,
+                finished_at=finished_at,
+                phase={
+                    'feeds_processed': len(feeds),
+                    'transcripts_downloaded': total_transcripts,
+                    'usable_episodes': total_usable,
+                    'episodes_scored': total_scored,
+                    'episodes_relevant': total_relevant,
+                    'episodes_not_relevant': total_not_relevant,
+                    'topics_extracted': total_topics,
+                    'errors': total_errors,
+                    'llm_usage': llm_usage,
+                    'duration_seconds': (finished_at - started_at).total_seconds()
+                },
+                notes=f"Scored {total_scored} episodes, {total_relevant} relevant"
+            )
+
         return 0 if total_errors == 0 else 1
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
+
+        # Log failure to database
+        if db and not args.dry_run:
+            try:
+                usage_ledger.flush()
+                db.log_pipeline_run(
+                    run_id=run_id,
+                    workflow_name='youtube_transcripts',
+                    status='completed',
+                    conclusion='failure',
+                    started_at=started_at,
+                    finished_at=datetime.now(timezone.utc),
+                    phase={'llm_usage': usage_ledger.summary()},
+                    notes=f"Error: {str(e)}"
+                )
+            except Exception:
+                pass  # Don't fail on logging errors
+
         return 1
 
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Story Arc Summary Update Script
+
+Regenerates story_arcs.summary for arcs with events newer than their last
+summary (see src/topic_tracking/arc_summarizer.py). Run after the transcript
+pipeline and before newsletter generation; arcs with nothing new are not
+sent to the model, so repeated runs are cheap.
+
+Usage:
+    python scripts/update_arc_summaries.py [--dry-run] [--digest-topic NAME] [--limit N] [--verbose]
+"""
+
+import argparse
+import logging
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.supabase_client import SupabaseClient
+from src.llm.usage import UsageLedger, set_usage_ledger
+from src.topic_tracking.arc_summarizer import ArcSummarizer
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    level = logging.DEBUG if verbose else logging.INFO
+
+    log_dir = project_root / 'logs'
+    log_dir.mkdir(exist_ok=True)
+
+    log_file = log_dir / f"arc_summary_update_{datetime.now().strftime('%Y%m%d')}.log"
+
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Story Arc Summary Update')
+    parser.add_argument('--dry-run', action='store_true', help='List stale arcs without summarizing')
+    parser.add_argument('--digest-topic', type=str, help='Process only specific digest topic')
+    parser.add_argument('--limit', type=int, help='Maximum arcs to summarize (most recently updated first)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+    logger.info("=" * 60)
+    logger.info("Story Arc Summary Update")
+    logger.info("=" * 60)
+
+    if args.dry_run:
+        logger.info("DRY RUN MODE - No changes will be made")
+
+    run_id = f"arc-summary-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    started_at = datetime.now(timezone.utc)
+    db = None
+
+    try:
+        db = SupabaseClient()
+
+        usage_ledger = UsageLedger(db_client=None if args.dry_run else db, run_id=run_id)
+        set_usage_ledger(usage_ledger)
+
+        if not args.dry_run:
+            db.log_pipeline_run(
+                run_id=run_id,
+                workflow_name='arc_summary_update',
+                status='running',
+                started_at=started_at,
+                trigger='manual' if args.digest_topic or args.limit else 'cron'
+            )
+
+        summarizer = ArcSummarizer(db_client=db)
+        logger.info(
+            f"Model {summarizer.model}, {summarizer.batch_size} arcs per request, "
+            f"{summarizer.concurrency} requests in flight"
+        )
+        stats = summarizer.run(digest_topic=args.digest_topic, limit=args.limit, dry_run=args.dry_run)
+
+        logger.info("=" * 60)
+        logger.info(f"Arcs needing a summary: {stats.arcs_pending}")
+        logger.info(f"Summaries updated: {stats.arcs_summarized}")
+        logger.info(f"Errors: {len(stats.errors)}")
+
+        usage_ledger.flush()
+        usage_ledger.log_summary()
+
+        if not args.dry_run:
+            finished_at = datetime.now(timezone.utc)
+            db.log_pipeline_run(
+                run_id=run_id,
+                workflow_name='arc_summary_update',
+                status='completed',
+                conclusion='success' if not stats.errors else 'failure',
+                started_at=started_at,
+                finished_at=finished_at,
+                phase={
+                    'arcs_pending': stats.arcs_pending,
+                    'arcs_summarized': stats.arcs_summarized,
+                    'batches': stats.batches,
+                    'errors': len(stats.errors),
+                    'llm_usage': usage_ledger.summary(),
+                    'duration_seconds': (finished_at - started_at).total_seconds()
+                },
+                notes=f"Updated {stats.arcs_summarized}/{stats.arcs_pending} story arc summaries"
+            )
+
+        return 0 if not stats.errors else 1
+
+    except Exception as e:
+        logger.error(f"Summary update failed: {e}", exc_info=True)
+
+        if db and not args.dry_run:
+            try:
+                db.log_pipeline_run(
+                    run_id=run_id,
+                    workflow_name='arc_summary_update',
+                    status='completed',
+                    conclusion='failure',
+                    started_at=started_at,
+                    finished_at=datetime.now(timezone.utc),
+                    notes=f"Error: {str(e)}"
+                )
+            except Exception:
+                pass  # Don't fail on logging errors
+
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
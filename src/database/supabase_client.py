@@ -9,7 +9,7 @@ import logging
 from datetime import datetime, timezone
 from typing import List, Dict, Optional, Any
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -252,6 +252,185 @@ class SupabaseClient:
                 ))
                 conn.commit()
 
+    def merge_episode_scores(self, scores_by_guid: Dict[str, Dict[str, float]]) -> int:
+        """
+        Merge topic scores into episodes' existing scores in one statement.
+
+        Keys in the new scores replace existing keys; other topics' scores
+        are kept. Status is left alone (see recompute_episode_relevance).
+
+        Args:
+            scores_by_guid: Episode GUID -> topic scores to merge
+
+        Returns:
+            Number of episodes updated
+        """
+        import json
+
+        if not scores_by_guid:
+            return 0
+
+        query = """
+            UPDATE episodes AS e
+            SET scores = COALESCE(e.scores::jsonb, '{}'::jsonb) || v.scores::jsonb,
+                scored_at = v.scored_at, updated_at = v.scored_at
+            FROM (VALUES %s) AS v(episode_guid, scores, scored_at)
+            WHERE e.episode_guid = v.episode_guid
+        """
+
+        now = datetime.now(timezone.utc)
+        values = [(guid, json.dumps(scores), now) for guid, scores in scores_by_guid.items()]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur, query, values,
+                    template="(%s, %s, %s::timestamptz)",
+                    page_size=len(values)
+                )
+                updated = cur.rowcount
+                conn.commit()
+                return updated
+
+    def recompute_episode_relevance(
+        self,
+        episode_guids: List[str],
+        topic_names: List[str],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Recompute scored/not_relevant status from stored scores in one statement.
+
+        An episode is relevant when any of `topic_names` has a stored score at
+        or above the threshold. Episodes in other statuses (pending, failed,
+        ...) are not touched.
+
+        Args:
+            episode_guids: Episodes to recompute
+            topic_names: Active topic names that count towards relevance
+            score_threshold: Minimum score for relevance
+
+        Returns:
+            List of dicts with episode_guid, old_status and new_status for
+            episodes whose status changed
+        """
+        if not episode_guids:
+            return []
+
+        query = """
+            WITH recomputed AS (
+                SELECT e.episode_guid, e.status AS old_status,
+                       CASE WHEN EXISTS (
+                           SELECT 1 FROM jsonb_each(COALESCE(e.scores::jsonb, '{}'::jsonb)) AS s
+                           WHERE s.key = ANY(%s)
+                             AND jsonb_typeof(s.value) = 'number'
+                             AND (s.value #>> '{}')::float >= %s
+                       ) THEN 'scored' ELSE 'not_relevant' END AS new_status
+                FROM episodes e
+                WHERE e.episode_guid = ANY(%s)
+                  AND e.status IN ('scored', 'not_relevant')
+            )
+            UPDATE episodes AS e
+            SET status = r.new_status, updated_at = %s
+            FROM recomputed r
+            WHERE e.episode_guid = r.episode_guid
+              AND r.new_status <> r.old_status
+            RETURNING e.episode_guid, r.old_status, r.new_status
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (
+                    list(topic_names),
+                    score_threshold,
+                    list(episode_guids),
+                    datetime.now(timezone.utc)
+                ))
+                changed = [dict(row) for row in cur.fetchall()]
+                conn.commit()
+                return changed
+
+    def update_episode_transcript(
+        self,
+        episode_guid: str,
+        transcript_content: str,
+        transcript_word_count: int
+    ) -> bool:
+        """
+        Replace an episode's transcript (e.g. after re-parsing cached subtitles).
+
+        Args:
+            episode_guid: Episode GUID
+            transcript_content: New transcript text
+            transcript_word_count: New word count
+
+        Returns:
+            True if an episode was updated
+        """
+        query = """
+            UPDATE episodes
+            SET transcript_content = %s, transcript_word_count = %s, updated_at = %s
+            WHERE episode_guid = %s
+        """
+
+        now = datetime.now(timezone.utc)
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (transcript_content, transcript_word_count, now, episode_guid))
+                updated = cur.rowcount > 0
+                conn.commit()
+                return updated
+
+    def get_episodes_for_rescoring(
+        self,
+        statuses: List[str] = None,
+        since_days: int = None,
+        episode_guids: List[str] = None,
+        limit: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get episodes with transcripts for (re)scoring, newest first.
+
+        Args:
+            statuses: Only episodes in these statuses (optional)
+            since_days: Only episodes published in the last N days (optional)
+            episode_guids: Only these episodes (optional)
+            limit: Maximum number of episodes (optional)
+
+        Returns:
+            List of episode dictionaries with id, episode_guid, feed_id, title,
+            published_date, status, scores and transcript_content
+        """
+        conditions = ["transcript_content IS NOT NULL", "transcript_content != ''"]
+        params = []
+
+        if statuses:
+            conditions.append("status = ANY(%s)")
+            params.append(list(statuses))
+        if since_days:
+            conditions.append("published_date >= NOW() - make_interval(days => %s)")
+            params.append(since_days)
+        if episode_guids:
+            conditions.append("episode_guid = ANY(%s)")
+            params.append(list(episode_guids))
+
+        query = f"""
+            SELECT id, episode_guid, feed_id, title, published_date, status,
+                   scores, transcript_content
+            FROM episodes
+            WHERE {' AND '.join(conditions)}
+            ORDER BY published_date DESC
+        """
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                return [dict(row) for row in cur.fetchall()]
+
     def update_episode_failed(
         self,
         episode_guid: str,
@@ -313,6 +492,193 @@ class SupabaseClient:
                 row = cur.fetchone()
                 return dict(row) if row else None
 
+    # ==================== Score Cache ====================
+
+    def get_cached_scores(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached topic scores and record the hit.
+
+        Args:
+            cache_key: Score cache key (see src.scoring.score_cache)
+
+        Returns:
+            Dictionary with scores, model, prompt_tokens, completion_tokens,
+            or None if not cached
+        """
+        query = """
+            UPDATE score_cache
+            SET hit_count = hit_count + 1, last_hit_at = %s
+            WHERE cache_key = %s
+            RETURNING scores, model, prompt_tokens, completion_tokens
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (datetime.now(timezone.utc), cache_key))
+                row = cur.fetchone()
+                conn.commit()
+                return dict(row) if row else None
+
+    def store_cached_scores(
+        self,
+        cache_key: str,
+        scores: Dict[str, float],
+        model: str,
+        prompt_version: str,
+        topic_fingerprint: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0
+    ) -> None:
+        """
+        Store topic scores in the score cache.
+
+        Args:
+            cache_key: Score cache key
+            scores: Dictionary of topic scores
+            model: Model that produced the scores
+            prompt_version: Scoring prompt version
+            topic_fingerprint: Fingerprint of the topic set
+            prompt_tokens: Input tokens the scoring request used
+            completion_tokens: Output tokens the scoring request used
+        """
+        import json
+
+        query = """
+            INSERT INTO score_cache (
+                cache_key, scores, model, prompt_version, topic_fingerprint,
+                prompt_tokens, completion_tokens, created_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                scores = EXCLUDED.scores,
+                prompt_tokens = EXCLUDED.prompt_tokens,
+                completion_tokens = EXCLUDED.completion_tokens
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (
+                    cache_key,
+                    json.dumps(scores),
+                    model,
+                    prompt_version,
+                    topic_fingerprint,
+                    prompt_tokens,
+                    completion_tokens,
+                    datetime.now(timezone.utc)
+                ))
+                conn.commit()
+
+    # ==================== Topic Score Fingerprints ====================
+
+    def get_topic_score_fingerprints(self) -> Dict[int, str]:
+        """
+        Get the topic hash stored episode scores were produced with, per topic.
+
+        Returns:
+            Dictionary of topic_id -> topic hash
+        """
+        query = "SELECT topic_id, topic_hash FROM topic_score_fingerprints"
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query)
+                return {row[0]: row[1] for row in cur.fetchall()}
+
+    def store_topic_score_fingerprints(
+        self,
+        topic_hashes: List[tuple],
+        model: str = None,
+        prompt_version: str = None
+    ) -> None:
+        """
+        Record the topic hashes episodes have now been scored with.
+
+        Args:
+            topic_hashes: List of (topic_id, topic_name, topic_hash)
+            model: Scoring model used
+            prompt_version: Scoring prompt version used
+        """
+        if not topic_hashes:
+            return
+
+        query = """
+            INSERT INTO topic_score_fingerprints (
+                topic_id, topic_name, topic_hash, model, prompt_version, scored_at
+            ) VALUES %s
+            ON CONFLICT (topic_id) DO UPDATE SET
+                topic_name = EXCLUDED.topic_name,
+                topic_hash = EXCLUDED.topic_hash,
+                model = EXCLUDED.model,
+                prompt_version = EXCLUDED.prompt_version,
+                scored_at = EXCLUDED.scored_at
+        """
+
+        now = datetime.now(timezone.utc)
+        values = [(topic_id, name, topic_hash, model, prompt_version, now) for topic_id, name, topic_hash in topic_hashes]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, values)
+                conn.commit()
+
+    # ==================== LLM Usage Ledger ====================
+
+    def insert_llm_usage(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Insert LLM usage records in one statement.
+
+        Args:
+            records: Dicts with run_id, stage, operation, model, episode_guid,
+                     prompt_version, prompt_tokens, completion_tokens, cached_tokens,
+                     latency_ms, retries, cost_usd, success, error and created_at
+        """
+        if not records:
+            return
+
+        columns = (
+            'run_id', 'stage', 'operation', 'model', 'episode_guid', 'prompt_version', 'prompt_tokens',
+            'completion_tokens', 'cached_tokens', 'latency_ms', 'retries', 'cost_usd',
+            'success', 'error', 'created_at'
+        )
+        query = f"INSERT INTO llm_usage ({', '.join(columns)}) VALUES %s"
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, [tuple(r.get(c) for c in columns) for r in records])
+                conn.commit()
+
+    def get_llm_cache_usage(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Prompt-cache effectiveness of recent chat calls, per stage, model and prompt version.
+
+        Args:
+            days: Only calls made in the last N days
+
+        Returns:
+            List of dicts with stage, model, prompt_version, calls, prompt_tokens,
+            cached_tokens, cached_calls (calls with any cached tokens) and cost_usd,
+            most prompt tokens first
+        """
+        query = """
+            SELECT stage, model, prompt_version,
+                   COUNT(*) AS calls,
+                   COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+                   COALESCE(SUM(cached_tokens), 0) AS cached_tokens,
+                   COUNT(*) FILTER (WHERE cached_tokens > 0) AS cached_calls,
+                   COALESCE(SUM(cost_usd), 0) AS cost_usd
+            FROM llm_usage
+            WHERE operation = 'chat'
+              AND success
+              AND created_at >= NOW() - make_interval(days => %s)
+            GROUP BY stage, model, prompt_version
+            ORDER BY SUM(prompt_tokens) DESC
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (days,))
+                return [dict(row) for row in cur.fetchall()]
+
     # ==================== Pipeline Run Logging ====================
 
     def log_pipeline_run(
@@ -460,7 +826,8 @@ class SupabaseClient:
 
         query = """
             SELECT sa.id, sa.arc_name, sa.arc_slug, sa.functional_category,
-                   sa.digest_topic, sa.summary, sa.started_at, sa.last_updated_at,
+                   sa.digest_topic, sa.summary, sa.summary_updated_at,
+                   sa.started_at, sa.last_updated_at,
                    sa.event_count, sa.source_count, sa.included_in_digest_id,
                    sa.included_at, sa.created_at, sa.updated_at
             FROM story_arcs sa
@@ -713,6 +1080,359 @@ class SupabaseClient:
             initial_event=initial_event
         )
 
+    def has_story_arc_events(self, episode_guid: str, digest_topic: str) -> bool:
+        """
+        Check whether story arcs were already extracted from an episode for a topic.
+
+        Args:
+            episode_guid: Episode GUID
+            digest_topic: Parent topic
+
+        Returns:
+            True if any story arc event under digest_topic cites the episode
+        """
+        query = """
+            SELECT 1
+            FROM story_arc_events e
+            JOIN story_arcs a ON a.id = e.story_arc_id
+            WHERE e.source_episode_guid = %s AND a.digest_topic = %s
+            LIMIT 1
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (episode_guid, digest_topic))
+                return cur.fetchone() is not None
+
+    def clear_story_arc_events_for_episodes(
+        self,
+        digest_topic: str,
+        episode_guids: List[str]
+    ) -> Dict[str, int]:
+        """
+        Delete the story arc events extracted from episodes, so they can be re-extracted.
+
+        Arcs left without events are deleted. The remaining arcs touched get their
+        counts and last_updated_at recomputed, and their summaries marked stale.
+
+        Args:
+            digest_topic: Parent topic
+            episode_guids: GUIDs of the source episodes
+
+        Returns:
+            Dict with events_deleted and arcs_deleted
+        """
+        if not episode_guids:
+            return {'events_deleted': 0, 'arcs_deleted': 0}
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM story_arc_events e
+                    USING story_arcs a
+                    WHERE a.id = e.story_arc_id
+                      AND a.digest_topic = %s
+                      AND e.source_episode_guid = ANY(%s)
+                    RETURNING e.story_arc_id
+                """, (digest_topic, list(episode_guids)))
+                arc_ids = sorted({row[0] for row in cur.fetchall()})
+                events_deleted = cur.rowcount
+
+                cur.execute("""
+                    DELETE FROM story_arcs a
+                    WHERE a.id = ANY(%s)
+                      AND NOT EXISTS (SELECT 1 FROM story_arc_events e WHERE e.story_arc_id = a.id)
+                """, (arc_ids,))
+                arcs_deleted = cur.rowcount
+
+                cur.execute("""
+                    UPDATE story_arcs a
+                    SET event_count = s.event_count,
+                        source_count = s.source_count,
+                        last_updated_at = s.last_event_date,
+                        summary_updated_at = NULL,
+                        updated_at = NOW()
+                    FROM (
+                        SELECT story_arc_id,
+                               COUNT(*) AS event_count,
+                               COUNT(DISTINCT source_feed_id) AS source_count,
+                               MAX(event_date) AS last_event_date
+                        FROM story_arc_events
+                        WHERE story_arc_id = ANY(%s)
+                        GROUP BY story_arc_id
+                    ) s
+                    WHERE a.id = s.story_arc_id
+                """, (arc_ids,))
+
+                conn.commit()
+                return {'events_deleted': events_deleted, 'arcs_deleted': arcs_deleted}
+
+    def get_story_arc(self, story_arc_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a story arc by ID.
+
+        Args:
+            story_arc_id: Story arc ID
+
+        Returns:
+            Story arc dictionary (without events) or None
+        """
+        query = """
+            SELECT id, arc_name, arc_slug, functional_category,
+                   digest_topic, summary, started_at, last_updated_at,
+                   event_count, source_count
+            FROM story_arcs
+            WHERE id = %s
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (story_arc_id,))
+                row = cur.fetchone()
+                return dict(row) if row else None
+
+    def get_story_arc_aliases(self, digest_topic: str) -> Dict[str, int]:
+        """
+        Get learned arc name aliases for a digest topic.
+
+        Args:
+            digest_topic: Parent topic name
+
+        Returns:
+            Dict mapping alias slug to story_arc_id
+        """
+        query = """
+            SELECT alias_slug, story_arc_id
+            FROM story_arc_aliases
+            WHERE digest_topic = %s
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (digest_topic,))
+                return {row['alias_slug']: row['story_arc_id'] for row in cur.fetchall()}
+
+    def add_story_arc_aliases(
+        self,
+        digest_topic: str,
+        aliases: Dict[str, int],
+        source: str
+    ) -> None:
+        """
+        Insert or repoint arc name aliases.
+
+        Args:
+            digest_topic: Parent topic name
+            aliases: Dict mapping alias slug to story_arc_id
+            source: How the aliases were learned ('merge' or 'fuzzy')
+        """
+        if not aliases:
+            return
+
+        query = """
+            INSERT INTO story_arc_aliases (digest_topic, alias_slug, story_arc_id, source, created_at)
+            VALUES %s
+            ON CONFLICT (alias_slug, digest_topic) DO UPDATE SET
+                story_arc_id = EXCLUDED.story_arc_id,
+                source = EXCLUDED.source
+        """
+
+        now = datetime.now(timezone.utc)
+        values = [(digest_topic, slug, arc_id, source, now) for slug, arc_id in aliases.items()]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, values)
+                conn.commit()
+
+    def get_story_arc_embeddings(
+        self,
+        story_arc_ids: List[int],
+        model: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get stored story arc embeddings.
+
+        Args:
+            story_arc_ids: Story arc IDs
+            model: Embedding model the vectors were made with
+
+        Returns:
+            Dict mapping story_arc_id to {'text_hash', 'embedding'} (list of floats)
+        """
+        if not story_arc_ids:
+            return {}
+
+        query = """
+            SELECT story_arc_id, text_hash, embedding
+            FROM story_arc_embeddings
+            WHERE story_arc_id = ANY(%s) AND model = %s
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, (list(story_arc_ids), model))
+                return {
+                    row['story_arc_id']: {'text_hash': row['text_hash'], 'embedding': row['embedding']}
+                    for row in cur.fetchall()
+                }
+
+    def store_story_arc_embeddings(
+        self,
+        embeddings: List[tuple],
+        model: str
+    ) -> None:
+        """
+        Insert or replace story arc embeddings.
+
+        Args:
+            embeddings: List of (story_arc_id, text_hash, embedding as list of floats)
+            model: Embedding model the vectors were made with
+        """
+        if not embeddings:
+            return
+
+        query = """
+            INSERT INTO story_arc_embeddings (story_arc_id, model, text_hash, embedding, updated_at)
+            VALUES %s
+            ON CONFLICT (story_arc_id, model) DO UPDATE SET
+                text_hash = EXCLUDED.text_hash,
+                embedding = EXCLUDED.embedding,
+                updated_at = EXCLUDED.updated_at
+        """
+
+        now = datetime.now(timezone.utc)
+        values = [(arc_id, model, text_hash, embedding, now) for arc_id, text_hash, embedding in embeddings]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, values, template="(%s, %s, %s, %s::real[], %s)")
+                conn.commit()
+
+    def get_story_arcs_needing_summary(
+        self,
+        digest_topic: str = None,
+        days: int = None,
+        limit: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get active story arcs whose summary is missing or older than their events.
+
+        An arc needs a summary when it has events extracted after its
+        summary_updated_at watermark (or has no summary yet).
+
+        Args:
+            digest_topic: Only arcs of this digest topic (optional)
+            days: Only arcs updated in the last N days (defaults to retention setting)
+            limit: Maximum number of arcs, most recently updated first (optional)
+
+        Returns:
+            List of story arc dictionaries with their events (oldest first)
+        """
+        if days is None:
+            days = self.get_setting('story_arcs', 'retention_days', 14)
+
+        conditions = ["sa.last_updated_at >= NOW() - make_interval(days => %s)"]
+        params = [days]
+        if digest_topic:
+            conditions.append("sa.digest_topic = %s")
+            params.append(digest_topic)
+
+        query = f"""
+            SELECT sa.id, sa.arc_name, sa.arc_slug, sa.functional_category,
+                   sa.digest_topic, sa.summary, sa.summary_updated_at,
+                   sa.started_at, sa.last_updated_at, sa.event_count, sa.source_count
+            FROM story_arcs sa
+            WHERE {" AND ".join(conditions)}
+              AND EXISTS (
+                  SELECT 1 FROM story_arc_events e
+                  WHERE e.story_arc_id = sa.id
+                    AND (sa.summary_updated_at IS NULL OR e.extracted_at > sa.summary_updated_at)
+              )
+            ORDER BY sa.last_updated_at DESC
+        """
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        events_query = """
+            SELECT id, story_arc_id, event_date, event_summary, key_points,
+                   source_feed_id, source_name, perspective, extracted_at
+            FROM story_arc_events
+            WHERE story_arc_id = ANY(%s)
+            ORDER BY story_arc_id, event_date ASC
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                arcs = [dict(a) for a in cur.fetchall()]
+                if not arcs:
+                    return []
+
+                events_by_arc = {arc['id']: [] for arc in arcs}
+                cur.execute(events_query, (list(events_by_arc.keys()),))
+                for event in cur.fetchall():
+                    events_by_arc[event['story_arc_id']].append(dict(event))
+
+                for arc in arcs:
+                    arc['events'] = events_by_arc[arc['id']]
+                return arcs
+
+    def update_story_arc_summaries(self, summaries: List[tuple]) -> int:
+        """
+        Store regenerated story arc summaries and advance their watermarks.
+
+        A watermark never moves backwards, so a slower job finishing after a
+        newer one cannot overwrite the newer summary.
+
+        Args:
+            summaries: List of (story_arc_id, summary, watermark), where watermark
+                       is the extracted_at of the newest event the summary covers
+
+        Returns:
+            Number of arcs updated
+        """
+        if not summaries:
+            return 0
+
+        query = """
+            UPDATE story_arcs sa
+            SET summary = v.summary,
+                summary_updated_at = v.watermark
+            FROM (VALUES %s) AS v(id, summary, watermark)
+            WHERE sa.id = v.id
+              AND (sa.summary_updated_at IS NULL OR sa.summary_updated_at < v.watermark)
+        """
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, summaries, template="(%s, %s, %s::timestamptz)")
+                updated = cur.rowcount
+                conn.commit()
+                return updated
+
+    @staticmethod
+    def story_arc_recent_events(arc: Dict[str, Any], max_events: int) -> List[Dict[str, Any]]:
+        """
+        Events of an arc to show next to its summary: those extracted after
+        the summary watermark (at least the latest), oldest first.
+
+        Args:
+            arc: Story arc with summary_updated_at and events (oldest first)
+            max_events: Maximum events to return
+
+        Returns:
+            List of event dictionaries
+        """
+        events = arc.get('events') or []
+        watermark = arc.get('summary_updated_at')
+        if watermark is not None:
+            newer = [e for e in events if e.get('extracted_at') is None or e['extracted_at'] > watermark]
+        else:
+            newer = events
+        return (newer or events[-1:])[-max_events:]
+
     def get_story_arcs_for_prompt(
         self,
         digest_topic: str,
@@ -730,8 +1450,27 @@ class SupabaseClient:
         Returns:
             Formatted string describing active story arcs
         """
-        arcs = self.get_active_story_arcs(digest_topic)
+        return self.format_story_arcs_for_prompt(
+            self.get_active_story_arcs(digest_topic), max_arcs, max_events_per_arc
+        )
 
+    @staticmethod
+    def format_story_arcs_for_prompt(
+        arcs: List[Dict[str, Any]],
+        max_arcs: int = 15,
+        max_events_per_arc: int = 5
+    ) -> str:
+        """
+        Format story arcs (as returned by get_active_story_arcs) for an extraction prompt.
+
+        Args:
+            arcs: Story arcs with their events, most recently updated first
+            max_arcs: Maximum arcs to include
+            max_events_per_arc: Maximum events per arc to show
+
+        Returns:
+            Formatted string describing the story arcs ('' if there are none)
+        """
         if not arcs:
             return ""
 
@@ -742,10 +1481,17 @@ class SupabaseClient:
             lines.append(f"Started: {arc['started_at'].strftime('%Y-%m-%d') if arc['started_at'] else 'Unknown'}")
             lines.append(f"Last update: {arc['last_updated_at'].strftime('%Y-%m-%d') if arc['last_updated_at'] else 'Unknown'}")
             lines.append(f"Sources: {arc['source_count']} feeds")
-            lines.append("Timeline:")
 
-            events = arc.get('events', [])
-            for event in events[-max_events_per_arc:]:  # Most recent events
+            # Summarized arcs: the summary plus events since it; others: the timeline
+            if arc.get('summary'):
+                lines.append(f"Summary: {arc['summary']}")
+                lines.append("Latest:")
+                events = SupabaseClient.story_arc_recent_events(arc, max_events_per_arc)
+            else:
+                lines.append("Timeline:")
+                events = arc.get('events', [])[-max_events_per_arc:]  # Most recent events
+
+            for event in events:
                 event_date = event['event_date']
                 date_str = event_date.strftime('%b %d') if event_date else '???'
                 lines.append(f"  - [{date_str}] {event['event_summary']}")
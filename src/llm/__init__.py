@@ -0,0 +1,4 @@
+# Shared OpenAI helpers (pricing, usage accounting)
+from .pricing import estimate_cost
+
+__all__ = ['estimate_cost']
@@ -0,0 +1,421 @@
+"""
+Batch Jobs
+
+Offline bulk requests through the OpenAI Batch API: chat completion requests
+are written to a JSONL file, submitted as one job and answered within the
+completion window, at half the synchronous price and outside the per-minute
+rate limits. Suited to backfills and rescoring, not the daily pipeline.
+
+LocalBatchBackend implements the same submit/retrieve/download cycle on the
+filesystem and answers each request with a schema-conforming placeholder (or
+a caller-supplied responder), so the bulk flow can run with no network.
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .models import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = '/v1/chat/completions'
+COMPLETION_WINDOW = '24h'
+
+# Batch statuses after which a job will not change again
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+DEFAULT_LOCAL_DIR = 'batch_jobs/local_backend'
+
+
+@dataclass
+class BatchJob:
+    """Snapshot of a submitted batch job."""
+    id: str
+    status: str
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    request_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+@dataclass
+class BatchResult:
+    """One answered request from a batch output (or error) file."""
+    custom_id: str
+    content: Optional[str]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.content is not None
+
+
+def write_batch_requests(path: Path, requests: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+    """
+    Write chat completion requests as a batch input file.
+
+    Args:
+        path: Destination JSONL file
+        requests: (custom_id, request body) pairs; custom_ids must be unique
+
+    Returns:
+        Number of requests written
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for custom_id, body in requests:
+            line = {
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': CHAT_COMPLETIONS_ENDPOINT,
+                'body': body,
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def read_batch_results(path: Path) -> Iterator[BatchResult]:
+    """
+    Read a batch output or error file.
+
+    Args:
+        path: JSONL file downloaded from a completed job
+
+    Yields:
+        BatchResult per line; failed requests carry an error message
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            custom_id = record.get('custom_id', '')
+
+            if record.get('error'):
+                error = record['error']
+                message = error.get('message') if isinstance(error, dict) else str(error)
+                yield BatchResult(custom_id=custom_id, content=None, error=message)
+                continue
+
+            response = record.get('response') or {}
+            body = response.get('body') or {}
+            if response.get('status_code') != 200:
+                message = (body.get('error') or {}).get('message') or f"HTTP {response.get('status_code')}"
+                yield BatchResult(custom_id=custom_id, content=None, error=message)
+                continue
+
+            usage = body.get('usage') or {}
+            choices = body.get('choices') or []
+            content = choices[0].get('message', {}).get('content') if choices else None
+            error = None
+            if content is None:
+                error = 'Response has no message content'
+            elif choices[0].get('finish_reason') == 'length':
+                error = 'Response truncated (finish_reason=length)'
+
+            yield BatchResult(
+                custom_id=custom_id,
+                content=content,
+                prompt_tokens=usage.get('prompt_tokens') or 0,
+                completion_tokens=usage.get('completion_tokens') or 0,
+                error=error
+            )
+
+
+class OpenAIBatchBackend:
+    """Batch jobs on the OpenAI Batch API."""
+
+    name = 'openai'
+
+    def __init__(self, client=None):
+        """
+        Initialize the backend.
+
+        Args:
+            client: OpenAI client (default: create_openai_client())
+        """
+        if client is None:
+            from .client import create_openai_client
+
+            client = create_openai_client(timeout=120.0)
+        self.client = client
+
+    @staticmethod
+    def _to_job(batch) -> BatchJob:
+        counts = getattr(batch, 'request_counts', None)
+        return BatchJob(
+            id=batch.id,
+            status=batch.status,
+            output_file_id=getattr(batch, 'output_file_id', None),
+            error_file_id=getattr(batch, 'error_file_id', None),
+            request_counts={
+                'total': getattr(counts, 'total', 0) or 0,
+                'completed': getattr(counts, 'completed', 0) or 0,
+                'failed': getattr(counts, 'failed', 0) or 0,
+            }
+        )
+
+    def submit(self, input_path: Path, metadata: Dict[str, str] = None) -> BatchJob:
+        """
+        Upload an input file and create a batch job for it.
+
+        Args:
+            input_path: File written by write_batch_requests()
+            metadata: Short string labels stored with the job
+
+        Returns:
+            BatchJob for the new job
+        """
+        with open(input_path, 'rb') as f:
+            uploaded = self.client.files.create(file=f, purpose='batch')
+
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata=metadata or None
+        )
+        logger.info(f"Submitted batch {batch.id} (input file {uploaded.id})")
+        return self._to_job(batch)
+
+    def retrieve(self, batch_id: str) -> BatchJob:
+        """Get the current state of a batch job."""
+        return self._to_job(self.client.batches.retrieve(batch_id))
+
+    def download(self, file_id: str, dest_path: Path) -> Path:
+        """Download an output or error file to dest_path."""
+        content = self.client.files.content(file_id)
+        Path(dest_path).write_bytes(content.read())
+        return Path(dest_path)
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for the Batch API.
+
+    Each job is a directory under root_dir holding the input file and a
+    job.json state file. A job reports in_progress for the first
+    `polls_until_complete - 1` retrievals and is then answered in full.
+    """
+
+    name = 'local'
+
+    def __init__(
+        self,
+        root_dir: Path = DEFAULT_LOCAL_DIR,
+        responder: Callable[[str, Dict[str, Any]], str] = None,
+        polls_until_complete: int = 1
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            root_dir: Directory holding job directories
+            responder: Called with (custom_id, request body); returns the
+                       message content, or raises to fail that request
+                       (default: a placeholder matching the response schema)
+            polls_until_complete: Retrievals before a job completes
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.responder = responder or placeholder_response
+        self.polls_until_complete = max(1, polls_until_complete)
+
+    def _job_dir(self, batch_id: str) -> Path:
+        return self.root_dir / batch_id
+
+    def _load_state(self, batch_id: str) -> Dict[str, Any]:
+        state_path = self._job_dir(batch_id) / 'job.json'
+        if not state_path.exists():
+            raise ValueError(f"Unknown local batch: {batch_id}")
+        return json.loads(state_path.read_text(encoding='utf-8'))
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        state_path = self._job_dir(state['id']) / 'job.json'
+        state_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+
+    @staticmethod
+    def _to_job(state: Dict[str, Any]) -> BatchJob:
+        return BatchJob(
+            id=state['id'],
+            status=state['status'],
+            output_file_id=state.get('output_file_id'),
+            error_file_id=state.get('error_file_id'),
+            request_counts=dict(state.get('request_counts', {}))
+        )
+
+    def submit(self, input_path: Path, metadata: Dict[str, str] = None) -> BatchJob:
+        """Copy the input file into a new job directory."""
+        batch_id = f"batch_local_{uuid.uuid4().hex[:16]}"
+        job_dir = self._job_dir(batch_id)
+        job_dir.mkdir(parents=True)
+        shutil.copyfile(input_path, job_dir / 'input.jsonl')
+
+        with open(job_dir / 'input.jsonl', 'r', encoding='utf-8') as f:
+            total = sum(1 for line in f if line.strip())
+
+        state = {
+            'id': batch_id,
+            'status': 'in_progress',
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'metadata': metadata or {},
+            'polls': 0,
+            'request_counts': {'total': total, 'completed': 0, 'failed': 0},
+        }
+        self._save_state(state)
+        logger.info(f"Submitted local batch {batch_id} ({total} requests)")
+        return self._to_job(state)
+
+    def retrieve(self, batch_id: str) -> BatchJob:
+        """Get the job state, answering all requests once it is due."""
+        state = self._load_state(batch_id)
+        if state['status'] in TERMINAL_STATUSES:
+            return self._to_job(state)
+
+        state['polls'] += 1
+        if state['polls'] >= self.polls_until_complete:
+            self._run(state)
+        self._save_state(state)
+        return self._to_job(state)
+
+    def _run(self, state: Dict[str, Any]) -> None:
+        job_dir = self._job_dir(state['id'])
+        output_path = job_dir / 'output.jsonl'
+        error_path = job_dir / 'errors.jsonl'
+        completed = 0
+        failed = 0
+
+        with open(job_dir / 'input.jsonl', 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8') as out, \
+                open(error_path, 'w', encoding='utf-8') as err:
+            for line in src:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                custom_id = request['custom_id']
+                body = request['body']
+                try:
+                    content = self.responder(custom_id, body)
+                except Exception as e:
+                    err.write(json.dumps({
+                        'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                        'custom_id': custom_id,
+                        'response': None,
+                        'error': {'code': 'local_responder_error', 'message': str(e)},
+                    }) + '\n')
+                    failed += 1
+                    continue
+
+                prompt_tokens = sum(estimate_tokens(m.get('content') or '') for m in body.get('messages', []))
+                completion_tokens = estimate_tokens(content)
+                out.write(json.dumps({
+                    'id': f"batch_req_{uuid.uuid4().hex[:16]}",
+                    'custom_id': custom_id,
+                    'response': {
+                        'status_code': 200,
+                        'request_id': uuid.uuid4().hex,
+                        'body': {
+                            'object': 'chat.completion',
+                            'model': body.get('model'),
+                            'choices': [{
+                                'index': 0,
+                                'message': {'role': 'assistant', 'content': content},
+                                'finish_reason': 'stop',
+                            }],
+                            'usage': {
+                                'prompt_tokens': prompt_tokens,
+                                'completion_tokens': completion_tokens,
+                                'total_tokens': prompt_tokens + completion_tokens,
+                            },
+                        },
+                    },
+                    'error': None,
+                }, ensure_ascii=False) + '\n')
+                completed += 1
+
+        state['status'] = 'completed'
+        state['completed_at'] = datetime.now(timezone.utc).isoformat()
+        state['output_file_id'] = str(output_path)
+        state['error_file_id'] = str(error_path) if failed else None
+        state['request_counts'].update({'completed': completed, 'failed': failed})
+
+    def download(self, file_id: str, dest_path: Path) -> Path:
+        """Copy an output or error file to dest_path."""
+        shutil.copyfile(file_id, dest_path)
+        return Path(dest_path)
+
+
+def placeholder_from_schema(schema: Dict[str, Any]) -> Any:
+    """
+    Build the smallest value that satisfies a strict JSON schema.
+
+    Args:
+        schema: JSON schema (object/array/string/number/integer/boolean, enum)
+
+    Returns:
+        Placeholder value
+    """
+    if 'enum' in schema:
+        return schema['enum'][0]
+
+    schema_type = schema.get('type')
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != 'null'), 'null')
+
+    if schema_type == 'object':
+        properties = schema.get('properties', {})
+        return {name: placeholder_from_schema(properties[name]) for name in schema.get('required', properties)}
+    if schema_type == 'array':
+        return [placeholder_from_schema(schema.get('items', {})) for _ in range(schema.get('minItems', 0))]
+    if schema_type == 'string':
+        return ''
+    if schema_type == 'number':
+        return 0.0
+    if schema_type == 'integer':
+        return 0
+    if schema_type == 'boolean':
+        return False
+    return None
+
+
+def placeholder_response(custom_id: str, body: Dict[str, Any]) -> str:
+    """Default LocalBatchBackend responder: a placeholder for the request's JSON schema."""
+    response_format = body.get('response_format') or {}
+    schema = (response_format.get('json_schema') or {}).get('schema')
+    if schema is None:
+        return ''
+    return json.dumps(placeholder_from_schema(schema))
+
+
+def get_batch_backend(name: str = None, **kwargs):
+    """
+    Create a batch backend.
+
+    Args:
+        name: 'openai' or 'local' (default: LLM_BATCH_BACKEND, else 'openai')
+        **kwargs: Backend constructor arguments; the local backend's root_dir
+                  defaults to LLM_BATCH_LOCAL_DIR
+
+    Returns:
+        OpenAIBatchBackend or LocalBatchBackend
+    """
+    name = name or os.getenv('LLM_BATCH_BACKEND', 'openai')
+    if name == 'openai':
+        return OpenAIBatchBackend(**kwargs)
+    if name == 'local':
+        kwargs.setdefault('root_dir', os.getenv('LLM_BATCH_LOCAL_DIR', DEFAULT_LOCAL_DIR))
+        return LocalBatchBackend(**kwargs)
+    raise ValueError(f"Unknown batch backend: {name}")
@@ -0,0 +1,68 @@
+"""
+OpenAI Client Factory
+
+Every OpenAI client in the project is built here, so all of them honour the
+same settings:
+
+- OPENAI_API_KEY: API key (required unless OPENAI_BASE_URL is set)
+- OPENAI_BASE_URL: alternative API endpoint, e.g. the local fake server
+  (python -m src.llm.fake_server) for offline load and latency testing
+"""
+
+import os
+from typing import Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+# API key sent to a custom endpoint when OPENAI_API_KEY is not set
+LOCAL_API_KEY = 'local'
+
+
+def get_base_url() -> Optional[str]:
+    """Custom API endpoint from OPENAI_BASE_URL, or None for api.openai.com."""
+    return os.getenv('OPENAI_BASE_URL') or None
+
+
+def get_api_key() -> str:
+    """
+    API key from OPENAI_API_KEY.
+
+    Raises:
+        ValueError: If no key is set and no custom endpoint is configured
+    """
+    api_key = os.getenv('OPENAI_API_KEY')
+    if api_key:
+        return api_key
+    if get_base_url():
+        return LOCAL_API_KEY
+    raise ValueError("OPENAI_API_KEY environment variable not set")
+
+
+def create_openai_client(timeout: float = 60.0, max_retries: int = None) -> OpenAI:
+    """
+    Create a synchronous OpenAI client.
+
+    Args:
+        timeout: Request timeout in seconds
+        max_retries: SDK-level retries (default: the SDK's own default)
+
+    Returns:
+        OpenAI client
+    """
+    kwargs = {'max_retries': max_retries} if max_retries is not None else {}
+    return OpenAI(api_key=get_api_key(), base_url=get_base_url(), timeout=timeout, **kwargs)
+
+
+def create_async_openai_client(timeout: float = 60.0, max_retries: int = None) -> AsyncOpenAI:
+    """
+    Create an asynchronous OpenAI client.
+
+    Args:
+        timeout: Request timeout in seconds
+        max_retries: SDK-level retries (default: the SDK's own default)
+
+    Returns:
+        AsyncOpenAI client
+    """
+    kwargs = {'max_retries': max_retries} if max_retries is not None else {}
+    return AsyncOpenAI(api_key=get_api_key(), base_url=get_base_url(), timeout=timeout, **kwargs)
@@ -0,0 +1,146 @@
+"""
+Batched Embeddings
+
+One helper for every embedding caller (relevance prefilter, arc retrieval,
+semantic topic matching): texts are packed into requests within the
+endpoint's input and token limits, sent with optional concurrency, and
+returned as one L2-normalized float32 matrix.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from src.llm.models import count_tokens, truncate_to_tokens
+from src.llm.usage import create_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Inputs per embeddings request (the endpoint's limit)
+EMBEDDING_MAX_INPUTS = 2048
+# Tokens per embeddings request: below the endpoint's 300k, since counts may be estimates
+EMBEDDING_CHUNK_TOKENS = 250_000
+# Tokens per input: below the endpoint's 8191, for the same reason
+EMBEDDING_INPUT_TOKENS = 8000
+
+
+@dataclass
+class EmbeddingResult:
+    """Embeddings for a list of texts."""
+    vectors: np.ndarray       # float32, one L2-normalized row per text
+    prompt_tokens: int = 0
+    failed: int = 0           # Texts whose request failed (NaN rows), with skip_failed
+
+
+def chunk_texts(
+    texts: List[str],
+    model: str = None,
+    max_inputs: int = EMBEDDING_MAX_INPUTS,
+    max_tokens: int = EMBEDDING_CHUNK_TOKENS,
+    max_input_tokens: int = EMBEDDING_INPUT_TOKENS
+) -> List[List[str]]:
+    """
+    Split texts into consecutive requests within the input and token limits.
+
+    Texts over max_input_tokens are cut to it, so one long text can't fail
+    the request it shares with others.
+
+    Args:
+        texts: Texts to embed
+        model: Embedding model (for token counts)
+        max_inputs: Inputs per request
+        max_tokens: Tokens per request
+        max_input_tokens: Tokens per text
+
+    Returns:
+        Chunks of texts, in order
+    """
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    chunk_tokens = 0
+    for text in texts:
+        tokens = count_tokens(text, model)
+        if tokens > max_input_tokens:
+            logger.debug(f"Truncating embedding input from {tokens} to {max_input_tokens} tokens")
+            text = truncate_to_tokens(text, max_input_tokens, model)
+            tokens = max_input_tokens
+        if chunk and (len(chunk) >= max_inputs or chunk_tokens + tokens > max_tokens):
+            chunks.append(chunk)
+            chunk, chunk_tokens = [], 0
+        chunk.append(text)
+        chunk_tokens += tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def embed_texts(
+    client,
+    stage: str,
+    model: str,
+    texts: List[str],
+    max_inputs: int = EMBEDDING_MAX_INPUTS,
+    concurrency: int = 1,
+    skip_failed: bool = False
+) -> EmbeddingResult:
+    """
+    Embed texts with as few requests as the endpoint limits allow.
+
+    Blank texts are sent as a single space (the endpoint rejects empty input)
+    and texts over EMBEDDING_INPUT_TOKENS are truncated (see chunk_texts).
+
+    Args:
+        client: OpenAI client
+        stage: Usage stage to record the requests under
+        model: Embedding model
+        texts: Texts to embed
+        max_inputs: Inputs per request
+        concurrency: Requests in flight
+        skip_failed: Log failed requests and return NaN rows for their texts
+                     instead of raising
+
+    Returns:
+        EmbeddingResult with one row per text
+    """
+    inputs = [t if t.strip() else ' ' for t in texts]
+    chunks = chunk_texts(inputs, model, max_inputs=max_inputs)
+
+    def embed_chunk(chunk: List[str]):
+        try:
+            response = create_embeddings(client, stage, model=model, input=chunk)
+        except Exception as e:
+            if not skip_failed:
+                raise
+            logger.warning(f"Embedding request for {len(chunk)} texts failed: {e}")
+            return None, 0
+        rows = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        return rows, response.usage.prompt_tokens if response.usage else 0
+
+    if concurrency > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+            results = list(executor.map(embed_chunk, chunks))
+    else:
+        results = [embed_chunk(chunk) for chunk in chunks]
+
+    rows = []
+    prompt_tokens = failed = 0
+    for chunk, (chunk_rows, tokens) in zip(chunks, results):
+        prompt_tokens += tokens
+        if chunk_rows is None:
+            failed += len(chunk)
+            rows.extend([None] * len(chunk))
+        else:
+            rows.extend(chunk_rows)
+
+    dim = next((len(r) for r in rows if r is not None), 0)
+    matrix = np.full((len(rows), dim), np.nan, dtype=np.float32)
+    for i, row in enumerate(rows):
+        if row is not None:
+            matrix[i] = row
+    # In place; einsum avoids the full-size temporary np.linalg.norm would allocate
+    norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix))[:, None]
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return EmbeddingResult(vectors=matrix, prompt_tokens=prompt_tokens, failed=failed)
@@ -0,0 +1,299 @@
+"""
+Transcript Excerpts
+
+Builds the transcript excerpt sent to the scoring and story arc extraction
+prompts. Excerpts are sized in model tokens (tiktoken when installed) rather
+than characters, and drawn from the whole episode instead of its first few
+minutes:
+
+- 'spread': evenly spaced windows from beginning, middle and end
+- 'tfidf': the windows with the most distinctive vocabulary for this
+  episode (mean TF-IDF against the episode's other windows), always
+  including the opening window, kept in chronological order
+- 'head': the opening of the transcript, as before
+
+The first and last 5% of a long transcript (sponsor reads, intros and
+outros) are dropped before windowing. Omitted stretches are marked with
+"[...]". Window analysis and finished excerpts are cached per transcript,
+so the scorer and the extractor share the work for the same episode.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from .models import CHARS_PER_TOKEN, count_tokens
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('spread', 'tfidf', 'head')
+DEFAULT_STRATEGY = 'spread'
+
+# Tokens per window; windows are cut on word boundaries
+DEFAULT_WINDOW_TOKENS = 200
+
+# Share of a transcript trimmed from each end before windowing, and the
+# shortest transcript (characters) that gets trimmed
+TRIM_FRACTION = 0.05
+MIN_TRIM_CHARS = 500
+
+# Transcripts kept in each cache
+DEFAULT_CACHE_SIZE = 64
+
+GAP_MARKER = "[...]"
+
+# English words per token, used to size windows before counting them
+WORDS_PER_TOKEN = 0.75
+
+_TERM_PATTERN = re.compile(r"[a-z0-9][a-z0-9'\-]+")
+
+# Frequent spoken-English words that carry no topic information
+STOPWORDS = frozenset("""
+about actually after again also and any are because been before being but can could did does doing
+don't for from going gonna got had has have here how i'm it's its just know like lot maybe more
+much not now okay one our out over really right say see should some something that that's the
+their them then there these they thing things think this those through want was way we're well
+were what when where which who will with would yeah you you're your
+""".split())
+
+
+@dataclass
+class _Window:
+    """A contiguous run of transcript words."""
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TERM_PATTERN.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+class ExcerptBuilder:
+    """
+    Token-budgeted transcript excerpts, shared by the scorer and the extractor.
+
+    Thread-safe: one builder may serve concurrent scoring and extraction.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1000,
+        strategy: str = DEFAULT_STRATEGY,
+        model: str = None,
+        window_tokens: int = DEFAULT_WINDOW_TOKENS,
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            token_budget: Default excerpt size in tokens (build() may override it)
+            strategy: Window selection: 'spread', 'tfidf' or 'head'
+            model: Model whose tokenizer counts the budget (default: o200k_base)
+            window_tokens: Size of each sampled window in tokens
+            cache_size: Transcripts whose analysis and excerpts are kept
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown excerpt strategy '{strategy}' (expected one of {', '.join(STRATEGIES)})")
+
+        self.token_budget = token_budget
+        self.strategy = strategy
+        self.model = model
+        self.window_tokens = max(20, window_tokens)
+        self.cache_size = cache_size
+
+        self._windows: 'OrderedDict[str, List[_Window]]' = OrderedDict()
+        self._excerpts: 'OrderedDict[Tuple[str, int, str], str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, db_client, model: str = None) -> 'ExcerptBuilder':
+        """
+        Create a builder from web_settings (ai_content_scoring.excerpt_strategy).
+
+        Token budgets are per stage (ai_content_scoring.excerpt_tokens,
+        topic_tracking.excerpt_tokens) and passed to build() by each caller.
+
+        Args:
+            db_client: Database client for fetching settings
+            model: Model whose tokenizer counts the budget
+
+        Returns:
+            ExcerptBuilder
+        """
+        return cls(
+            strategy=db_client.get_setting('ai_content_scoring', 'excerpt_strategy', DEFAULT_STRATEGY),
+            model=model
+        )
+
+    def build(self, transcript: str, token_budget: int = None) -> str:
+        """
+        Build the excerpt of a transcript.
+
+        Args:
+            transcript: Full transcript text
+            token_budget: Excerpt size in tokens (default: the builder's budget)
+
+        Returns:
+            Excerpt of at most token_budget tokens (plus gap markers); the
+            whole trimmed transcript when it fits
+        """
+        if not transcript or not transcript.strip():
+            return ''
+
+        budget = token_budget or self.token_budget
+        digest = hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+        key = (digest, budget, self.strategy)
+
+        with self._lock:
+            if key in self._excerpts:
+                self._excerpts.move_to_end(key)
+                self.hits += 1
+                return self._excerpts[key]
+            self.misses += 1
+
+        windows = self._get_windows(digest, transcript)
+        excerpt = self._join(windows, self._select(windows, budget), budget)
+
+        with self._lock:
+            self._excerpts[key] = excerpt
+            while len(self._excerpts) > self.cache_size * 2:
+                self._excerpts.popitem(last=False)
+        return excerpt
+
+    def _get_windows(self, digest: str, transcript: str) -> List[_Window]:
+        """Windows of a transcript, computed once per transcript."""
+        with self._lock:
+            if digest in self._windows:
+                self._windows.move_to_end(digest)
+                return self._windows[digest]
+
+        windows = self._split(self._trim(transcript))
+        self._score_windows(windows)
+
+        with self._lock:
+            self._windows[digest] = windows
+            while len(self._windows) > self.cache_size:
+                self._windows.popitem(last=False)
+        return windows
+
+    def _trim(self, transcript: str) -> str:
+        """Drop the first and last TRIM_FRACTION of a transcript, where ads typically appear."""
+        if len(transcript) < MIN_TRIM_CHARS:
+            return transcript
+        trim_amount = int(len(transcript) * TRIM_FRACTION)
+        return transcript[trim_amount:len(transcript) - trim_amount]
+
+    def _split(self, text: str) -> List[_Window]:
+        """Cut text into windows of about window_tokens tokens."""
+        words = text.split()
+        step = max(1, int(self.window_tokens * WORDS_PER_TOKEN))
+        windows = []
+        for start in range(0, len(words), step):
+            chunk = " ".join(words[start:start + step])
+            windows.append(_Window(text=chunk, tokens=count_tokens(chunk, self.model)))
+        return windows
+
+    def _score_windows(self, windows: List[_Window]) -> None:
+        """Score each window by the mean TF-IDF of its terms within this transcript."""
+        term_counts = [Counter(_terms(w.text)) for w in windows]
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        n = len(windows)
+        for window, counts in zip(windows, term_counts):
+            total = sum(counts.values())
+            if not total:
+                continue
+            window.score = sum(
+                count * (math.log((1 + n) / (1 + document_frequency[term])) + 1)
+                for term, count in counts.items()
+            ) / total
+
+    def _select(self, windows: List[_Window], budget: int) -> List[int]:
+        """Indices of the windows that make up the excerpt, in transcript order."""
+        if sum(w.tokens for w in windows) <= budget:
+            return list(range(len(windows)))
+
+        if self.strategy == 'head':
+            return self._fill(windows, range(len(windows)), budget, contiguous=True)
+
+        if self.strategy == 'tfidf':
+            if windows[0].tokens > budget:
+                # The opening window is always included; cut it down in _join
+                return []
+            ranked = sorted(range(1, len(windows)), key=lambda i: windows[i].score, reverse=True)
+            return sorted(self._fill(windows, [0] + ranked, budget))
+
+        # spread: evenly spaced windows, as many as the budget allows. Start
+        # from the average-size estimate, step down until the windows fit and
+        # up while one more still fits, then top up with the windows farthest
+        # from those chosen while any fits
+        def spaced(count: int) -> List[int]:
+            if count == 1:
+                return [len(windows) // 2]
+            return [round(i * (len(windows) - 1) / (count - 1)) for i in range(count)]
+
+        def fits(count: int) -> bool:
+            return sum(windows[i].tokens for i in spaced(count)) <= budget
+
+        average = sum(w.tokens for w in windows) / len(windows)
+        count = max(1, min(len(windows), int(budget // average)))
+        while count > 1 and not fits(count):
+            count -= 1
+        while count < len(windows) and fits(count + 1):
+            count += 1
+        if not fits(count):
+            return []
+
+        chosen = spaced(count)
+        left = budget - sum(windows[i].tokens for i in chosen)
+        while True:
+            candidates = [i for i in range(len(windows)) if i not in chosen and windows[i].tokens <= left]
+            if not candidates:
+                return sorted(chosen)
+            best = max(candidates, key=lambda i: min(abs(i - c) for c in chosen))
+            chosen.append(best)
+            left -= windows[best].tokens
+
+    def _fill(self, windows: List[_Window], order, budget: int, contiguous: bool = False) -> List[int]:
+        """Take windows in `order` while they fit the budget."""
+        chosen = []
+        used = 0
+        for i in order:
+            if used + windows[i].tokens <= budget:
+                chosen.append(i)
+                used += windows[i].tokens
+            elif contiguous:
+                break
+        return chosen
+
+    def _join(self, windows: List[_Window], indices: List[int], budget: int) -> str:
+        """Join selected windows, marking omitted stretches."""
+        if not indices:
+            # Budget smaller than one window: cut the first window down
+            first = windows[0].text if windows else ''
+            return first[:budget * CHARS_PER_TOKEN] + f" {GAP_MARKER}"
+
+        parts = [GAP_MARKER] if indices[0] > 0 else []
+        for position, i in enumerate(indices):
+            if position and i != indices[position - 1] + 1:
+                parts.append(GAP_MARKER)
+            parts.append(windows[i].text)
+        if indices[-1] < len(windows) - 1:
+            parts.append(GAP_MARKER)
+        return " ".join(parts)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters for this run."""
+        return {'hits': self.hits, 'misses': self.misses, 'cached_transcripts': len(self._windows)}
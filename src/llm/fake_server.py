@@ -0,0 +1,439 @@
+"""
+Fake OpenAI Server
+
+Local stand-in for the OpenAI API, for load, latency and failure testing
+without API keys or spend. Implements:
+
+- POST /v1/chat/completions: json_schema responses are generated from the
+  request's schema, deterministically from the prompt (the same request
+  always gets the same answer); batch scoring requests answer every
+  episode ID in the prompt. json_object and plain-text requests get '{}'
+  and a fixed sentence. Recorded fixtures take precedence when they match.
+- POST /v1/embeddings: deterministic hashed bag-of-words vectors, so texts
+  that share words are similar (float or base64 encoding, `dimensions`
+  honoured).
+
+Latency, server errors and 429s are injected at configurable rates from a
+seeded RNG; 429s carry retry-after-ms. Usage blocks report estimated token
+counts, with repeated prompt prefixes of 1024+ tokens reported as cached
+like OpenAI's prompt cache.
+
+Point the project's clients at it with OPENAI_BASE_URL:
+
+    python -m src.llm.fake_server --port 8089 --latency 0.4 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python scripts/run_youtube_transcripts.py --dry-run
+
+Fixtures are JSONL lines {"contains": "<substring of the last user message>",
+"content": "<response content>"} or {"key": fixture_key(body), "content": ...}.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import random
+import re
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from .models import PROMPT_CACHE_MIN_TOKENS, PROMPT_CACHE_STEP_TOKENS, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_DIMENSIONS = 1536
+
+# Prompt caching: prefixes of at least 1024 tokens, in 128-token steps
+CACHE_MIN_TOKENS = PROMPT_CACHE_MIN_TOKENS
+CACHE_STEP_TOKENS = PROMPT_CACHE_STEP_TOKENS
+CHARS_PER_TOKEN = 4
+
+PLAIN_TEXT_RESPONSE = "This is a stub response from the fake OpenAI server."
+
+_EPISODE_ID_PATTERN = re.compile(r"=== Episode ID: (.+?) ===")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def fixture_key(body: Dict[str, Any]) -> str:
+    """Key identifying a chat request for fixtures: model, messages and response format."""
+    payload = json.dumps(
+        [body.get('model'), body.get('messages'), body.get('response_format')],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_fixtures(path: str) -> List[Dict[str, str]]:
+    """Read fixture lines from a JSONL file."""
+    fixtures = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                fixtures.append(json.loads(line))
+    return fixtures
+
+
+def stub_from_schema(schema: Dict[str, Any], rng: random.Random) -> Any:
+    """
+    Generate a value satisfying a strict JSON schema, drawing numbers from rng.
+
+    Args:
+        schema: JSON schema (object/array/string/number/integer/boolean, enum)
+        rng: Random source seeded from the request
+
+    Returns:
+        Generated value
+    """
+    if 'enum' in schema:
+        return rng.choice(schema['enum'])
+
+    schema_type = schema.get('type')
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != 'null'), 'null')
+
+    if schema_type == 'object':
+        properties = schema.get('properties', {})
+        return {name: stub_from_schema(properties[name], rng) for name in schema.get('required', properties)}
+    if schema_type == 'array':
+        count = max(schema.get('minItems', 0), min(schema.get('maxItems', 2), rng.randint(0, 2)))
+        return [stub_from_schema(schema.get('items', {}), rng) for _ in range(count)]
+    if schema_type == 'string':
+        return f"stub-{rng.randint(0, 9999)}"
+    if schema_type == 'number':
+        return round(rng.random(), 2)
+    if schema_type == 'integer':
+        return rng.randint(0, 10)
+    if schema_type == 'boolean':
+        return rng.random() < 0.5
+    return None
+
+
+def _batch_scores_response(schema: Dict[str, Any], prompt: str, rng: random.Random) -> Any:
+    """Batch scoring: one result per episode ID named in the prompt."""
+    item_schema = schema['properties']['results']['items']
+    results = []
+    for episode_id in _EPISODE_ID_PATTERN.findall(prompt):
+        item = stub_from_schema(item_schema, rng)
+        item['episode_id'] = episode_id
+        results.append(item)
+    return {'results': results}
+
+
+# Schema name -> generator for requests whose answer depends on the prompt
+SCHEMA_RESPONDERS: Dict[str, Callable[[Dict[str, Any], str, random.Random], Any]] = {
+    'batch_content_scores': _batch_scores_response,
+}
+
+
+def hashed_embedding(text: str, dimensions: int = DEFAULT_EMBEDDING_DIMENSIONS) -> List[float]:
+    """Deterministic unit vector: signed feature hashing of the text's words."""
+    vector = [0.0] * dimensions
+    for word in _WORD_PATTERN.findall(text.lower()) or [text]:
+        digest = hashlib.md5(word.encode('utf-8')).digest()
+        index = int.from_bytes(digest[:4], 'little') % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOpenAIServer:
+    """
+    Threaded fake OpenAI HTTP server.
+
+    Usage:
+        with FakeOpenAIServer(latency=0.2, rate_limit_rate=0.1) as server:
+            os.environ['OPENAI_BASE_URL'] = server.base_url
+            ...
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        fixtures: List[Dict[str, str]] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize the server (call start() or use it as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Seconds added to every response
+            jitter: Extra uniform random latency, 0..jitter seconds
+            error_rate: Share of requests answered with a 500
+            rate_limit_rate: Share of requests answered with a 429
+            retry_after: Retry-After sent with 429s, in seconds
+            fixtures: Recorded responses (see load_fixtures)
+            seed: Seed for injected latency and failures
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.fixtures_by_key = {f['key']: f['content'] for f in fixtures or [] if 'key' in f}
+        self.fixtures_by_text = [(f['contains'], f['content']) for f in fixtures or [] if 'contains' in f]
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._prefixes = set()
+        self._thread: Optional[threading.Thread] = None
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle(self)
+
+            def do_GET(self):
+                if self.path.rstrip('/').endswith('/models'):
+                    server._send(self, 200, {'object': 'list', 'data': []})
+                else:
+                    server._send(self, 404, _error('Not found', 'invalid_request_error'))
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """URL for OPENAI_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake OpenAI server listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Request counters since start."""
+        return {
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+            'errors': self.errors,
+            'peak_in_flight': self.peak_in_flight,
+        }
+
+    # ==================== Request handling ====================
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+        try:
+            length = int(handler.headers.get('Content-Length') or 0)
+            try:
+                body = json.loads(handler.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send(handler, 400, _error('Invalid JSON body', 'invalid_request_error'))
+                return
+
+            time.sleep(delay)
+
+            if roll < self.rate_limit_rate:
+                with self._lock:
+                    self.rate_limited += 1
+                self._send(
+                    handler, 429,
+                    _error('Rate limit reached (fake server)', 'requests', code='rate_limit_exceeded'),
+                    headers={
+                        'retry-after': str(max(1, round(self.retry_after))),
+                        'retry-after-ms': str(int(self.retry_after * 1000)),
+                    }
+                )
+                return
+            if roll < self.rate_limit_rate + self.error_rate:
+                with self._lock:
+                    self.errors += 1
+                self._send(handler, 500, _error('Injected server error (fake server)', 'server_error'))
+                return
+
+            path = handler.path.split('?')[0].rstrip('/')
+            if path.endswith('/chat/completions'):
+                self._send(handler, 200, self._chat_completion(body))
+            elif path.endswith('/embeddings'):
+                self._send(handler, 200, self._embeddings(body))
+            else:
+                self._send(handler, 404, _error(f"Unknown endpoint {path}", 'invalid_request_error'))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, payload: Dict, headers: Dict[str, str] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _chat_content(self, body: Dict[str, Any], prompt: str) -> str:
+        """Response content: a matching fixture, else a deterministic stub."""
+        content = self.fixtures_by_key.get(fixture_key(body))
+        if content is not None:
+            return content
+        messages = body.get('messages') or []
+        last_user = next((m.get('content') for m in reversed(messages) if m.get('role') == 'user'), '') or ''
+        for needle, fixture_content in self.fixtures_by_text:
+            if needle in last_user:
+                return fixture_content
+
+        response_format = body.get('response_format') or {}
+        if response_format.get('type') == 'json_schema':
+            json_schema = response_format.get('json_schema') or {}
+            rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+            responder = SCHEMA_RESPONDERS.get(json_schema.get('name'))
+            schema = json_schema.get('schema') or {}
+            value = responder(schema, prompt, rng) if responder else stub_from_schema(schema, rng)
+            return json.dumps(value)
+        if response_format.get('type') == 'json_object':
+            return '{}'
+        return PLAIN_TEXT_RESPONSE
+
+    def _cached_tokens(self, prompt: str) -> int:
+        """Tokens of the longest previously seen cacheable prefix; remembers this prompt's prefixes."""
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        if prompt_tokens < CACHE_MIN_TOKENS:
+            return 0
+        lengths = range(CACHE_MIN_TOKENS, prompt_tokens + 1, CACHE_STEP_TOKENS)
+        hashes = [hashlib.sha256(prompt[:n * CHARS_PER_TOKEN].encode('utf-8')).digest() for n in lengths]
+        with self._lock:
+            cached = 0
+            for n, digest in zip(lengths, hashes):
+                if digest not in self._prefixes:
+                    break
+                cached = n
+            self._prefixes.update(hashes)
+        return cached
+
+    def _chat_completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get('messages') or []
+        prompt = "\n".join(
+            m['content'] if isinstance(m.get('content'), str) else json.dumps(m.get('content'))
+            for m in messages
+        )
+        content = self._chat_content(body, prompt)
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(content)
+        return {
+            'id': f"chatcmpl-fake-{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:24]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake-model'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content, 'refusal': None},
+                'finish_reason': 'stop',
+                'logprobs': None,
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'prompt_tokens_details': {'cached_tokens': self._cached_tokens(prompt)},
+            },
+        }
+
+    def _embeddings(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = body.get('input')
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dimensions = body.get('dimensions') or DEFAULT_EMBEDDING_DIMENSIONS
+        data = []
+        for index, text in enumerate(inputs or []):
+            vector = hashed_embedding(str(text), dimensions)
+            if body.get('encoding_format') == 'base64':
+                embedding = base64.b64encode(struct.pack(f'<{len(vector)}f', *vector)).decode('ascii')
+            else:
+                embedding = vector
+            data.append({'object': 'embedding', 'index': index, 'embedding': embedding})
+        tokens = sum(estimate_tokens(str(text)) for text in inputs or [])
+        return {
+            'object': 'list',
+            'data': data,
+            'model': body.get('model', 'fake-embedding'),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        }
+
+
+def _error(message: str, error_type: str, code: str = None) -> Dict[str, Any]:
+    return {'error': {'message': message, 'type': error_type, 'param': None, 'code': code}}
+
+
+def main():
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description='Fake OpenAI API server for offline testing')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8089, help='Port (default: 8089)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency, 0..N seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After for 429s in seconds')
+    parser.add_argument('--fixtures', type=str, help='JSONL file of recorded responses')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for injected latency and failures')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        fixtures=load_fixtures(args.fixtures) if args.fixtures else None,
+        seed=args.seed
+    )
+    print(f"Fake OpenAI server on {server.base_url} (set OPENAI_BASE_URL to this)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Stopped: {server.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+OpenAI Model Limits
+
+Context window and output limits per model, used to size batched requests,
+plus token counting: exact counts with tiktoken when it is installed, and a
+cheap characters-per-token estimate otherwise.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# model -> (context window tokens, max output tokens)
+MODEL_LIMITS: Dict[str, tuple] = {
+    'gpt-5': (400_000, 128_000),
+    'gpt-5-mini': (400_000, 128_000),
+    'gpt-5-nano': (400_000, 128_000),
+    'gpt-4.1': (1_047_576, 32_768),
+    'gpt-4.1-mini': (1_047_576, 32_768),
+    'gpt-4.1-nano': (1_047_576, 32_768),
+    'gpt-4o': (128_000, 16_384),
+    'gpt-4o-mini': (128_000, 16_384),
+}
+
+# Assumed for models not in MODEL_LIMITS
+DEFAULT_LIMITS = (128_000, 16_384)
+
+# Average characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+# Provider prompt caching: only prompts whose shared prefix is at least this
+# long get cached-token discounts (then in 128-token steps)
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_STEP_TOKENS = 128
+
+# Encoding for models tiktoken does not recognise (gpt-4o and later use o200k_base)
+DEFAULT_ENCODING = 'o200k_base'
+
+
+def resolve_model_name(model: str, known: Iterable[str]) -> Optional[str]:
+    """
+    Map a model name to an entry in `known`, accepting dated snapshots.
+
+    'gpt-4o-mini-2024-07-18' resolves to 'gpt-4o-mini' (longest matching
+    prefix wins, so it never resolves to 'gpt-4o').
+    """
+    known = list(known)
+    if model in known:
+        return model
+    matches = [name for name in known if model.startswith(f"{name}-")]
+    return max(matches, key=len) if matches else None
+
+
+def get_context_window(model: str) -> int:
+    """Context window (input + output tokens) for a model."""
+    name = resolve_model_name(model, MODEL_LIMITS)
+    return MODEL_LIMITS[name][0] if name else DEFAULT_LIMITS[0]
+
+
+def get_max_output_tokens(model: str) -> int:
+    """Maximum completion tokens for a model."""
+    name = resolve_model_name(model, MODEL_LIMITS)
+    return MODEL_LIMITS[name][1] if name else DEFAULT_LIMITS[1]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for request planning."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough token count of a chat request's messages (~4 tokens framing each)."""
+    return sum(estimate_tokens(m.get('content') or '') + 4 for m in messages)
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: Optional[str]):
+    """tiktoken encoding for a model, or None if tiktoken is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to estimates
+        logger.warning(f"tiktoken encoding unavailable for {model or DEFAULT_ENCODING}, estimating tokens: {e}")
+        return None
+
+
+def has_tokenizer(model: str = None) -> bool:
+    """Whether count_tokens() gives exact counts for a model."""
+    return _get_encoding(model) is not None
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    """
+    Count the tokens a model sees for `text`.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use (default: o200k_base)
+
+    Returns:
+        Exact token count with tiktoken, estimate_tokens() otherwise
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = None) -> str:
+    """
+    Cut `text` to at most `max_tokens` tokens for a model.
+
+    Args:
+        text: Text to cut
+        max_tokens: Token limit
+        model: Model whose tokenizer to use (default: o200k_base)
+
+    Returns:
+        `text` unchanged if within the limit, else its leading part
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text if estimate_tokens(text) <= max_tokens else text[:max(max_tokens - 1, 0) * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
@@ -0,0 +1,81 @@
+"""
+OpenAI Model Pricing
+
+Per-token list prices used to estimate spend and savings (e.g. score cache
+hits). Prices are USD per 1M tokens; update them when OpenAI changes its
+price list. Unknown models are costed as zero rather than guessed.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from .models import resolve_model_name
+
+logger = logging.getLogger(__name__)
+
+# model -> (input, cached input, output) USD per 1M tokens
+MODEL_PRICING: Dict[str, Tuple[float, float, float]] = {
+    'gpt-5': (1.25, 0.125, 10.00),
+    'gpt-5-mini': (0.25, 0.025, 2.00),
+    'gpt-5-nano': (0.05, 0.005, 0.40),
+    'gpt-4.1': (2.00, 0.50, 8.00),
+    'gpt-4.1-mini': (0.40, 0.10, 1.60),
+    'gpt-4.1-nano': (0.10, 0.025, 0.40),
+    'gpt-4o': (2.50, 1.25, 10.00),
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+    'text-embedding-3-small': (0.02, 0.02, 0.0),
+    'text-embedding-3-large': (0.13, 0.13, 0.0),
+}
+
+_warned_models = set()
+
+
+def get_model_pricing(model: str) -> Optional[Tuple[float, float, float]]:
+    """
+    Look up prices for a model, accepting dated snapshots.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        (input, cached input, output) USD per 1M tokens, or None if unknown
+    """
+    name = resolve_model_name(model, MODEL_PRICING)
+    if name:
+        return MODEL_PRICING[name]
+
+    if model not in _warned_models:
+        _warned_models.add(model)
+        logger.warning(f"No pricing known for model {model}; costs will be reported as $0")
+    return None
+
+
+def estimate_cost(
+    model: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cached_tokens: int = 0
+) -> float:
+    """
+    Estimate the USD cost of a request.
+
+    Args:
+        model: OpenAI model name
+        prompt_tokens: Total input tokens (including cached ones)
+        completion_tokens: Output tokens
+        cached_tokens: Input tokens served from the prompt cache
+
+    Returns:
+        Estimated cost in USD
+    """
+    pricing = get_model_pricing(model)
+    if not pricing:
+        return 0.0
+
+    input_price, cached_price, output_price = pricing
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
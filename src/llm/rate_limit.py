@@ -0,0 +1,232 @@
+"""
+Rate Limiting and Retries
+
+Client-side helpers for running many OpenAI requests concurrently without
+tripping the account's rate limits:
+
+- TokenBudget: a token bucket shared by concurrent requests, refilled at
+  tokens_per_minute. Requests reserve their estimated tokens up front and
+  settle the difference once the real usage is known. A 429 pauses the
+  whole bucket, not just the request that hit it.
+- retry_async: exponential backoff with jitter for transient errors (429,
+  408/409, 5xx, timeouts, dropped connections), honouring the server's
+  Retry-After / retry-after-ms headers when present.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_MAX_RETRIES = 5
+
+# Exponential backoff: BASE_DELAY * 2^attempt seconds with jitter, capped
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# Longest Retry-After we are willing to honour before giving up on the wait
+MAX_RETRY_AFTER = 300.0
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class TokenBudget:
+    """
+    Tokens-per-minute budget shared by concurrent async requests.
+
+    Waiters are served in arrival order; a request larger than the whole
+    budget waits for a full bucket rather than forever.
+    """
+
+    def __init__(self, tokens_per_minute: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the budget.
+
+        Args:
+            tokens_per_minute: Sustained token rate to stay under
+            clock: Monotonic clock in seconds (injectable for tests)
+        """
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self._clock = clock
+        self._available = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+        self.waited_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Reserve tokens, waiting until the budget allows them.
+
+        Args:
+            tokens: Estimated tokens the request will use (prompt + completion)
+        """
+        # A budget may outlive an event loop (one asyncio.run per batch)
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+
+        tokens = min(float(tokens), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                now = self._clock()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._available >= tokens:
+                    self._available -= tokens
+                    return
+                else:
+                    delay = (tokens - self._available) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """
+        Correct a reservation once actual usage is known.
+
+        Args:
+            reserved: Tokens passed to acquire()
+            used: Tokens the request actually used (0 if it failed before
+                  reaching the model)
+        """
+        self._refill()
+        self._available = min(self.capacity, self._available + reserved - used)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for `seconds` (after a 429)."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's requested wait from an API error's headers.
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        Seconds to wait, or None if the response carries no Retry-After
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether an API error is transient.
+
+    Quota exhaustion (429 insufficient_quota) is not: waiting will not help.
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if getattr(error, 'code', None) == 'insufficient_quota':
+        return False
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        return False
+    return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number attempt + 1.
+
+    Args:
+        attempt: Zero-based attempt that just failed
+        retry_after: Server-requested wait, used as given when present
+
+    Returns:
+        Delay in seconds
+    """
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_AFTER)
+    return min(MAX_DELAY, BASE_DELAY * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+
+async def retry_async(
+    make_call: Callable[[], Awaitable[T]],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    budget: TokenBudget = None,
+    description: str = 'request',
+    on_retry: Callable[[int, Exception], None] = None
+) -> T:
+    """
+    Run an async API call, retrying transient errors with backoff.
+
+    Args:
+        make_call: Zero-argument coroutine factory (called once per attempt)
+        max_retries: Retries after the first attempt
+        budget: Token budget to pause on rate limiting (optional)
+        description: Label for log messages
+        on_retry: Called with (attempt, error) before each retry (optional)
+
+    Returns:
+        The call's result
+
+    Raises:
+        The last error, once it is not retryable or retries are exhausted
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await make_call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+
+            retry_after = retry_after_seconds(e)
+            delay = backoff_delay(attempt, retry_after)
+            if budget and getattr(e, 'status_code', None) == 429:
+                budget.pause(delay)
+            if on_retry:
+                on_retry(attempt, e)
+
+            logger.warning(
+                f"{description} failed ({e.__class__.__name__}), "
+                f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+                + (" (Retry-After)" if retry_after is not None else "")
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,336 @@
+"""
+LLM Usage Ledger
+
+Records every chat completion and embedding call the pipeline makes: model,
+prompt/completion/cached tokens, latency, retries and estimated cost, tagged
+by stage, episode and run. Records are written to the llm_usage table in
+batches and summarized per stage for pipeline_runs.phase, so expensive
+stages and cost per relevant episode are visible run over run.
+
+Calls go through track() (or the chat_completion / create_embeddings
+helpers), which record into the process-wide ledger. Scripts install a
+database-backed ledger for their run with set_usage_ledger(); without one,
+usage is still summarized in memory but not persisted.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from .pricing import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+# Stage tags
+STAGE_SCORING = 'scoring'
+STAGE_PREFILTER = 'prefilter'
+STAGE_ARC_EXTRACTION = 'arc_extraction'
+STAGE_FUSED = 'fused_scoring_extraction'
+STAGE_ARC_DEDUPE = 'arc_dedupe'
+STAGE_ARC_RETRIEVAL = 'arc_retrieval'
+STAGE_ARC_SUMMARY = 'arc_summary'
+STAGE_NEWSLETTER = 'newsletter'
+
+# Records buffered before a database write
+DEFAULT_FLUSH_SIZE = 50
+
+
+@dataclass
+class UsageRecord:
+    """One API call."""
+    stage: str
+    model: str
+    operation: str = 'chat'
+    run_id: Optional[str] = None
+    episode_guid: Optional[str] = None
+    prompt_version: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency_ms: int = 0
+    retries: int = 0
+    cost_usd: float = 0.0
+    success: bool = True
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TrackedCall:
+    """Handle yielded by track(); set .response (and count .retries) inside the block."""
+
+    def __init__(self):
+        self.response = None
+        self.retries = 0
+
+    def on_retry(self, attempt: int, error: Exception) -> None:
+        """retry_async callback: count a retry."""
+        self.retries += 1
+
+
+def _usage_counts(response) -> tuple:
+    """(prompt, completion, cached) tokens from a response's usage block."""
+    usage = getattr(response, 'usage', None)
+    if not usage:
+        return 0, 0, 0
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached = getattr(details, 'cached_tokens', 0) if details else 0
+    return (
+        getattr(usage, 'prompt_tokens', 0) or 0,
+        getattr(usage, 'completion_tokens', 0) or 0,
+        cached or 0
+    )
+
+
+class UsageLedger:
+    """
+    Thread-safe usage recorder with batched database writes.
+
+    Database errors never fail a call; the first one is logged and the
+    ledger carries on memory-only for the rest of the run.
+    """
+
+    def __init__(self, db_client=None, run_id: str = None, flush_size: int = DEFAULT_FLUSH_SIZE):
+        """
+        Initialize the ledger.
+
+        Args:
+            db_client: Database client with insert_llm_usage (None for memory-only)
+            run_id: Pipeline run the records belong to
+            flush_size: Records buffered before writing them in one insert
+        """
+        self.db = db_client
+        self.run_id = run_id
+        self.flush_size = max(1, flush_size)
+        self._pending: List[UsageRecord] = []
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        response=None,
+        operation: str = 'chat',
+        episode_guid: str = None,
+        latency: float = 0.0,
+        retries: int = 0,
+        error: str = None,
+        prompt_version: str = None
+    ) -> UsageRecord:
+        """
+        Record one API call.
+
+        Args:
+            stage: Pipeline stage (STAGE_* constant)
+            model: Model the request named
+            response: API response carrying a usage block (None if the call failed)
+            operation: 'chat' or 'embedding'
+            episode_guid: Episode the call was for (None for multi-episode calls)
+            latency: Wall time in seconds, including retries
+            retries: Retries before the final attempt
+            error: Error message if the call failed
+            prompt_version: Version of the prompt sent (to compare cached-token
+                            share across prompt layouts)
+
+        Returns:
+            The stored UsageRecord
+        """
+        prompt_tokens, completion_tokens, cached_tokens = _usage_counts(response)
+        record = UsageRecord(
+            stage=stage,
+            model=getattr(response, 'model', None) or model,
+            operation=operation,
+            run_id=self.run_id,
+            episode_guid=episode_guid,
+            prompt_version=prompt_version,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            latency_ms=int(latency * 1000),
+            retries=retries,
+            cost_usd=estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+            success=error is None,
+            error=error[:500] if error else None
+        )
+
+        with self._lock:
+            stats = self._stages.setdefault(stage, {
+                'calls': 0, 'errors': 0, 'retries': 0, 'prompt_tokens': 0,
+                'completion_tokens': 0, 'cached_tokens': 0, 'cost_usd': 0.0, 'latencies': []
+            })
+            stats['calls'] += 1
+            stats['errors'] += 0 if record.success else 1
+            stats['retries'] += retries
+            stats['prompt_tokens'] += prompt_tokens
+            stats['completion_tokens'] += completion_tokens
+            stats['cached_tokens'] += cached_tokens
+            stats['cost_usd'] += record.cost_usd
+            stats['latencies'].append(record.latency_ms)
+
+            if self.db:
+                self._pending.append(record)
+            should_flush = len(self._pending) >= self.flush_size
+
+        if should_flush:
+            self.flush()
+        return record
+
+    @contextmanager
+    def track(
+        self,
+        stage: str,
+        model: str,
+        operation: str = 'chat',
+        episode_guid: str = None,
+        prompt_version: str = None
+    ) -> Iterator[TrackedCall]:
+        """
+        Time and record the API call made inside the block.
+
+        Usage:
+            with ledger.track(STAGE_SCORING, model, episode_guid=guid) as call:
+                call.response = client.chat.completions.create(...)
+
+        Exceptions are recorded as failed calls and re-raised.
+        """
+        call = TrackedCall()
+        start = time.monotonic()
+        try:
+            yield call
+        except Exception as e:
+            self.record(
+                stage, model, operation=operation, episode_guid=episode_guid,
+                latency=time.monotonic() - start, retries=call.retries,
+                error=f"{e.__class__.__name__}: {e}", prompt_version=prompt_version
+            )
+            raise
+        self.record(
+            stage, model, response=call.response, operation=operation, episode_guid=episode_guid,
+            latency=time.monotonic() - start, retries=call.retries, prompt_version=prompt_version
+        )
+
+    def flush(self) -> None:
+        """Write buffered records to the database."""
+        with self._flush_lock:
+            with self._lock:
+                records, self._pending = self._pending, []
+            if not records or not self.db:
+                return
+            try:
+                self.db.insert_llm_usage([asdict(r) for r in records])
+            except Exception as e:
+                logger.warning(f"LLM usage ledger database unavailable, keeping usage in memory only: {e}")
+                self.db = None
+
+    def summary(self, relevant_episodes: int = None) -> Dict[str, Any]:
+        """
+        Per-stage and total usage for this run, for pipeline_runs.phase.
+
+        Args:
+            relevant_episodes: Episodes found relevant in the run, to report
+                               cost per relevant episode (optional)
+
+        Returns:
+            Dict with 'stages' (per-stage calls, tokens, cost, latency p50/p95)
+            and run totals
+        """
+        with self._lock:
+            stages = {}
+            for stage, stats in self._stages.items():
+                latencies = sorted(stats['latencies'])
+                stages[stage] = {
+                    **{k: v for k, v in stats.items() if k != 'latencies'},
+                    'cost_usd': round(stats['cost_usd'], 6),
+                    'cached_share': round(stats['cached_tokens'] / stats['prompt_tokens'], 4) if stats['prompt_tokens'] else 0.0,
+                    'latency_p50_ms': latencies[len(latencies) // 2] if latencies else 0,
+                    'latency_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0,
+                }
+
+        total_cost = sum(s['cost_usd'] for s in stages.values())
+        summary = {
+            'stages': stages,
+            'calls': sum(s['calls'] for s in stages.values()),
+            'prompt_tokens': sum(s['prompt_tokens'] for s in stages.values()),
+            'completion_tokens': sum(s['completion_tokens'] for s in stages.values()),
+            'cached_tokens': sum(s['cached_tokens'] for s in stages.values()),
+            'cost_usd': round(total_cost, 6),
+        }
+        if relevant_episodes is not None:
+            summary['relevant_episodes'] = relevant_episodes
+            summary['cost_per_relevant_episode_usd'] = (
+                round(total_cost / relevant_episodes, 6) if relevant_episodes else None
+            )
+        return summary
+
+    def log_summary(self) -> None:
+        """Log one line per stage."""
+        for stage, stats in self.summary()['stages'].items():
+            logger.info(
+                f"LLM usage [{stage}]: {stats['calls']} calls, {stats['prompt_tokens']} prompt "
+                f"({stats['cached_tokens']} cached, {stats['cached_share']:.0%}) + {stats['completion_tokens']} completion tokens, "
+                f"~${stats['cost_usd']:.4f}, p50 {stats['latency_p50_ms']}ms, "
+                f"{stats['retries']} retries, {stats['errors']} errors"
+            )
+
+
+_ledger = UsageLedger()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """The process-wide ledger API calls are recorded into."""
+    return _ledger
+
+
+def set_usage_ledger(ledger: UsageLedger) -> UsageLedger:
+    """
+    Install the process-wide ledger (e.g. a database-backed one for a run).
+
+    Returns:
+        The ledger that was replaced
+    """
+    global _ledger
+    previous, _ledger = _ledger, ledger
+    return previous
+
+
+def chat_completion(client, stage: str, episode_guid: str = None, prompt_version: str = None, **request):
+    """
+    Call client.chat.completions.create(**request) and record its usage.
+
+    Args:
+        client: OpenAI client
+        stage: Pipeline stage (STAGE_* constant)
+        episode_guid: Episode the call is for (optional)
+        prompt_version: Version of the prompt sent (optional)
+        **request: Chat completion parameters (must include model)
+
+    Returns:
+        The API response
+    """
+    with get_usage_ledger().track(
+        stage, request.get('model', ''), episode_guid=episode_guid, prompt_version=prompt_version
+    ) as call:
+        call.response = client.chat.completions.create(**request)
+    return call.response
+
+
+def create_embeddings(client, stage: str, **request):
+    """
+    Call client.embeddings.create(**request) and record its usage.
+
+    Args:
+        client: OpenAI client
+        stage: Pipeline stage (STAGE_* constant)
+        **request: Embedding parameters (must include model and input)
+
+    Returns:
+        The API response
+    """
+    with get_usage_ledger().track(stage, request.get('model', ''), operation='embedding') as call:
+        call.response = client.embeddings.create(**request)
+    return call.response
@@ -17,21 +17,93 @@ Structure:
 
 import json
 import logging
-import os
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from src.llm.client import create_openai_client
+from src.llm.usage import STAGE_NEWSLETTER, chat_completion
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Import story arc patterns
-from src.topic_tracking.topic_extractor import STORY_ARC_PATTERNS
+# Bump whenever the newsletter prompts change
+NEWSLETTER_PROMPT_VERSION = 'newsletter-v2'
+
+# Static instructions (system messages), kept apart from the week's arcs and
+# episodes so they form a stable prompt prefix
+STORY_ARC_SYSTEM_PROMPT = """You are writing the "Big Stories" section of a weekly AI newsletter.
+
+TONE GUIDANCE:
+- Pragmatic optimism with urgency - acknowledge opportunities most are missing
+- Ground technical concepts in relatable business scenarios
+- Shift the narrative from "AI automates boring tasks" to "AI scales human judgment"
+- Strategic mentorship, not marketing fluff
+
+The user message lists the story arcs we've been tracking this week.
+
+For each major story (pick the 2-3 most significant), create:
+1. A compelling title that captures the narrative
+2. A 2-3 sentence summary of what happened and why it matters
+3. 3-4 key developments as bullet points (use the key points provided)
+4. One sentence on why this matters for business professionals
+
+Return as JSON:
+{
+    "story_arcs": [
+        {
+            "arc_id": "gpt-5-release",
+            "title": "GPT-5.2 Arrives: OpenAI's Bet on Business Value Over Benchmarks",
+            "summary": "Summary here...",
+            "key_developments": ["point 1", "point 2", "point 3"],
+            "why_it_matters": "Why this matters..."
+        }
+    ]
+}
+
+Use each story's Arc ID as its arc_id.
+"""
+
+PRACTICAL_TIPS_SYSTEM_PROMPT = """You are extracting practical AI applications for a newsletter.
+
+TONE GUIDANCE:
+- Focus on transformational use cases that codify expertise, not just automation
+- Ground examples in real business scenarios
+- Emphasize human + AI collaboration
+- Be specific enough to replicate
+
+AUDIENCE: Mixed professionals (engineering/consumer electronics testing, marketing/social, operations)
+
+FUNCTIONAL CATEGORIES:
+1. Code & Development - Technical tools, coding assistants, developer workflows
+2. Marketing & Sales - Content, outreach, customer engagement
+3. Operations - Process automation, compliance, finance/HR/legal
+4. Productivity - Cross-functional tools, personal AI assistants
+
+From the episodes in the user message, extract 6-8 practical AI applications. For each:
+- Categorize into one of the functional areas
+- Make it specific and actionable
+- Focus on complex workflows, not basic automation
+
+Return as JSON:
+{
+    "practical_tips": [
+        {
+            "title": "Catchy, specific title",
+            "description": "What it does and why interesting (2-3 sentences)",
+            "how_to_replicate": "Step 1: ... Step 2: ... Step 3: ...",
+            "why_useful": "Who benefits and what problem it solves",
+            "functional_area": "code_development|marketing_sales|operations|productivity",
+            "source_episode_id": 123
+        }
+    ],
+    "intro_hook": "One compelling sentence to open the newsletter that captures this week's theme"
+}
+"""
 
 
 # Functional area categories for organizing practical tips
@@ -107,15 +179,13 @@ class NewsletterGenerator:
 
     # Maximum items per section
     MAX_STORY_ARCS = 3
+    MAX_ARCS_IN_PROMPT = 10
+    MAX_RECENT_EVENTS = 3  # Events shown after an arc's summary
     MAX_TIPS_PER_CATEGORY = 2
 
     def __init__(self, db_client):
         """Initialize the generator."""
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-
-        self.client = OpenAI(api_key=api_key, timeout=120.0)
+        self.client = create_openai_client(timeout=120.0)
         self.db = db_client
 
         # Load model from web_settings
@@ -127,28 +197,15 @@ class NewsletterGenerator:
         """
         Get story arcs that have activity in the past N days.
 
-        Returns topics grouped by story arc with their key points.
+        Returns the most significant arcs (most events, then most sources),
+        each with its events.
         """
-        topics = self.db.get_recent_episode_topics(
+        arcs = self.db.get_active_story_arcs(
             digest_topic='AI and Technology',
             days=days
         )
-
-        # Group topics by story arc
-        arc_topics = {}
-        for topic in topics:
-            text = (topic.get('topic_name', '') + ' ' +
-                   ' '.join(topic.get('key_points', []) or [])).lower()
-
-            for arc_id, patterns in STORY_ARC_PATTERNS.items():
-                for pattern in patterns:
-                    if pattern in text:
-                        if arc_id not in arc_topics:
-                            arc_topics[arc_id] = []
-                        arc_topics[arc_id].append(topic)
-                        break
-
-        return arc_topics
+        arcs.sort(key=lambda a: (a['event_count'], a['source_count']), reverse=True)
+        return arcs[:self.MAX_ARCS_IN_PROMPT]
 
     def get_recent_episodes(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get episodes from the past N days with high AI scores."""
@@ -182,63 +239,42 @@ class NewsletterGenerator:
                 episodes = cur.fetchall()
                 return [dict(e) for e in episodes]
 
-    def _create_story_arc_prompt(self, arc_topics: Dict[str, List[Dict]]) -> str:
-        """Create prompt to summarize story arcs."""
+    def _create_story_arc_prompt(self, arcs: List[Dict]) -> str:
+        """Create the per-week part of the story arc prompt: the tracked arcs."""
 
         arc_descriptions = []
-        for arc_id, topics in arc_topics.items():
-            if not topics:
+        for arc in arcs:
+            events = arc.get('events', [])
+            if not events:
                 continue
 
-            # Collect all key points for this arc
-            all_points = []
-            topic_names = []
-            for t in topics:
-                topic_names.append(t.get('topic_name', ''))
-                all_points.extend(t.get('key_points', []) or [])
+            if arc.get('summary'):
+                # Summary plus the events it doesn't cover yet, most recent first
+                recent = self.db.story_arc_recent_events(arc, self.MAX_RECENT_EVENTS)
+                developments = f"Summary: {arc['summary']}\nLatest Developments:\n" + "\n".join(
+                    f"- {event['event_summary']}" for event in reversed(recent)
+                )
+            else:
+                # Key points from the most recent events first
+                all_points = []
+                for event in reversed(events):
+                    all_points.extend(event.get('key_points') or [event['event_summary']])
+                developments = "Key Developments:\n" + "\n".join(f'- {p}' for p in all_points[:8])
 
             arc_descriptions.append(f"""
-Story Arc: {arc_id.replace('-', ' ').title()}
-Related Topics: {', '.join(set(topic_names))}
-Key Developments:
-{chr(10).join(f'- {p}' for p in all_points[:8])}
+Story Arc: {arc['arc_name']}
+Arc ID: {arc['arc_slug']}
+Category: {arc.get('functional_category', 'other')}
+Sources: {arc.get('source_count', 0)} feeds, {len(events)} events
+{developments}
 """)
 
-        prompt = f"""You are writing the "Big Stories" section of a weekly AI newsletter.
-
-TONE GUIDANCE:
-- Pragmatic optimism with urgency - acknowledge opportunities most are missing
-- Ground technical concepts in relatable business scenarios
-- Shift the narrative from "AI automates boring tasks" to "AI scales human judgment"
-- Strategic mentorship, not marketing fluff
-
-Here are the story arcs we've been tracking this week:
-
-{''.join(arc_descriptions)}
-
-For each major story (pick the 2-3 most significant), create:
-1. A compelling title that captures the narrative
-2. A 2-3 sentence summary of what happened and why it matters
-3. 3-4 key developments as bullet points (use the key points provided)
-4. One sentence on why this matters for business professionals
+        return f"""Here are the story arcs we've been tracking this week:
 
-Return as JSON:
-{{
-    "story_arcs": [
-        {{
-            "arc_id": "gpt-5-release",
-            "title": "GPT-5.2 Arrives: OpenAI's Bet on Business Value Over Benchmarks",
-            "summary": "Summary here...",
-            "key_developments": ["point 1", "point 2", "point 3"],
-            "why_it_matters": "Why this matters..."
-        }}
-    ]
-}}
-"""
-        return prompt
+{''.join(arc_descriptions)}"""
 
     def _create_practical_tips_prompt(self, episodes: List[Dict]) -> str:
-        """Create prompt for extracting practical tips categorized by function."""
+        """Create the per-week part of the practical tips prompt: the episodes."""
 
         episode_texts = []
         for i, ep in enumerate(episodes[:8], 1):
@@ -252,60 +288,22 @@ Transcript excerpt:
 {transcript}
 """)
 
-        prompt = f"""You are extracting practical AI applications for a newsletter.
-
-TONE GUIDANCE:
-- Focus on transformational use cases that codify expertise, not just automation
-- Ground examples in real business scenarios
-- Emphasize human + AI collaboration
-- Be specific enough to replicate
-
-AUDIENCE: Mixed professionals (engineering/consumer electronics testing, marketing/social, operations)
-
-FUNCTIONAL CATEGORIES:
-1. Code & Development - Technical tools, coding assistants, developer workflows
-2. Marketing & Sales - Content, outreach, customer engagement
-3. Operations - Process automation, compliance, finance/HR/legal
-4. Productivity - Cross-functional tools, personal AI assistants
-
-Episodes to analyze:
-{''.join(episode_texts)}
-
-Extract 6-8 practical AI applications. For each:
-- Categorize into one of the functional areas
-- Make it specific and actionable
-- Focus on complex workflows, not basic automation
-
-Return as JSON:
-{{
-    "practical_tips": [
-        {{
-            "title": "Catchy, specific title",
-            "description": "What it does and why interesting (2-3 sentences)",
-            "how_to_replicate": "Step 1: ... Step 2: ... Step 3: ...",
-            "why_useful": "Who benefits and what problem it solves",
-            "functional_area": "code_development|marketing_sales|operations|productivity",
-            "source_episode_id": 123
-        }}
-    ],
-    "intro_hook": "One compelling sentence to open the newsletter that captures this week's theme"
-}}
-"""
-        return prompt
+        return f"""Episodes to analyze:
+{''.join(episode_texts)}"""
 
     def generate_content(self, days: int = 7) -> Optional[NewsletterContent]:
         """Generate newsletter content from story arcs and episodes."""
         logger.info(f"Generating newsletter content for past {days} days")
 
         # Get story arcs
-        arc_topics = self.get_active_story_arcs(days)
-        logger.info(f"Found {len(arc_topics)} active story arcs")
+        arcs = self.get_active_story_arcs(days)
+        logger.info(f"Found {len(arcs)} active story arcs")
 
         # Get recent episodes for practical tips
         episodes = self.get_recent_episodes(days)
         logger.info(f"Found {len(episodes)} episodes to analyze")
 
-        if not arc_topics and not episodes:
+        if not arcs and not episodes:
             logger.warning("No story arcs or episodes found")
             return None
 
@@ -316,12 +314,18 @@ Return as JSON:
         intro_hook = ""
 
         # Generate story arc summaries
-        if arc_topics:
+        if arcs:
             try:
-                prompt = self._create_story_arc_prompt(arc_topics)
-                response = self.client.chat.completions.create(
+                prompt = self._create_story_arc_prompt(arcs)
+                response = chat_completion(
+                    self.client,
+                    STAGE_NEWSLETTER,
+                    prompt_version=NEWSLETTER_PROMPT_VERSION,
                     model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
+                    messages=[
+                        {"role": "system", "content": STORY_ARC_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
                     response_format={"type": "json_object"},
                     max_completion_tokens=2000,
                     temperature=0.7
@@ -345,9 +349,15 @@ Return as JSON:
         if episodes:
             try:
                 prompt = self._create_practical_tips_prompt(episodes)
-                response = self.client.chat.completions.create(
+                response = chat_completion(
+                    self.client,
+                    STAGE_NEWSLETTER,
+                    prompt_version=NEWSLETTER_PROMPT_VERSION,
                     model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
+                    messages=[
+                        {"role": "system", "content": PRACTICAL_TIPS_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
                     response_format={"type": "json_object"},
                     max_completion_tokens=3000,
                     temperature=0.7
@@ -1,4 +1,6 @@
 # Content scoring module
 from .content_scorer import ContentScorer
+from .relevance_prefilter import RelevancePrefilter
+from .score_cache import ScoreCache
 
-__all__ = ['ContentScorer']
+__all__ = ['ContentScorer', 'RelevancePrefilter', 'ScoreCache']
@@ -5,21 +5,55 @@ Uses OpenAI GPT to evaluate transcript relevancy against configured topics.
 Simplified version adapted from podscrape2-reference.
 """
 
+import asyncio
 import json
 import logging
-import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 from dataclasses import dataclass
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from src.llm.client import create_async_openai_client, create_openai_client
+from src.llm.excerpt import ExcerptBuilder
+from src.llm.models import estimate_message_tokens, estimate_tokens, get_context_window, get_max_output_tokens
+from src.llm.rate_limit import TokenBudget, retry_async
+from src.llm.usage import STAGE_SCORING, chat_completion, get_usage_ledger
+from .relevance_prefilter import PrefilterDecision, RelevancePrefilter
+from .score_cache import ScoreCache, make_score_key, topic_fingerprint
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the scoring prompt, schema or excerpting changes, so cached
+# scores produced by the old prompt are no longer reused
+SCORING_PROMPT_VERSION = 'scoring-v3'
+
+# Transcript tokens sent to the model per episode
+DEFAULT_EXCERPT_TOKENS = 1000
+
+# Batch scoring: most episodes per request, and the share of the model's
+# context window a batch may fill (long prompts dilute attention per item)
+DEFAULT_MAX_BATCH_SIZE = 8
+BATCH_CONTEXT_FRACTION = 0.25
+
+# Output budget per episode in a batch response: JSON keys/punctuation plus
+# one number per topic
+BATCH_ITEM_OUTPUT_TOKENS = 24
+BATCH_TOPIC_OUTPUT_TOKENS = 12
+
+# Concurrent scoring (score_many): requests in flight at once
+DEFAULT_MAX_CONCURRENCY = 4
+
+SCORING_GUIDELINES = """Scoring Guidelines:
+- 0.0-0.3: Not relevant or only tangentially mentioned
+- 0.4-0.6: Somewhat relevant, touches on topic but not central
+- 0.7-0.8: Highly relevant, significant discussion of topic
+- 0.9-1.0: Extremely relevant, topic is central to the content"""
+
 
 @dataclass
 class ScoringResult:
@@ -29,6 +63,9 @@ class ScoringResult:
     processing_time: float
     success: bool
     error_message: Optional[str] = None
+    from_cache: bool = False
+    prefiltered: bool = False
+    prefilter_similarity: Optional[float] = None
 
 
 class ContentScorer:
@@ -47,7 +84,13 @@ class ContentScorer:
         topics: List[Dict[str, Any]],
         score_threshold: float = None,
         model: str = None,
-        db_client = None
+        db_client = None,
+        score_cache: ScoreCache = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        prefilter: RelevancePrefilter = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        token_budget: TokenBudget = None,
+        excerpt_builder: ExcerptBuilder = None
     ):
         """
         Initialize content scorer.
@@ -57,15 +100,26 @@ class ContentScorer:
             score_threshold: Minimum score for relevance (default: 0.65)
             model: OpenAI model to use (default from web_settings: ai_content_scoring.model)
             db_client: Database client for fetching settings
+            score_cache: Cache checked before every API call (optional)
+            max_batch_size: Most transcripts per score_batch() request (1 disables batching)
+            prefilter: Embedding gate; transcripts it rejects are not relevant
+                       without an LLM call (optional)
+            max_concurrency: Requests in flight at once in score_many()
+            token_budget: Tokens-per-minute budget score_many() requests share (optional)
+            excerpt_builder: Builds the transcript excerpt that is scored; share one
+                             with StoryArcExtractor to reuse its per-episode analysis
+                             (default: a private builder configured from web_settings)
         """
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-
-        self.client = OpenAI(api_key=api_key, timeout=60.0)
+        self.client = create_openai_client(timeout=60.0)
         self.topics = topics
+        self.topics_fingerprint = topic_fingerprint(topics)
+        self.score_cache = score_cache
+        self.prefilter = prefilter
         self.score_threshold = score_threshold or self.DEFAULT_THRESHOLD
         self.max_tokens = 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.token_budget = token_budget
 
         # Load model from web_settings if not provided
         if model:
@@ -75,41 +129,77 @@ class ContentScorer:
         else:
             self.model = 'gpt-4o-mini'
 
+        self.excerpt_tokens = DEFAULT_EXCERPT_TOKENS
+        if db_client:
+            self.excerpt_tokens = db_client.get_setting('ai_content_scoring', 'excerpt_tokens', DEFAULT_EXCERPT_TOKENS)
+        if excerpt_builder is None:
+            if db_client:
+                excerpt_builder = ExcerptBuilder.from_settings(db_client, model=self.model)
+            else:
+                excerpt_builder = ExcerptBuilder(model=self.model)
+        self.excerpt_builder = excerpt_builder
+
         logger.info(
             f"ContentScorer initialized with {len(topics)} topics, "
             f"model={self.model}, threshold={self.score_threshold}"
         )
 
-    def _create_scoring_prompt(self, transcript: str) -> str:
-        """Create the scoring prompt for the AI model."""
-        topic_descriptions = []
-        for topic in self.topics:
-            topic_descriptions.append(f"- {topic['name']}: {topic.get('description', 'No description')}")
+    def build_excerpt(self, transcript: str) -> str:
+        """Excerpt of a transcript that is scored: ads trimmed, then sampled to excerpt_tokens."""
+        return self.excerpt_builder.build(transcript, self.excerpt_tokens)
 
-        # Truncate transcript to first 4000 chars for prompt
-        truncated = transcript[:4000]
-        if len(transcript) > 4000:
-            truncated += "..."
+    def _topic_lines(self) -> str:
+        return "\n".join(
+            f"- {topic['name']}: {topic.get('description', 'No description')}" for topic in self.topics
+        )
 
-        prompt = f"""You are an expert content analyst evaluating transcript relevancy.
+    # Prompts are laid out for provider prompt caching: the system message
+    # (instructions, guidelines, topic list) is identical for every episode
+    # scored with the same topics, and only the user message varies.
 
-Analyze this transcript and score its relevance to each topic on a scale of 0.0 to 1.0:
+    def _create_system_prompt(self) -> str:
+        """Static scoring instructions shared by every single-episode request."""
+        return f"""You are an expert content analyst evaluating transcript relevancy.
 
-Topics to evaluate:
-{chr(10).join(topic_descriptions)}
+Analyze the transcript in the user message and score its relevance to each topic on a scale of 0.0 to 1.0:
 
-Scoring Guidelines:
-- 0.0-0.3: Not relevant or only tangentially mentioned
-- 0.4-0.6: Somewhat relevant, touches on topic but not central
-- 0.7-0.8: Highly relevant, significant discussion of topic
-- 0.9-1.0: Extremely relevant, topic is central to the content
+Topics to evaluate:
+{self._topic_lines()}
 
-Transcript to analyze:
-{truncated}
+{SCORING_GUIDELINES}
 
 Provide scores for each topic as a JSON object with topic names as keys and scores as values."""
 
-        return prompt
+    def _create_scoring_messages(self, excerpt: str) -> List[Dict[str, str]]:
+        """Chat messages that score one excerpt: static system prompt, then the transcript."""
+        return [
+            {"role": "system", "content": self._create_system_prompt()},
+            {"role": "user", "content": f"Transcript to analyze:\n{excerpt}"},
+        ]
+
+    def _create_batch_system_prompt(self) -> str:
+        """Static instructions shared by every batched request."""
+        return f"""You are an expert content analyst evaluating transcript relevancy.
+
+The user message contains several transcripts, each introduced by its episode ID. Score each
+transcript independently for its relevance to each topic on a scale of 0.0 to 1.0:
+
+Topics to evaluate:
+{self._topic_lines()}
+
+{SCORING_GUIDELINES}
+
+Return one result per transcript with its episode ID exactly as given and its topic scores."""
+
+    def _create_batch_messages(self, excerpts: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """Chat messages that score several (episode_id, excerpt) pairs at once."""
+        sections = "\n\n".join(
+            f"=== Episode ID: {episode_id} ===\n{excerpt}" for episode_id, excerpt in excerpts
+        )
+        return [
+            {"role": "system", "content": self._create_batch_system_prompt()},
+            {"role": "user", "content": f"{len(excerpts)} transcripts to analyze:\n\n{sections}"},
+        ]
 
     def _create_json_schema(self) -> dict:
         """Create JSON schema for structured output."""
@@ -127,21 +217,37 @@ Provide scores for each topic as a JSON object with topic names as keys and scor
             "additionalProperties": False
         }
 
-    def _clean_transcript(self, transcript: str) -> str:
-        """
-        Clean transcript by removing advertisement portions.
-        Removes first 5% and last 5% where ads typically appear.
-        """
-        if not transcript or len(transcript) < 500:
-            return transcript
-
-        total_length = len(transcript)
-        trim_amount = int(total_length * 0.05)
-
-        cleaned = transcript[trim_amount:total_length - trim_amount]
+    def _create_batch_json_schema(self) -> dict:
+        """Create JSON schema for batch output: an array of per-episode scores."""
+        return {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "episode_id": {"type": "string"},
+                            "scores": self._create_json_schema()
+                        },
+                        "required": ["episode_id", "scores"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False
+        }
 
-        logger.debug(f"Transcript cleaned: {total_length} -> {len(cleaned)} chars")
-        return cleaned
+    def _validate_scores(self, scores: Dict[str, Any]) -> Dict[str, float]:
+        """Replace non-numeric scores with 0.0 and clamp the rest to 0.0-1.0."""
+        for topic_name, score in scores.items():
+            if not isinstance(score, (int, float)):
+                scores[topic_name] = 0.0
+            elif not (0.0 <= score <= 1.0):
+                logger.warning(f"Score {score} for {topic_name} outside range, clamping")
+                scores[topic_name] = max(0.0, min(1.0, float(score)))
+        return scores
 
     def score_transcript(self, transcript: str, episode_id: str = None) -> ScoringResult:
         """
@@ -156,39 +262,127 @@ Provide scores for each topic as a JSON object with topic names as keys and scor
         """
         start_time = datetime.now()
 
-        # Clean transcript
-        cleaned_transcript = self._clean_transcript(transcript)
+        # Trim ads and sample the excerpt
+        excerpt = self.build_excerpt(transcript)
+
+        cache_key = None
+        if self.score_cache:
+            cache_key = make_score_key(excerpt, self.topics_fingerprint, self.model, SCORING_PROMPT_VERSION)
+            cached_scores = self.score_cache.get(cache_key)
+            if cached_scores is not None:
+                logger.info(f"Scored {episode_id or 'transcript'}: score cache hit")
+                return ScoringResult(
+                    episode_id=episode_id or "unknown",
+                    scores=cached_scores,
+                    processing_time=(datetime.now() - start_time).total_seconds(),
+                    success=True,
+                    from_cache=True
+                )
 
-        try:
-            prompt = self._create_scoring_prompt(cleaned_transcript)
-            schema = self._create_json_schema()
+        if self.prefilter:
+            decision = self.prefilter.check(excerpt)
+            if not decision.escalate:
+                return self._prefiltered_result(episode_id, decision, start_time)
 
-            # Call OpenAI API with structured output
-            response = self.client.chat.completions.create(
+        return self._score_excerpt(excerpt, episode_id, cache_key, start_time)
+
+    def _prefiltered_result(
+        self,
+        episode_id: Optional[str],
+        decision: PrefilterDecision,
+        start_time: datetime
+    ) -> ScoringResult:
+        """
+        Result for a transcript the prefilter rejected.
+
+        Scores stay empty: the episode was never scored by the LLM, which
+        keeps it out of prefilter calibration and lets a rescore fill them in.
+        """
+        logger.info(
+            f"Prefiltered {episode_id or 'transcript'} as not relevant "
+            f"(best topic similarity {decision.best_similarity:.3f} < {self.prefilter.floor})"
+        )
+        return ScoringResult(
+            episode_id=episode_id or "unknown",
+            scores={},
+            processing_time=(datetime.now() - start_time).total_seconds(),
+            success=True,
+            prefiltered=True,
+            prefilter_similarity=decision.best_similarity
+        )
+
+    def _request_body(self, excerpt: str) -> Dict[str, Any]:
+        """Chat completion request that scores one excerpt."""
+        return {
+            "model": self.model,
+            "messages": self._create_scoring_messages(excerpt),
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "content_scores",
+                    "schema": self._create_json_schema(),
+                    "strict": True
+                }
+            },
+            "max_completion_tokens": self.max_tokens
+        }
+
+    def parse_scores(self, content: str) -> Dict[str, float]:
+        """Parse and clamp the scores in a single-excerpt response."""
+        return self._validate_scores(json.loads(content))
+
+    def batch_request(self, transcript: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the offline (Batch API) request for one transcript.
+
+        Args:
+            transcript: The transcript text
+
+        Returns:
+            (score cache key, chat completion request body)
+        """
+        excerpt = self.build_excerpt(transcript)
+        cache_key = make_score_key(excerpt, self.topics_fingerprint, self.model, SCORING_PROMPT_VERSION)
+        return cache_key, self._request_body(excerpt)
+
+    def _cache_scores(self, cache_key: Optional[str], scores: Dict[str, float], usage) -> None:
+        """
+        Store freshly paid-for scores in the score cache (no-op without a key).
+
+        A failed write is logged, never raised: the scores are still good.
+        """
+        if not cache_key:
+            return
+        try:
+            self.score_cache.put(
+                cache_key,
+                scores,
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "content_scores",
-                        "schema": schema,
-                        "strict": True
-                    }
-                },
-                max_completion_tokens=self.max_tokens
+                prompt_version=SCORING_PROMPT_VERSION,
+                topics_fingerprint=self.topics_fingerprint,
+                prompt_tokens=usage.prompt_tokens if usage else 0,
+                completion_tokens=usage.completion_tokens if usage else 0
             )
+        except Exception as e:
+            logger.warning(f"Could not cache scores under {cache_key[:12]}: {e}")
 
-            # Parse response
-            scores_json = response.choices[0].message.content
-            scores = json.loads(scores_json)
+    def _score_excerpt(
+        self,
+        excerpt: str,
+        episode_id: Optional[str],
+        cache_key: Optional[str],
+        start_time: datetime
+    ) -> ScoringResult:
+        """Score one excerpt with an API call and cache the result under cache_key."""
+        try:
+            # Call OpenAI API with structured output
+            response = chat_completion(
+                self.client, STAGE_SCORING, episode_guid=episode_id,
+                prompt_version=SCORING_PROMPT_VERSION, **self._request_body(excerpt)
+            )
 
-            # Validate and clamp scores
-            for topic_name, score in scores.items():
-                if not isinstance(score, (int, float)):
-                    scores[topic_name] = 0.0
-                elif not (0.0 <= score <= 1.0):
-                    logger.warning(f"Score {score} for {topic_name} outside range, clamping")
-                    scores[topic_name] = max(0.0, min(1.0, float(score)))
+            # Parse, validate and clamp scores
+            scores = self.parse_scores(response.choices[0].message.content)
 
             processing_time = (datetime.now() - start_time).total_seconds()
 
@@ -199,6 +393,8 @@ Provide scores for each topic as a JSON object with topic names as keys and scor
                     f"{response.usage.total_tokens} tokens, {processing_time:.2f}s"
                 )
 
+            self._cache_scores(cache_key, scores, response.usage)
+
             return ScoringResult(
                 episode_id=episode_id or "unknown",
                 scores=scores,
@@ -219,6 +415,355 @@ Provide scores for each topic as a JSON object with topic names as keys and scor
                 error_message=error_msg
             )
 
+    def plan_batches(self, excerpts: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """
+        Split (episode_id, excerpt) pairs into batches that fit the model.
+
+        A batch closes when it reaches max_batch_size, when its prompt would
+        exceed BATCH_CONTEXT_FRACTION of the model's context window, or when
+        its expected output would exceed the model's output limit.
+
+        Args:
+            excerpts: (episode_id, excerpt) pairs in scoring order
+
+        Returns:
+            List of batches, each a list of (episode_id, excerpt) pairs
+        """
+        input_budget = int(get_context_window(self.model) * BATCH_CONTEXT_FRACTION)
+        output_budget = get_max_output_tokens(self.model)
+        fixed_tokens = estimate_message_tokens(self._create_batch_messages([]))
+        item_output = BATCH_ITEM_OUTPUT_TOKENS + BATCH_TOPIC_OUTPUT_TOKENS * len(self.topics)
+
+        batches = []
+        current = []
+        current_tokens = fixed_tokens
+        for episode_id, excerpt in excerpts:
+            # Section header is ~10 tokens
+            item_tokens = estimate_tokens(excerpt) + 10
+            if current and (
+                len(current) >= self.max_batch_size
+                or current_tokens + item_tokens > input_budget
+                or item_output * (len(current) + 1) > output_budget
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = fixed_tokens
+            current.append((episode_id, excerpt))
+            current_tokens += item_tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _score_batch_request(self, batch: List[Tuple[str, str]]) -> Dict[str, Dict[str, float]]:
+        """
+        Score one planned batch in a single request.
+
+        Returns:
+            Scores for each episode the response covered completely; episodes
+            that are missing, duplicated or lack a topic are left out
+        """
+        start_time = datetime.now()
+        expected = {episode_id for episode_id, _ in batch}
+        topic_names = {topic['name'] for topic in self.topics}
+        item_output = BATCH_ITEM_OUTPUT_TOKENS + BATCH_TOPIC_OUTPUT_TOKENS * len(self.topics)
+
+        response = chat_completion(
+            self.client,
+            STAGE_SCORING,
+            prompt_version=SCORING_PROMPT_VERSION,
+            model=self.model,
+            messages=self._create_batch_messages(batch),
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "batch_content_scores",
+                    "schema": self._create_batch_json_schema(),
+                    "strict": True
+                }
+            },
+            max_completion_tokens=max(self.max_tokens, item_output * len(batch) * 2)
+        )
+
+        results = json.loads(response.choices[0].message.content).get('results')
+        if not isinstance(results, list):
+            raise ValueError("batch response has no results array")
+
+        scored = {}
+        seen = set()
+        for item in results:
+            if not isinstance(item, dict) or not isinstance(item.get('scores'), dict):
+                continue
+            episode_id = str(item.get('episode_id', ''))
+            if episode_id not in expected:
+                continue
+            if episode_id in seen:
+                # Model answered twice for one episode: trust neither
+                scored.pop(episode_id, None)
+                continue
+            seen.add(episode_id)
+            if not topic_names.issubset(item['scores']):
+                continue
+            scored[episode_id] = self._validate_scores(
+                {name: item['scores'][name] for name in topic_names}
+            )
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+        if response.usage:
+            logger.info(
+                f"Batch scored {len(scored)}/{len(batch)} transcripts: "
+                f"{response.usage.total_tokens} tokens, {processing_time:.2f}s"
+            )
+
+        if self.score_cache and scored:
+            # Attribute prompt tokens by excerpt length, completion tokens evenly
+            usage = response.usage
+            excerpts = dict(batch)
+            total_chars = sum(len(excerpts[e]) for e in scored) or 1
+            for episode_id, scores in scored.items():
+                excerpt = excerpts[episode_id]
+                self.score_cache.put(
+                    make_score_key(excerpt, self.topics_fingerprint, self.model, SCORING_PROMPT_VERSION),
+                    scores,
+                    model=self.model,
+                    prompt_version=SCORING_PROMPT_VERSION,
+                    topics_fingerprint=self.topics_fingerprint,
+                    prompt_tokens=int(usage.prompt_tokens * len(excerpt) / total_chars) if usage else 0,
+                    completion_tokens=usage.completion_tokens // len(scored) if usage else 0
+                )
+
+        return scored
+
+    def _answer_without_llm(
+        self,
+        items: List[Tuple[str, str]]
+    ) -> Tuple[Dict[str, ScoringResult], List[Tuple[str, str]], Dict[str, str]]:
+        """
+        Answer what the score cache and prefilter can, before any scoring call.
+
+        Args:
+            items: (episode_id, transcript) pairs
+
+        Returns:
+            (results by episode ID, (episode_id, excerpt) pairs still to score,
+             score cache key by episode ID)
+        """
+        results: Dict[str, ScoringResult] = {}
+        pending = []
+        cache_keys = {}
+
+        for episode_id, transcript in items:
+            excerpt = self.build_excerpt(transcript)
+            if self.score_cache:
+                key = make_score_key(excerpt, self.topics_fingerprint, self.model, SCORING_PROMPT_VERSION)
+                cache_keys[episode_id] = key
+                cached_scores = self.score_cache.get(key)
+                if cached_scores is not None:
+                    results[episode_id] = ScoringResult(
+                        episode_id=episode_id,
+                        scores=cached_scores,
+                        processing_time=0.0,
+                        success=True,
+                        from_cache=True
+                    )
+                    continue
+            pending.append((episode_id, excerpt))
+
+        if self.prefilter and pending:
+            start_time = datetime.now()
+            decisions = self.prefilter.check_many([excerpt for _, excerpt in pending])
+            escalated = []
+            for (episode_id, excerpt), decision in zip(pending, decisions):
+                if decision.escalate:
+                    escalated.append((episode_id, excerpt))
+                else:
+                    results[episode_id] = self._prefiltered_result(episode_id, decision, start_time)
+            pending = escalated
+
+        return results, pending, cache_keys
+
+    def score_batch(self, items: List[Tuple[str, str]]) -> List[ScoringResult]:
+        """
+        Score several transcripts, packing them into as few requests as fit.
+
+        Cached excerpts are answered from the score cache, and excerpts the
+        prefilter rejects are not relevant without a request. Episodes a batch
+        response leaves out or answers malformed - and every episode of a
+        batch whose request fails - are re-scored one at a time.
+
+        Args:
+            items: (episode_id, transcript) pairs; episode IDs must be unique
+
+        Returns:
+            ScoringResult per item, in input order
+        """
+        results, pending, cache_keys = self._answer_without_llm(items)
+
+        if pending:
+            logger.info(
+                f"Batch scoring {len(pending)} transcripts "
+                f"({len(items) - len(pending)} answered from cache or prefilter)"
+            )
+
+        for batch in self.plan_batches(pending):
+            if len(batch) == 1:
+                episode_id, excerpt = batch[0]
+                results[episode_id] = self._score_excerpt(
+                    excerpt, episode_id, cache_keys.get(episode_id), datetime.now()
+                )
+                continue
+
+            start_time = datetime.now()
+            try:
+                scored = self._score_batch_request(batch)
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} failed, scoring individually: {e}")
+                scored = {}
+
+            per_item_time = (datetime.now() - start_time).total_seconds() / len(batch)
+            for episode_id, excerpt in batch:
+                if episode_id in scored:
+                    results[episode_id] = ScoringResult(
+                        episode_id=episode_id,
+                        scores=scored[episode_id],
+                        processing_time=per_item_time,
+                        success=True
+                    )
+                else:
+                    logger.info(f"Batch response incomplete for {episode_id}, scoring individually")
+                    results[episode_id] = self._score_excerpt(
+                        excerpt, episode_id, cache_keys.get(episode_id), datetime.now()
+                    )
+
+        return [results[episode_id] for episode_id, _ in items]
+
+    def _make_async_client(self) -> AsyncOpenAI:
+        """Async client for one score_many() run; retries are handled by retry_async."""
+        return create_async_openai_client(timeout=60.0, max_retries=0)
+
+    async def _score_excerpt_async(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        token_budget: Optional[TokenBudget],
+        excerpt: str,
+        episode_id: str,
+        cache_key: Optional[str]
+    ) -> ScoringResult:
+        """Score one excerpt within the concurrency limit and token budget."""
+        request = self._request_body(excerpt)
+        reserved = (
+            estimate_message_tokens(request["messages"])
+            + BATCH_ITEM_OUTPUT_TOKENS + BATCH_TOPIC_OUTPUT_TOKENS * len(self.topics)
+        )
+
+        async with semaphore:
+            start_time = datetime.now()
+            try:
+                if token_budget:
+                    await token_budget.acquire(reserved)
+                used = 0
+                try:
+                    with get_usage_ledger().track(
+                        STAGE_SCORING, self.model, episode_guid=episode_id, prompt_version=SCORING_PROMPT_VERSION
+                    ) as call:
+                        call.response = await retry_async(
+                            lambda: client.chat.completions.create(**request),
+                            budget=token_budget,
+                            description=f"Scoring {episode_id}",
+                            on_retry=call.on_retry
+                        )
+                    response = call.response
+                    used = response.usage.total_tokens if response.usage else reserved
+                finally:
+                    if token_budget:
+                        token_budget.settle(reserved, used)
+
+                scores = self.parse_scores(response.choices[0].message.content)
+                processing_time = (datetime.now() - start_time).total_seconds()
+                if response.usage:
+                    logger.info(
+                        f"Scored {episode_id}: {response.usage.total_tokens} tokens, {processing_time:.2f}s"
+                    )
+
+                if cache_key:
+                    await asyncio.to_thread(self._cache_scores, cache_key, scores, response.usage)
+
+                return ScoringResult(
+                    episode_id=episode_id,
+                    scores=scores,
+                    processing_time=processing_time,
+                    success=True
+                )
+
+            except Exception as e:
+                error_msg = f"Scoring failed: {e}"
+                logger.error(f"{error_msg} ({episode_id})")
+                return ScoringResult(
+                    episode_id=episode_id,
+                    scores={},
+                    processing_time=(datetime.now() - start_time).total_seconds(),
+                    success=False,
+                    error_message=error_msg
+                )
+
+    async def score_many(
+        self,
+        items: List[Tuple[str, str]],
+        concurrency: int = None,
+        token_budget: TokenBudget = None
+    ) -> AsyncIterator[ScoringResult]:
+        """
+        Score transcripts with concurrent requests, yielding results as they finish.
+
+        Cache hits and prefiltered transcripts are yielded first. The rest
+        are scored one request each, at most `concurrency` in flight, within
+        the shared token budget; transient API errors (429, 5xx, timeouts)
+        are retried with backoff that honours Retry-After. A transcript whose
+        retries run out yields a failed ScoringResult.
+
+        Args:
+            items: (episode_id, transcript) pairs; episode IDs must be unique
+            concurrency: Requests in flight at once (default: max_concurrency)
+            token_budget: Tokens-per-minute budget (default: the scorer's)
+
+        Yields:
+            ScoringResult per item, in completion order
+        """
+        concurrency = max(1, concurrency or self.max_concurrency)
+        token_budget = token_budget or self.token_budget
+
+        # Score cache reads and prefilter embeddings block: keep them off the event loop
+        results, pending, cache_keys = await asyncio.to_thread(self._answer_without_llm, items)
+        for result in results.values():
+            yield result
+
+        if not pending:
+            return
+
+        logger.info(
+            f"Scoring {len(pending)} transcripts, {concurrency} concurrent "
+            f"({len(results)} answered from cache or prefilter)"
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        client = self._make_async_client()
+        tasks = [
+            asyncio.ensure_future(self._score_excerpt_async(
+                client, semaphore, token_budget, excerpt, episode_id, cache_keys.get(episode_id)
+            ))
+            for episode_id, excerpt in pending
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Consumer stopped early: don't leave requests running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await client.close()
+
     def is_relevant(self, scores: Dict[str, float]) -> bool:
         """
         Check if any topic score meets the relevance threshold.
@@ -0,0 +1,200 @@
+"""
+Relevance Prefilter
+
+Embedding-based gate in front of the LLM scorer. Each transcript excerpt is
+embedded once and compared by cosine similarity to embeddings of every
+active topic's name and description. Transcripts whose best similarity is
+below a calibrated floor are marked not relevant without a scoring call;
+borderline and likely-relevant ones are escalated to the LLM.
+
+An embedding costs a small fraction of a scoring call, so the prefilter pays
+for itself as long as the floor skips a meaningful share of off-topic
+videos. Calibrate the floor against historical scores with
+scripts/calibrate_prefilter.py before enabling it.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from openai import OpenAI
+
+from src.llm.client import create_openai_client
+from src.llm.embeddings import embed_texts
+from src.llm.pricing import estimate_cost
+from src.llm.usage import STAGE_PREFILTER
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
+
+# Conservative default; replace with the calibrated value
+DEFAULT_FLOOR = 0.15
+
+# Topic embeddings by (model, text), shared by every prefilter in the process
+_topic_embeddings: Dict[Tuple[str, str], np.ndarray] = {}
+
+
+@dataclass
+class PrefilterDecision:
+    """Prefilter outcome for one excerpt."""
+    similarities: Dict[str, float] = field(default_factory=dict)
+    best_similarity: float = 0.0
+    escalate: bool = True
+    error: Optional[str] = None
+
+
+def topic_text(topic: Dict[str, Any]) -> str:
+    """Text embedded for a topic: its name and description."""
+    description = topic.get('description')
+    return f"{topic['name']}: {description}" if description else topic['name']
+
+
+class RelevancePrefilter:
+    """
+    Embedding similarity gate that decides which transcripts need LLM scoring.
+
+    Embedding errors never drop a transcript: the excerpt is escalated to the
+    LLM as if the prefilter were disabled.
+    """
+
+    def __init__(
+        self,
+        topics: List[Dict[str, Any]],
+        floor: float = DEFAULT_FLOOR,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        client: OpenAI = None
+    ):
+        """
+        Initialize the prefilter.
+
+        Args:
+            topics: List of topic dicts with 'name' and 'description'
+            floor: Best topic similarity below which a transcript is not relevant
+            model: OpenAI embedding model
+            client: OpenAI client (default: create_openai_client())
+        """
+        if client is None:
+            client = create_openai_client(timeout=60.0)
+
+        self.client = client
+        self.topics = topics
+        self.topic_names = [t['name'] for t in topics]
+        self.floor = floor
+        self.model = model
+        self._topic_matrix: Optional[np.ndarray] = None
+
+        self.checks = 0
+        self.skipped = 0
+        self.errors = 0
+        self.embedding_tokens = 0
+
+    @classmethod
+    def from_settings(cls, topics: List[Dict[str, Any]], db_client) -> 'RelevancePrefilter':
+        """
+        Create a prefilter from web_settings (ai_content_scoring.prefilter_floor
+        and ai_content_scoring.prefilter_model).
+
+        Args:
+            topics: List of topic dicts with 'name' and 'description'
+            db_client: Database client for fetching settings
+
+        Returns:
+            RelevancePrefilter
+        """
+        return cls(
+            topics=topics,
+            floor=db_client.get_setting('ai_content_scoring', 'prefilter_floor', DEFAULT_FLOOR),
+            model=db_client.get_setting('ai_content_scoring', 'prefilter_model', DEFAULT_EMBEDDING_MODEL)
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts (see src.llm.embeddings.embed_texts).
+
+        Args:
+            texts: Non-empty strings
+
+        Returns:
+            float32 matrix with one L2-normalized row per text
+        """
+        result = embed_texts(self.client, STAGE_PREFILTER, self.model, texts)
+        self.embedding_tokens += result.prompt_tokens
+        return result.vectors
+
+    def _topic_embeddings(self) -> np.ndarray:
+        """Normalized topic embeddings (topics x dims), embedding only unseen topic texts."""
+        if self._topic_matrix is None:
+            texts = [topic_text(t) for t in self.topics]
+            missing = [text for text in dict.fromkeys(texts) if (self.model, text) not in _topic_embeddings]
+            if missing:
+                for text, vector in zip(missing, self.embed(missing)):
+                    _topic_embeddings[(self.model, text)] = vector
+                logger.info(f"Embedded {len(missing)} topic descriptions with {self.model}")
+            self._topic_matrix = np.stack([_topic_embeddings[(self.model, text)] for text in texts])
+        return self._topic_matrix
+
+    def similarities(self, excerpts: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of each excerpt to each topic.
+
+        Args:
+            excerpts: Transcript excerpts
+
+        Returns:
+            Matrix of shape (len(excerpts), len(topics))
+        """
+        if not excerpts:
+            return np.zeros((0, len(self.topics)), dtype=np.float32)
+        topic_matrix = self._topic_embeddings()
+        return self.embed([e if e.strip() else ' ' for e in excerpts]) @ topic_matrix.T
+
+    def check_many(self, excerpts: List[str]) -> List[PrefilterDecision]:
+        """
+        Decide which excerpts need LLM scoring, with one embedding request per chunk.
+
+        Args:
+            excerpts: Transcript excerpts (as sent to the scorer)
+
+        Returns:
+            PrefilterDecision per excerpt, in input order
+        """
+        if not excerpts:
+            return []
+        self.checks += len(excerpts)
+
+        try:
+            matrix = self.similarities(excerpts)
+        except Exception as e:
+            self.errors += len(excerpts)
+            logger.warning(f"Relevance prefilter unavailable, escalating {len(excerpts)} transcripts: {e}")
+            return [PrefilterDecision(error=str(e)) for _ in excerpts]
+
+        decisions = []
+        for row in matrix:
+            best = float(row.max()) if row.size else 0.0
+            escalate = best >= self.floor
+            if not escalate:
+                self.skipped += 1
+            decisions.append(PrefilterDecision(
+                similarities={name: round(float(s), 4) for name, s in zip(self.topic_names, row)},
+                best_similarity=best,
+                escalate=escalate
+            ))
+        return decisions
+
+    def check(self, excerpt: str) -> PrefilterDecision:
+        """Decide whether one excerpt needs LLM scoring."""
+        return self.check_many([excerpt])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this run."""
+        return {
+            'checks': self.checks,
+            'skipped': self.skipped,
+            'escalated': self.checks - self.skipped,
+            'errors': self.errors,
+            'embedding_tokens': self.embedding_tokens,
+            'embedding_cost_usd': round(estimate_cost(self.model, self.embedding_tokens), 6),
+        }
@@ -0,0 +1,224 @@
+"""
+Score Cache
+
+Remembers topic scores for transcript excerpts so identical scoring
+requests are never paid for twice: a rescore after a crash, a reprocessed
+feed, or the same video re-uploaded on another channel.
+
+The cache key covers everything that determines the model's answer: the
+excerpt text sent to the model, the topic names and descriptions, the model
+and the scoring prompt version. Entries live in the score_cache table, with
+a small in-process LRU in front of it.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.llm.pricing import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+# In-process entries kept in front of the database
+DEFAULT_MEMORY_ENTRIES = 1024
+
+
+def topic_fingerprint(topics: List[Dict[str, Any]]) -> str:
+    """
+    Fingerprint a topic set by names and descriptions (order-insensitive).
+
+    Args:
+        topics: List of topic dicts with 'name' and 'description'
+
+    Returns:
+        16-character hex digest
+    """
+    items = sorted((t['name'], t.get('description') or '') for t in topics)
+    payload = json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def topic_hash(topic: Dict[str, Any]) -> str:
+    """
+    Hash one topic's name and description, to detect added or edited topics.
+
+    Args:
+        topic: Topic dict with 'name' and 'description'
+
+    Returns:
+        16-character hex digest
+    """
+    payload = json.dumps([topic['name'], topic.get('description') or ''], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def make_score_key(excerpt: str, topics_fingerprint: str, model: str, prompt_version: str) -> str:
+    """
+    Build the cache key for one scoring request.
+
+    Args:
+        excerpt: Exact transcript excerpt sent to the model
+        topics_fingerprint: Result of topic_fingerprint()
+        model: OpenAI model name
+        prompt_version: Scoring prompt version constant
+
+    Returns:
+        64-character hex digest
+    """
+    excerpt_hash = hashlib.sha256(excerpt.encode('utf-8')).hexdigest()
+    payload = '\n'.join((prompt_version, model, topics_fingerprint, excerpt_hash))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """
+    Read-through score cache: in-process LRU backed by the score_cache table.
+
+    Database errors never fail scoring; the first one is logged and the
+    cache carries on memory-only for the rest of the run. Safe to share
+    between threads: the LRU and counters are locked, database calls are not.
+    """
+
+    def __init__(self, db_client=None, max_memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            db_client: Database client with get_cached_scores/store_cached_scores
+                       (None for a memory-only cache)
+            max_memory_entries: In-process LRU size
+        """
+        self.db = db_client
+        self.max_memory_entries = max_memory_entries
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.tokens_saved = 0
+        self.cost_saved = 0.0
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Add an entry to the LRU (caller holds _lock)."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disable_db(self, error: Exception) -> None:
+        with self._lock:
+            if self.db is None:
+                return
+            self.db = None
+        logger.warning(f"Score cache database unavailable, using memory only: {error}")
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """
+        Look up cached scores.
+
+        Args:
+            key: Result of make_score_key()
+
+        Returns:
+            Topic scores dict, or None on a miss
+        """
+        with self._lock:
+            self.lookups += 1
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            db = self.db
+
+        if entry is None and db:
+            try:
+                entry = db.get_cached_scores(key)
+            except Exception as e:
+                self._disable_db(e)
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self.db_hits += 1
+                    self._remember(key, entry)
+
+        if entry is None:
+            return None
+
+        prompt_tokens = entry.get('prompt_tokens') or 0
+        completion_tokens = entry.get('completion_tokens') or 0
+        cost = estimate_cost(entry.get('model', ''), prompt_tokens, completion_tokens)
+        with self._lock:
+            self.tokens_saved += prompt_tokens + completion_tokens
+            self.cost_saved += cost
+        return dict(entry['scores'])
+
+    def put(
+        self,
+        key: str,
+        scores: Dict[str, float],
+        model: str,
+        prompt_version: str,
+        topics_fingerprint: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0
+    ) -> None:
+        """
+        Store scores for a request that was just paid for.
+
+        Args:
+            key: Result of make_score_key()
+            scores: Topic scores returned by the model
+            model: OpenAI model name
+            prompt_version: Scoring prompt version constant
+            topics_fingerprint: Result of topic_fingerprint()
+            prompt_tokens: Input tokens the request used
+            completion_tokens: Output tokens the request used
+        """
+        entry = {
+            'scores': dict(scores),
+            'model': model,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+        }
+        with self._lock:
+            self._remember(key, entry)
+            db = self.db
+
+        if db:
+            try:
+                db.store_cached_scores(
+                    cache_key=key,
+                    scores=scores,
+                    model=model,
+                    prompt_version=prompt_version,
+                    topic_fingerprint=topics_fingerprint,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens
+                )
+            except Exception as e:
+                self._disable_db(e)
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.db_hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this run."""
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'hit_rate': round(self.hit_rate, 3),
+                'tokens_saved': self.tokens_saved,
+                'cost_saved_usd': round(self.cost_saved, 4),
+            }
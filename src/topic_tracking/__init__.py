@@ -5,7 +5,12 @@ Extracts and tracks story arcs from transcripts.
 Story arcs are evolving news narratives tracked across multiple episodes.
 """
 
+from src.topic_tracking.arc_context import ArcContextCache, PointInTimeArcContext
+from src.topic_tracking.arc_resolution import ArcResolutionIndex
+from src.topic_tracking.arc_retrieval import ArcRetriever
+from src.topic_tracking.arc_summarizer import ArcSummarizer
 from src.topic_tracking.topic_extractor import StoryArcExtractor
 from src.topic_tracking.semantic_matcher import SemanticTopicMatcher
+from src.topic_tracking.fused_analyzer import FusedEpisodeAnalyzer
 
-__all__ = ['StoryArcExtractor', 'SemanticTopicMatcher']
+__all__ = ['ArcContextCache', 'PointInTimeArcContext', 'ArcResolutionIndex', 'ArcRetriever', 'ArcSummarizer', 'StoryArcExtractor', 'SemanticTopicMatcher', 'FusedEpisodeAnalyzer']
@@ -0,0 +1,278 @@
+"""
+ArcContextCache: per-run cache of the active story arcs shown to the extractor.
+
+Every extraction prompt includes the digest topic's active story arcs. Loading
+them means one query for the arcs plus one per arc for its events, and during
+a run only the run's own writes change the result. The cache loads each
+digest topic once, applies the extractor's new arcs and events to its copy in
+place, and memoizes the formatted prompt text until the next change, so the
+cost of building arc context no longer grows with the number of episodes.
+
+Writes made by other processes during the run (e.g. dedupe_topics.py) are not
+seen until invalidate() is called or a new cache is created.
+
+PointInTimeArcContext shows the arcs as they stood on a past date instead,
+for backfills that extract from old episodes.
+"""
+
+import bisect
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Arcs and events per arc shown in extraction prompts
+DEFAULT_MAX_ARCS = 20
+DEFAULT_MAX_EVENTS_PER_ARC = 4
+
+
+class ArcContextCache:
+    """
+    Thread-safe, write-through cache of active story arcs per digest topic.
+
+    Mirrors what SupabaseClient.get_story_arcs_for_prompt would return after
+    each write: arcs ordered by last update, events ordered by date, and the
+    same prompt formatting.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        max_arcs: int = DEFAULT_MAX_ARCS,
+        max_events_per_arc: int = DEFAULT_MAX_EVENTS_PER_ARC
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_client: Database client with get_active_story_arcs and
+                       format_story_arcs_for_prompt
+            max_arcs: Arcs included in the prompt text
+            max_events_per_arc: Most recent events shown per arc
+        """
+        self.db = db_client
+        self.max_arcs = max_arcs
+        self.max_events_per_arc = max_events_per_arc
+        self.max_events_stored = db_client.get_setting('story_arcs', 'max_events_per_arc', 20)
+
+        self._arcs: Dict[str, List[Dict[str, Any]]] = {}
+        self._text: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._loads = 0
+        self._lookups = 0
+        self._formats = 0
+        self._writes = 0
+
+    def _load(self, digest_topic: str) -> List[Dict[str, Any]]:
+        """Arcs for a digest topic, loading them on first use (call with the lock held)."""
+        arcs = self._arcs.get(digest_topic)
+        if arcs is None:
+            arcs = self.db.get_active_story_arcs(digest_topic)
+            self._arcs[digest_topic] = arcs
+            self._loads += 1
+            logger.debug(f"Loaded {len(arcs)} active story arcs for {digest_topic}")
+        return arcs
+
+    def get_arcs(self, digest_topic: str) -> List[Dict[str, Any]]:
+        """Active arcs (with events) for a digest topic, most recently updated first."""
+        with self._lock:
+            return list(self._load(digest_topic))
+
+    def get_prompt_arcs(self, digest_topic: str) -> List[Dict[str, Any]]:
+        """Arcs eligible for extraction prompts, most recently updated first."""
+        return self.get_arcs(digest_topic)
+
+    def get_prompt_context(self, digest_topic: str) -> str:
+        """
+        Formatted active arcs for an extraction prompt.
+
+        Args:
+            digest_topic: Parent topic name
+
+        Returns:
+            Prompt text ('' if the topic has no active arcs)
+        """
+        with self._lock:
+            self._lookups += 1
+            text = self._text.get(digest_topic)
+            if text is None:
+                text = self.db.format_story_arcs_for_prompt(
+                    self.get_prompt_arcs(digest_topic), self.max_arcs, self.max_events_per_arc
+                )
+                self._text[digest_topic] = text
+                self._formats += 1
+            return text
+
+    def record_event(self, digest_topic: str, arc: Dict[str, Any], event: Dict[str, Any]) -> None:
+        """
+        Apply an event just stored with add_story_arc_event.
+
+        Args:
+            digest_topic: Parent topic of the arc
+            arc: Story arc the event was added to (as returned by the database)
+            event: Stored event (as returned by add_story_arc_event)
+        """
+        with self._lock:
+            if digest_topic not in self._arcs:
+                # Not loaded yet: the first lookup will read the write from the database
+                return
+            cached = self._find(digest_topic, arc['id'])
+            if cached is None:
+                # Arc older than the retention window, revived by this event
+                cached = {**arc, 'events': []}
+                self._arcs[digest_topic].append(cached)
+            self._add_event(digest_topic, cached, event)
+
+    def record_new_arc(
+        self,
+        digest_topic: str,
+        arc: Dict[str, Any],
+        initial_event: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Apply an arc just stored with create_story_arc.
+
+        create_story_arc returns an existing arc with the same slug unchanged
+        (its initial event is not stored), so an arc already in the cache is
+        left as it is.
+
+        Args:
+            digest_topic: Parent topic of the arc
+            arc: Story arc returned by create_story_arc
+            initial_event: Event create_story_arc was given, if any
+        """
+        with self._lock:
+            if digest_topic not in self._arcs or self._find(digest_topic, arc['id']) is not None:
+                return
+            cached = {**arc, 'events': []}
+            self._arcs[digest_topic].append(cached)
+            if initial_event:
+                self._add_event(digest_topic, cached, {'story_arc_id': arc['id'], **initial_event})
+            else:
+                self._changed(digest_topic)
+
+    def invalidate(self, digest_topic: str = None) -> None:
+        """Drop cached arcs for one digest topic (or all), forcing a reload."""
+        with self._lock:
+            if digest_topic is None:
+                self._arcs.clear()
+                self._text.clear()
+            else:
+                self._arcs.pop(digest_topic, None)
+                self._text.pop(digest_topic, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Loads from the database, prompt lookups, formatting passes and writes applied."""
+        with self._lock:
+            return {
+                'loads': self._loads,
+                'lookups': self._lookups,
+                'formats': self._formats,
+                'writes': self._writes,
+            }
+
+    def _find(self, digest_topic: str, arc_id: int) -> Optional[Dict[str, Any]]:
+        for arc in self._arcs[digest_topic]:
+            if arc['id'] == arc_id:
+                return arc
+        return None
+
+    def _add_event(self, digest_topic: str, arc: Dict[str, Any], event: Dict[str, Any]) -> None:
+        """Insert an event the way add_story_arc_event updates the database row."""
+        events = arc.setdefault('events', [])
+        dates = [_sort_date(e.get('event_date')) for e in events]
+        events.insert(bisect.bisect_right(dates, _sort_date(event.get('event_date'))), event)
+
+        # add_story_arc_event counts before pruning the oldest events
+        arc['event_count'] = len(events)
+        arc['source_count'] = len({e['source_feed_id'] for e in events if e.get('source_feed_id') is not None})
+        arc['last_updated_at'] = event.get('event_date') or arc.get('last_updated_at')
+        if len(events) > self.max_events_stored:
+            del events[:len(events) - self.max_events_stored]
+
+        self._changed(digest_topic)
+
+    def _changed(self, digest_topic: str) -> None:
+        """Re-sort a topic's arcs by last update and drop its memoized prompt text."""
+        self._arcs[digest_topic].sort(key=lambda a: _sort_date(a.get('last_updated_at')), reverse=True)
+        self._text.pop(digest_topic, None)
+        self._writes += 1
+
+
+class PointInTimeArcContext(ArcContextCache):
+    """
+    Arc context as of a past date, for extracting from old episodes.
+
+    Arcs written by a backfill carry old event dates, so in a regular cache
+    they sort behind the current arcs and rarely make the prompt. Here each
+    digest topic has an as-of date (the episode being extracted): prompts
+    show only events up to that date, and only arcs with such an event inside
+    the retention window before it, ordered by their last event by then.
+    Name resolution (get_arcs) still sees every loaded arc.
+    """
+
+    def __init__(self, db_client, load_days: int, retention_days: int = None, **kwargs):
+        """
+        Initialize the context.
+
+        Args:
+            db_client: Database client (see ArcContextCache)
+            load_days: Arcs updated in the last N days are loaded; cover the
+                       backfill window plus the retention window
+            retention_days: Days before the as-of date an arc stays active
+                            (default: story_arcs.retention_days)
+            **kwargs: max_arcs and max_events_per_arc, as for ArcContextCache
+        """
+        super().__init__(db_client, **kwargs)
+        self.load_days = load_days
+        self.retention_days = retention_days or db_client.get_setting('story_arcs', 'retention_days', 14)
+        self._as_of: Dict[str, datetime] = {}
+
+    def _load(self, digest_topic: str) -> List[Dict[str, Any]]:
+        arcs = self._arcs.get(digest_topic)
+        if arcs is None:
+            arcs = self.db.get_active_story_arcs(digest_topic, days=self.load_days)
+            self._arcs[digest_topic] = arcs
+            self._loads += 1
+            logger.debug(f"Loaded {len(arcs)} story arcs of the last {self.load_days} days for {digest_topic}")
+        return arcs
+
+    def set_as_of(self, digest_topic: str, as_of: Optional[datetime]) -> None:
+        """Show a digest topic's arcs as of this date (None: as of now)."""
+        with self._lock:
+            if self._as_of.get(digest_topic) != as_of:
+                self._as_of[digest_topic] = as_of
+                self._text.pop(digest_topic, None)
+
+    def get_prompt_arcs(self, digest_topic: str) -> List[Dict[str, Any]]:
+        """Arcs with their events as of the topic's as-of date, last updated first."""
+        with self._lock:
+            as_of = self._as_of.get(digest_topic)
+            if as_of is None:
+                return self.get_arcs(digest_topic)
+
+            limit = _sort_date(as_of)
+            cutoff = _sort_date(as_of - timedelta(days=self.retention_days))
+            arcs = []
+            for arc in self._load(digest_topic):
+                events = [e for e in arc.get('events', []) if _sort_date(e.get('event_date')) <= limit]
+                last = max((e['event_date'] for e in events if e.get('event_date')), key=_sort_date, default=None)
+                if last is None or _sort_date(last) < cutoff:
+                    continue
+                view = {**arc, 'events': events, 'last_updated_at': last, 'event_count': len(events)}
+                if len(events) < len(arc.get('events', [])):
+                    # The summary covers events after the as-of date
+                    view['summary'] = None
+                arcs.append(view)
+
+            arcs.sort(key=lambda a: _sort_date(a['last_updated_at']), reverse=True)
+            return arcs
+
+
+def _sort_date(value) -> float:
+    """Sortable timestamp for a (possibly missing or naive) datetime."""
+    if not isinstance(value, datetime):
+        return float('-inf')
+    return value.timestamp()
@@ -0,0 +1,278 @@
+"""
+ArcResolutionIndex: resolves extracted arc names to existing story arcs in memory.
+
+The database matches an extracted arc name to an existing arc only by exact
+slug, so small variants from the model ("GPT-5.2 Release" for "GPT 5.2
+Launch", "OpenAI's GPT-5" for "GPT-5 OpenAI") create a new arc each time,
+which dedupe_topics.py later has to merge. The index loads each digest
+topic's active arcs and learned aliases once and resolves a name, before
+anything is written, by:
+
+1. exact slug of an active arc
+2. learned alias (slugs of arcs merged away by dedupe_topics.py, and names
+   previously resolved here)
+3. token key: the name's words, normalized and sorted, so word order,
+   possessives, stopwords and common synonyms (release/launch) don't matter
+4. trigram similarity of token keys, above a threshold and only between
+   names with the same numbers (so "GPT-4" never resolves to "GPT-5")
+
+Fuzzy resolutions are stored as aliases, so the same variant resolves
+exactly in later runs.
+"""
+
+import logging
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Minimum trigram similarity (Jaccard) between token keys for a fuzzy match
+DEFAULT_FUZZY_THRESHOLD = 0.7
+
+STOPWORDS = {'a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'its', 'of', 'on', 'the', 'to', 'vs', 'with'}
+
+# Interchangeable words in arc names, mapped to one form
+TOKEN_EQUIVALENTS = {
+    'release': 'launch', 'released': 'launch', 'releases': 'launch',
+    'launched': 'launch', 'launches': 'launch', 'rollout': 'launch', 'debut': 'launch',
+    'announced': 'announcement', 'announces': 'announcement',
+    'unveiling': 'announcement', 'unveiled': 'announcement', 'unveils': 'announcement',
+    'regulations': 'regulation', 'rules': 'regulation',
+    'lawsuits': 'lawsuit', 'suit': 'lawsuit',
+}
+
+
+def name_tokens(arc_name: str) -> List[str]:
+    """Normalized words of an arc name (or slug)."""
+    text = arc_name.lower()
+    text = re.sub(r"['’]s\b", '', text)
+    text = re.sub(r'(?<=\d)\.(?=\d)', '', text)  # "5.2" -> "52", as in slugs
+    text = re.sub(r'(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])', ' ', text)  # "gpt5" -> "gpt 5"
+    tokens = [TOKEN_EQUIVALENTS.get(t, t) for t in re.findall(r'[a-z0-9]+', text)]
+    return [t for t in tokens if t not in STOPWORDS]
+
+
+def token_key(arc_name: str) -> str:
+    """Order-independent key of an arc name."""
+    return ' '.join(sorted(set(name_tokens(arc_name))))
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Word trigrams of a token key, padded like pg_trgm."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _numbers(key: str) -> Set[str]:
+    return {t for t in key.split() if t.isdigit()}
+
+
+@dataclass
+class ArcMatch:
+    """An existing arc an extracted name resolved to."""
+    arc: Dict[str, Any]
+    method: str  # slug, alias, key, fuzzy
+    similarity: float = 1.0
+
+
+class _TopicIndex:
+    """Lookup structures for one digest topic."""
+
+    def __init__(self):
+        self.arcs: Dict[int, Dict[str, Any]] = {}
+        self.by_slug: Dict[str, int] = {}
+        self.by_key: Dict[str, int] = {}
+        self.aliases: Dict[str, int] = {}
+        self.alias_keys: Dict[str, int] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.key_trigrams: Dict[str, Set[str]] = {}
+
+    def add_key(self, key: str) -> None:
+        if not key or key in self.key_trigrams:
+            return
+        grams = _trigrams(key)
+        self.key_trigrams[key] = grams
+        for gram in grams:
+            self.postings[gram].add(key)
+
+    def arc_for_key(self, key: str) -> Optional[int]:
+        arc_id = self.by_key.get(key)
+        return arc_id if arc_id is not None else self.alias_keys.get(key)
+
+
+class ArcResolutionIndex:
+    """
+    Thread-safe per-digest-topic index of active arc names and aliases.
+
+    Shares loaded arcs with an ArcContextCache when one is given, so the index
+    costs no extra queries for arcs; aliases are one query per topic.
+    """
+
+    def __init__(self, db_client, arc_context=None, fuzzy_threshold: float = None):
+        """
+        Initialize the index.
+
+        Args:
+            db_client: Database client with story arc and alias methods
+            arc_context: ArcContextCache to read active arcs from (default: query them)
+            fuzzy_threshold: Minimum trigram similarity for a fuzzy match
+                             (default: topic_tracking.arc_fuzzy_threshold)
+        """
+        self.db = db_client
+        self.arc_context = arc_context
+        self.normalize_slug = db_client._normalize_arc_slug
+        self.fuzzy_threshold = fuzzy_threshold or db_client.get_setting(
+            'topic_tracking', 'arc_fuzzy_threshold', DEFAULT_FUZZY_THRESHOLD
+        )
+
+        self._topics: Dict[str, _TopicIndex] = {}
+        self._lock = threading.RLock()
+        self._counts = defaultdict(int)
+
+    def _load(self, digest_topic: str) -> _TopicIndex:
+        """Index for a digest topic, building it on first use (call with the lock held)."""
+        index = self._topics.get(digest_topic)
+        if index is not None:
+            return index
+
+        index = _TopicIndex()
+        if self.arc_context is not None:
+            arcs = self.arc_context.get_arcs(digest_topic)
+        else:
+            arcs = self.db.get_active_story_arcs(digest_topic)
+        for arc in arcs:
+            self._index_arc(index, arc)
+
+        try:
+            aliases = self.db.get_story_arc_aliases(digest_topic)
+        except Exception as e:
+            logger.warning(f"Failed to load story arc aliases for {digest_topic}: {e}")
+            aliases = {}
+        for alias_slug, arc_id in aliases.items():
+            self._index_alias(index, alias_slug, arc_id)
+
+        self._topics[digest_topic] = index
+        logger.debug(f"Indexed {len(arcs)} arcs and {len(aliases)} aliases for {digest_topic}")
+        return index
+
+    def _index_arc(self, index: _TopicIndex, arc: Dict[str, Any]) -> None:
+        index.arcs[arc['id']] = arc
+        index.by_slug.setdefault(arc.get('arc_slug') or self.normalize_slug(arc['arc_name']), arc['id'])
+        key = token_key(arc['arc_name'])
+        index.by_key.setdefault(key, arc['id'])
+        index.add_key(key)
+
+    def _index_alias(self, index: _TopicIndex, alias_slug: str, arc_id: int) -> None:
+        index.aliases[alias_slug] = arc_id
+        key = token_key(alias_slug)
+        index.alias_keys.setdefault(key, arc_id)
+        index.add_key(key)
+
+    def _arc(self, index: _TopicIndex, arc_id: int) -> Optional[Dict[str, Any]]:
+        """Arc by ID, fetching arcs outside the active window (e.g. alias targets) once."""
+        arc = index.arcs.get(arc_id)
+        if arc is None:
+            arc = self.db.get_story_arc(arc_id)
+            if arc is not None:
+                index.arcs[arc_id] = arc
+        return arc
+
+    def _fuzzy(self, index: _TopicIndex, key: str) -> Optional[tuple]:
+        """Best (arc_id, similarity) among keys sharing trigrams and numbers with key."""
+        grams = _trigrams(key)
+        if not grams:
+            return None
+
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in index.postings.get(gram, ()):
+                shared[candidate] += 1
+
+        numbers = _numbers(key)
+        best = None
+        for candidate, overlap in shared.items():
+            similarity = overlap / (len(grams) + len(index.key_trigrams[candidate]) - overlap)
+            if similarity < self.fuzzy_threshold or _numbers(candidate) != numbers:
+                continue
+            if best is None or similarity > best[1]:
+                best = (index.arc_for_key(candidate), similarity)
+        return best
+
+    def resolve(self, digest_topic: str, arc_name: str) -> Optional[ArcMatch]:
+        """
+        Find the existing arc an extracted arc name refers to.
+
+        Args:
+            digest_topic: Parent topic name
+            arc_name: Arc name returned by the model
+
+        Returns:
+            ArcMatch, or None if the name is new to this topic
+        """
+        slug = self.normalize_slug(arc_name)
+        key = token_key(arc_name)
+
+        with self._lock:
+            index = self._load(digest_topic)
+            self._counts['lookups'] += 1
+
+            match = None
+            if slug in index.by_slug:
+                match = ArcMatch(self._arc(index, index.by_slug[slug]), 'slug')
+            elif slug in index.aliases:
+                match = ArcMatch(self._arc(index, index.aliases[slug]), 'alias')
+            elif index.arc_for_key(key) is not None:
+                match = ArcMatch(self._arc(index, index.arc_for_key(key)), 'key')
+            else:
+                fuzzy = self._fuzzy(index, key)
+                if fuzzy:
+                    match = ArcMatch(self._arc(index, fuzzy[0]), 'fuzzy', fuzzy[1])
+
+            if match is None or match.arc is None:
+                self._counts['misses'] += 1
+                return None
+
+            self._counts[match.method] += 1
+            if match.method in ('key', 'fuzzy'):
+                self._learn_alias(digest_topic, index, slug, match.arc['id'])
+
+        if match.method != 'slug':
+            logger.info(
+                f"Resolved arc name '{arc_name}' to '{match.arc['arc_name']}' "
+                f"(id={match.arc['id']}, {match.method}, similarity={match.similarity:.2f})"
+            )
+        return match
+
+    def _learn_alias(self, digest_topic: str, index: _TopicIndex, slug: str, arc_id: int) -> None:
+        """Remember a resolved variant so it matches exactly from now on."""
+        self._index_alias(index, slug, arc_id)
+        try:
+            self.db.add_story_arc_aliases(digest_topic, {slug: arc_id}, source='fuzzy')
+        except Exception as e:
+            logger.warning(f"Failed to store story arc alias '{slug}': {e}")
+
+    def add_arc(self, digest_topic: str, arc: Dict[str, Any]) -> None:
+        """Index an arc just created (or found) in the database."""
+        with self._lock:
+            index = self._topics.get(digest_topic)
+            if index is not None and arc['id'] not in index.arcs:
+                self._index_arc(index, arc)
+
+    def invalidate(self, digest_topic: str = None) -> None:
+        """Drop the index for one digest topic (or all), forcing a reload."""
+        with self._lock:
+            if digest_topic is None:
+                self._topics.clear()
+            else:
+                self._topics.pop(digest_topic, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Lookups, resolutions per method and misses."""
+        with self._lock:
+            return {name: self._counts[name] for name in ('lookups', 'slug', 'alias', 'key', 'fuzzy', 'misses')}
@@ -0,0 +1,262 @@
+"""
+ArcRetriever: picks the story arcs most similar to an episode as extraction context.
+
+By default the extraction prompt lists the most recently updated arcs,
+whatever the episode is about, so prompts grow with the arc count and an
+older arc the episode continues can fall off the list and be created again.
+With retrieval, each arc is embedded once (name plus latest events; vectors
+are stored in story_arc_embeddings and refreshed only when that text
+changes), the episode excerpt is embedded per episode, and the arcs are
+ranked by cosine similarity in one matrix product. The top-k arcs that fit
+a token budget are sent.
+
+Enable with topic_tracking.arc_retrieval_enabled; tune with
+topic_tracking.arc_retrieval_top_k and topic_tracking.arc_retrieval_token_budget.
+Compare prompt sizes and duplicate rates with scripts/report_arc_retrieval.py.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from openai import OpenAI
+
+from src.llm.client import create_openai_client
+from src.llm.embeddings import embed_texts
+from src.llm.models import count_tokens
+from src.llm.usage import STAGE_ARC_RETRIEVAL
+from src.topic_tracking.arc_context import DEFAULT_MAX_EVENTS_PER_ARC
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
+DEFAULT_TOP_K = 8
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Latest event summaries included in an arc's embedded text
+ARC_TEXT_EVENTS = 3
+
+# Excerpt embeddings kept in memory (the same excerpt is looked up once per topic)
+EXCERPT_CACHE_SIZE = 32
+
+
+def arc_text(arc: Dict[str, Any]) -> str:
+    """Text embedded for an arc: its name and latest event summaries."""
+    summaries = [e['event_summary'] for e in (arc.get('events') or [])[-ARC_TEXT_EVENTS:]]
+    return "\n".join([arc['arc_name'], *summaries])
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _prompt_hash(arc: Dict[str, Any]) -> str:
+    """Hash of what an arc's prompt text is formatted from."""
+    return _text_hash("\n".join([
+        arc_text(arc), str(arc.get('summary')), str(arc.get('summary_updated_at')),
+        str(arc.get('last_updated_at')), str(len(arc.get('events') or []))
+    ]))
+
+
+class ArcRetriever:
+    """
+    Ranks a digest topic's arcs by embedding similarity to an episode excerpt.
+
+    Embedding or database errors never fail extraction: the most recently
+    updated arcs are used instead, within the same limits.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        top_k: int = DEFAULT_TOP_K,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        max_events_per_arc: int = DEFAULT_MAX_EVENTS_PER_ARC,
+        client: OpenAI = None
+    ):
+        """
+        Initialize the retriever.
+
+        Args:
+            db_client: Database client with story arc embedding methods and
+                       format_story_arcs_for_prompt
+            top_k: Most arcs selected per prompt
+            token_budget: Most prompt tokens the selected arcs may take
+            model: OpenAI embedding model
+            max_events_per_arc: Events shown per arc (to size each arc's prompt text)
+            client: OpenAI client (default: create_openai_client())
+        """
+        self.db = db_client
+        self.client = client or create_openai_client(timeout=60.0)
+        self.top_k = max(1, top_k)
+        self.token_budget = token_budget
+        self.model = model
+        self.max_events_per_arc = max_events_per_arc
+
+        self._vectors: Dict[int, Tuple[str, np.ndarray]] = {}
+        self._tokens: Dict[int, Tuple[str, int]] = {}
+        self._excerpts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.selections = 0
+        self.retrieved = 0
+        self.fallbacks = 0
+        self.arcs_embedded = 0
+        self.arcs_loaded = 0
+
+    @classmethod
+    def from_settings(cls, db_client) -> 'ArcRetriever':
+        """
+        Create a retriever from web_settings (topic_tracking.arc_retrieval_top_k,
+        topic_tracking.arc_retrieval_token_budget and topic_tracking.embedding_model).
+        """
+        return cls(
+            db_client,
+            top_k=db_client.get_setting('topic_tracking', 'arc_retrieval_top_k', DEFAULT_TOP_K),
+            token_budget=db_client.get_setting('topic_tracking', 'arc_retrieval_token_budget', DEFAULT_TOKEN_BUDGET),
+            model=db_client.get_setting('topic_tracking', 'embedding_model', DEFAULT_EMBEDDING_MODEL)
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts (see src.llm.embeddings.embed_texts).
+
+        Returns:
+            float32 matrix with one L2-normalized row per text
+        """
+        return embed_texts(self.client, STAGE_ARC_RETRIEVAL, self.model, texts).vectors
+
+    def _arc_matrix(self, arcs: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Normalized embeddings (arcs x dims), from memory, then the database,
+        then the API for arcs whose text is new or changed.
+        """
+        hashes = [_text_hash(arc_text(arc)) for arc in arcs]
+        with self._lock:
+            missing = [
+                (arc, text_hash) for arc, text_hash in zip(arcs, hashes)
+                if self._vectors.get(arc['id'], (None,))[0] != text_hash
+            ]
+
+        if missing:
+            try:
+                stored = self.db.get_story_arc_embeddings([arc['id'] for arc, _ in missing], self.model)
+            except Exception as e:
+                logger.warning(f"Failed to load stored arc embeddings: {e}")
+                stored = {}
+
+            to_embed = []
+            with self._lock:
+                for arc, text_hash in missing:
+                    row = stored.get(arc['id'])
+                    if row and row['text_hash'] == text_hash:
+                        self._vectors[arc['id']] = (text_hash, np.asarray(row['embedding'], dtype=np.float32))
+                        self.arcs_loaded += 1
+                    else:
+                        to_embed.append((arc, text_hash))
+
+            if to_embed:
+                vectors = self.embed([arc_text(arc) for arc, _ in to_embed])
+                with self._lock:
+                    for (arc, text_hash), vector in zip(to_embed, vectors):
+                        self._vectors[arc['id']] = (text_hash, vector)
+                    self.arcs_embedded += len(to_embed)
+                logger.info(f"Embedded {len(to_embed)} story arcs with {self.model}")
+                try:
+                    self.db.store_story_arc_embeddings(
+                        [(arc['id'], text_hash, vector.tolist()) for (arc, text_hash), vector in zip(to_embed, vectors)],
+                        self.model
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to store arc embeddings: {e}")
+
+        with self._lock:
+            return np.stack([self._vectors[arc['id']][1] for arc in arcs])
+
+    def _excerpt_vector(self, excerpt: str) -> np.ndarray:
+        """Normalized embedding of an excerpt, reused across topics of the same episode."""
+        key = _text_hash(excerpt)
+        with self._lock:
+            vector = self._excerpts.get(key)
+            if vector is not None:
+                self._excerpts.move_to_end(key)
+                return vector
+
+        vector = self.embed([excerpt])[0]
+        with self._lock:
+            self._excerpts[key] = vector
+            while len(self._excerpts) > EXCERPT_CACHE_SIZE:
+                self._excerpts.popitem(last=False)
+        return vector
+
+    def arc_tokens(self, arc: Dict[str, Any]) -> int:
+        """Prompt tokens one arc takes in the extraction prompt, counted again only when the arc changes."""
+        prompt_hash = _prompt_hash(arc)
+        with self._lock:
+            cached = self._tokens.get(arc['id'])
+        if cached and cached[0] == prompt_hash:
+            return cached[1]
+
+        tokens = count_tokens(self.db.format_story_arcs_for_prompt([arc], 1, self.max_events_per_arc))
+        with self._lock:
+            self._tokens[arc['id']] = (prompt_hash, tokens)
+        return tokens
+
+    def _pack(self, ranked: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Take arcs in order while they fit top_k and the token budget."""
+        selected = []
+        used = 0
+        for arc in ranked:
+            if len(selected) >= self.top_k:
+                break
+            tokens = self.arc_tokens(arc)
+            if used + tokens > self.token_budget:
+                continue
+            selected.append(arc)
+            used += tokens
+        return selected
+
+    def select(self, arcs: List[Dict[str, Any]], excerpt: str) -> List[Dict[str, Any]]:
+        """
+        Choose the arcs to show for one episode.
+
+        Args:
+            arcs: Active arcs with events, most recently updated first
+            excerpt: Transcript excerpt sent to the extractor
+
+        Returns:
+            Selected arcs, most similar first (all arcs, in recency order and
+            without an embedding call, when they already fit the limits)
+        """
+        self.selections += 1
+        if not arcs:
+            return []
+
+        recent = self._pack(arcs)
+        if len(recent) == len(arcs):
+            return recent
+
+        try:
+            similarities = self._arc_matrix(arcs) @ self._excerpt_vector(excerpt)
+        except Exception as e:
+            self.fallbacks += 1
+            logger.warning(f"Arc retrieval unavailable, using the most recent arcs: {e}")
+            return recent
+
+        self.retrieved += 1
+        order = np.argsort(-similarities, kind='stable')
+        return self._pack([arcs[i] for i in order])
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for this run."""
+        return {
+            'selections': self.selections,
+            'retrieved': self.retrieved,
+            'fallbacks': self.fallbacks,
+            'arcs_embedded': self.arcs_embedded,
+            'arcs_loaded': self.arcs_loaded,
+        }
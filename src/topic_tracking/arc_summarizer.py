@@ -0,0 +1,213 @@
+"""
+ArcSummarizer: keeps story_arcs.summary current, regenerating only stale arcs.
+
+A summary is stale when its arc has events extracted after the arc's
+summary_updated_at watermark. Stale arcs are summarized in batches (several
+arcs per request) with a few requests in flight. An arc that already has a
+summary gets the previous summary plus only its new events, so the cost of
+keeping an arc current does not grow with its history. The watermark is set
+to the newest event the summary covered, so events added while the job runs
+are picked up next time.
+
+Extraction prompts and the newsletter use the summary plus the events since
+it instead of the full timeline (see SupabaseClient.format_story_arcs_for_prompt).
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from src.llm.client import create_openai_client
+from src.llm.usage import STAGE_ARC_SUMMARY, chat_completion
+
+logger = logging.getLogger(__name__)
+
+# Bump when the summary prompt or schema changes
+SUMMARY_PROMPT_VERSION = 'arc-summary-v1'
+
+DEFAULT_SUMMARY_MODEL = 'gpt-4o-mini'
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_CONCURRENCY = 4
+
+# Output token allowance per arc in a batch
+OUTPUT_TOKENS_PER_ARC = 200
+
+SUMMARY_SYSTEM_PROMPT = """You maintain running summaries of news story arcs: ongoing narratives tracked across podcast episodes.
+
+For each story arc in the user message, write a summary of the whole story so far in 2-3 sentences (at most 80 words):
+what the story is, the key developments in order, and where it stands now.
+
+- If a previous summary is given, update it with the new events: keep what still matters, add what changed,
+  and drop details the new events supersede.
+- Use only facts from the previous summary and the events. No speculation.
+- Write in plain, neutral newsletter style. No source names.
+
+Return one entry per arc, with its arc_id."""
+
+
+@dataclass
+class SummaryRunStats:
+    """Outcome of one summary maintenance run."""
+    arcs_pending: int = 0
+    arcs_summarized: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class ArcSummarizer:
+    """Regenerates the summaries of story arcs with new events."""
+
+    def __init__(
+        self,
+        db_client,
+        model: str = None,
+        batch_size: int = None,
+        concurrency: int = None
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            db_client: Database client with story arc summary methods
+            model: Chat model (default: topic_tracking.summary_model)
+            batch_size: Arcs per request (default: topic_tracking.summary_batch_size)
+            concurrency: Requests in flight (default: topic_tracking.summary_concurrency)
+        """
+        self.db = db_client
+        self.client = create_openai_client(timeout=120.0)
+        self.model = model or db_client.get_setting('topic_tracking', 'summary_model', DEFAULT_SUMMARY_MODEL)
+        self.batch_size = max(1, batch_size or db_client.get_setting(
+            'topic_tracking', 'summary_batch_size', DEFAULT_BATCH_SIZE
+        ))
+        self.concurrency = max(1, concurrency or db_client.get_setting(
+            'topic_tracking', 'summary_concurrency', DEFAULT_CONCURRENCY
+        ))
+
+    @staticmethod
+    def new_events(arc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Events the arc's summary doesn't cover yet (all events if it has none)."""
+        watermark = arc.get('summary_updated_at')
+        if not arc.get('summary') or watermark is None:
+            return arc['events']
+        return [e for e in arc['events'] if e['extracted_at'] > watermark]
+
+    def _create_batch_prompt(self, arcs: List[Dict[str, Any]]) -> str:
+        """Per-batch part of the prompt: each arc's previous summary and new events."""
+        sections = []
+        for arc in arcs:
+            events = "\n".join(
+                f"- [{e['event_date'].strftime('%Y-%m-%d') if e['event_date'] else 'undated'}] {e['event_summary']}"
+                for e in self.new_events(arc)
+            )
+            previous = arc['summary'] if arc.get('summary') else "(none yet)"
+            sections.append(
+                f"### ARC {arc['id']}: {arc['arc_name']}\n"
+                f"Previous summary: {previous}\n"
+                f"New events:\n{events}"
+            )
+        return "\n\n".join(sections)
+
+    @staticmethod
+    def _create_schema() -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "summaries": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "arc_id": {"type": "integer"},
+                            "summary": {"type": "string"}
+                        },
+                        "required": ["arc_id", "summary"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["summaries"],
+            "additionalProperties": False
+        }
+
+    def summarize_batch(self, arcs: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Summarize a batch of arcs with one request.
+
+        Args:
+            arcs: Arcs with events, as returned by get_story_arcs_needing_summary
+
+        Returns:
+            List of (story_arc_id, summary, watermark) for arcs the model summarized
+        """
+        response = chat_completion(
+            self.client, STAGE_ARC_SUMMARY, prompt_version=SUMMARY_PROMPT_VERSION,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": self._create_batch_prompt(arcs)},
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "story_arc_summaries",
+                    "schema": self._create_schema(),
+                    "strict": True
+                }
+            },
+            max_completion_tokens=OUTPUT_TOKENS_PER_ARC * len(arcs),
+        )
+
+        returned = {
+            item['arc_id']: item['summary'].strip()
+            for item in json.loads(response.choices[0].message.content).get('summaries', [])
+            if item.get('summary', '').strip()
+        }
+        updates = []
+        for arc in arcs:
+            if arc['id'] in returned:
+                watermark = max(e['extracted_at'] for e in arc['events'])
+                updates.append((arc['id'], returned[arc['id']], watermark))
+        return updates
+
+    def run(self, digest_topic: str = None, limit: int = None, dry_run: bool = False) -> SummaryRunStats:
+        """
+        Regenerate the summaries of all arcs with new events.
+
+        Args:
+            digest_topic: Only arcs of this digest topic (optional)
+            limit: Maximum arcs to summarize, most recently updated first (optional)
+            dry_run: Find stale arcs without calling the model or writing
+
+        Returns:
+            SummaryRunStats
+        """
+        stats = SummaryRunStats()
+        arcs = self.db.get_story_arcs_needing_summary(digest_topic=digest_topic, limit=limit)
+        stats.arcs_pending = len(arcs)
+        logger.info(f"{len(arcs)} story arcs need a summary update")
+        if dry_run or not arcs:
+            return stats
+
+        batches = [arcs[i:i + self.batch_size] for i in range(0, len(arcs), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+            futures = {executor.submit(self.summarize_batch, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                stats.batches += 1
+                try:
+                    updates = future.result()
+                    stats.arcs_summarized += self.db.update_story_arc_summaries(updates)
+                    if len(updates) < len(batch):
+                        logger.warning(f"Model returned {len(updates)}/{len(batch)} summaries for a batch")
+                except Exception as e:
+                    error_msg = f"Summary batch of arcs {[a['id'] for a in batch]} failed: {e}"
+                    logger.error(error_msg)
+                    stats.errors.append(error_msg)
+
+        logger.info(
+            f"Updated {stats.arcs_summarized}/{stats.arcs_pending} story arc summaries "
+            f"in {stats.batches} batches"
+        )
+        return stats
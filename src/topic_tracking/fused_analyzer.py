@@ -0,0 +1,249 @@
+"""
+FusedEpisodeAnalyzer: scores an episode and extracts its story arcs in one call.
+
+The two-call path sends a scoring excerpt to ContentScorer and then, for every
+tracking-enabled topic the episode is relevant to, a larger excerpt to
+StoryArcExtractor. The fused path sends the extraction excerpt once with both
+tasks in one structured-output request: topic scores, plus continuing and new
+arcs for each tracking topic, left empty when that topic scores below the
+threshold. Input tokens are paid once per episode and there is one round trip
+instead of 1 + N.
+
+Stored results are identical in shape to the two-call path, so the pipeline
+can switch between them (topic_tracking.fused_extraction) and
+scripts/ab_fused_extraction.py can compare them on the same episodes.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
+
+from src.llm.models import get_max_output_tokens
+from src.llm.usage import STAGE_FUSED, chat_completion
+from src.scoring.content_scorer import SCORING_GUIDELINES, ContentScorer, ScoringResult
+from src.topic_tracking.topic_extractor import ARC_DEFINITION, ARC_GUIDELINES, ARC_TASK, StoryArcExtractor
+
+logger = logging.getLogger(__name__)
+
+# Bump when the fused prompt or schema changes
+FUSED_PROMPT_VERSION = 'fused-v2'
+
+# Output token allowance: scores, plus arcs for each tracking topic
+SCORES_OUTPUT_TOKENS = 300
+ARCS_OUTPUT_TOKENS_PER_TOPIC = 3000
+
+
+@dataclass
+class FusedResult:
+    """Scores for an episode and the story arc extractions of its relevant tracking topics."""
+    scoring: ScoringResult
+    extractions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class FusedEpisodeAnalyzer:
+    """
+    Scores a transcript and extracts its story arcs with one structured-output call.
+
+    Uses the scorer's topics and threshold and the extractor's model, excerpt
+    and active arcs context; neither is modified.
+    """
+
+    def __init__(
+        self,
+        scorer: ContentScorer,
+        extractor: StoryArcExtractor,
+        tracking_topics: List[Dict[str, Any]],
+        score_threshold: float = None
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            scorer: ContentScorer supplying topics, threshold and prefilter
+            extractor: StoryArcExtractor supplying model, client and excerpt settings
+            tracking_topics: Topics with story arc tracking enabled
+            score_threshold: Minimum topic score for arc extraction
+                             (default: the scorer's threshold)
+        """
+        self.scorer = scorer
+        self.extractor = extractor
+        self.client = extractor.client
+        self.model = extractor.model
+        self.score_threshold = score_threshold or scorer.score_threshold
+
+        scored_names = {topic['name'] for topic in scorer.topics}
+        self.tracking_topic_names = [t['name'] for t in tracking_topics if t['name'] in scored_names]
+
+        logger.info(
+            f"FusedEpisodeAnalyzer initialized: model={self.model}, "
+            f"tracking topics={self.tracking_topic_names}"
+        )
+
+    def _create_system_prompt(self) -> str:
+        """Static instructions for both tasks; identical for every episode in a run."""
+        return f"""You are an expert content analyst. Analyze the podcast episode transcript in the user message and complete two tasks.
+
+# TASK 1: TOPIC RELEVANCE
+
+Score the transcript's relevance to each topic on a scale of 0.0 to 1.0:
+
+Topics to evaluate:
+{self.scorer._topic_lines()}
+
+{SCORING_GUIDELINES}
+
+# TASK 2: STORY ARCS
+
+{ARC_DEFINITION}
+
+For each tracked topic ({", ".join(self.tracking_topic_names)}), identify:
+
+{ARC_TASK}
+
+If a tracked topic's score from Task 1 is below {self.score_threshold}, return empty
+continuing_arcs and new_arcs for it.
+
+{ARC_GUIDELINES}"""
+
+    def _create_episode_prompt(self, excerpt: str, episode_title: str) -> str:
+        """Active arcs per tracked topic, then the episode itself."""
+        arc_sections = []
+        for topic_name in self.tracking_topic_names:
+            active_arcs_context = self.extractor._get_active_arcs_context(topic_name, excerpt)
+            arc_sections.append(
+                f"### {topic_name}\n{active_arcs_context or 'No active story arcs yet.'}"
+            )
+        active_arcs = "\n\n".join(arc_sections)
+
+        return f"""## ACTIVE STORY ARCS BY TOPIC
+If this episode discusses any of these stories, add a NEW EVENT to that story arc
+rather than creating a duplicate.
+
+{active_arcs}
+
+---
+
+## EPISODE
+"{episode_title}"
+
+## TRANSCRIPT
+{excerpt}
+
+---
+Return the topic scores and the story arcs for each tracked topic."""
+
+    def _create_fused_schema(self) -> dict:
+        """JSON schema: topic scores plus an extraction object per tracking topic."""
+        extraction_schema = self.extractor._create_extraction_schema()
+        arc_properties = {name: extraction_schema for name in self.tracking_topic_names}
+
+        return {
+            "type": "object",
+            "properties": {
+                "scores": self.scorer._create_json_schema(),
+                "story_arcs": {
+                    "type": "object",
+                    "properties": arc_properties,
+                    "required": list(arc_properties.keys()),
+                    "additionalProperties": False
+                }
+            },
+            "required": ["scores", "story_arcs"],
+            "additionalProperties": False
+        }
+
+    def build_request(self, transcript: str, episode_title: str) -> Dict[str, Any]:
+        """
+        Build the fused request for one episode.
+
+        Args:
+            transcript: Full episode transcript
+            episode_title: Episode title for context
+
+        Returns:
+            Chat completion request body
+        """
+        excerpt = self.extractor.excerpt_builder.build(transcript, self.extractor.excerpt_tokens)
+        output_tokens = SCORES_OUTPUT_TOKENS + ARCS_OUTPUT_TOKENS_PER_TOPIC * len(self.tracking_topic_names)
+
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._create_system_prompt()},
+                {"role": "user", "content": self._create_episode_prompt(excerpt, episode_title)},
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "fused_scores_and_story_arcs",
+                    "schema": self._create_fused_schema(),
+                    "strict": True
+                }
+            },
+            "max_completion_tokens": min(output_tokens, get_max_output_tokens(self.model)),
+        }
+
+    def analyze(self, transcript: str, episode_guid: str, episode_title: str) -> FusedResult:
+        """
+        Score one episode and extract story arcs for its relevant tracking topics.
+
+        Extractions are returned only for tracking topics scoring at or above
+        the threshold, whatever the model returned for the others. Nothing is
+        stored; use StoryArcExtractor.store_extraction for each entry.
+
+        Args:
+            transcript: Full episode transcript
+            episode_guid: Episode GUID
+            episode_title: Episode title for context
+
+        Returns:
+            FusedResult (scoring.success is False if the call failed)
+        """
+        start_time = datetime.now()
+
+        if self.scorer.prefilter:
+            decision = self.scorer.prefilter.check(self.scorer.build_excerpt(transcript))
+            if not decision.escalate:
+                return FusedResult(scoring=self.scorer._prefiltered_result(episode_guid, decision, start_time))
+
+        try:
+            response = chat_completion(
+                self.client, STAGE_FUSED, episode_guid=episode_guid,
+                prompt_version=FUSED_PROMPT_VERSION, **self.build_request(transcript, episode_title)
+            )
+            data = json.loads(response.choices[0].message.content)
+            scores = self.scorer._validate_scores(data.get("scores", {}))
+        except Exception as e:
+            logger.error(f"Fused scoring and extraction failed for {episode_guid}: {e}")
+            return FusedResult(scoring=ScoringResult(
+                episode_id=episode_guid,
+                scores={},
+                processing_time=(datetime.now() - start_time).total_seconds(),
+                success=False,
+                error_message=str(e)
+            ))
+
+        story_arcs = data.get("story_arcs", {})
+        extractions = {
+            topic_name: story_arcs.get(topic_name, {"continuing_arcs": [], "new_arcs": []})
+            for topic_name in self.tracking_topic_names
+            if scores.get(topic_name, 0.0) >= self.score_threshold
+        }
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+        logger.info(
+            f"Fused analysis of {episode_guid} in {processing_time:.2f}s: "
+            f"arcs extracted for {list(extractions) or 'no topics'}"
+        )
+
+        return FusedResult(
+            scoring=ScoringResult(
+                episode_id=episode_guid,
+                scores=scores,
+                processing_time=processing_time,
+                success=True
+            ),
+            extractions=extractions
+        )
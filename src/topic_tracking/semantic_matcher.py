@@ -5,17 +5,117 @@ Implements story arc recognition and duplicate detection.
 """
 
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from openai import OpenAI
 import numpy as np
 
-from src.config.web_config import WebConfigManager, SettingsKeys
+from src.llm.client import create_openai_client
+from src.llm.embeddings import embed_texts
+from src.llm.usage import STAGE_ARC_DEDUPE
 
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_EMBEDDING_CONCURRENCY = 4
+
+# Embeddings kept in memory (float32 at 1536 dims: ~60 MB)
+EMBEDDING_CACHE_SIZE = 10000
+
+# Rows x columns of the similarity matrix computed at once (float32: 16 MB)
+SIMILARITY_BLOCK_SIZE = 2048
+
+
+def normalize_embeddings(vectors: List[np.ndarray]) -> np.ndarray:
+    """Stack vectors into a float32 matrix with unit-length rows (zero rows stay zero)."""
+    matrix = np.empty((len(vectors), len(vectors[0]) if vectors else 0), dtype=np.float32)
+    for row, vector in zip(matrix, vectors):
+        row[:] = vector
+    # einsum avoids the full-size temporary np.linalg.norm would allocate
+    norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix))[:, None]
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def similar_pairs(
+    matrix: np.ndarray,
+    threshold: float,
+    block_size: int = SIMILARITY_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all row pairs of a normalized matrix with cosine similarity >= threshold.
+
+    The similarity matrix is computed one block_size x block_size tile at a
+    time over its upper triangle, so memory stays bounded for any number of rows.
+
+    Args:
+        matrix: Row-normalized embeddings (see normalize_embeddings)
+        threshold: Minimum cosine similarity
+        block_size: Tile edge length
+
+    Returns:
+        (rows, cols) index arrays with rows < cols
+    """
+    n = len(matrix)
+    rows, cols = [], []
+    for start in range(0, n, block_size):
+        block = matrix[start:start + block_size]
+        for col_start in range(start, n, block_size):
+            tile = block @ matrix[col_start:col_start + block_size].T
+            mask = tile >= threshold
+            if col_start == start:
+                # Diagonal tile: keep pairs above the diagonal only
+                mask = np.triu(mask, k=1)
+            i, j = np.nonzero(mask)
+            rows.append(i + start)
+            cols.append(j + col_start)
+
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def similarity_groups(
+    matrix: np.ndarray,
+    threshold: float,
+    block_size: int = SIMILARITY_BLOCK_SIZE
+) -> List[List[int]]:
+    """
+    Group rows connected by similarity >= threshold (connected components).
+
+    Args:
+        matrix: Row-normalized embeddings (see normalize_embeddings)
+        threshold: Minimum cosine similarity
+        block_size: Tile edge length for similar_pairs
+
+    Returns:
+        Groups of two or more row indices, in order of each group's first row
+    """
+    rows, cols = similar_pairs(matrix, threshold, block_size)
+
+    # Union-find over row indices
+    parent = list(range(len(matrix)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        pi, pj = find(i), find(j)
+        if pi != pj:
+            parent[pi] = pj
+
+    groups: Dict[int, List[int]] = {}
+    for index in sorted(set(rows.tolist()) | set(cols.tolist())):
+        groups.setdefault(find(index), []).append(index)
+
+    return [group for group in groups.values() if len(group) > 1]
+
+
 @dataclass
 class TopicMatch:
     """Result of a semantic topic match"""
@@ -32,21 +132,29 @@ class SemanticTopicMatcher:
     Uses configurable embedding model for cost-effective comparisons.
     """
 
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self, similarity_threshold: float = 0.85, db_client=None):
         """
         Initialize SemanticTopicMatcher.
 
         Args:
             similarity_threshold: Consider topics as duplicates if similarity >= threshold.
                                  Default 0.85 = 85% similar means same topic.
+            db_client: Database client for fetching settings (optional)
         """
-        self.client = OpenAI()
-        self.web_config = WebConfigManager()
-        self.embedding_model = self.web_config.get_setting(
-            SettingsKeys.TopicEvolution.CATEGORY, SettingsKeys.TopicEvolution.EMBEDDING_MODEL, "text-embedding-3-small"
-        )
+        self.client = create_openai_client(timeout=60.0)
+        self.embedding_model = "text-embedding-3-small"
+        if db_client:
+            self.embedding_model = db_client.get_setting(
+                'topic_tracking', 'embedding_model', self.embedding_model
+            )
+        self.embedding_concurrency = DEFAULT_EMBEDDING_CONCURRENCY
+        if db_client:
+            self.embedding_concurrency = max(1, db_client.get_setting(
+                'topic_tracking', 'embedding_concurrency', self.embedding_concurrency
+            ))
         self.similarity_threshold = similarity_threshold
-        self._embedding_cache: Dict[str, np.ndarray] = {}
+        self._embedding_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def find_matching_topic(
         self,
@@ -80,32 +188,30 @@ class SemanticTopicMatcher:
         if not existing_topics:
             return None
 
-        # Create text representation for new topic
+        # Create text representation for new and existing topics, embedded together
         new_text = self._create_topic_text(new_topic_name, new_key_points)
-
-        try:
-            new_embedding = self._get_embedding(new_text)
-        except Exception as e:
-            logger.error(f"Failed to get embedding for new topic '{new_topic_name}': {e}")
+        existing_texts = [
+            self._create_topic_text(existing.get('topic_name', ''), existing.get('key_points', []))
+            for existing in existing_topics
+        ]
+        new_embedding, *existing_embeddings = self.get_embeddings([new_text, *existing_texts])
+
+        if new_embedding is None:
+            logger.error(f"Failed to get embedding for new topic '{new_topic_name}'")
             return None
 
         # Find most similar existing topic
         best_match: Optional[TopicMatch] = None
         best_similarity = 0.0
 
-        for existing in existing_topics:
-            existing_text = self._create_topic_text(
-                existing.get('topic_name', ''),
-                existing.get('key_points', [])
-            )
-
+        for existing, existing_text, existing_embedding in zip(
+            existing_topics, existing_texts, existing_embeddings
+        ):
             if not existing_text.strip():
                 continue
 
-            try:
-                existing_embedding = self._get_embedding(existing_text)
-            except Exception as e:
-                logger.warning(f"Failed to get embedding for topic {existing.get('id')}: {e}")
+            if existing_embedding is None:
+                logger.warning(f"Failed to get embedding for topic {existing.get('id')}")
                 continue
 
             similarity = self._cosine_similarity(new_embedding, existing_embedding)
@@ -155,57 +261,33 @@ class SemanticTopicMatcher:
         threshold = similarity_threshold or self.similarity_threshold
 
         # Get embeddings for all topics
+        texts = [
+            self._create_topic_text(topic.get('topic_name', ''), topic.get('key_points', []))
+            for topic in topics
+        ]
         embeddings: Dict[int, np.ndarray] = {}
-        for topic in topics:
-            topic_id = topic.get('id')
-            text = self._create_topic_text(
-                topic.get('topic_name', ''),
-                topic.get('key_points', [])
-            )
-            if text.strip():
-                try:
-                    embeddings[topic_id] = self._get_embedding(text)
-                except Exception as e:
-                    logger.warning(f"Failed to get embedding for topic {topic_id}: {e}")
-
-        # Union-find data structure
-        parent = {t['id']: t['id'] for t in topics if t.get('id') in embeddings}
-
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-
-        # Compare all pairs and union similar topics
+        for topic, text, embedding in zip(topics, texts, self.get_embeddings(texts)):
+            if not text.strip():
+                continue
+            if embedding is None:
+                logger.warning(f"Failed to get embedding for topic {topic.get('id')}")
+                continue
+            embeddings[topic.get('id')] = embedding
+
+        if not embeddings:
+            return []
+
         topic_ids = list(embeddings.keys())
-        for i, id1 in enumerate(topic_ids):
-            for id2 in topic_ids[i + 1:]:
-                similarity = self._cosine_similarity(embeddings[id1], embeddings[id2])
-                if similarity >= threshold:
-                    union(id1, id2)
-
-        # Group topics by their root parent
-        groups: Dict[int, List[Dict]] = {}
         topic_by_id = {t['id']: t for t in topics if t.get('id') in embeddings}
-
-        for topic_id in topic_ids:
-            root = find(topic_id)
-            if root not in groups:
-                groups[root] = []
-            groups[root].append(topic_by_id[topic_id])
+        matrix = normalize_embeddings([embeddings[topic_id] for topic_id in topic_ids])
 
         # Filter to groups with more than one topic and sort by age
         result = []
-        for group in groups.values():
-            if len(group) > 1:
-                # Sort by first_mentioned_at (oldest first)
-                group.sort(key=lambda t: t.get('first_mentioned_at') or t.get('created_at') or '')
-                result.append(group)
+        for indices in similarity_groups(matrix, threshold):
+            group = [topic_by_id[topic_ids[i]] for i in indices]
+            # Sort by first_mentioned_at (oldest first)
+            group.sort(key=lambda t: t.get('first_mentioned_at') or t.get('created_at') or '')
+            result.append(group)
 
         logger.info(f"Found {len(result)} duplicate groups from {len(topics)} topics")
         return result
@@ -355,23 +437,57 @@ class SemanticTopicMatcher:
         points_text = " ".join(key_points) if key_points else ""
         return f"{topic_name} {points_text}".strip()
 
-    def _get_embedding(self, text: str) -> np.ndarray:
-        """Get embedding vector for text, with caching"""
-        # Use cache to avoid redundant API calls
-        cache_key = text[:500]  # Truncate for cache key
-        if cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
-
-        response = self.client.embeddings.create(
-            model=self.embedding_model,
-            input=text
-        )
-        embedding = np.array(response.data[0].embedding)
+    def get_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Embed texts with as few requests as possible.
+
+        Duplicate texts are embedded once and cached texts not at all. The rest
+        are embedded with src.llm.embeddings.embed_texts, with up to
+        embedding_concurrency requests in flight.
 
-        # Cache (limit cache size)
-        if len(self._embedding_cache) < 1000:
-            self._embedding_cache[cache_key] = embedding
+        Args:
+            texts: Texts to embed
 
+        Returns:
+            One float32 vector per text, or None for blank texts and texts whose
+            chunk failed (the failure is logged)
+        """
+        vectors: Dict[str, np.ndarray] = {}
+        pending: List[str] = []
+        with self._cache_lock:
+            for text in dict.fromkeys(t for t in texts if t.strip()):
+                if text in self._embedding_cache:
+                    self._embedding_cache.move_to_end(text)
+                    vectors[text] = self._embedding_cache[text]
+                else:
+                    pending.append(text)
+
+        if pending:
+            result = embed_texts(
+                self.client, STAGE_ARC_DEDUPE, self.embedding_model, pending,
+                concurrency=self.embedding_concurrency, skip_failed=True
+            )
+            with self._cache_lock:
+                for text, vector in zip(pending, result.vectors):
+                    if not vector.size or np.isnan(vector[0]):
+                        continue
+                    vectors[text] = vector
+                    self._embedding_cache[text] = vector
+                while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                    self._embedding_cache.popitem(last=False)
+
+            logger.debug(
+                f"Embedded {len(pending) - result.failed}/{len(pending)} texts "
+                f"({len(texts) - len(pending)} duplicate, cached or blank)"
+            )
+
+        return [vectors.get(text) for text in texts]
+
+    def _get_embedding(self, text: str) -> np.ndarray:
+        """Get embedding vector for one text (see get_embeddings)"""
+        embedding = self.get_embeddings([text])[0]
+        if embedding is None:
+            raise ValueError(f"No embedding for text: {text[:80]!r}")
         return embedding
 
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
@@ -387,9 +503,10 @@ class SemanticTopicMatcher:
 
     def clear_cache(self):
         """Clear the embedding cache"""
-        self._embedding_cache.clear()
+        with self._cache_lock:
+            self._embedding_cache.clear()
 
 
-def get_semantic_matcher(similarity_threshold: float = 0.85) -> SemanticTopicMatcher:
+def get_semantic_matcher(similarity_threshold: float = 0.85, db_client=None) -> SemanticTopicMatcher:
     """Factory function to create SemanticTopicMatcher instance"""
-    return SemanticTopicMatcher(similarity_threshold=similarity_threshold)
+    return SemanticTopicMatcher(similarity_threshold=similarity_threshold, db_client=db_client)
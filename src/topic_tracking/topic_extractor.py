@@ -11,20 +11,33 @@ Key features:
 - Functional category classification for organization
 """
 
-import os
 import json
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from src.llm.client import create_openai_client
+from src.llm.excerpt import ExcerptBuilder
+from src.llm.usage import STAGE_ARC_EXTRACTION, chat_completion
+from src.topic_tracking.arc_context import ArcContextCache
+from src.topic_tracking.arc_resolution import ArcResolutionIndex
+from src.topic_tracking.arc_retrieval import ArcRetriever
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Transcript tokens sent to the model per episode
+DEFAULT_EXCERPT_TOKENS = 1500
+
+# Topics of one episode extracted at the same time
+DEFAULT_EXTRACTION_CONCURRENCY = 4
+
 # Functional categories for story arc classification
 FUNCTIONAL_CATEGORIES = [
     "model_release",      # New model announcements, updates, versions
@@ -41,6 +54,77 @@ FUNCTIONAL_CATEGORIES = [
 ]
 
 
+# Bump whenever the extraction prompt or schema changes
+EXTRACTION_PROMPT_VERSION = 'extraction-v2'
+
+# Shared by the extraction prompt and the fused scoring + extraction prompt
+ARC_DEFINITION = """A STORY ARC is an ongoing news narrative that evolves over time. Examples:
+- "OpenAI's GPT-5 Development" (tracks rumors → announcements → release → reactions)
+- "EU AI Act Implementation" (tracks drafts → votes → enforcement → industry response)
+- "Google Gemini Launch" (tracks leaks → announcement → reviews → updates)"""
+
+ARC_GUIDELINES = """## CRITICAL GUIDELINES - READ CAREFULLY
+
+1. **STRONGLY prefer adding events to existing arcs over creating new arcs**
+   - If content relates to ANY existing arc, add an event to it instead of creating a new arc
+   - Look for thematic overlap, not just exact matches
+
+2. **Only create a NEW arc if this is a significant story likely to have follow-up coverage**
+   - One-off mentions or general discussions should NOT become arcs
+   - Ask: "Will this specific story likely appear in future episodes?"
+
+3. **Maximum 2-3 story arcs per episode** - quality over quantity
+   - If you find more than 3 relevant stories, pick the most significant ones
+
+4. **When in doubt, add to an existing arc with a similar theme**
+   - Example: "Claude Code Updates" should be added to existing "Claude Code" arc, not create a new one
+
+## CLASSIFICATION CATEGORIES
+Use one of these for each arc:
+- model_release: New model announcements, updates, versions
+- company_strategy: Business moves, pivots, leadership changes
+- research: Papers, studies, breakthroughs
+- regulation: Policy, legal, governance
+- product_launch: New products, features, services
+- partnership: Collaborations, acquisitions, investments
+- controversy: Disputes, criticisms, debates
+- industry_trend: Broader patterns, market shifts
+- technique: New methods, approaches, architectures
+- use_case: Applications, implementations
+- other: Miscellaneous
+
+## PERSPECTIVE VALUES
+- positive: Episode is enthusiastic/supportive about this development
+- negative: Episode is critical/concerned about this development
+- neutral: Episode presents factual coverage without strong stance
+- analytical: Episode provides in-depth analysis/comparison"""
+
+ARC_TASK = """1. **CONTINUING ARCS**: Stories from the active story arcs list that this episode discusses
+   - Add a NEW EVENT capturing what this episode says about the story
+   - Capture the episode's PERSPECTIVE (positive, negative, neutral, analytical)
+   - Include 2-3 specific key points from this episode
+
+2. **NEW ARCS**: New stories not in the active story arcs list
+   - Only create if this is a significant, newsworthy development
+   - Don't create arcs for general discussion topics (too broad)
+   - Each arc should be specific enough to track over time"""
+
+# Static system prompt: identical for every extraction request, so providers
+# can serve it from their prompt cache. Everything episode- or topic-specific
+# goes in the user message (see _create_episode_prompt).
+EXTRACTION_SYSTEM_PROMPT = f"""Analyze podcast episode transcripts and identify STORY ARCS related to the digest topic named in the user message.
+
+{ARC_DEFINITION}
+
+## YOUR TASK
+
+For the episode in the user message, identify:
+
+{ARC_TASK}
+
+{ARC_GUIDELINES}"""
+
+
 class StoryArcExtractor:
     """
     Extracts and tracks story arcs from episode transcripts.
@@ -53,6 +137,10 @@ class StoryArcExtractor:
         self,
         db_client,
         max_arcs_per_episode: int = 3,
+        excerpt_builder: ExcerptBuilder = None,
+        arc_context: ArcContextCache = None,
+        arc_retriever: ArcRetriever = None,
+        arc_index: ArcResolutionIndex = None,
     ):
         """
         Initialize StoryArcExtractor.
@@ -60,12 +148,17 @@ class StoryArcExtractor:
         Args:
             db_client: Database client with story arc methods
             max_arcs_per_episode: Maximum story arcs to extract per episode
+            excerpt_builder: Builds the transcript excerpt sent to the model; share
+                             one with ContentScorer to reuse its per-episode analysis
+            arc_context: Cache of active arcs shown in prompts, kept current with
+                         this extractor's writes (default: a new cache for this run)
+            arc_retriever: Selects the arcs most similar to each episode instead of
+                           the most recent (default: from settings when
+                           topic_tracking.arc_retrieval_enabled is set)
+            arc_index: Resolves extracted arc names to existing arcs before writing
+                       (default: a new index over arc_context)
         """
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-
-        self.client = OpenAI(api_key=api_key, timeout=120.0)
+        self.client = create_openai_client(timeout=120.0)
         self.db = db_client
         self.max_arcs_per_episode = max_arcs_per_episode
 
@@ -79,6 +172,21 @@ class StoryArcExtractor:
             self.model = "gpt-4o-mini"
             logger.warning(f"Failed to get model from settings, using: {self.model}")
 
+        self.excerpt_builder = excerpt_builder or ExcerptBuilder.from_settings(db_client, model=self.model)
+        self.excerpt_tokens = db_client.get_setting('topic_tracking', 'excerpt_tokens', DEFAULT_EXCERPT_TOKENS)
+        self.arc_context = arc_context or ArcContextCache(db_client)
+
+        self.arc_retriever = arc_retriever
+        if arc_retriever is None and db_client.get_setting('topic_tracking', 'arc_retrieval_enabled', False):
+            self.arc_retriever = ArcRetriever.from_settings(db_client)
+        self.arc_index = arc_index or ArcResolutionIndex(db_client, arc_context=self.arc_context)
+
+        self.extraction_concurrency = db_client.get_setting(
+            'topic_tracking', 'extraction_concurrency', DEFAULT_EXTRACTION_CONCURRENCY
+        )
+        self._topic_locks: Dict[str, threading.Lock] = {}
+        self._topic_locks_guard = threading.Lock()
+
     def extract_and_store_story_arcs(
         self,
         episode_id: int,
@@ -114,56 +222,220 @@ class StoryArcExtractor:
             f"Extracting story arcs from episode {episode_guid} for {digest_topic}"
         )
 
-        # Get active story arcs for context
-        active_arcs_context = ""
         try:
-            active_arcs_context = self.db.get_story_arcs_for_prompt(
+            extraction_data = self.extract(transcript, digest_topic, episode_title, episode_guid)
+
+            return self.store_extraction(
+                extraction_data,
+                episode_id=episode_id,
+                episode_guid=episode_guid,
+                feed_id=feed_id,
+                digest_topic=digest_topic,
+                episode_title=episode_title,
+                episode_published_date=episode_published_date,
+                relevance_score=relevance_score
+            )
+
+        except Exception as e:
+            logger.error(f"Story arc extraction failed for {episode_guid}: {e}")
+            raise
+
+    def extract_and_store_for_topics(
+        self,
+        topic_scores: Dict[str, float],
+        episode_id: int,
+        episode_guid: str,
+        feed_id: int,
+        transcript: str,
+        episode_title: str,
+        episode_published_date: datetime,
+    ) -> Dict[str, Union[List[Dict], Exception]]:
+        """
+        Extract and store story arcs for several digest topics of one episode.
+
+        Topics are extracted concurrently, up to topic_tracking.extraction_concurrency
+        at a time; each topic's database writes are still serialized (see
+        store_extraction). A failure for one topic does not affect the others.
+
+        Args:
+            topic_scores: Relevance score per digest topic to extract
+            episode_id: Episode database ID
+            episode_guid: Episode GUID
+            feed_id: Source feed ID
+            transcript: Full episode transcript
+            episode_title: Episode title (for source attribution)
+            episode_published_date: When episode was published
+
+        Returns:
+            Per topic, the story arc results or the exception that stopped it
+        """
+        def run(digest_topic: str) -> List[Dict]:
+            return self.extract_and_store_story_arcs(
+                episode_id=episode_id,
+                episode_guid=episode_guid,
+                feed_id=feed_id,
                 digest_topic=digest_topic,
-                max_arcs=20,
-                max_events_per_arc=4
+                transcript=transcript,
+                episode_title=episode_title,
+                episode_published_date=episode_published_date,
+                relevance_score=topic_scores[digest_topic]
             )
+
+        outcomes = {}
+        workers = min(max(1, self.extraction_concurrency), len(topic_scores))
+        if workers <= 1:
+            for digest_topic in topic_scores:
+                try:
+                    outcomes[digest_topic] = run(digest_topic)
+                except Exception as e:
+                    outcomes[digest_topic] = e
+            return outcomes
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run, digest_topic): digest_topic for digest_topic in topic_scores}
+            for future in as_completed(futures):
+                try:
+                    outcomes[futures[future]] = future.result()
+                except Exception as e:
+                    outcomes[futures[future]] = e
+        return outcomes
+
+    def extract(
+        self,
+        transcript: str,
+        digest_topic: str,
+        episode_title: str,
+        episode_guid: str = None
+    ) -> Dict:
+        """
+        Run extraction for one episode and topic without storing anything.
+
+        Args:
+            transcript: Full episode transcript
+            digest_topic: Parent topic name
+            episode_title: Episode title for context
+            episode_guid: Episode GUID (for usage tracking)
+
+        Returns:
+            Parsed response with continuing_arcs and new_arcs
+        """
+        request_body = self.build_request(transcript, digest_topic, episode_title)
+
+        # Call GPT with structured output
+        response = chat_completion(
+            self.client, STAGE_ARC_EXTRACTION, episode_guid=episode_guid,
+            prompt_version=EXTRACTION_PROMPT_VERSION, **request_body
+        )
+
+        return json.loads(response.choices[0].message.content)
+
+    def _topic_lock(self, digest_topic: str) -> threading.Lock:
+        """Lock serializing story arc writes for one digest topic."""
+        with self._topic_locks_guard:
+            return self._topic_locks.setdefault(digest_topic, threading.Lock())
+
+    def _get_active_arcs_context(self, digest_topic: str, excerpt: str = None) -> str:
+        """
+        Get active story arcs for the prompt ('' if unavailable).
+
+        With an arc retriever and the episode excerpt, only the arcs most
+        similar to the excerpt are included; otherwise the most recent.
+        """
+        active_arcs_context = ""
+        try:
+            if self.arc_retriever and excerpt:
+                arcs = self.arc_retriever.select(self.arc_context.get_prompt_arcs(digest_topic), excerpt)
+                active_arcs_context = self.db.format_story_arcs_for_prompt(
+                    arcs, len(arcs), self.arc_context.max_events_per_arc
+                )
+            else:
+                active_arcs_context = self.arc_context.get_prompt_context(digest_topic)
             arc_count = active_arcs_context.count("STORY ARC") if active_arcs_context else 0
             logger.info(f"Retrieved {arc_count} active story arcs for context")
         except Exception as e:
             logger.warning(f"Failed to retrieve active story arcs: {e}")
+        return active_arcs_context
+
+    def build_request(self, transcript: str, digest_topic: str, episode_title: str) -> Dict:
+        """
+        Build the extraction request for one episode and topic.
+
+        Used directly for synchronous extraction and written to JSONL for
+        offline (Batch API) extraction. The active arcs context is captured
+        when the request is built.
 
-        # Create prompt for GPT
-        prompt = self._create_extraction_prompt(
-            transcript=transcript,
+        Args:
+            transcript: Full episode transcript
+            digest_topic: Parent topic name
+            episode_title: Episode title for context
+
+        Returns:
+            Chat completion request body
+        """
+        excerpt = self.excerpt_builder.build(transcript, self.excerpt_tokens)
+        episode_prompt = self._create_episode_prompt(
+            transcript=excerpt,
             digest_topic=digest_topic,
-            active_arcs_context=active_arcs_context,
+            active_arcs_context=self._get_active_arcs_context(digest_topic, excerpt),
             episode_title=episode_title
         )
-        schema = self._create_extraction_schema()
 
-        try:
-            # Call GPT with structured output
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "story_arc_extraction",
-                        "schema": schema,
-                        "strict": True,
-                    },
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": episode_prompt},
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "story_arc_extraction",
+                    "schema": self._create_extraction_schema(),
+                    "strict": True,
                 },
-                max_completion_tokens=3000,
-            )
+            },
+            "max_completion_tokens": 3000,
+        }
 
-            # Parse response
-            extraction_data = json.loads(response.choices[0].message.content)
+    def store_extraction(
+        self,
+        extraction_data: Dict,
+        episode_id: int,
+        episode_guid: str,
+        feed_id: int,
+        digest_topic: str,
+        episode_title: str,
+        episode_published_date: datetime,
+        relevance_score: float = 0.0,
+    ) -> List[Dict]:
+        """
+        Store an extraction response as story arc events and new arcs.
 
-            # Process continuing arcs (updates to existing stories)
-            continuing_arcs = extraction_data.get("continuing_arcs", [])
-            new_arcs = extraction_data.get("new_arcs", [])
+        Args:
+            extraction_data: Parsed response with continuing_arcs and new_arcs
+            episode_id: Episode database ID
+            episode_guid: Episode GUID
+            feed_id: Source feed ID
+            digest_topic: Parent topic
+            episode_title: Episode title (for source attribution)
+            episode_published_date: When episode was published
+            relevance_score: Episode's relevance score
 
-            logger.info(
-                f"Extracted {len(continuing_arcs)} continuing arcs, "
-                f"{len(new_arcs)} new arcs from {episode_guid}"
-            )
+        Returns:
+            List of story arc results (new arcs and events added)
+        """
+        # Process continuing arcs (updates to existing stories)
+        continuing_arcs = extraction_data.get("continuing_arcs", [])
+        new_arcs = extraction_data.get("new_arcs", [])
 
+        logger.info(
+            f"Extracted {len(continuing_arcs)} continuing arcs, "
+            f"{len(new_arcs)} new arcs from {episode_guid}"
+        )
+
+        # Serialized per digest topic: get_or_create_story_arc and create_story_arc
+        # dedupe by slug, which concurrent writers to the same topic could race
+        with self._topic_lock(digest_topic):
             results = []
 
             # Handle continuing arcs (add events to existing stories)
@@ -174,12 +446,17 @@ class StoryArcExtractor:
                     key_points = arc_data.get("key_points", [])
                     perspective = arc_data.get("perspective")
 
-                    # Find or get the existing arc
-                    arc = self.db.get_or_create_story_arc(
-                        arc_name=arc_name,
-                        digest_topic=digest_topic,
-                        functional_category=arc_data.get("category", "other")
-                    )
+                    # Resolve the name in memory, else find or create the arc by slug
+                    match = self.arc_index.resolve(digest_topic, arc_name)
+                    if match:
+                        arc = match.arc
+                    else:
+                        arc = self.db.get_or_create_story_arc(
+                            arc_name=arc_name,
+                            digest_topic=digest_topic,
+                            functional_category=arc_data.get("category", "other")
+                        )
+                        self.arc_index.add_arc(digest_topic, arc)
 
                     # Add the new event
                     event = self.db.add_story_arc_event(
@@ -194,6 +471,7 @@ class StoryArcExtractor:
                         perspective=perspective,
                         relevance_score=relevance_score
                     )
+                    self.arc_context.record_event(digest_topic, arc, event)
 
                     results.append({
                         "arc_name": arc_name,
@@ -221,23 +499,48 @@ class StoryArcExtractor:
                     category = arc_data.get("category", "other")
                     perspective = arc_data.get("perspective")
 
-                    # Create the arc with initial event
+                    # Event for the new arc (or the existing arc it resolves to)
+                    initial_event = {
+                        "event_date": episode_published_date,
+                        "event_summary": event_summary,
+                        "key_points": key_points,
+                        "source_feed_id": feed_id,
+                        "source_episode_id": episode_id,
+                        "source_episode_guid": episode_guid,
+                        "source_name": episode_title,
+                        "perspective": perspective,
+                        "relevance_score": relevance_score
+                    }
+
+                    # A variant of an existing arc's name continues that arc
+                    match = self.arc_index.resolve(digest_topic, arc_name)
+                    if match:
+                        arc = match.arc
+                        event = self.db.add_story_arc_event(story_arc_id=arc['id'], **initial_event)
+                        self.arc_context.record_event(digest_topic, arc, event)
+
+                        results.append({
+                            "arc_name": arc['arc_name'],
+                            "arc_id": arc['id'],
+                            "is_new": False,
+                            "event_id": event['id'],
+                            "event_summary": event_summary
+                        })
+
+                        logger.info(
+                            f"Added event to story arc '{arc['arc_name']}' (id={arc['id']}) "
+                            f"instead of creating '{arc_name}'"
+                        )
+                        continue
+
                     arc = self.db.create_story_arc(
                         arc_name=arc_name,
                         digest_topic=digest_topic,
                         functional_category=category,
-                        initial_event={
-                            "event_date": episode_published_date,
-                            "event_summary": event_summary,
-                            "key_points": key_points,
-                            "source_feed_id": feed_id,
-                            "source_episode_id": episode_id,
-                            "source_episode_guid": episode_guid,
-                            "source_name": episode_title,
-                            "perspective": perspective,
-                            "relevance_score": relevance_score
-                        }
+                        initial_event=initial_event
                     )
+                    self.arc_context.record_new_arc(digest_topic, arc, initial_event)
+                    self.arc_index.add_arc(digest_topic, arc)
 
                     results.append({
                         "arc_name": arc_name,
@@ -263,11 +566,7 @@ class StoryArcExtractor:
 
             return results
 
-        except Exception as e:
-            logger.error(f"Story arc extraction failed for {episode_guid}: {e}")
-            raise
-
-    def _create_extraction_prompt(
+    def _create_episode_prompt(
         self,
         transcript: str,
         digest_topic: str,
@@ -275,10 +574,14 @@ class StoryArcExtractor:
         episode_title: str
     ) -> str:
         """
-        Create GPT prompt for story arc extraction.
+        Create the per-episode part of the extraction prompt.
+
+        Ordered from most to least shared: the digest topic and its active
+        arcs are the same for every episode of a topic in a run, so they
+        extend the cacheable prefix; the episode title and transcript come last.
 
         Args:
-            transcript: Episode transcript
+            transcript: Transcript excerpt
             digest_topic: Parent topic name
             active_arcs_context: Formatted active story arcs
             episode_title: Episode title for context
@@ -286,9 +589,6 @@ class StoryArcExtractor:
         Returns:
             Formatted prompt string
         """
-        # Truncate transcript to reasonable length
-        truncated_transcript = transcript[:6000]
-
         active_arcs_section = ""
         if active_arcs_context:
             active_arcs_section = f"""
@@ -301,67 +601,14 @@ you should add a NEW EVENT to that story arc rather than creating a duplicate.
 ---
 """
 
-        return f"""Analyze this podcast episode transcript and identify STORY ARCS related to "{digest_topic}".
-
-A STORY ARC is an ongoing news narrative that evolves over time. Examples:
-- "OpenAI's GPT-5 Development" (tracks rumors → announcements → release → reactions)
-- "EU AI Act Implementation" (tracks drafts → votes → enforcement → industry response)
-- "Google Gemini Launch" (tracks leaks → announcement → reviews → updates)
-
+        return f"""## DIGEST TOPIC
+Identify story arcs related to "{digest_topic}".
 {active_arcs_section}
-
-## YOUR TASK
-
-For this episode from "{episode_title}", identify:
-
-1. **CONTINUING ARCS**: Stories from the active list above that this episode discusses
-   - Add a NEW EVENT capturing what this episode says about the story
-   - Capture the episode's PERSPECTIVE (positive, negative, neutral, analytical)
-   - Include 2-3 specific key points from this episode
-
-2. **NEW ARCS**: New stories not in the active list
-   - Only create if this is a significant, newsworthy development
-   - Don't create arcs for general discussion topics (too broad)
-   - Each arc should be specific enough to track over time
-
-## CRITICAL GUIDELINES - READ CAREFULLY
-
-1. **STRONGLY prefer adding events to existing arcs over creating new arcs**
-   - If content relates to ANY existing arc, add an event to it instead of creating a new arc
-   - Look for thematic overlap, not just exact matches
-
-2. **Only create a NEW arc if this is a significant story likely to have follow-up coverage**
-   - One-off mentions or general discussions should NOT become arcs
-   - Ask: "Will this specific story likely appear in future episodes?"
-
-3. **Maximum 2-3 story arcs per episode** - quality over quantity
-   - If you find more than 3 relevant stories, pick the most significant ones
-
-4. **When in doubt, add to an existing arc with a similar theme**
-   - Example: "Claude Code Updates" should be added to existing "Claude Code" arc, not create a new one
-
-## CLASSIFICATION CATEGORIES
-Use one of these for each arc:
-- model_release: New model announcements, updates, versions
-- company_strategy: Business moves, pivots, leadership changes
-- research: Papers, studies, breakthroughs
-- regulation: Policy, legal, governance
-- product_launch: New products, features, services
-- partnership: Collaborations, acquisitions, investments
-- controversy: Disputes, criticisms, debates
-- industry_trend: Broader patterns, market shifts
-- technique: New methods, approaches, architectures
-- use_case: Applications, implementations
-- other: Miscellaneous
-
-## PERSPECTIVE VALUES
-- positive: Episode is enthusiastic/supportive about this development
-- negative: Episode is critical/concerned about this development
-- neutral: Episode presents factual coverage without strong stance
-- analytical: Episode provides in-depth analysis/comparison
+## EPISODE
+"{episode_title}"
 
 ## TRANSCRIPT
-{truncated_transcript}
+{transcript}
 
 ---
 Identify story arcs and events from this episode."""
@@ -0,0 +1,133 @@
+"""
+Compact Timestamped Cue Store
+
+Keeps subtitle timing alongside a parsed transcript without per-cue objects:
+parallel typed arrays of start/end times plus character offsets into the
+single transcript text buffer. A 3-hour episode costs a few hundred KB.
+
+For excerpting transcripts by time window and mapping a piece of transcript
+text back to a video timestamp. Parsers build one with with_cues=True, and
+YtdlpTranscriptFetcher(with_cues=True) attaches it to TranscriptResult.cues.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+
+class CueStore:
+    """
+    Timing index over a transcript text buffer.
+
+    Entry i covers text[offsets[i]:offsets[i + 1]] and was displayed from
+    starts[i] to ends[i] seconds. Entries are in document order, so starts
+    and offsets are non-decreasing.
+    """
+
+    __slots__ = ('text', 'starts', 'ends', 'offsets')
+
+    def __init__(self, text: str = '', starts: array = None, ends: array = None, offsets: array = None):
+        self.text = text
+        self.starts = starts if starts is not None else array('d')
+        self.ends = ends if ends is not None else array('d')
+        self.offsets = offsets if offsets is not None else array('I')
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def duration(self) -> float:
+        """Time of the last cue end, in seconds (0.0 when empty)."""
+        return max(self.ends) if self.ends else 0.0
+
+    def append(self, start: float, end: float, offset: int) -> None:
+        """Record that text starting at `offset` was shown from start to end."""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.offsets.append(offset)
+
+    def nbytes(self) -> int:
+        """Memory used by the timing arrays (excluding the text buffer)."""
+        return sum(a.itemsize * len(a) for a in (self.starts, self.ends, self.offsets))
+
+    def _text_end(self, index: int) -> int:
+        return self.offsets[index] if index < len(self.offsets) else len(self.text)
+
+    def slice_text(self, start: float, end: float) -> str:
+        """
+        Get the transcript text displayed between two times.
+
+        Args:
+            start: Window start in seconds
+            end: Window end in seconds
+
+        Returns:
+            Text of all cues overlapping [start, end)
+        """
+        if not self.starts or end <= start:
+            return ''
+
+        first = max(0, bisect_right(self.starts, start) - 1)
+        if self.ends[first] <= start:
+            first += 1
+        last = bisect_left(self.starts, end)
+
+        if first >= last:
+            return ''
+        return self.text[self.offsets[first]:self._text_end(last)].strip()
+
+    def time_at_offset(self, offset: int) -> float:
+        """
+        Map a character offset in the transcript text to a timestamp.
+
+        Args:
+            offset: Character offset into self.text
+
+        Returns:
+            Start time (seconds) of the cue containing that character
+        """
+        if not self.offsets:
+            return 0.0
+        index = max(0, bisect_right(self.offsets, offset) - 1)
+        return self.starts[index]
+
+    def sample_windows(
+        self,
+        count: int,
+        window_seconds: float
+    ) -> List[Tuple[float, float, str]]:
+        """
+        Take evenly spaced time windows across the whole video.
+
+        Args:
+            count: Number of windows
+            window_seconds: Length of each window
+
+        Returns:
+            List of (start, end, text) tuples in time order
+        """
+        if not self.starts or count <= 0:
+            return []
+
+        begin = self.starts[0]
+        span = max(0.0, self.duration - begin - window_seconds)
+        step = span / (count - 1) if count > 1 else 0.0
+
+        windows = []
+        for i in range(count):
+            start = begin + step * i
+            end = start + window_seconds
+            text = self.slice_text(start, end)
+            if text:
+                windows.append((start, end, text))
+        return windows
+
+    def find_time(self, snippet: str) -> Optional[float]:
+        """Timestamp where `snippet` first appears in the transcript, if it does."""
+        offset = self.text.find(snippet)
+        return self.time_at_offset(offset) if offset >= 0 else None
+
+
+def youtube_timestamp_url(video_id: str, seconds: float) -> str:
+    """Link to a YouTube video at a given time."""
+    return f"https://www.youtube.com/watch?v={video_id}&t={int(seconds)}s"
@@ -130,16 +130,7 @@ class YouTubeFeedProcessor:
                         logger.error(f"Feed parse failed after {MAX_RETRIES} attempts for {feed_url}: {last_error}")
                         return []
 
-                videos = []
-                channel_name = feed.feed.get('title', 'Unknown Channel')
-
-                for entry in feed.entries:
-                    video = self._parse_entry(entry, channel_id, channel_name)
-                    if video:
-                        videos.append(video)
-
-                logger.info(f"Parsed {len(videos)} videos from {channel_name}")
-                return videos
+                return self.videos_from_feed(feed, channel_id)
 
             except requests.exceptions.Timeout:
                 last_error = f"Request timeout after {REQUEST_TIMEOUT}s"
@@ -163,6 +154,28 @@ class YouTubeFeedProcessor:
         logger.error(f"Feed processing failed after {MAX_RETRIES} attempts for {feed_url}: {last_error}")
         return []
 
+    def videos_from_feed(self, feed, channel_id: str) -> List[YouTubeVideo]:
+        """
+        Convert a parsed feed document into videos, skipping bad entries.
+
+        Args:
+            feed: Result of feedparser.parse()
+            channel_id: YouTube channel ID the feed belongs to
+
+        Returns:
+            List of YouTubeVideo objects
+        """
+        videos = []
+        channel_name = feed.feed.get('title', 'Unknown Channel')
+
+        for entry in feed.entries:
+            video = self._parse_entry(entry, channel_id, channel_name)
+            if video:
+                videos.append(video)
+
+        logger.info(f"Parsed {len(videos)} videos from {channel_name}")
+        return videos
+
     def _parse_entry(self, entry: dict, channel_id: str, channel_name: str) -> Optional[YouTubeVideo]:
         """Parse a single feed entry into a YouTubeVideo."""
         try:
@@ -0,0 +1,351 @@
+"""
+Raw Subtitle Cache
+
+Local, content-addressed cache of raw caption payloads downloaded by yt-dlp.
+Lets us re-parse transcripts (after parser changes, in dry runs, or while
+debugging) without spending YouTube rate-limit budget on a second download.
+
+Layout on disk:
+    <cache_dir>/index.json            - key -> blob metadata, access times
+    <cache_dir>/blobs/ab/abcdef....gz - gzip-compressed payloads, named by SHA-256
+
+Entries are keyed by (video_id, language, kind, format). Identical payloads
+share one blob. The cache is bounded by total compressed size and evicts the
+least recently used entries first.
+
+Access times from reads are kept in memory and written with the next index
+save: a mutation, every ACCESS_FLUSH_INTERVAL reads, flush() or exit.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default size limit for the cache (compressed bytes)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Reads between index saves that only record access times
+ACCESS_FLUSH_INTERVAL = 100
+
+# Track kinds
+KIND_MANUAL = 'manual'
+KIND_AUTO = 'auto'
+
+
+@dataclass
+class CachedSubtitle:
+    """Metadata for one cached caption track."""
+    video_id: str
+    language: str
+    kind: str
+    format: str
+    sha256: str
+    size: int           # Compressed size on disk
+    raw_size: int       # Uncompressed payload size
+    stored_at: float
+    last_access: float
+
+    @property
+    def key(self) -> str:
+        return SubtitleCache.make_key(self.video_id, self.language, self.kind, self.format)
+
+    @property
+    def filename(self) -> str:
+        """yt-dlp style filename for this track (e.g. VIDEOID.en-orig.vtt)."""
+        suffix = '-orig' if self.kind == KIND_AUTO else ''
+        return f"{self.video_id}.{self.language}{suffix}.{self.format}"
+
+
+class SubtitleCache:
+    """
+    Size-bounded, gzip-compressed LRU cache of raw subtitle payloads.
+
+    Safe to share between threads in one process. The index is rewritten
+    atomically on every mutation so a crashed run never corrupts it; a crash
+    loses at most the access times of the last ACCESS_FLUSH_INTERVAL reads.
+    """
+
+    INDEX_FILENAME = 'index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store the index and blobs in
+            max_bytes: Maximum total compressed size before LRU eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / 'blobs'
+        self.index_path = self.cache_dir / self.INDEX_FILENAME
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, CachedSubtitle] = self._load_index()
+
+        # Entries per blob and total size of referenced blobs
+        self._refs: Dict[str, int] = {}
+        self._stored_bytes = 0
+        for entry in self._entries.values():
+            self._add_ref(entry)
+        self._unsaved_reads = 0
+        atexit.register(self.flush)
+
+        logger.info(
+            f"SubtitleCache initialized at {self.cache_dir}: "
+            f"{len(self._entries)} entries, {self.total_bytes() / 1024 / 1024:.1f} MB "
+            f"(limit {self.max_bytes / 1024 / 1024:.0f} MB)"
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional['SubtitleCache']:
+        """
+        Create a cache from SUBTITLE_CACHE_DIR / SUBTITLE_CACHE_MAX_MB.
+
+        Returns:
+            SubtitleCache, or None if SUBTITLE_CACHE_DIR is not set
+        """
+        cache_dir = os.getenv('SUBTITLE_CACHE_DIR')
+        if not cache_dir:
+            return None
+        max_mb = int(os.getenv('SUBTITLE_CACHE_MAX_MB', str(DEFAULT_MAX_BYTES // (1024 * 1024))))
+        return cls(cache_dir, max_bytes=max_mb * 1024 * 1024)
+
+    @staticmethod
+    def make_key(video_id: str, language: str, kind: str, format: str) -> str:
+        """Build the index key for a caption track."""
+        return f"{video_id}/{language}/{kind}/{format.lower()}"
+
+    # ==================== Reads ====================
+
+    def get(self, video_id: str, language: str, kind: str, format: str) -> Optional[bytes]:
+        """
+        Get a raw caption payload.
+
+        Args:
+            video_id: YouTube video ID
+            language: Language code (e.g. 'en', 'en-US')
+            kind: 'manual' or 'auto'
+            format: Subtitle format extension ('vtt', 'srt', ...)
+
+        Returns:
+            Uncompressed payload bytes, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(self.make_key(video_id, language, kind, format))
+            if not entry:
+                return None
+            return self._read_entry(entry)
+
+    def get_video(self, video_id: str) -> List[CachedSubtitle]:
+        """Get metadata for all cached tracks of a video."""
+        prefix = f"{video_id}/"
+        with self._lock:
+            return [e for k, e in self._entries.items() if k.startswith(prefix)]
+
+    def read(self, entry: CachedSubtitle) -> Optional[bytes]:
+        """Read the payload for an entry returned by get_video/entries."""
+        with self._lock:
+            if entry.key not in self._entries:
+                return None
+            return self._read_entry(self._entries[entry.key])
+
+    def entries(self) -> List[CachedSubtitle]:
+        """Snapshot of all cache entries."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def video_ids(self) -> List[str]:
+        """Sorted list of video IDs with at least one cached track."""
+        with self._lock:
+            return sorted({e.video_id for e in self._entries.values()})
+
+    def total_bytes(self) -> int:
+        """Total compressed size of all referenced blobs."""
+        return self._stored_bytes
+
+    def stats(self) -> Dict[str, float]:
+        """Summary statistics for logging."""
+        with self._lock:
+            raw = sum(e.raw_size for e in self._entries.values())
+            stored = self.total_bytes()
+            return {
+                'entries': len(self._entries),
+                'videos': len({e.video_id for e in self._entries.values()}),
+                'raw_bytes': raw,
+                'stored_bytes': stored,
+                'compression_ratio': (raw / stored) if stored else 0.0,
+            }
+
+    # ==================== Writes ====================
+
+    def put(
+        self,
+        video_id: str,
+        language: str,
+        kind: str,
+        format: str,
+        payload: bytes
+    ) -> CachedSubtitle:
+        """
+        Store a raw caption payload, evicting old entries if over the limit.
+
+        Args:
+            video_id: YouTube video ID
+            language: Language code
+            kind: 'manual' or 'auto'
+            format: Subtitle format extension
+            payload: Raw payload bytes as downloaded
+
+        Returns:
+            Metadata for the stored entry
+        """
+        sha = hashlib.sha256(payload).hexdigest()
+        blob_path = self._blob_path(sha)
+        now = time.time()
+
+        with self._lock:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_suffix('.tmp')
+                with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                    f.write(payload)
+                os.replace(tmp_path, blob_path)
+
+            entry = CachedSubtitle(
+                video_id=video_id,
+                language=language,
+                kind=kind,
+                format=format.lower(),
+                sha256=sha,
+                size=blob_path.stat().st_size,
+                raw_size=len(payload),
+                stored_at=now,
+                last_access=now
+            )
+            self._add_ref(entry)
+            previous = self._entries.get(entry.key)
+            self._entries[entry.key] = entry
+            if previous:
+                self._release(previous)
+            self._evict()
+            self._save_index()
+
+        logger.debug(
+            f"Cached subtitle {entry.key}: {entry.raw_size} -> {entry.size} bytes"
+        )
+        return entry
+
+    def delete_video(self, video_id: str) -> int:
+        """Remove all tracks for a video. Returns number of entries removed."""
+        prefix = f"{video_id}/"
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            if keys:
+                self._save_index()
+            return len(keys)
+
+    def flush(self) -> None:
+        """Write access times recorded since the last index save."""
+        with self._lock:
+            if self._unsaved_reads:
+                self._save_index()
+
+    # ==================== Internals ====================
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.blob_dir / sha[:2] / f"{sha}.gz"
+
+    def _read_entry(self, entry: CachedSubtitle) -> Optional[bytes]:
+        """Read and decompress a blob, dropping the entry if the blob is gone."""
+        try:
+            with gzip.open(self._blob_path(entry.sha256), 'rb') as f:
+                payload = f.read()
+        except (OSError, EOFError) as e:
+            logger.warning(f"Dropping unreadable cache entry {entry.key}: {e}")
+            self._remove(entry.key)
+            self._save_index()
+            return None
+
+        entry.last_access = time.time()
+        self._unsaved_reads += 1
+        if self._unsaved_reads >= ACCESS_FLUSH_INTERVAL:
+            self._save_index()
+        return payload
+
+    def _add_ref(self, entry: CachedSubtitle) -> None:
+        count = self._refs.get(entry.sha256, 0)
+        if count == 0:
+            self._stored_bytes += entry.size
+        self._refs[entry.sha256] = count + 1
+
+    def _release(self, entry: CachedSubtitle) -> int:
+        """Drop an entry's blob reference, deleting the blob when unused. Returns bytes freed."""
+        count = self._refs.get(entry.sha256, 0) - 1
+        if count > 0:
+            self._refs[entry.sha256] = count
+            return 0
+        self._refs.pop(entry.sha256, None)
+        self._stored_bytes -= entry.size
+        try:
+            self._blob_path(entry.sha256).unlink()
+        except FileNotFoundError:
+            pass
+        return entry.size
+
+    def _remove(self, key: str) -> int:
+        """Remove an index entry and its blob if no other entry references it. Returns bytes freed."""
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return 0
+        return self._release(entry)
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until under the size limit."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_access):
+            if total <= self.max_bytes:
+                break
+            total -= self._remove(entry.key)
+            evicted += 1
+
+        logger.info(f"SubtitleCache evicted {evicted} entries ({total / 1024 / 1024:.1f} MB remaining)")
+
+    def _load_index(self) -> Dict[str, CachedSubtitle]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            raw = json.loads(self.index_path.read_text())
+            entries = {}
+            for item in raw.get('entries', []):
+                entry = CachedSubtitle(**item)
+                if self._blob_path(entry.sha256).exists():
+                    entries[entry.key] = entry
+            return entries
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Subtitle cache index unreadable, starting empty: {e}")
+            return {}
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path.with_suffix('.tmp')
+        data = {'entries': [asdict(e) for e in self._entries.values()]}
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.index_path)
+        self._unsaved_reads = 0
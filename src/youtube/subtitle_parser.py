@@ -1,13 +1,43 @@
 """
 Subtitle Parser Utility
 
-Parses VTT/SRT subtitle files to plain text.
+Parses VTT/SRT and YouTube json3/srv3 subtitle files to plain text.
 Used by yt-dlp transcript fetcher to convert downloaded subtitles.
+
+Parsing is streaming and single-pass: input is consumed line by line from a
+string, a file handle, or an iterator of byte/str chunks, so a 3-hour
+auto-caption file never needs to be split into an intermediate list.
+Deduplication, tag cleanup, whitespace normalization and word counting all
+happen as each line is seen.
 """
 
+import codecs
+import json
 import re
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass
-from typing import Optional
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .cue_store import CueStore
+
+# Precompiled patterns (hot loop - avoid the re module cache lookup per line)
+_TAG_RE = re.compile(r'<[^>]+>')        # VTT/HTML tags: <c>, </c>, <b>, <00:00:01.000>
+_BRACE_RE = re.compile(r'\{[^}]+\}')    # Position/alignment and ASS/SSA style tags
+_TIMING_RE = re.compile(
+    r'((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})'
+)
+
+# Rolling auto-caption de-duplication: how many recent words a new line is
+# compared against, and the shortest overlap we treat as a repeat rather
+# than a speaker genuinely saying the same words again
+OVERLAP_WINDOW_WORDS = 32
+MIN_OVERLAP_WORDS = 3
+
+# Chunk size used when reading from file handles
+READ_CHUNK_SIZE = 64 * 1024
+
+# Anything we know how to stream lines out of
+SubtitleSource = Union[str, bytes, IO, Iterable[bytes], Iterable[str]]
 
 
 @dataclass
@@ -16,156 +46,416 @@ class ParsedSubtitle:
     text: str
     word_count: int
     line_count: int
+    cues: Optional[CueStore] = None
 
 
-def parse_vtt(content: str) -> ParsedSubtitle:
+class _TranscriptBuilder:
     """
-    Parse WebVTT subtitle content to plain text.
+    Accumulates cleaned subtitle lines into transcript text.
+
+    Drops consecutive identical lines (VTT often has overlapping cues with
+    repeated text), collapses internal whitespace and counts words as lines
+    arrive, so no second pass over the joined text is needed.
+
+    With merge_overlaps, it also removes the rolling-window repetition of
+    YouTube auto-captions: a line that was already emitted within the last
+    few words is dropped, and a line whose leading words repeat the tail of
+    the transcript only contributes its new words.
+    """
+
+    __slots__ = (
+        '_parts', '_prev', '_tail', '_length', 'merge_overlaps',
+        'word_count', 'line_count', 'cues', 'cue_start', 'cue_end'
+    )
+
+    def __init__(self, merge_overlaps: bool = False, with_cues: bool = False):
+        self._parts: List[str] = []
+        self._prev: Optional[str] = None
+        self._tail: List[str] = []
+        self._length = 0
+        self.merge_overlaps = merge_overlaps
+        self.word_count = 0
+        self.line_count = 0
+
+        # Timing of the cue currently being read (only tracked with_cues)
+        self.cues = CueStore() if with_cues else None
+        self.cue_start = 0.0
+        self.cue_end = 0.0
+
+    def set_timing(self, line: str) -> None:
+        """Record the timing of the cue that starts at this timestamp line."""
+        timing = _parse_timing(line)
+        if timing:
+            self.cue_start, self.cue_end = timing
+
+    def add(self, line: str) -> None:
+        """Add a cleaned, stripped, non-empty subtitle line."""
+        if line == self._prev:
+            return
+        self._prev = line
+
+        words = line.split()
+        if self.merge_overlaps:
+            words = self._trim_overlap(words)
+            if not words:
+                return
+
+        part = ' '.join(words)
+        if self.cues is not None:
+            offset = self._length + 1 if self._parts else 0
+            self.cues.append(self.cue_start, self.cue_end, offset)
+            self._length = offset + len(part)
+
+        self._parts.append(part)
+        self.word_count += len(words)
+        self.line_count += 1
+
+    def _trim_overlap(self, words: List[str]) -> List[str]:
+        """Strip the part of a line that repeats recently emitted words."""
+        keys = [w.lower() for w in words]
+        tail = self._tail
+
+        if tail and len(keys) >= MIN_OVERLAP_WORDS:
+            # Whole line re-displayed from the rolling window
+            if f" {' '.join(keys)} " in f" {' '.join(tail)} ":
+                return []
+
+            # Leading words continue where the transcript left off
+            for k in range(min(len(tail), len(keys) - 1), MIN_OVERLAP_WORDS - 1, -1):
+                if tail[-k:] == keys[:k]:
+                    words = words[k:]
+                    keys = keys[k:]
+                    break
+
+        tail.extend(keys)
+        if len(tail) > OVERLAP_WINDOW_WORDS:
+            del tail[:len(tail) - OVERLAP_WINDOW_WORDS]
+        return words
+
+    def build(self) -> ParsedSubtitle:
+        text = ' '.join(self._parts)
+        if self.cues is not None:
+            self.cues.text = text
+        return ParsedSubtitle(
+            text=text,
+            word_count=self.word_count,
+            line_count=self.line_count,
+            cues=self.cues
+        )
+
+
+def _timestamp_seconds(timestamp: str) -> float:
+    """Convert '01:02:03.456', '02:03.456' or '01:02:03,456' to seconds."""
+    parts = timestamp.replace(',', '.').split(':')
+    seconds = float(parts[-1]) + int(parts[-2]) * 60
+    if len(parts) == 3:
+        seconds += int(parts[0]) * 3600
+    return seconds
+
+
+def _parse_timing(line: str) -> Optional[Tuple[float, float]]:
+    """Parse a cue timing line into (start, end) seconds."""
+    match = _TIMING_RE.search(line)
+    if not match:
+        return None
+    return _timestamp_seconds(match.group(1)), _timestamp_seconds(match.group(2))
+
+
+def _clean_line(line: str) -> str:
+    """Remove markup tags from a subtitle text line."""
+    if '<' in line:
+        line = _TAG_RE.sub('', line)
+    if '{' in line:
+        line = _BRACE_RE.sub('', line)
+    return line.strip()
+
+
+def _iter_chunks(source: SubtitleSource, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Union[str, bytes]]:
+    """Yield raw str/bytes chunks from any supported subtitle source."""
+    if isinstance(source, (str, bytes)):
+        yield source
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        yield from source
+
+
+def iter_lines(source: SubtitleSource, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield lines from subtitle content, splitting on '\\n'.
 
     Args:
-        content: Raw VTT file content
+        source: Raw content (str/bytes), a text or binary file handle,
+                or an iterator of str/bytes chunks split at arbitrary points
+        chunk_size: Read size used for file handles
+
+    Yields:
+        Lines without the trailing newline (bytes are decoded as UTF-8)
+    """
+    if isinstance(source, bytes):
+        source = source.decode('utf-8', errors='replace')
+
+    if isinstance(source, str):
+        start = 0
+        while True:
+            end = source.find('\n', start)
+            if end == -1:
+                yield source[start:]
+                return
+            yield source[start:end]
+            start = end + 1
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+
+    for chunk in _iter_chunks(source, chunk_size):
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        if not chunk:
+            continue
+
+        pending += chunk
+        lines = pending.split('\n')
+        pending = lines.pop()
+        yield from lines
+
+    pending += decoder.decode(b'', final=True)
+    yield pending
+
+
+def parse_vtt_stream(
+    source: SubtitleSource,
+    merge_overlaps: bool = False,
+    with_cues: bool = False
+) -> ParsedSubtitle:
+    """
+    Parse WebVTT subtitle content to plain text in a single pass.
+
+    Args:
+        source: Raw VTT content, file handle, or iterator of chunks
+        merge_overlaps: Remove rolling-window repeats (auto-captions only: manual
+                        captions can repeat a line on purpose)
+        with_cues: Also build a CueStore mapping text to timestamps
 
     Returns:
         ParsedSubtitle with clean text and word count
     """
-    lines = content.split('\n')
-    text_lines = []
-
-    # Skip WEBVTT header and metadata
+    builder = _TranscriptBuilder(merge_overlaps=merge_overlaps, with_cues=with_cues)
     in_cue = False
 
-    for line in lines:
+    for line in iter_lines(source):
         line = line.strip()
 
-        # Skip empty lines
+        # Blank line ends a cue
         if not line:
             in_cue = False
             continue
 
-        # Skip WEBVTT header
-        if line.startswith('WEBVTT'):
-            continue
-
-        # Skip NOTE comments
-        if line.startswith('NOTE'):
+        # Skip WEBVTT header and NOTE comments
+        if line.startswith('WEBVTT') or line.startswith('NOTE'):
             continue
 
-        # Skip timestamp lines (00:00:00.000 --> 00:00:05.000)
+        # Timestamp line (00:00:00.000 --> 00:00:05.000) starts a cue
         if '-->' in line:
             in_cue = True
+            if with_cues:
+                builder.set_timing(line)
             continue
 
-        # Skip cue identifiers (numeric or alphanumeric before timestamp)
-        if re.match(r'^[\d\w-]+$', line) and not in_cue:
+        # Outside a cue: cue identifiers, Kind/Language metadata, STYLE blocks
+        if not in_cue:
             continue
 
         # Skip Kind/Language metadata
-        if line.startswith('Kind:') or line.startswith('Language:'):
+        if line.startswith(('Kind:', 'Language:')):
             continue
 
-        # This is actual subtitle text
-        if in_cue:
-            # Remove VTT formatting tags like <c>, </c>, <b>, etc.
-            clean_line = re.sub(r'<[^>]+>', '', line)
-            # Remove position/alignment tags
-            clean_line = re.sub(r'\{[^}]+\}', '', clean_line)
-
-            if clean_line.strip():
-                text_lines.append(clean_line.strip())
-
-    # Join lines and deduplicate consecutive identical lines
-    # (VTT often has overlapping cues with repeated text)
-    deduped_lines = []
-    prev_line = None
-    for line in text_lines:
-        if line != prev_line:
-            deduped_lines.append(line)
-            prev_line = line
-
-    # Join into paragraphs (sentences ending with punctuation start new lines)
-    text = ' '.join(deduped_lines)
-
-    # Clean up multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-
-    # Calculate word count
-    word_count = len(text.split()) if text else 0
-
-    return ParsedSubtitle(
-        text=text,
-        word_count=word_count,
-        line_count=len(deduped_lines)
-    )
+        clean_line = _clean_line(line)
+        if clean_line:
+            builder.add(clean_line)
+
+    return builder.build()
 
 
-def parse_srt(content: str) -> ParsedSubtitle:
+def parse_srt_stream(source: SubtitleSource, with_cues: bool = False) -> ParsedSubtitle:
     """
-    Parse SRT subtitle content to plain text.
+    Parse SRT subtitle content to plain text in a single pass.
 
     Args:
-        content: Raw SRT file content
+        source: Raw SRT content, file handle, or iterator of chunks
+        with_cues: Also build a CueStore mapping text to timestamps
 
     Returns:
         ParsedSubtitle with clean text and word count
     """
-    lines = content.split('\n')
-    text_lines = []
+    builder = _TranscriptBuilder(with_cues=with_cues)
 
-    for line in lines:
+    for line in iter_lines(source):
         line = line.strip()
 
-        # Skip empty lines
-        if not line:
-            continue
-
-        # Skip sequence numbers (just digits)
-        if re.match(r'^\d+$', line):
+        # Skip empty lines and sequence numbers (just digits)
+        if not line or line.isdecimal():
             continue
 
         # Skip timestamp lines (00:00:00,000 --> 00:00:05,000)
         if '-->' in line:
+            if with_cues:
+                builder.set_timing(line)
             continue
 
-        # This is actual subtitle text
-        # Remove HTML-style formatting tags
-        clean_line = re.sub(r'<[^>]+>', '', line)
-        # Remove ASS/SSA style tags
-        clean_line = re.sub(r'\{[^}]+\}', '', clean_line)
+        clean_line = _clean_line(line)
+        if clean_line:
+            builder.add(clean_line)
 
-        if clean_line.strip():
-            text_lines.append(clean_line.strip())
+    return builder.build()
 
-    # Deduplicate consecutive identical lines
-    deduped_lines = []
-    prev_line = None
-    for line in text_lines:
-        if line != prev_line:
-            deduped_lines.append(line)
-            prev_line = line
 
-    # Join into single text
-    text = ' '.join(deduped_lines)
+def parse_json3_stream(source: SubtitleSource, with_cues: bool = False) -> ParsedSubtitle:
+    """
+    Parse YouTube json3 captions to plain text.
 
-    # Clean up multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
+    json3 carries explicit caption events with segment text, so there is no
+    rolling-window repetition to undo: each event's segments are new words.
+    Events without text (window definitions, appended line breaks) are skipped.
+
+    Args:
+        source: Raw json3 content, file handle, or iterator of chunks
+        with_cues: Also build a CueStore mapping text to timestamps
 
-    # Calculate word count
-    word_count = len(text.split()) if text else 0
+    Returns:
+        ParsedSubtitle with clean text and word count
+    """
+    builder = _TranscriptBuilder(with_cues=with_cues)
 
-    return ParsedSubtitle(
-        text=text,
-        word_count=word_count,
-        line_count=len(deduped_lines)
+    raw = b''.join(
+        chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+        for chunk in _iter_chunks(source)
     )
+    try:
+        data = json.loads(raw.decode('utf-8', errors='replace'))
+        events = data.get('events')
+    except (ValueError, AttributeError):
+        return builder.build()
+    if not isinstance(events, list):
+        return builder.build()
+
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        segs = event.get('segs')
+        if not isinstance(segs, list):
+            continue
 
+        text = ''.join(
+            seg.get('utf8', '') for seg in segs
+            if isinstance(seg, dict) and isinstance(seg.get('utf8'), str)
+        )
+        clean_line = _clean_line(text)
+        if not clean_line:
+            continue
 
-def parse_subtitle(content: str, format: str = 'vtt') -> ParsedSubtitle:
+        if with_cues:
+            try:
+                start = float(event.get('tStartMs', 0)) / 1000
+                builder.cue_start = start
+                builder.cue_end = start + float(event.get('dDurationMs', 0)) / 1000
+            except (TypeError, ValueError):
+                pass
+        builder.add(clean_line)
+
+    return builder.build()
+
+
+def parse_srv3_stream(source: SubtitleSource, with_cues: bool = False) -> ParsedSubtitle:
+    """
+    Parse YouTube srv3 (timedtext XML) captions to plain text.
+
+    Each <p t="ms" d="ms"> element is one caption event; word-level <s>
+    segments are concatenated. Parsed incrementally with a pull parser, and
+    malformed XML yields whatever was parsed before the error.
+
+    Args:
+        source: Raw srv3 content, file handle, or iterator of chunks
+        with_cues: Also build a CueStore mapping text to timestamps
+
+    Returns:
+        ParsedSubtitle with clean text and word count
+    """
+    builder = _TranscriptBuilder(with_cues=with_cues)
+    parser = ET.XMLPullParser(events=('end',))
+
+    def drain():
+        for _, elem in parser.read_events():
+            if elem.tag != 'p':
+                continue
+            clean_line = _clean_line(''.join(elem.itertext()))
+            if clean_line:
+                if with_cues:
+                    try:
+                        start = float(elem.get('t', 0)) / 1000
+                        builder.cue_start = start
+                        builder.cue_end = start + float(elem.get('d', 0)) / 1000
+                    except (TypeError, ValueError):
+                        pass
+                builder.add(clean_line)
+            elem.clear()
+
+    try:
+        for chunk in _iter_chunks(source):
+            parser.feed(chunk)
+            drain()
+        parser.close()
+        drain()
+    except ET.ParseError:
+        pass
+
+    return builder.build()
+
+
+def parse_vtt(content: str, merge_overlaps: bool = False, with_cues: bool = False) -> ParsedSubtitle:
+    """
+    Parse WebVTT subtitle content to plain text.
+
+    Args:
+        content: Raw VTT file content
+        merge_overlaps: Remove rolling-window repeats (auto-captions only: manual
+                        captions can repeat a line on purpose)
+        with_cues: Also build a CueStore mapping text to timestamps
+
+    Returns:
+        ParsedSubtitle with clean text and word count
+    """
+    return parse_vtt_stream(content, merge_overlaps=merge_overlaps, with_cues=with_cues)
+
+
+def parse_srt(content: str, with_cues: bool = False) -> ParsedSubtitle:
+    """
+    Parse SRT subtitle content to plain text.
+
+    Args:
+        content: Raw SRT file content
+        with_cues: Also build a CueStore mapping text to timestamps
+
+    Returns:
+        ParsedSubtitle with clean text and word count
+    """
+    return parse_srt_stream(content, with_cues=with_cues)
+
+
+def parse_subtitle(
+    content: str,
+    format: str = 'vtt',
+    with_cues: bool = False,
+    merge_overlaps: bool = False
+) -> ParsedSubtitle:
     """
     Parse subtitle content to plain text.
 
     Args:
         content: Raw subtitle file content
-        format: Subtitle format ('vtt' or 'srt')
+        format: Subtitle format ('vtt', 'srt', 'json3' or 'srv3')
+        with_cues: Also build a CueStore mapping text to timestamps
+        merge_overlaps: Remove rolling-window repeats from VTT auto-captions
 
     Returns:
         ParsedSubtitle with clean text and word count
@@ -173,34 +463,57 @@ def parse_subtitle(content: str, format: str = 'vtt') -> ParsedSubtitle:
     format = format.lower()
 
     if format == 'vtt':
-        return parse_vtt(content)
+        return parse_vtt(content, merge_overlaps=merge_overlaps, with_cues=with_cues)
     elif format == 'srt':
-        return parse_srt(content)
+        return parse_srt(content, with_cues=with_cues)
+    elif format == 'json3':
+        return parse_json3_stream(content, with_cues=with_cues)
+    elif format == 'srv3':
+        return parse_srv3_stream(content, with_cues=with_cues)
     else:
         # Try to auto-detect
-        if content.strip().startswith('WEBVTT'):
-            return parse_vtt(content)
+        head = content.lstrip()
+        if head.startswith('WEBVTT'):
+            return parse_vtt(content, merge_overlaps=merge_overlaps, with_cues=with_cues)
+        elif head.startswith('{'):
+            return parse_json3_stream(content, with_cues=with_cues)
+        elif head.startswith('<'):
+            return parse_srv3_stream(content, with_cues=with_cues)
         else:
-            return parse_srt(content)
+            return parse_srt(content, with_cues=with_cues)
 
 
-def parse_subtitle_file(filepath: str) -> ParsedSubtitle:
+def parse_subtitle_file(filepath: str, with_cues: bool = False, merge_overlaps: bool = False) -> ParsedSubtitle:
     """
-    Parse a subtitle file to plain text.
+    Parse a subtitle file to plain text, streaming from disk.
 
     Args:
-        filepath: Path to subtitle file (.vtt or .srt)
+        filepath: Path to subtitle file (.vtt, .srt, .json3 or .srv3)
+        with_cues: Also build a CueStore mapping text to timestamps
+        merge_overlaps: Remove rolling-window repeats from VTT auto-captions
 
     Returns:
         ParsedSubtitle with clean text and word count
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Detect format from extension
-    if filepath.endswith('.vtt'):
-        return parse_vtt(content)
-    elif filepath.endswith('.srt'):
-        return parse_srt(content)
-    else:
-        return parse_subtitle(content)
+    with open(filepath, 'rb') as f:
+        # Detect format from extension
+        if filepath.endswith('.vtt'):
+            return parse_vtt_stream(f, merge_overlaps=merge_overlaps, with_cues=with_cues)
+        elif filepath.endswith('.srt'):
+            return parse_srt_stream(f, with_cues=with_cues)
+        elif filepath.endswith('.json3'):
+            return parse_json3_stream(f, with_cues=with_cues)
+        elif filepath.endswith('.srv3'):
+            return parse_srv3_stream(f, with_cues=with_cues)
+
+        # Try to auto-detect from the first bytes
+        head = f.read(64)
+        f.seek(0)
+        head = head.lstrip(codecs.BOM_UTF8).lstrip()
+        if head.startswith(b'WEBVTT'):
+            return parse_vtt_stream(f, merge_overlaps=merge_overlaps, with_cues=with_cues)
+        elif head.startswith(b'{'):
+            return parse_json3_stream(f, with_cues=with_cues)
+        elif head.startswith(b'<'):
+            return parse_srv3_stream(f, with_cues=with_cues)
+        return parse_srt_stream(f, with_cues=with_cues)
@@ -7,7 +7,8 @@ youtube-transcript-api, which was being blocked by YouTube.
 Key features:
 - More resilient to YouTube blocking
 - Downloads auto-generated or manual captions
-- Parses VTT subtitles to plain text
+- Prefers YouTube json3/srv3 captions, falls back to VTT
+- Optional read-through cache of raw subtitle payloads (see subtitle_cache)
 """
 
 import logging
@@ -23,10 +24,25 @@ try:
 except ImportError:
     raise ImportError("yt-dlp not installed. Run: pip install yt-dlp")
 
-from .subtitle_parser import parse_subtitle_file
+from .subtitle_parser import parse_subtitle, parse_subtitle_file
+from .subtitle_cache import SubtitleCache, KIND_AUTO, KIND_MANUAL
+from .cue_store import CueStore
 
 logger = logging.getLogger(__name__)
 
+# Subtitle formats ranked by parse cost and transcript quality.
+# json3/srv3 carry explicit caption events (no rolling-window duplicates) and
+# parse with json/xml; VTT needs line scanning plus overlap merging.
+SUBTITLE_FORMAT_SCORES = {
+    '.json3': 30,
+    '.srv3': 20,
+    '.vtt': 10,
+    '.srt': 5,
+}
+
+# yt-dlp format preference string derived from the ranking above
+SUBTITLE_FORMAT_PREFERENCE = 'json3/srv3/vtt'
+
 
 @dataclass
 class TranscriptResult:
@@ -39,6 +55,8 @@ class TranscriptResult:
     is_generated: bool = False
     error_message: str = ""
     fetch_time_seconds: float = 0.0
+    from_cache: bool = False
+    cues: Optional[CueStore] = None  # Timing index into transcript_text (with_cues fetchers only)
 
 
 class YtdlpTranscriptFetcher:
@@ -48,15 +66,28 @@ class YtdlpTranscriptFetcher:
     More resilient to YouTube blocking than youtube-transcript-api.
     """
 
-    def __init__(self, prefer_languages: List[str] = None):
+    def __init__(
+        self,
+        prefer_languages: List[str] = None,
+        subtitle_cache: Optional[SubtitleCache] = None,
+        with_cues: bool = False
+    ):
         """
         Initialize the fetcher.
 
         Args:
             prefer_languages: List of language codes to prefer, in order
+            subtitle_cache: Optional raw subtitle cache used as a read-through layer
+            with_cues: Also build a CueStore timing index (TranscriptResult.cues);
+                       off by default since the pipeline only uses the text
         """
         self.prefer_languages = prefer_languages or ['en', 'en-US', 'en-GB', 'en-AU']
-        logger.info(f"YtdlpTranscriptFetcher initialized with languages: {self.prefer_languages}")
+        self.subtitle_cache = subtitle_cache
+        self.with_cues = with_cues
+        logger.info(
+            f"YtdlpTranscriptFetcher initialized with languages: {self.prefer_languages}, "
+            f"cache={'on' if subtitle_cache else 'off'}"
+        )
 
     def fetch_transcript(self, video_id: str) -> TranscriptResult:
         """
@@ -73,6 +104,13 @@ class YtdlpTranscriptFetcher:
 
         logger.debug(f"Fetching transcript for video: {video_id}")
 
+        # Serve from the raw subtitle cache if we already downloaded this video
+        if self.subtitle_cache:
+            cached = self.transcript_from_cache(video_id)
+            if cached:
+                cached.fetch_time_seconds = time.time() - start_time
+                return cached
+
         # Create temp directory for subtitle files
         with tempfile.TemporaryDirectory() as tmpdir:
             output_template = os.path.join(tmpdir, '%(id)s.%(ext)s')
@@ -83,7 +121,7 @@ class YtdlpTranscriptFetcher:
                 'writeautomaticsub': True,  # Download auto-generated subs
                 'writesubtitles': True,     # Download manual subs (preferred)
                 'subtitleslangs': self.prefer_languages,  # Only English variants
-                'subtitlesformat': 'vtt',   # Use VTT format
+                'subtitlesformat': SUBTITLE_FORMAT_PREFERENCE,  # json3, then srv3, then VTT
                 'skip_download': True,      # Don't download video
                 'outtmpl': output_template,
                 'quiet': True,
@@ -106,12 +144,7 @@ class YtdlpTranscriptFetcher:
                         )
 
                     # Check for downloaded subtitle files
-                    subtitle_files = list(Path(tmpdir).glob(f"{video_id}*.vtt"))
-
-                    if not subtitle_files:
-                        # Check for other formats
-                        subtitle_files = list(Path(tmpdir).glob(f"{video_id}*.*"))
-                        subtitle_files = [f for f in subtitle_files if f.suffix in ['.vtt', '.srt', '.ttml']]
+                    subtitle_files = self._find_subtitle_files(tmpdir, video_id)
 
                     if not subtitle_files:
                         return TranscriptResult(
@@ -121,15 +154,17 @@ class YtdlpTranscriptFetcher:
                             fetch_time_seconds=time.time() - start_time
                         )
 
+                    self._store_in_cache(video_id, subtitle_files)
+
                     # Find best subtitle file (prefer English, prefer manual over auto)
                     best_file = self._select_best_subtitle(subtitle_files)
 
-                    # Parse the subtitle file
-                    parsed = parse_subtitle_file(str(best_file))
-
                     # Detect if auto-generated from filename
                     is_auto = '-orig' in best_file.name
 
+                    # Parse the subtitle file (only auto-captions repeat lines in a rolling window)
+                    parsed = parse_subtitle_file(str(best_file), with_cues=self.with_cues, merge_overlaps=is_auto)
+
                     # Extract language from filename
                     lang_match = best_file.stem.replace(video_id, '').strip('.')
                     language = lang_match.split('-')[0] if lang_match else 'en'
@@ -146,17 +181,21 @@ class YtdlpTranscriptFetcher:
                         word_count=parsed.word_count,
                         language=language,
                         is_generated=is_auto,
-                        fetch_time_seconds=time.time() - start_time
+                        fetch_time_seconds=time.time() - start_time,
+                        cues=parsed.cues
                     )
 
             except yt_dlp.utils.DownloadError as e:
                 error_msg = str(e)
 
                 # Check if we got subtitle files despite the error
-                subtitle_files = list(Path(tmpdir).glob(f"{video_id}*.vtt"))
+                subtitle_files = self._find_subtitle_files(tmpdir, video_id)
                 if subtitle_files:
+                    self._store_in_cache(video_id, subtitle_files)
                     best_file = self._select_best_subtitle(subtitle_files)
-                    parsed = parse_subtitle_file(str(best_file))
+                    parsed = parse_subtitle_file(
+                        str(best_file), with_cues=self.with_cues, merge_overlaps='-orig' in best_file.name
+                    )
                     lang_match = best_file.stem.replace(video_id, '').strip('.')
                     language = lang_match.split('-')[0] if lang_match else 'en'
 
@@ -171,7 +210,8 @@ class YtdlpTranscriptFetcher:
                         word_count=parsed.word_count,
                         language=language,
                         is_generated='-orig' in best_file.name,
-                        fetch_time_seconds=time.time() - start_time
+                        fetch_time_seconds=time.time() - start_time,
+                        cues=parsed.cues
                     )
 
                 if 'HTTP Error 429' in error_msg:
@@ -197,6 +237,76 @@ class YtdlpTranscriptFetcher:
                     fetch_time_seconds=time.time() - start_time
                 )
 
+    def transcript_from_cache(self, video_id: str) -> Optional[TranscriptResult]:
+        """
+        Build a transcript from cached raw subtitles without touching YouTube.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            TranscriptResult, or None if nothing usable is cached
+        """
+        if not self.subtitle_cache:
+            return None
+
+        entries = self.subtitle_cache.get_video(video_id)
+        if not entries:
+            return None
+
+        by_name = {e.filename: e for e in entries}
+        best_file = self._select_best_subtitle([Path(name) for name in by_name])
+        entry = by_name[best_file.name]
+
+        payload = self.subtitle_cache.read(entry)
+        if payload is None:
+            return None
+
+        parsed = parse_subtitle(
+            payload.decode('utf-8', errors='replace'), entry.format,
+            with_cues=self.with_cues, merge_overlaps=entry.kind == KIND_AUTO
+        )
+
+        logger.info(
+            f"Served transcript for {video_id} from subtitle cache: "
+            f"{parsed.word_count} words, lang={entry.language}, auto={entry.kind == KIND_AUTO}"
+        )
+
+        return TranscriptResult(
+            video_id=video_id,
+            success=True,
+            transcript_text=parsed.text,
+            word_count=parsed.word_count,
+            language=entry.language.split('-')[0],
+            is_generated=entry.kind == KIND_AUTO,
+            from_cache=True,
+            cues=parsed.cues
+        )
+
+    def _store_in_cache(self, video_id: str, subtitle_files: List[Path]) -> None:
+        """Copy downloaded subtitle files into the raw subtitle cache."""
+        if not self.subtitle_cache:
+            return
+
+        for f in subtitle_files:
+            track = f.stem.replace(video_id, '').strip('.') or 'en'
+            kind = KIND_AUTO if track.endswith('-orig') else KIND_MANUAL
+            language = track[:-len('-orig')] if kind == KIND_AUTO else track
+            try:
+                self.subtitle_cache.put(
+                    video_id, language, kind, f.suffix.lstrip('.'), f.read_bytes()
+                )
+            except OSError as e:
+                # Caching is best-effort; never fail a fetch because of it
+                logger.warning(f"Failed to cache subtitle {f.name}: {e}")
+
+    def _find_subtitle_files(self, tmpdir: str, video_id: str) -> List[Path]:
+        """Find downloaded subtitle files in a format we can parse."""
+        return [
+            f for f in Path(tmpdir).glob(f"{video_id}*.*")
+            if f.suffix in SUBTITLE_FORMAT_SCORES
+        ]
+
     def _select_best_subtitle(self, subtitle_files: List[Path]) -> Path:
         """
         Select the best subtitle file from available options.
@@ -206,6 +316,8 @@ class YtdlpTranscriptFetcher:
         2. English auto-generated subtitles
         3. Any other language
 
+        Within each tier, json3 > srv3 > vtt > srt.
+
         Args:
             subtitle_files: List of subtitle file paths
 
@@ -225,9 +337,8 @@ class YtdlpTranscriptFetcher:
             if '-orig' not in name:
                 score += 50
 
-            # Prefer VTT format
-            if f.suffix == '.vtt':
-                score += 10
+            # Prefer formats that are cheaper to parse and cleaner (json3 > srv3 > vtt > srt)
+            score += SUBTITLE_FORMAT_SCORES.get(f.suffix, 0)
 
             scored_files.append((score, f))
 
@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the project root importable as in scripts/."""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
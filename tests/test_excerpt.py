@@ -0,0 +1,43 @@
+"""
+Tests for excerpt sizing in src/llm/excerpt.py.
+
+The transcript is synthetic: numbered words of equal length, so every window
+has about the same token count (the last is shorter) and distinct vocabulary.
+"""
+
+import pytest
+
+from src.llm.excerpt import DEFAULT_WINDOW_TOKENS, GAP_MARKER, STRATEGIES, WORDS_PER_TOKEN, ExcerptBuilder
+from src.llm.models import count_tokens
+
+WORDS = [f"w{i % 9000:04d}" for i in range(20040)]
+TRANSCRIPT = " ".join(WORDS)
+
+STEP = int(DEFAULT_WINDOW_TOKENS * WORDS_PER_TOKEN)
+WINDOW_TOKENS = max(count_tokens(" ".join(WORDS[s:s + STEP])) for s in range(0, len(WORDS), STEP))
+
+
+def _tokens(excerpt: str) -> int:
+    return count_tokens(excerpt.replace(GAP_MARKER, ''))
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_excerpt_fills_budget(strategy):
+    budget = 5 * WINDOW_TOKENS + 100
+    excerpt = ExcerptBuilder(strategy=strategy).build(TRANSCRIPT, budget)
+
+    # Whatever is left unused is too small for another window
+    assert budget - WINDOW_TOKENS < _tokens(excerpt) <= budget
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_budget_below_one_window_cuts_the_opening(strategy):
+    excerpt = ExcerptBuilder(strategy=strategy, window_tokens=200).build(TRANSCRIPT, 150)
+    opening = ExcerptBuilder(strategy='head', window_tokens=200).build(TRANSCRIPT, 150)
+
+    assert excerpt == opening
+    assert _tokens(excerpt) > 100
+
+
+def test_whitespace_transcript_gives_empty_excerpt():
+    assert ExcerptBuilder().build("  \n\t ") == ''
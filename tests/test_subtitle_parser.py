@@ -0,0 +1,45 @@
+"""
+Tests for overlap merging in src/youtube/subtitle_parser.py.
+
+Fixtures in tests/fixtures are YouTube-style caption tracks: a rolling-window
+auto-caption track (.en-orig.vtt) and a manual track (.en.vtt) whose speaker
+really repeats lines.
+"""
+
+from pathlib import Path
+
+from src.youtube.subtitle_parser import parse_subtitle, parse_subtitle_file, parse_vtt
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+AUTO_CAPTION = FIXTURES / 'auto_caption.en-orig.vtt'
+MANUAL_REPEATED = FIXTURES / 'manual_repeated_lines.en.vtt'
+
+AUTO_CAPTION_TEXT = (
+    "welcome back to the show today we're talking about the new model release "
+    "and what it means for developers so let's get right into it"
+)
+MANUAL_TEXT = (
+    "Is it good? I think it is. Is it fast? I think it is. "
+    "Thank you so much. Bye everyone. Thank you so much."
+)
+
+
+def test_auto_caption_rolling_window_is_deduplicated():
+    parsed = parse_subtitle_file(str(AUTO_CAPTION), merge_overlaps=True)
+
+    assert parsed.text == AUTO_CAPTION_TEXT
+    assert parsed.word_count == len(AUTO_CAPTION_TEXT.split())
+
+
+def test_auto_caption_keeps_repeats_without_merging():
+    parsed = parse_subtitle_file(str(AUTO_CAPTION))
+
+    assert parsed.word_count > len(AUTO_CAPTION_TEXT.split())
+
+
+def test_manual_captions_keep_repeated_lines():
+    content = MANUAL_REPEATED.read_text(encoding='utf-8')
+
+    assert parse_subtitle_file(str(MANUAL_REPEATED)).text == MANUAL_TEXT
+    assert parse_subtitle(content, 'vtt').text == MANUAL_TEXT
+    assert parse_vtt(content).text == MANUAL_TEXT